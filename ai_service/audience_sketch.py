@@ -0,0 +1,224 @@
+"""
+Audience Sketches for Influencelytic-Match
+HyperLogLog sketches of each influencer's follower set, mergeable and a few KB
+each, for union cardinality, pairwise overlap and deduplicated campaign reach
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+# Share of an audience a sponsored post is expected to reach (as in AIMatchingEngine)
+REACH_RATE = 0.3
+
+DEFAULT_PRECISION = 12          # 4096 one-byte registers, ~1.6% standard error
+DEFAULT_SKETCH_PATH = os.getenv('AUDIENCE_SKETCH_PATH', './data/audience_sketches.npz')
+
+_POW2 = 2.0 ** -np.arange(66)
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """Vectorized splitmix64 finalizer, a well-mixed 64-bit hash of integer ids"""
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def hash_ids(ids: Any) -> np.ndarray:
+    """
+    64-bit hashes of follower ids. Integer ids and their decimal string form
+    hash identically, so sketches built from the follower graph (int64 ids)
+    and from platform_user_id strings can be merged.
+    """
+    ids = np.asarray(ids)
+    if ids.dtype.kind in 'iu':
+        return _splitmix64(ids)
+    ids = ids.astype(str)
+    numeric = np.char.isdigit(ids) & (np.char.str_len(ids) < 19)
+    hashes = np.empty(len(ids), dtype=np.uint64)
+    hashes[numeric] = _splitmix64(ids[numeric].astype(np.int64))
+    hashes[~numeric] = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(i.encode(), digest_size=8).digest(), 'little') for i in ids[~numeric]),
+        dtype=np.uint64, count=int((~numeric).sum())
+    )
+    return hashes
+
+
+def registers_from_hashes(hashes: np.ndarray, precision: int = DEFAULT_PRECISION) -> np.ndarray:
+    """HyperLogLog registers: top bits pick a register, the rank of the rest is stored"""
+    m = 1 << precision
+    registers = np.zeros(m, dtype=np.uint8)
+    if not len(hashes):
+        return registers
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << (64 - precision)) - 1)
+    # Remainders have at most 52 bits, so float64 holds them exactly and frexp gives bit_length
+    bit_length = np.frexp(remainder.astype(np.float64))[1]
+    rank = (64 - precision - bit_length + 1).astype(np.uint8)
+    np.maximum.at(registers, index, rank)
+    return registers
+
+
+def estimate_cardinality(registers: np.ndarray) -> np.ndarray:
+    """HyperLogLog estimate with linear counting for small sets; accepts (..., m) registers"""
+    registers = np.asarray(registers)
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / _POW2[registers].sum(axis=-1)
+    zeros = (registers == 0).sum(axis=-1)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+class AudienceSketchStore:
+    """One HyperLogLog register row per influencer, stored as a dense uint8 matrix"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 12 <= precision <= 18:
+            raise ValueError("precision must be between 12 and 18")
+        self.precision = precision
+        self.influencer_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.registers = np.zeros((0, 1 << precision), dtype=np.uint8)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.influencer_ids)
+
+    def __contains__(self, influencer_id: str) -> bool:
+        return influencer_id in self.index
+
+    def _row(self, influencer_id: str) -> int:
+        row = self.index.get(influencer_id)
+        if row is None:
+            row = self.index[influencer_id] = len(self.influencer_ids)
+            self.influencer_ids.append(influencer_id)
+            if row >= len(self.registers):
+                grown = np.zeros((max(16, 2 * len(self.registers)), self.registers.shape[1]), dtype=np.uint8)
+                grown[:len(self.registers)] = self.registers
+                self.registers = grown
+        return row
+
+    def add_followers(self, influencer_id: str, follower_ids: Any):
+        """Fold a batch of follower ids into an influencer's sketch"""
+        self.merge_registers(influencer_id, registers_from_hashes(hash_ids(follower_ids), self.precision))
+
+    def merge_registers(self, influencer_id: str, registers: np.ndarray):
+        """Union a sketch built elsewhere (another worker or a backfill) into the store"""
+        with self._lock:
+            row = self._row(influencer_id)
+            np.maximum(self.registers[row], registers, out=self.registers[row])
+
+    def merge(self, other: 'AudienceSketchStore'):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        for influencer_id, row in other.index.items():
+            self.merge_registers(influencer_id, other.registers[row])
+
+    def sketch(self, influencer_id: str) -> Optional[np.ndarray]:
+        row = self.index.get(influencer_id)
+        return None if row is None else self.registers[row]
+
+    def _rows(self, influencer_ids: Iterable[str]) -> np.ndarray:
+        return np.array([self.index[i] for i in influencer_ids if i in self.index], dtype=np.int64)
+
+    def cardinality(self, influencer_ids: Iterable[str]) -> Dict[str, float]:
+        ids = [i for i in influencer_ids if i in self.index]
+        estimates = estimate_cardinality(self.registers[self._rows(ids)])
+        return dict(zip(ids, estimates.tolist()))
+
+    def union_cardinality(self, influencer_ids: Iterable[str]) -> float:
+        rows = self._rows(influencer_ids)
+        if not len(rows):
+            return 0.0
+        return float(estimate_cardinality(self.registers[rows].max(axis=0)))
+
+    def overlap_matrix(self, influencer_ids: List[str]) -> Dict[str, Any]:
+        """
+        Pairwise shared-audience estimates by inclusion-exclusion over
+        register-wise unions, computed in blocks to bound memory
+        """
+        ids = [i for i in influencer_ids if i in self.index]
+        sketches = self.registers[self._rows(ids)]
+        sizes = estimate_cardinality(sketches)
+        k = len(ids)
+        unions = np.zeros((k, k))
+        block_size = max(1, (1 << 22) // max(k * sketches.shape[1], 1))
+        for start in range(0, k, block_size):
+            block = sketches[start:start + block_size]
+            unions[start:start + len(block)] = estimate_cardinality(np.maximum(block[:, None, :], sketches[None, :, :]))
+        shared = np.clip(sizes[:, None] + sizes[None, :] - unions, 0, None)
+        np.fill_diagonal(shared, sizes)
+        jaccard = np.divide(shared, unions, out=np.zeros_like(shared), where=unions > 0)
+        return {'influencer_ids': ids, 'audience_size': sizes, 'shared_audience': shared, 'jaccard': jaccard}
+
+    def campaign_reach(self, influencer_ids: List[str], reach_rate: float = REACH_RATE) -> Dict[str, Any]:
+        """Deduplicated reach of a multi-influencer plan versus the naive per-creator sum"""
+        ids = [i for i in influencer_ids if i in self.index]
+        sketches = self.registers[self._rows(ids)]
+        total_audience = float(estimate_cardinality(sketches).sum()) if ids else 0.0
+        unique_audience = float(estimate_cardinality(sketches.max(axis=0))) if ids else 0.0
+        return {
+            'influencers_sketched': len(ids),
+            'missing_influencers': [i for i in influencer_ids if i not in self.index],
+            'total_audience': int(total_audience),
+            'unique_audience': int(unique_audience),
+            'audience_overlap_pct': round((1 - unique_audience / total_audience) * 100, 2) if total_audience else 0.0,
+            'naive_reach': int(total_audience * reach_rate),
+            'deduplicated_reach': int(unique_audience * reach_rate)
+        }
+
+    def combined_reach(self,
+                       influencer_ids: List[str],
+                       fallback_reach: Dict[str, float],
+                       reach_rate: float = REACH_RATE) -> Dict[str, Any]:
+        """
+        campaign_reach for a plan where not every influencer has a sketch:
+        sketched audiences are deduplicated, the rest add their fallback
+        reach estimate as is
+        """
+        reach = self.campaign_reach(influencer_ids, reach_rate)
+        unsketched = int(sum(fallback_reach.get(i, 0.0) for i in reach['missing_influencers']))
+        return {
+            **reach,
+            'naive_reach': reach['naive_reach'] + unsketched,
+            'deduplicated_reach': reach['deduplicated_reach'] + unsketched
+        }
+
+    @classmethod
+    def from_follower_graph(cls, graph, account_ids: Any, precision: int = DEFAULT_PRECISION) -> 'AudienceSketchStore':
+        """Sketch the follower sets of the given accounts from a FollowerGraph"""
+        store = cls(precision)
+        rows = graph.index_of(account_ids)
+        matrix = graph.matrix
+        for account_id, row in zip(np.asarray(account_ids), rows):
+            if row < 0:
+                continue
+            followers = graph.node_ids[matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]]
+            store.add_followers(str(account_id), followers)
+        return store
+
+    def save(self, path: str = DEFAULT_SKETCH_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            np.savez(path, precision=self.precision, influencer_ids=np.asarray(self.influencer_ids, dtype=str),
+                     registers=self.registers[:len(self.influencer_ids)])
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_SKETCH_PATH) -> 'AudienceSketchStore':
+        with np.load(path, allow_pickle=False) as data:
+            store = cls(int(data['precision']))
+            store.influencer_ids = data['influencer_ids'].tolist()
+            store.index = {influencer_id: row for row, influencer_id in enumerate(store.influencer_ids)}
+            store.registers = data['registers'].copy()
+        return store
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_SKETCH_PATH) -> 'AudienceSketchStore':
+        return cls.load(path) if os.path.exists(path) else cls()
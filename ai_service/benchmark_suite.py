@@ -0,0 +1,634 @@
+"""
+Benchmark Suite for Influencelytic-Match
+Measures the matching, similarity, sentiment and pricing paths on seeded
+synthetic populations at 1k-1M scale. Each case reports latency
+percentiles, throughput and the peak memory traced while it ran. Results
+are written as JSON, and `compare` flags regressions against a stored
+baseline. By default models are replaced with deterministic stand-ins
+(hashed token embeddings, a lexicon sentiment classifier), so the suite
+runs offline and its numbers measure the service code rather than model
+inference.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import re
+import resource
+import sys
+import time
+import tracemalloc
+import types
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from demographics import FIELDS as DEMOGRAPHIC_FIELDS
+from profiles import CampaignRequirements, InfluencerProfile
+from sentiment_cascade import LABELS, NEGATIVE_WORDS, NEUTRAL, NEUTRAL_WORDS, POSITIVE_WORDS, LexiconSentimentScorer
+
+
+logger = logging.getLogger(__name__)
+
+SCALES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_RESULTS_PATH = os.getenv('BENCHMARK_RESULTS_PATH', 'data/benchmarks/results.json')
+DEFAULT_BASELINE_PATH = os.getenv('BENCHMARK_BASELINE_PATH', 'data/benchmarks/baseline.json')
+# Relative change beyond which a metric counts as a regression
+REGRESSION_THRESHOLD = float(os.getenv('BENCHMARK_REGRESSION_THRESHOLD', 0.10))
+
+# Metric -> whether larger is better, and the absolute change below which differences are noise
+METRICS = {
+    'latency_ms_p50': (False, 0.05),
+    'latency_ms_p95': (False, 0.05),
+    'throughput_per_s': (True, 0.0),
+    'peak_traced_mb': (False, 1.0),
+}
+
+N_CAMPAIGNS = 100
+POSTS_PER_PROFILE = 12
+# Whole-population operations (ranking, similarity) run once per query campaign or reference
+DEFAULT_QUERIES = 3
+# Per-call operations are timed over at most this many calls drawn from the population
+DEFAULT_MAX_CALLS = 10_000
+# Per-call operations trace memory over this many calls; whole-population ones over one
+MEMORY_CALLS = 100
+EMBEDDING_DIM = 384
+
+PLATFORMS = ('instagram', 'tiktok', 'youtube', 'twitter')
+PLATFORM_SHARE = (0.8, 0.5, 0.3, 0.25)
+NICHES = ('fitness', 'beauty', 'tech', 'food', 'travel', 'gaming', 'fashion', 'finance', 'parenting', 'music')
+NICHE_INDUSTRIES = {'tech': 'technology', 'gaming': 'technology', 'parenting': 'lifestyle', 'fitness': 'health'}
+LOCATIONS = (
+    'New York, NY', 'Los Angeles, CA', 'Austin, Texas', 'Chicago', 'London', 'Manchester', 'Berlin',
+    'Paris', 'Toronto', 'Sydney', 'Mumbai', 'Sao Paulo', '',
+)
+TARGET_LOCATIONS = ([], [], ['United States'], ['London'], ['Canada', 'United States'], ['Germany'])
+POST_TEMPLATES = (
+    "{pos} new {niche} drop today, {pos} results #{niche}",
+    "honestly a {neg} experience with this {niche} brand, {neg}",
+    "{niche} update: pretty {neu} week, nothing new",
+    "not {pos} at all, the {niche} kit was {neg} #{niche}",
+    "{pos} {niche} haul but the shipping was {neg}",
+    "weekly {niche} recap #{niche} #ad",
+)
+
+
+class HashingTextModel:
+    """
+    SentenceTransformer stand-in: hashed bag-of-words vectors, so texts that
+    share words stay similar and every run produces the same embeddings
+    """
+
+    def __init__(self, model_name: Optional[str] = None, dim: int = EMBEDDING_DIM, **kwargs):
+        self.model_name = model_name
+        self.dim = dim
+
+    def encode(self, sentences, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in re.findall(r"\w+", text.lower()):
+                code = zlib.crc32(token.encode())
+                embeddings[row, code % self.dim] += 1.0 if code & 0x80000000 else -1.0
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+class LexiconSentimentPipeline:
+    """transformers sentiment pipeline stand-in answering from the word lists"""
+
+    def __init__(self, *args, **kwargs):
+        self.lexicon = LexiconSentimentScorer()
+
+    def __call__(self, texts, **kwargs) -> List[Dict[str, Any]]:
+        result = self.lexicon.score([texts] if isinstance(texts, str) else list(texts))
+        return [
+            {"label": LABELS[label], "score": 0.6 if label == NEUTRAL else 0.5 + 0.5 * float(confidence)}
+            for label, confidence in zip(result.labels, result.confidence)
+        ]
+
+
+@classmethod
+def _no_weights(cls, *args, **kwargs):
+    return None
+
+
+_MISSING = object()
+
+
+@contextmanager
+def stand_in_models():
+    """
+    Swap the model loaders matching_engine and main3 call for the stand-ins.
+    main3 loads its models at import time, so import it inside this block.
+    The stand-ins never load weights, so sentence_transformers is stubbed
+    for the duration when it is not installed.
+    """
+    stub = None
+    try:
+        import sentence_transformers
+    except ImportError:
+        stub = types.ModuleType('sentence_transformers')
+        stub.SentenceTransformer = HashingTextModel
+        sys.modules['sentence_transformers'] = stub
+    try:
+        import matching_engine
+    finally:
+        if stub is not None:
+            del sys.modules['sentence_transformers']
+
+    patches = [(matching_engine, 'SentenceTransformer', HashingTextModel)]
+    try:
+        import transformers
+        patches += [
+            (transformers, 'pipeline', LexiconSentimentPipeline),
+            (transformers.AutoModel, 'from_pretrained', _no_weights),
+            (transformers.AutoTokenizer, 'from_pretrained', _no_weights),
+        ]
+    except ImportError:
+        pass
+
+    originals = [(owner, name, vars(owner).get(name, _MISSING)) for owner, name, _ in patches]
+    for owner, name, value in patches:
+        setattr(owner, name, value)
+    try:
+        yield
+    finally:
+        for owner, name, value in originals:
+            if value is _MISSING:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, value)
+
+
+def build_engine(stand_ins: bool = True):
+    """AIMatchingEngine, on the stand-in text model unless real models are wanted"""
+    if not stand_ins:
+        from matching_engine import AIMatchingEngine
+        return AIMatchingEngine()
+    with stand_in_models():
+        from matching_engine import AIMatchingEngine
+        return AIMatchingEngine()
+
+
+def load_service(stand_ins: bool = True):
+    """The main3 module, imported under the stand-ins unless real models are wanted"""
+    if not stand_ins:
+        import main3
+        return main3
+    with stand_in_models():
+        import main3
+    return main3
+
+
+def _choices(rng: np.random.Generator, values: Sequence[str], n: int, max_k: int) -> List[List[str]]:
+    """n lists of 1..max_k distinct values"""
+    order = np.argsort(rng.random((n, len(values))), axis=1)[:, :max_k]
+    lengths = rng.integers(1, max_k + 1, n)
+    return [[values[j] for j in row[:length]] for row, length in zip(order, lengths)]
+
+
+def synthetic_influencers(n: int, seed: int = 0) -> List[InfluencerProfile]:
+    """
+    Creator profiles with log-normal audiences, engagement falling with
+    audience size, a low fake-follower tail and partially filled demographics
+    """
+    rng = np.random.default_rng(seed)
+    followers = np.clip(np.round(10 ** rng.normal(4.3, 0.8, n)), 100, 50_000_000).astype(np.int64)
+    engagement = np.round(rng.lognormal(np.log(6.0) - 0.35 * (np.log10(followers) - 3), 0.5), 2)
+    fake = np.round(rng.beta(2, 14, n) * 100, 2)
+    quality = np.round(rng.uniform(30, 95, n), 1)
+    frequency = rng.poisson(4, n)
+    platform_codes = (rng.random((n, len(PLATFORMS))) < PLATFORM_SHARE) @ (1 << np.arange(len(PLATFORMS)))
+    platform_sets = {code: [p for j, p in enumerate(PLATFORMS) if code >> j & 1] or ['instagram'] for code in range(16)}
+    niches = _choices(rng, NICHES, n, 3)
+    locations = rng.integers(0, len(LOCATIONS), n)
+    shares = np.round(np.hstack([rng.dirichlet(np.ones(6), n), rng.dirichlet(np.ones(3), n)]) * 100, 2)
+    present = rng.random((n, len(DEMOGRAPHIC_FIELDS))) > 0.2
+
+    return [
+        InfluencerProfile(
+            user_id=f"inf_{i}",
+            platforms=list(platform_sets[platform_codes[i]]),
+            follower_count=int(followers[i]),
+            engagement_rate=float(engagement[i]),
+            niche_categories=niches[i],
+            audience_demographics={
+                field: float(shares[i, slot]) for slot, field in enumerate(DEMOGRAPHIC_FIELDS) if present[i, slot]
+            },
+            location=LOCATIONS[locations[i]],
+            content_quality_score=float(quality[i]),
+            fake_follower_percentage=float(fake[i]),
+            posting_frequency=int(frequency[i]),
+            bio_text=f"{' and '.join(niches[i])} creator sharing daily {niches[i][0]} tips",
+            recent_content=[]
+        )
+        for i in range(n)
+    ]
+
+
+def synthetic_campaigns(n: int = N_CAMPAIGNS, seed: int = 1) -> List[CampaignRequirements]:
+    rng = np.random.default_rng(seed)
+    min_followers = rng.choice([1_000, 5_000, 10_000, 50_000], n)
+    niches = _choices(rng, NICHES, n, 2)
+    platforms = _choices(rng, PLATFORMS, n, 2)
+    demographic_keys = _choices(rng, DEMOGRAPHIC_FIELDS, n, 3)
+    budget_min = rng.choice([250, 500, 1_000, 5_000], n)
+
+    return [
+        CampaignRequirements(
+            campaign_id=f"camp_{j}",
+            brand_id=f"brand_{j % 17}",
+            required_platforms=platforms[j],
+            min_followers=int(min_followers[j]),
+            max_followers=None if j % 3 == 0 else int(min_followers[j] * rng.choice([20, 100])),
+            min_engagement_rate=float(np.round(rng.uniform(1, 4), 2)),
+            max_fake_followers=float(rng.choice([10, 20, 30])),
+            target_niches=niches[j],
+            target_demographics={key: float(np.round(rng.uniform(20, 60), 1)) for key in demographic_keys[j]},
+            target_locations=list(TARGET_LOCATIONS[j % len(TARGET_LOCATIONS)]),
+            budget_range=(int(budget_min[j]), int(budget_min[j] * 5)),
+            campaign_description=f"Looking for {' and '.join(niches[j])} creators to launch our new {niches[j][0]} line",
+            content_guidelines="Disclose the partnership and tag the brand"
+        )
+        for j in range(n)
+    ]
+
+
+def campaign_industry(campaign: CampaignRequirements) -> str:
+    niche = campaign.target_niches[0] if campaign.target_niches else ''
+    return NICHE_INDUSTRIES.get(niche, niche)
+
+
+def synthetic_posts(n: int, seed: int = 2) -> List[Dict[str, Any]]:
+    """SocialMediaPost fields as dicts, mixing clear, neutral, negated and mixed-polarity captions"""
+    rng = np.random.default_rng(seed)
+    templates = rng.integers(0, len(POST_TEMPLATES), n)
+    words = {
+        'pos': np.array(POSITIVE_WORDS)[rng.integers(0, len(POSITIVE_WORDS), n)],
+        'neg': np.array(NEGATIVE_WORDS)[rng.integers(0, len(NEGATIVE_WORDS), n)],
+        'neu': np.array(NEUTRAL_WORDS)[rng.integers(0, len(NEUTRAL_WORDS), n)],
+        'niche': np.array(NICHES)[rng.integers(0, len(NICHES), n)],
+    }
+    likes = np.round(rng.lognormal(5, 1.5, n)).astype(np.int64)
+    comments = rng.binomial(likes, 0.03)
+    shares = rng.binomial(likes, 0.01)
+    offsets = np.sort(rng.integers(0, 90 * 86_400, n))
+    platforms = rng.integers(0, len(PLATFORMS), n)
+    start = datetime(2024, 1, 1)
+
+    return [
+        {
+            "id": f"post_{i}",
+            "content": POST_TEMPLATES[templates[i]].format(
+                pos=words['pos'][i], neg=words['neg'][i], neu=words['neu'][i], niche=words['niche'][i]
+            ),
+            "likes": int(likes[i]),
+            "comments": int(comments[i]),
+            "shares": int(shares[i]),
+            "timestamp": start + timedelta(seconds=int(offsets[i])),
+            "platform": PLATFORMS[platforms[i]],
+        }
+        for i in range(n)
+    ]
+
+
+def service_influencer(service, influencer: InfluencerProfile, posts: List[Dict[str, Any]]):
+    """main3.InfluencerProfile for a synthetic creator, followers split across its platforms"""
+    split = len(influencer.platforms)
+    return service.InfluencerProfile(
+        user_id=influencer.user_id,
+        platforms=influencer.platforms,
+        follower_counts={p: influencer.follower_count // split for p in influencer.platforms},
+        recent_posts=[service.SocialMediaPost(**post) for post in posts],
+        demographics=influencer.audience_demographics,
+        interests=influencer.niche_categories
+    )
+
+
+def service_campaign(service, campaign: CampaignRequirements):
+    budget_min, budget_max = campaign.budget_range
+    return service.CampaignData(
+        campaign_id=campaign.campaign_id,
+        brand_profile=service.BrandProfile(
+            user_id=campaign.brand_id,
+            industry=campaign_industry(campaign),
+            target_demographics=campaign.target_demographics,
+            target_interests=campaign.target_niches,
+            budget_range={"min": budget_min, "max": budget_max}
+        ),
+        title=f"{campaign_industry(campaign).title()} launch",
+        description=campaign.campaign_description,
+        target_audience=campaign.target_demographics,
+        required_platforms=campaign.required_platforms,
+        budget_min=budget_min,
+        budget_max=budget_max
+    )
+
+
+@dataclass
+class Workload:
+    """One measured operation: call(i) for i in range(calls) processes items units in total"""
+    calls: int
+    items: int
+    unit: str
+    call: Callable[[int], Any]
+    memory_calls: int = MEMORY_CALLS
+
+
+class BenchmarkContext:
+    """Engine, lazily imported service and the synthetic populations, built once per scale"""
+
+    def __init__(self, seed: int = 0, stand_ins: bool = True,
+                 queries: int = DEFAULT_QUERIES, max_calls: Optional[int] = DEFAULT_MAX_CALLS):
+        self.seed = seed
+        self.stand_ins = stand_ins
+        self.queries = queries
+        self.max_calls = max_calls
+        self.engine = build_engine(stand_ins)
+        self.campaigns = synthetic_campaigns(N_CAMPAIGNS, seed + 1)
+        self._service = None
+        self.scale = 0
+        self.influencers: List[InfluencerProfile] = []
+        self.posts: List[Dict[str, Any]] = []
+
+    @property
+    def service(self):
+        if self._service is None:
+            self._service = load_service(self.stand_ins)
+        return self._service
+
+    def populate(self, scale: int) -> float:
+        """Generate influencers and posts for this scale; returns seconds spent"""
+        start = time.perf_counter()
+        # Release the previous scale's population before building the next
+        self.influencers = self.posts = []
+        self.influencers = synthetic_influencers(scale, self.seed)
+        self.posts = synthetic_posts(scale, self.seed + 2)
+        self.scale = scale
+        return time.perf_counter() - start
+
+    def calls(self, available: int) -> int:
+        return min(available, self.max_calls) if self.max_calls else available
+
+
+def _calculate_match_score(context: BenchmarkContext, mode: Optional[str]) -> Workload:
+    influencers, campaigns = context.influencers, context.campaigns
+    return Workload(
+        calls=context.calls(len(influencers)),
+        items=context.calls(len(influencers)),
+        unit="pairs",
+        call=lambda i: context.engine.calculate_match_score(influencers[i], campaigns[i % len(campaigns)])
+    )
+
+
+def _rank_influencers(context: BenchmarkContext, mode: Optional[str]) -> Workload:
+    influencers, campaigns = context.influencers, context.campaigns
+    return Workload(
+        calls=context.queries,
+        items=context.queries * len(influencers),
+        unit="influencers",
+        call=lambda i: context.engine.rank_influencers(influencers, campaigns[i % len(campaigns)], top_n=50),
+        memory_calls=1
+    )
+
+
+def _find_similar_influencers(context: BenchmarkContext, mode: Optional[str]) -> Workload:
+    influencers = context.influencers
+    return Workload(
+        calls=context.queries,
+        items=context.queries * len(influencers),
+        unit="influencers",
+        call=lambda i: context.engine.find_similar_influencers(influencers[i], influencers, top_n=10),
+        memory_calls=1
+    )
+
+
+def _analyze_content(context: BenchmarkContext, mode: Optional[str]) -> Workload:
+    service = context.service
+    analyzer = service.SentimentAnalyzer(mode or "transformer")
+    calls = context.calls(math.ceil(len(context.posts) / POSTS_PER_PROFILE))
+    batches = [
+        [service.SocialMediaPost(**post) for post in context.posts[i * POSTS_PER_PROFILE:(i + 1) * POSTS_PER_PROFILE]]
+        for i in range(calls)
+    ]
+    return Workload(
+        calls=calls,
+        items=sum(len(batch) for batch in batches),
+        unit="posts",
+        call=lambda i: analyzer.analyze_content(batches[i])
+    )
+
+
+def _suggest_pricing(context: BenchmarkContext, mode: Optional[str]) -> Workload:
+    service = context.service
+    engine = service.PricingSuggestionEngine()
+    calls = context.calls(len(context.influencers))
+    posts = context.posts
+    profiles = [
+        service_influencer(service, influencer, [posts[(i * POSTS_PER_PROFILE + k) % len(posts)]
+                                                 for k in range(POSTS_PER_PROFILE)])
+        for i, influencer in enumerate(context.influencers[:calls])
+    ]
+    campaigns = [service_campaign(service, campaign) for campaign in context.campaigns]
+    return Workload(
+        calls=calls,
+        items=calls,
+        unit="quotes",
+        call=lambda i: engine.suggest_pricing(profiles[i], campaigns[i % len(campaigns)])
+    )
+
+
+# Target name -> workload builder; the optional [mode] suffix selects a variant
+TARGETS: Dict[str, Callable[[BenchmarkContext, Optional[str]], Workload]] = {
+    'calculate_match_score': _calculate_match_score,
+    'rank_influencers': _rank_influencers,
+    'find_similar_influencers': _find_similar_influencers,
+    'analyze_content': _analyze_content,
+    'suggest_pricing': _suggest_pricing,
+}
+DEFAULT_TARGETS = (
+    'calculate_match_score', 'rank_influencers', 'find_similar_influencers',
+    'analyze_content[transformer]', 'analyze_content[cascade]', 'analyze_content[lexicon]', 'suggest_pricing',
+)
+
+
+def parse_target(target: str):
+    name, _, mode = target.partition('[')
+    if name not in TARGETS:
+        raise ValueError(f"Unknown benchmark target: {target}")
+    return name, mode.rstrip(']') or None
+
+
+def measure(workload: Workload, trace_memory: bool = True) -> Dict[str, Any]:
+    """Time every call (after one warm-up call), then trace peak memory over a separate pass"""
+    workload.call(0)
+    latencies = np.empty(workload.calls)
+    start = time.perf_counter()
+    for i in range(workload.calls):
+        call_start = time.perf_counter()
+        workload.call(i)
+        latencies[i] = time.perf_counter() - call_start
+    seconds = time.perf_counter() - start
+
+    result = {
+        "calls": workload.calls,
+        "items": workload.items,
+        "unit": workload.unit,
+        "seconds": round(seconds, 4),
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)) * 1000, 4),
+        "latency_ms_p95": round(float(np.percentile(latencies, 95)) * 1000, 4),
+        "latency_ms_max": round(float(latencies.max()) * 1000, 4),
+        "throughput_per_s": round(workload.items / seconds, 1) if seconds > 0 else None,
+    }
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            for i in range(min(workload.calls, workload.memory_calls)):
+                workload.call(i)
+            result["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3)
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(scales: Sequence[int] = SCALES[:2],
+              targets: Sequence[str] = DEFAULT_TARGETS,
+              seed: int = 0,
+              stand_ins: bool = True,
+              queries: int = DEFAULT_QUERIES,
+              max_calls: Optional[int] = DEFAULT_MAX_CALLS,
+              trace_memory: bool = True) -> Dict[str, Any]:
+    """
+    Every target at every scale. Cases keyed "target@scale"; a target whose
+    module can't be imported is recorded as skipped with the reason.
+    """
+    parsed = [(target, *parse_target(target)) for target in targets]
+    context = BenchmarkContext(seed, stand_ins, queries, max_calls)
+    report: Dict[str, Any] = {
+        "created_at": datetime.utcnow().isoformat(),
+        "seed": seed,
+        "stand_ins": stand_ins,
+        "queries": queries,
+        "max_calls": max_calls,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "cases": {},
+    }
+
+    for scale in scales:
+        generate_seconds = context.populate(scale)
+        logger.info(f"Generated {scale} influencers and posts in {generate_seconds:.1f}s")
+        for target, name, mode in parsed:
+            key = f"{target}@{scale}"
+            try:
+                workload = TARGETS[name](context, mode)
+            except ImportError as e:
+                report["cases"][key] = {"skipped": str(e)}
+                continue
+            report["cases"][key] = {"target": target, "scale": scale, **measure(workload, trace_memory)}
+            logger.info(f"{key}: {json.dumps(report['cases'][key])}")
+        report.setdefault("generate_seconds", {})[str(scale)] = round(generate_seconds, 2)
+
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = REGRESSION_THRESHOLD) -> Dict[str, Any]:
+    """
+    Metric-by-metric change of every case present in both reports. A change
+    counts as a regression when it is worse by more than threshold (relative)
+    and by more than the metric's noise floor.
+    """
+    regressions, improvements = [], []
+    current_cases, baseline_cases = current.get("cases", {}), baseline.get("cases", {})
+    for key in sorted(set(current_cases) & set(baseline_cases)):
+        now, before = current_cases[key], baseline_cases[key]
+        for metric, (higher_is_better, noise_floor) in METRICS.items():
+            if now.get(metric) is None or not before.get(metric):
+                continue
+            change = (now[metric] - before[metric]) / before[metric]
+            worse = -change if higher_is_better else change
+            if abs(now[metric] - before[metric]) <= noise_floor or abs(worse) <= threshold:
+                continue
+            entry = {"case": key, "metric": metric, "baseline": before[metric], "current": now[metric],
+                     "change": round(change, 4)}
+            (regressions if worse > 0 else improvements).append(entry)
+
+    return {
+        "threshold": threshold,
+        "comparable": all(current.get(k) == baseline.get(k) for k in ("stand_ins", "seed", "max_calls", "queries")),
+        "regressions": regressions,
+        "improvements": improvements,
+        "missing": sorted(set(baseline_cases) - set(current_cases)),
+        "new": sorted(set(current_cases) - set(baseline_cases)),
+    }
+
+
+def save_report(report: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark matching, similarity, sentiment and pricing")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="Run the suite and write a JSON report")
+    run.add_argument('--scales', type=int, nargs='+', default=list(SCALES[:2]),
+                     help=f"Population sizes (the full ladder is {' '.join(map(str, SCALES))})")
+    run.add_argument('--targets', nargs='+', default=list(DEFAULT_TARGETS),
+                     help=f"Any of {', '.join(TARGETS)}; analyze_content[mode] picks the sentiment mode")
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--queries', type=int, default=DEFAULT_QUERIES,
+                     help="Campaigns ranked / references searched per whole-population target")
+    run.add_argument('--max-calls', type=int, default=DEFAULT_MAX_CALLS, help="Cap on per-call targets; 0 for all")
+    run.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    run.add_argument('--real-models', action='store_true', help="Load the real models instead of stand-ins")
+    run.add_argument('--output', default=DEFAULT_RESULTS_PATH)
+    run.add_argument('--baseline', help="Compare against this report after the run")
+
+    diff = commands.add_parser('compare', help="Flag regressions of a report against a baseline")
+    diff.add_argument('current', nargs='?', default=DEFAULT_RESULTS_PATH)
+    diff.add_argument('baseline', nargs='?', default=DEFAULT_BASELINE_PATH)
+    diff.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        for target in args.targets:
+            parse_target(target)
+        current = run_suite(args.scales, args.targets, args.seed, not args.real_models,
+                            args.queries, args.max_calls or None, not args.no_memory)
+        save_report(current, args.output)
+        print(json.dumps({"output": args.output, "cases": len(current["cases"]),
+                          "peak_rss_mb": current["peak_rss_mb"]}))
+        if not args.baseline:
+            return
+        baseline, threshold = load_report(args.baseline), REGRESSION_THRESHOLD
+    else:
+        current, baseline, threshold = load_report(args.current), load_report(args.baseline), args.threshold
+
+    result = compare(current, baseline, threshold)
+    print(json.dumps(result, indent=2))
+    if result["regressions"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,203 @@
+"""
+Brand Safety Scanner for Influencelytic-Match
+Compiles weighted, categorized lexicons into a single trie-structured regex
+with word-boundary semantics and scans all of an influencer's posts in one pass
+"""
+
+import csv
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+# Built-in lexicon, equivalent to the keyword lists InfluencerBrandMatcher used
+DEFAULT_LEXICON = {
+    "controversy": {"polarity": "unsafe", "terms": ["controversy", "scandal"]},
+    "hate": {"polarity": "unsafe", "terms": ["hate"]},
+    "violence": {"polarity": "unsafe", "terms": ["violence"]},
+    "drugs": {"polarity": "unsafe", "terms": ["drugs"]},
+    "alcohol": {"polarity": "unsafe", "terms": ["alcohol"]},
+    "wholesome": {"polarity": "safe", "terms": ["positive", "inspiration", "family", "health", "education"]},
+}
+
+
+@dataclass
+class LexiconTerm:
+    term: str
+    category: str
+    weight: float = 1.0
+
+
+@dataclass
+class ScanResult:
+    """Hits for a batch of posts, aggregated per category and per post; each term counts once per post"""
+    category_hits: Dict[str, int]
+    category_weights: Dict[str, float]
+    post_unsafe_weight: np.ndarray
+    post_safe_weight: np.ndarray
+    top_terms: List[Tuple[str, int]] = field(default_factory=list)
+
+    @property
+    def unsafe_weight(self) -> float:
+        return float(self.post_unsafe_weight.sum())
+
+    @property
+    def safe_weight(self) -> float:
+        return float(self.post_safe_weight.sum())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "category_hits": self.category_hits,
+            "category_weights": {k: round(v, 3) for k, v in self.category_weights.items()},
+            "unsafe_weight": round(self.unsafe_weight, 3),
+            "safe_weight": round(self.safe_weight, 3),
+            "flagged_posts": int(np.count_nonzero(self.post_unsafe_weight)),
+            "top_terms": [{"term": term, "hits": hits} for term, hits in self.top_terms]
+        }
+
+
+def _normalize(term: str) -> str:
+    return ' '.join(term.lower().split())
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation shaped like a trie so shared prefixes are matched once"""
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        terminal = '' in node
+        branches = []
+        for char in sorted(k for k in node if k):
+            # Phrase gaps match any whitespace except the newline that separates posts
+            atom = r'[^\S\n]+' if char == ' ' else re.escape(char)
+            branches.append(atom + render(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 and not terminal else '(?:' + '|'.join(branches) + ')'
+        return body + '?' if terminal else body
+
+    return render(trie)
+
+
+class BrandSafetyScanner:
+    """Word-boundary multi-pattern matcher over categorized, weighted terms"""
+
+    def __init__(self,
+                 terms: Iterable[LexiconTerm],
+                 category_polarity: Dict[str, str]):
+        self.terms: Dict[str, LexiconTerm] = {}
+        for term in terms:
+            normalized = _normalize(term.term)
+            if normalized:
+                self.terms[normalized] = LexiconTerm(normalized, term.category, term.weight)
+        self.category_polarity = category_polarity
+        self.categories = sorted({t.category for t in self.terms.values()})
+
+        body = _trie_pattern(self.terms) if self.terms else r'(?!)'
+        self.pattern = re.compile(r'(?<!\w)(?:' + body + r')(?!\w)', re.IGNORECASE)
+
+    @classmethod
+    def from_lexicon(cls, lexicon: Dict[str, Dict[str, Any]]) -> 'BrandSafetyScanner':
+        """
+        Build from {category: {"polarity": "unsafe"|"safe", "weight": w,
+        "terms": [term, ...] or {term: weight}}}
+        """
+        terms = []
+        polarity = {}
+        for category, spec in lexicon.items():
+            polarity[category] = spec.get("polarity", "unsafe")
+            category_weight = float(spec.get("weight", 1.0))
+            entries = spec.get("terms", [])
+            if isinstance(entries, dict):
+                items = entries.items()
+            else:
+                items = ((term, 1.0) for term in entries)
+            terms.extend(LexiconTerm(term, category, category_weight * float(weight)) for term, weight in items)
+        return cls(terms, polarity)
+
+    @classmethod
+    def load(cls, path: str) -> 'BrandSafetyScanner':
+        """Load a JSON lexicon, or a CSV with term,category,weight[,polarity] columns"""
+        if path.endswith('.json'):
+            with open(path) as f:
+                return cls.from_lexicon(json.load(f))
+
+        terms = []
+        polarity = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                category = row['category']
+                terms.append(LexiconTerm(row['term'], category, float(row.get('weight') or 1.0)))
+                polarity.setdefault(category, row.get('polarity') or 'unsafe')
+        return cls(terms, polarity)
+
+    @classmethod
+    def default(cls) -> 'BrandSafetyScanner':
+        """Lexicon from BRAND_SAFETY_LEXICON_PATH if set, else the built-in list"""
+        path = os.getenv('BRAND_SAFETY_LEXICON_PATH')
+        if path and os.path.exists(path):
+            return cls.load(path)
+        return cls.from_lexicon(DEFAULT_LEXICON)
+
+    def scan(self, texts: List[str], top_n: int = 10) -> ScanResult:
+        """Scan every post in a single regex pass over the joined batch"""
+        n = len(texts)
+        # Newline separators cannot be part of a match's word boundary, so
+        # matches never span posts; boundaries map matches back to posts
+        joined = '\n'.join(texts)
+        starts = np.cumsum([0] + [len(t) + 1 for t in texts[:-1]]) if n else np.zeros(0, dtype=np.int64)
+
+        positions = []
+        matched_terms = []
+        for match in self.pattern.finditer(joined):
+            positions.append(match.start())
+            matched_terms.append(_normalize(match.group(0)))
+
+        post_unsafe = np.zeros(n)
+        post_safe = np.zeros(n)
+        category_hits = {category: 0 for category in self.categories}
+        category_weights = {category: 0.0 for category in self.categories}
+        term_hits: Dict[str, int] = {}
+
+        if positions:
+            post_index = np.searchsorted(starts, np.asarray(positions), side='right') - 1
+            # A term counts once per post however often it repeats, like the old keyword checks
+            hits = sorted({(int(post), text) for post, text in zip(post_index, matched_terms)})
+            post_index = np.fromiter((post for post, _ in hits), dtype=np.int64, count=len(hits))
+            weights = np.empty(len(hits))
+            unsafe = np.empty(len(hits), dtype=bool)
+            for i, (_, text) in enumerate(hits):
+                term = self.terms.get(text)
+                if term is None:
+                    # Case-folding edge cases (e.g. non-ASCII) that do not map back to a term
+                    weights[i] = 0.0
+                    unsafe[i] = False
+                    continue
+                weights[i] = term.weight
+                unsafe[i] = self.category_polarity.get(term.category, 'unsafe') == 'unsafe'
+                category_hits[term.category] += 1
+                category_weights[term.category] += term.weight
+                term_hits[text] = term_hits.get(text, 0) + 1
+            np.add.at(post_unsafe, post_index[unsafe], weights[unsafe])
+            np.add.at(post_safe, post_index[~unsafe], weights[~unsafe])
+
+        top_terms = sorted(term_hits.items(), key=lambda item: item[1], reverse=True)[:top_n]
+        return ScanResult(category_hits, category_weights, post_unsafe, post_safe, top_terms)
+
+
+def brand_safety_score(result: ScanResult) -> float:
+    """Map scan results onto the 10-point brand safety component of the match score"""
+    if result.unsafe_weight > 0:
+        return max(2.0, 10 - (result.unsafe_weight * 2))
+    elif result.safe_weight > 0:
+        return 10.0
+    return 8.0
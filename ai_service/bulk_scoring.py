@@ -0,0 +1,421 @@
+"""
+Bulk Scoring for Influencelytic-Match
+Scores exported creator catalogues against campaign briefs offline. The
+creator file (Parquet, or Arrow IPC memory-mapped) is read one row group at
+a time and sliced into chunks. Each chunk is scored against every campaign
+with AIMatchingEngine.score_batch and priced with the rate-card arrays
+PricingSuggestionEngine uses. Chunks run on a bounded worker pool and results
+are appended to a Parquet file in input order, so memory depends on the
+chunk size rather than the file size.
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+import batch_pricing
+from demographics import DEMOGRAPHIC_COLUMNS, DemographicMatrix
+from matching_engine import AIMatchingEngine, CampaignRequirements
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.getenv('MAX_WORKERS', 4))
+DEFAULT_CHUNK_ROWS = 8192
+# Chunks shrink so one chunk never scores more pairs than this across all campaigns
+MAX_PAIRS_PER_CHUNK = 250_000
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+
+SCORE_COLUMNS = (
+    'total_score', 'platform_match', 'audience_match', 'engagement_quality',
+    'niche_relevance', 'demographic_alignment', 'location_match',
+)
+PERFORMANCE_COLUMNS = ('estimated_reach', 'estimated_engagements', 'estimated_conversions')
+PRICE_COLUMNS = ('suggested_price', 'price_min', 'price_max')
+# followers_<platform> columns price each platform at its own rate
+FOLLOWER_PREFIX = 'followers_'
+
+
+def output_schema(pricing: bool = True) -> pa.Schema:
+    fields = [pa.field('campaign_id', pa.string()), pa.field('influencer_id', pa.string())]
+    fields += [pa.field(name, pa.float64()) for name in SCORE_COLUMNS]
+    fields.append(pa.field('recommendation', pa.string()))
+    fields += [pa.field(name, pa.int64()) for name in PERFORMANCE_COLUMNS]
+    if pricing:
+        fields += [pa.field(name, pa.float64()) for name in PRICE_COLUMNS]
+    return pa.schema(fields)
+
+
+def _is_arrow(path: str) -> bool:
+    return path.lower().endswith(ARROW_SUFFIXES)
+
+
+def read_schema(path: str) -> pa.Schema:
+    if _is_arrow(path):
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).schema
+    return pq.read_schema(path)
+
+
+def iter_chunks(path: str, chunk_rows: int, columns: Optional[List[str]] = None) -> Iterator[pa.RecordBatch]:
+    """
+    Record batches of at most chunk_rows. Parquet is decoded one row group at
+    a time; Arrow IPC batches are memory-mapped and sliced without copying.
+    """
+    if _is_arrow(path):
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for offset in range(0, batch.num_rows, chunk_rows):
+                    yield batch.slice(offset, chunk_rows)
+        return
+
+    parquet = pq.ParquetFile(path, memory_map=True)
+    for i in range(parquet.num_row_groups):
+        yield from parquet.read_row_group(i, columns=columns).to_batches(max_chunksize=chunk_rows)
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    if _is_arrow(path):
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all().to_pylist()
+    return pq.read_table(path).to_pylist()
+
+
+def _decoded(value: Any, default: Any) -> Any:
+    """List and dict cells may arrive as JSON text from database exports"""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return json.loads(value) if value.strip() else default
+    if isinstance(value, list) and isinstance(default, dict):
+        return dict(value)  # Arrow maps come back as (key, value) pairs
+    return value
+
+
+@dataclass
+class CampaignBriefs:
+    """Campaign briefs held in memory, with the per-campaign pricing inputs"""
+    requirements: List[CampaignRequirements]
+    industries: List[str]
+    demand_scores: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.requirements)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> 'CampaignBriefs':
+        requirements = []
+        for record in records:
+            requirements.append(CampaignRequirements(
+                campaign_id=str(record['campaign_id']),
+                brand_id=str(record.get('brand_id') or ''),
+                required_platforms=_decoded(record.get('required_platforms'), []),
+                min_followers=record.get('min_followers') or 0,
+                max_followers=record.get('max_followers'),
+                min_engagement_rate=record.get('min_engagement_rate') or 0,
+                max_fake_followers=(record['max_fake_followers']
+                                    if record.get('max_fake_followers') is not None else 100),
+                target_niches=_decoded(record.get('target_niches'), []),
+                target_demographics=_decoded(record.get('target_demographics'), {}),
+                target_locations=_decoded(record.get('target_locations'), []),
+                budget_range=(record.get('budget_min') or 0, record.get('budget_max') or 0),
+                campaign_description=record.get('description') or '',
+                content_guidelines=record.get('content_guidelines') or ''
+            ))
+        return cls(
+            requirements=requirements,
+            industries=[str(record.get('industry') or '') for record in records],
+            demand_scores=np.array([
+                np.nan if record.get('demand_score') is None else record['demand_score'] for record in records
+            ], dtype=np.float64)
+        )
+
+
+def _float_column(batch: pa.RecordBatch, name: str, default: float = 0.0) -> np.ndarray:
+    """Zero-copy for float64 columns without nulls; nulls become the default"""
+    if name not in batch.schema.names:
+        return np.full(batch.num_rows, default)
+    column = batch.column(name)
+    if column.null_count:
+        column = pc.fill_null(column.cast(pa.float64()), default)
+    return column.to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+
+
+def _list_column(batch: pa.RecordBatch, name: str) -> pa.Array:
+    column = batch.column(name) if name in batch.schema.names else pa.nulls(batch.num_rows, pa.list_(pa.string()))
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pa.array([_decoded(value, []) for value in column.to_pylist()], type=pa.list_(pa.string()))
+    return column
+
+
+def overlap_counts(values: pa.Array, targets: Sequence[str]) -> np.ndarray:
+    """Per row, how many distinct entries of a list column appear in targets"""
+    n = len(values)
+    targets = list(dict.fromkeys(targets))
+    if not targets or not n:
+        return np.zeros(n, dtype=np.int64)
+    flat = pc.list_flatten(values)
+    parents = pc.list_parent_indices(values).to_numpy()
+    codes = pc.fill_null(pc.index_in(flat.cast(pa.string()), value_set=pa.array(targets, pa.string())), -1)
+    codes = codes.to_numpy()
+    hits = codes >= 0
+    pairs = np.unique(parents[hits] * len(targets) + codes[hits])
+    return np.bincount(pairs // len(targets), minlength=n)
+
+
+def _demographics(batch: pa.RecordBatch) -> DemographicMatrix:
+    names = batch.schema.names
+    flat = [name for name in DEMOGRAPHIC_COLUMNS if name in names]
+    if flat:
+        return DemographicMatrix.from_columns({name: _float_column(batch, name, np.nan) for name in flat})
+    if 'audience_demographics' in names:
+        return DemographicMatrix.from_mappings(
+            [_decoded(value, {}) for value in batch.column('audience_demographics').to_pylist()]
+        )
+    return DemographicMatrix.from_mappings([None] * batch.num_rows)
+
+
+def _strings(batch: pa.RecordBatch, name: str) -> List[str]:
+    if name not in batch.schema.names:
+        return [''] * batch.num_rows
+    return [value or '' for value in batch.column(name).cast(pa.string()).to_pylist()]
+
+
+def score_chunk(engine: AIMatchingEngine,
+                campaigns: CampaignBriefs,
+                campaign_embeddings: np.ndarray,
+                batch: pa.RecordBatch,
+                min_score: float = 0.0,
+                pricing: bool = True) -> List[pa.RecordBatch]:
+    """Every influencer in the batch against every campaign, one output batch per campaign"""
+    schema = output_schema(pricing)
+    influencer_ids = batch.column('user_id').cast(pa.string())
+    follower_count = _float_column(batch, 'follower_count')
+    engagement_rate = _float_column(batch, 'engagement_rate')
+    fake_followers = _float_column(batch, 'fake_follower_percentage')
+    platforms = _list_column(batch, 'platforms')
+    niches = _list_column(batch, 'niche_categories')
+    locations = _strings(batch, 'location')
+    demographics = _demographics(batch)
+    bio_embeddings = engine.encode_texts(_strings(batch, 'bio_text'))
+
+    if pricing:
+        per_platform = {
+            name[len(FOLLOWER_PREFIX):]: _float_column(batch, name)
+            for name in batch.schema.names if name.startswith(FOLLOWER_PREFIX)
+        }
+        grid = batch_pricing.price_grid(
+            influencer_ids=range(batch.num_rows),
+            follower_counts=per_platform or {'': follower_count},
+            post_count=_float_column(batch, 'post_count'),
+            total_engagement=_float_column(batch, 'total_engagement'),
+            campaign_ids=[campaign.campaign_id for campaign in campaigns.requirements],
+            industries=campaigns.industries,
+            demand_scores=campaigns.demand_scores
+        )
+
+    outputs = []
+    for j, campaign in enumerate(campaigns.requirements):
+        scores = engine.score_batch(
+            campaign,
+            follower_count,
+            engagement_rate,
+            fake_followers,
+            overlap_counts(platforms, campaign.required_platforms),
+            overlap_counts(niches, campaign.target_niches),
+            locations,
+            demographics,
+            bio_embeddings,
+            campaign_embeddings[j] if campaign_embeddings.shape[1] else None
+        )
+        keep = np.flatnonzero(scores['total_score'] >= min_score)
+        if not len(keep):
+            continue
+        columns = {
+            'campaign_id': pa.array([campaign.campaign_id]).take(pa.array(np.zeros(len(keep), dtype=np.int64))),
+            'influencer_id': influencer_ids.take(pa.array(keep)),
+            **{name: scores[name][keep] for name in SCORE_COLUMNS},
+            'recommendation': scores['recommendation'][keep],
+            **{name: scores[name][keep] for name in PERFORMANCE_COLUMNS},
+        }
+        if pricing:
+            price = grid.suggested_price[keep, j]
+            columns.update(suggested_price=np.round(price, 2), price_min=np.round(price * 0.8, 2),
+                           price_max=np.round(price * 1.2, 2))
+        outputs.append(pa.record_batch([columns[field.name] for field in schema], schema=schema))
+    return outputs
+
+
+def score_files(influencers_path: str,
+                campaigns_path: str,
+                output_path: str,
+                engine: Optional[AIMatchingEngine] = None,
+                workers: int = DEFAULT_WORKERS,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                min_score: float = 0.0,
+                pricing: bool = True) -> Dict[str, Any]:
+    """
+    Stream the creator file through the worker pool and append results to
+    output_path. At most 2 * workers chunks are in flight, and results are
+    written in input order.
+    """
+    start = time.perf_counter()
+    engine = engine or AIMatchingEngine()
+    campaigns = CampaignBriefs.from_records(read_records(campaigns_path))
+    campaign_embeddings = engine.encode_texts([c.campaign_description for c in campaigns.requirements])
+    chunk_rows = max(1, min(chunk_rows, MAX_PAIRS_PER_CHUNK // max(len(campaigns), 1)))
+
+    available = set(read_schema(influencers_path).names)
+    if 'user_id' not in available:
+        raise ValueError(f"{influencers_path} has no user_id column")
+    wanted = {
+        'user_id', 'follower_count', 'engagement_rate', 'fake_follower_percentage', 'platforms',
+        'niche_categories', 'location', 'bio_text', 'audience_demographics', 'post_count', 'total_engagement',
+        *DEMOGRAPHIC_COLUMNS
+    }
+    columns = sorted(name for name in available if name in wanted or name.startswith(FOLLOWER_PREFIX))
+
+    report = {"campaigns": len(campaigns), "chunk_rows": chunk_rows, "workers": workers,
+              "influencers": 0, "pairs_scored": 0, "pairs_written": 0}
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool, \
+            pq.ParquetWriter(output_path, output_schema(pricing)) as writer:
+        pending = deque()
+
+        def drain(limit: int):
+            while len(pending) > limit:
+                for output in pending.popleft().result():
+                    writer.write_batch(output)
+                    report["pairs_written"] += output.num_rows
+
+        for batch in iter_chunks(influencers_path, chunk_rows, columns):
+            report["influencers"] += batch.num_rows
+            report["pairs_scored"] += batch.num_rows * len(campaigns)
+            pending.append(pool.submit(score_chunk, engine, campaigns, campaign_embeddings, batch, min_score, pricing))
+            drain(2 * workers)
+        drain(0)
+
+    seconds = time.perf_counter() - start
+    report["seconds"] = round(seconds, 3)
+    report["pairs_per_second"] = round(report["pairs_scored"] / seconds) if seconds > 0 else 0
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def synthetic_files(directory: str, n_influencers: int, n_campaigns: int, seed: int = 0,
+                    row_group_size: int = 100_000) -> Dict[str, str]:
+    """Creator and campaign Parquet files in the export layout"""
+    rng = np.random.default_rng(seed)
+    platforms = np.array(['instagram', 'tiktok', 'youtube', 'twitter'])
+    niches = np.array(['fitness', 'beauty', 'tech', 'food', 'travel', 'gaming', 'fashion', 'finance'])
+    cities = np.array(['New York, NY', 'London', 'Berlin', 'Austin, Texas', 'Toronto', 'Paris', 'Sydney'])
+    paths = {"influencers": os.path.join(directory, 'influencers.parquet'),
+             "campaigns": os.path.join(directory, 'campaigns.parquet')}
+
+    with pq.ParquetWriter(paths["influencers"], _synthetic_influencer_schema()) as writer:
+        for offset in range(0, n_influencers, row_group_size):
+            n = min(row_group_size, n_influencers - offset)
+            followers = np.round(10 ** rng.uniform(3, 6.5, n)).astype(np.int64)
+            ages = rng.dirichlet(np.ones(6), n) * 100
+            genders = rng.dirichlet(np.ones(3), n) * 100
+            columns = {
+                'user_id': [f"inf_{offset + i}" for i in range(n)],
+                'platforms': [list(platforms[rng.random(len(platforms)) < 0.4]) or ['instagram'] for _ in range(n)],
+                'follower_count': followers,
+                'followers_instagram': followers,
+                'engagement_rate': np.round(rng.gamma(2.0, 2.0, n), 2),
+                'fake_follower_percentage': np.round(rng.beta(2, 12, n) * 100, 2),
+                'niche_categories': [list(rng.choice(niches, 2, replace=False)) for _ in range(n)],
+                'location': cities[rng.integers(0, len(cities), n)],
+                'bio_text': [f"{a} and {b} creator" for a, b in rng.choice(niches, (n, 2))],
+                'post_count': rng.integers(0, 30, n),
+                'total_engagement': rng.integers(0, 50_000, n),
+                **{name: ages[:, k] for k, name in enumerate(DEMOGRAPHIC_COLUMNS[:6])},
+                **{name: genders[:, k] for k, name in enumerate(DEMOGRAPHIC_COLUMNS[6:])},
+            }
+            writer.write_table(pa.table(columns, schema=writer.schema))
+
+    pq.write_table(pa.table({
+        'campaign_id': [f"camp_{j}" for j in range(n_campaigns)],
+        'brand_id': [f"brand_{j % 7}" for j in range(n_campaigns)],
+        'required_platforms': [list(rng.choice(platforms, 1)) for _ in range(n_campaigns)],
+        'min_followers': rng.integers(1_000, 50_000, n_campaigns),
+        'max_followers': [None if j % 3 == 0 else 2_000_000 for j in range(n_campaigns)],
+        'min_engagement_rate': np.round(rng.uniform(1, 4, n_campaigns), 2),
+        'max_fake_followers': np.full(n_campaigns, 20.0),
+        'target_niches': [list(rng.choice(niches, 2, replace=False)) for _ in range(n_campaigns)],
+        'target_locations': [['United States'] if j % 2 else [] for j in range(n_campaigns)],
+        'target_demographics': [json.dumps({'age_18_24': 40, 'female': 60})] * n_campaigns,
+        'budget_min': np.full(n_campaigns, 500),
+        'budget_max': np.full(n_campaigns, 5_000),
+        'description': [f"Looking for {a} creators" for a in rng.choice(niches, n_campaigns)],
+        'industry': rng.choice(['fashion', 'technology', 'food', 'gaming'], n_campaigns),
+    }), paths["campaigns"])
+    return paths
+
+
+def _synthetic_influencer_schema() -> pa.Schema:
+    return pa.schema(
+        [('user_id', pa.string()), ('platforms', pa.list_(pa.string())), ('follower_count', pa.int64()),
+         ('followers_instagram', pa.int64()), ('engagement_rate', pa.float64()),
+         ('fake_follower_percentage', pa.float64()), ('niche_categories', pa.list_(pa.string())),
+         ('location', pa.string()), ('bio_text', pa.string()), ('post_count', pa.int64()),
+         ('total_engagement', pa.int64())]
+        + [(name, pa.float64()) for name in DEMOGRAPHIC_COLUMNS]
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Score creator catalogues against campaign briefs offline")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help="Score a creator file against a campaign file")
+    score.add_argument('influencers', help="Parquet or Arrow IPC creator catalogue")
+    score.add_argument('campaigns', help="Parquet or Arrow IPC campaign briefs")
+    score.add_argument('--output', required=True)
+    score.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    score.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    score.add_argument('--min-score', type=float, default=0.0, help="Only write pairs scoring at least this")
+    score.add_argument('--no-pricing', action='store_true')
+
+    bench = commands.add_parser('benchmark', help="Score synthetic files and report pairs/s and peak RSS")
+    bench.add_argument('--influencers', type=int, default=100_000)
+    bench.add_argument('--campaigns', type=int, default=20)
+    bench.add_argument('--workers', type=int, nargs='+', default=[1, DEFAULT_WORKERS])
+    args = parser.parse_args(argv)
+
+    if args.command == 'score':
+        print(json.dumps(score_files(args.influencers, args.campaigns, args.output, workers=args.workers,
+                                     chunk_rows=args.chunk_rows, min_score=args.min_score,
+                                     pricing=not args.no_pricing)))
+        return
+
+    engine = AIMatchingEngine()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = synthetic_files(directory, args.influencers, args.campaigns)
+        for workers in args.workers:
+            report = score_files(paths["influencers"], paths["campaigns"], os.path.join(directory, 'scores.parquet'),
+                                 engine, workers=workers)
+            print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
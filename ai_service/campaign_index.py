@@ -0,0 +1,429 @@
+"""
+Campaign Eligibility Index for Influencelytic-Match
+Answers "which open campaigns would accept this influencer" without scoring
+every campaign: range requirements live in sorted endpoint arrays, platforms
+and locations in posting lists, and only the most selective candidate set is
+verified
+"""
+
+import argparse
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from locations import Gazetteer
+
+
+# Unsorted inserts tolerated before the endpoint arrays are rebuilt
+PENDING_LIMIT = 1024
+# Rebuild once this share of indexed slots belongs to closed campaigns
+TOMBSTONE_RATIO = 0.25
+DEFAULT_TOLERANCE = 0.1
+# Required platforms are interned into one bit each of a uint64 mask
+MAX_PLATFORMS = 64
+
+
+def _normalize(value: str) -> str:
+    return value.strip().lower()
+
+
+@dataclass
+class CampaignConstraints:
+    """The eligibility columns of a campaigns row"""
+    campaign_id: str
+    min_followers: int = 0
+    max_followers: Optional[int] = None
+    min_engagement_rate: float = 0.0
+    max_fake_followers: float = 100.0
+    required_platforms: List[str] = field(default_factory=list)
+    target_locations: List[str] = field(default_factory=list)
+
+
+class _SortedEndpoint:
+    """One range bound: keys sorted ascending with the slot each key belongs to"""
+
+    def __init__(self):
+        self.keys = np.zeros(0)
+        self.slots = np.zeros(0, dtype=np.int64)
+
+    def build(self, values: np.ndarray, slots: np.ndarray):
+        order = np.argsort(values[slots], kind='stable')
+        self.slots = slots[order]
+        self.keys = values[self.slots]
+
+    def at_most(self, bound: float) -> np.ndarray:
+        """Slots whose key <= bound, found with one binary search"""
+        return self.slots[:np.searchsorted(self.keys, bound, side='right')]
+
+    def at_least(self, bound: float) -> np.ndarray:
+        return self.slots[np.searchsorted(self.keys, bound, side='left'):]
+
+    def count_at_most(self, bound: float) -> int:
+        return int(np.searchsorted(self.keys, bound, side='right'))
+
+    def count_at_least(self, bound: float) -> int:
+        return len(self.keys) - int(np.searchsorted(self.keys, bound, side='left'))
+
+
+class CampaignEligibilityIndex:
+    """
+    Campaigns occupy slots in flat constraint columns. Each of the four
+    range bounds is a sorted endpoint array; platforms and locations are
+    posting lists (sets of slots), with campaigns that have no requirement
+    kept in their own list. A query counts every candidate set in O(log n),
+    materializes only the smallest and checks the other constraints on it
+    with vectorized column lookups, so cost is O(log n + smallest set).
+
+    Opening a campaign appends it to a small pending buffer that every query
+    scans; closing one clears its active bit. The endpoint arrays are rebuilt
+    once pending inserts or closed slots pile up.
+    """
+
+    def __init__(self, gazetteer: Optional[Gazetteer] = None):
+        # Targets post under the place they name; influencers look up every place containing them
+        self.gazetteer = gazetteer or Gazetteer.default()
+        self.campaign_ids: List[Optional[str]] = []
+        self.slot_of: Dict[str, int] = {}
+        self.min_followers = np.zeros(0)
+        self.max_followers = np.zeros(0)
+        self.min_engagement = np.zeros(0)
+        self.max_fake = np.zeros(0)
+        self.active = np.zeros(0, dtype=bool)
+        self.platform_postings: Dict[str, Set[int]] = {}
+        self.location_postings: Dict[str, Set[int]] = {}
+        self.any_platform: Set[int] = set()
+        self.any_location: Set[int] = set()
+        self.has_location_requirement = np.zeros(0, dtype=bool)
+        self.platform_bits: Dict[str, int] = {}
+        self.platform_mask = np.zeros(0, dtype=np.uint64)
+        self.platforms_of: Dict[int, List[str]] = {}
+        self.locations_of: Dict[int, List[str]] = {}
+
+        self._min_followers = _SortedEndpoint()
+        self._max_followers = _SortedEndpoint()
+        self._min_engagement = _SortedEndpoint()
+        self._max_fake = _SortedEndpoint()
+        self._indexed_slots = 0
+        self._pending: List[int] = []
+        self.pending_limit = PENDING_LIMIT
+        self._tombstones = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.slot_of)
+
+    def __contains__(self, campaign_id: str) -> bool:
+        return campaign_id in self.slot_of
+
+    def _grow(self, size: int):
+        if size <= len(self.active):
+            return
+        used = len(self.active)
+        capacity = max(64, 2 * used, size)
+        for name in ('min_followers', 'max_followers', 'min_engagement', 'max_fake'):
+            column = np.zeros(capacity)
+            column[:used] = getattr(self, name)
+            setattr(self, name, column)
+        for name in ('active', 'has_location_requirement'):
+            column = np.zeros(capacity, dtype=bool)
+            column[:used] = getattr(self, name)
+            setattr(self, name, column)
+        column = np.zeros(capacity, dtype=np.uint64)
+        column[:used] = self.platform_mask
+        self.platform_mask = column
+
+    def _platform_mask(self, platforms: Iterable[str], assign: bool = False) -> int:
+        """Bitmask over interned platform names; unknown names are skipped unless assigned"""
+        mask = 0
+        for platform in platforms:
+            bit = self.platform_bits.get(platform)
+            if bit is None and assign:
+                if len(self.platform_bits) >= MAX_PLATFORMS:
+                    raise ValueError(f"Cannot index more than {MAX_PLATFORMS} distinct platforms "
+                                     f"(platform_mask is uint64); rejected {platform!r}")
+                bit = self.platform_bits[platform] = len(self.platform_bits)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def open(self, campaign: CampaignConstraints):
+        """Index a campaign that started accepting applications (re-opening replaces it)"""
+        platforms = sorted({_normalize(p) for p in campaign.required_platforms if p.strip()})
+        with self._lock:
+            # Intern platforms first so an over-full bitmask rejects the campaign before any state changes
+            mask = self._platform_mask(platforms, assign=True)
+            if campaign.campaign_id in self.slot_of:
+                self._close(campaign.campaign_id)
+            slot = len(self.campaign_ids)
+            self._grow(slot + 1)
+            self.campaign_ids.append(campaign.campaign_id)
+            self.slot_of[campaign.campaign_id] = slot
+            self.min_followers[slot] = campaign.min_followers or 0
+            self.max_followers[slot] = math.inf if campaign.max_followers is None else campaign.max_followers
+            self.min_engagement[slot] = campaign.min_engagement_rate or 0.0
+            self.max_fake[slot] = 100.0 if campaign.max_fake_followers is None else campaign.max_fake_followers
+            self.active[slot] = True
+
+            self.platforms_of[slot] = platforms
+            self.platform_mask[slot] = mask
+            for platform in platforms:
+                self.platform_postings.setdefault(platform, set()).add(slot)
+            if not platforms:
+                self.any_platform.add(slot)
+
+            locations = sorted({
+                key for key in (self.gazetteer.target_key(loc) for loc in campaign.target_locations) if key
+            })
+            self.locations_of[slot] = locations
+            for location in locations:
+                self.location_postings.setdefault(location, set()).add(slot)
+            self.has_location_requirement[slot] = bool(locations)
+            if not locations:
+                self.any_location.add(slot)
+
+            self._pending.append(slot)
+            if len(self._pending) > self.pending_limit:
+                self._rebuild()
+
+    def close(self, campaign_id: str) -> bool:
+        """Drop a campaign that closed, filled up or passed its deadline"""
+        with self._lock:
+            if campaign_id not in self.slot_of:
+                return False
+            self._close(campaign_id)
+            if self._tombstones > TOMBSTONE_RATIO * max(len(self.campaign_ids), 1):
+                self._compact()
+            return True
+
+    def _close(self, campaign_id: str):
+        slot = self.slot_of.pop(campaign_id)
+        self.active[slot] = False
+        self.campaign_ids[slot] = None
+        for platform in self.platforms_of.pop(slot):
+            self.platform_postings[platform].discard(slot)
+        for location in self.locations_of.pop(slot):
+            self.location_postings[location].discard(slot)
+        self.any_platform.discard(slot)
+        self.any_location.discard(slot)
+        self._tombstones += 1
+
+    def _rebuild(self):
+        """Re-sort the endpoint arrays over every open slot"""
+        slots = np.flatnonzero(self.active[:len(self.campaign_ids)])
+        self._min_followers.build(self.min_followers, slots)
+        self._max_followers.build(self.max_followers, slots)
+        self._min_engagement.build(self.min_engagement, slots)
+        self._max_fake.build(self.max_fake, slots)
+        self._indexed_slots = len(slots)
+        self._pending = []
+
+    def _compact(self):
+        """Reassign slots densely so closed campaigns stop costing memory and scan time"""
+        keep = np.flatnonzero(self.active[:len(self.campaign_ids)])
+        new_slot = {int(old): new for new, old in enumerate(keep)}
+        for name in ('min_followers', 'max_followers', 'min_engagement', 'max_fake', 'active',
+                     'has_location_requirement', 'platform_mask'):
+            setattr(self, name, getattr(self, name)[keep])
+        self.campaign_ids = [self.campaign_ids[old] for old in keep]
+        self.slot_of = {campaign_id: slot for slot, campaign_id in enumerate(self.campaign_ids)}
+        self.platforms_of = {new_slot[old]: values for old, values in self.platforms_of.items()}
+        self.locations_of = {new_slot[old]: values for old, values in self.locations_of.items()}
+        self.platform_postings = {}
+        self.location_postings = {}
+        for slot, values in self.platforms_of.items():
+            for platform in values:
+                self.platform_postings.setdefault(platform, set()).add(slot)
+        for slot, values in self.locations_of.items():
+            for location in values:
+                self.location_postings.setdefault(location, set()).add(slot)
+        self.any_platform = {new_slot[old] for old in self.any_platform}
+        self.any_location = {new_slot[old] for old in self.any_location}
+        self._tombstones = 0
+        self._rebuild()
+
+    def eligible(self,
+                 follower_count: int,
+                 engagement_rate: float,
+                 fake_follower_percentage: float = 0.0,
+                 platforms: Iterable[str] = (),
+                 location: Optional[str] = None,
+                 tolerance: float = DEFAULT_TOLERANCE,
+                 limit: Optional[int] = None) -> List[str]:
+        """
+        Ids of open campaigns whose requirements the influencer roughly
+        meets: follower and engagement bounds are relaxed by `tolerance`
+        (0.1 = within 10%), at least one required platform must be covered
+        and the influencer's location must lie inside a targeted city,
+        region or country, unless the campaign leaves either open.
+        """
+        platform_keys = {_normalize(p) for p in platforms if p.strip()}
+        place_keys = self.gazetteer.containment_keys(location)
+        followers_high = follower_count * (1 + tolerance)
+        followers_low = follower_count * (1 - tolerance)
+        engagement_high = engagement_rate * (1 + tolerance)
+
+        with self._lock:
+            # Candidate-set sizes, each known without materializing the set
+            sizes = {
+                'min_followers': self._min_followers.count_at_most(followers_high),
+                'max_followers': self._max_followers.count_at_least(followers_low),
+                'min_engagement': self._min_engagement.count_at_most(engagement_high),
+                'max_fake': self._max_fake.count_at_least(fake_follower_percentage),
+                'platforms': len(self.any_platform) + sum(len(self.platform_postings.get(p, ())) for p in platform_keys),
+                'locations': len(self.any_location) + sum(len(self.location_postings.get(p, ())) for p in place_keys)
+            }
+            driver = min(sizes, key=sizes.get)
+            if driver == 'min_followers':
+                candidates = self._min_followers.at_most(followers_high)
+            elif driver == 'max_followers':
+                candidates = self._max_followers.at_least(followers_low)
+            elif driver == 'min_engagement':
+                candidates = self._min_engagement.at_most(engagement_high)
+            elif driver == 'max_fake':
+                candidates = self._max_fake.at_least(fake_follower_percentage)
+            else:
+                postings = (self.platform_postings, self.any_platform, platform_keys) if driver == 'platforms' \
+                    else (self.location_postings, self.any_location, place_keys)
+                slots = set(postings[1])
+                for key in postings[2]:
+                    slots |= postings[0].get(key, set())
+                candidates = np.fromiter(slots, dtype=np.int64, count=len(slots))
+            if self._pending:
+                # Pending slots bypass the driver, so every constraint is checked on them
+                candidates = np.union1d(candidates, np.asarray(self._pending, dtype=np.int64))
+                driver = None
+
+            keep = (
+                self.active[candidates]
+                & (self.min_followers[candidates] <= followers_high)
+                & (self.max_followers[candidates] >= followers_low)
+                & (self.min_engagement[candidates] <= engagement_high)
+                & (self.max_fake[candidates] >= fake_follower_percentage)
+            )
+            candidates = candidates[keep]
+            if driver != 'platforms':
+                masks = self.platform_mask[candidates]
+                wanted = np.uint64(self._platform_mask(platform_keys))
+                candidates = candidates[(masks == 0) | ((masks & wanted) != 0)]
+            if driver != 'locations':
+                located = self.has_location_requirement[candidates]
+                if located.any():
+                    allowed = set()
+                    for key in place_keys:
+                        allowed |= self.location_postings.get(key, set())
+                    candidates = candidates[[not req or slot in allowed
+                                             for slot, req in zip(candidates.tolist(), located.tolist())]]
+            candidates = np.sort(candidates)
+            if limit is not None:
+                candidates = candidates[:limit]
+            return [self.campaign_ids[slot] for slot in candidates.tolist()]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open_campaigns": len(self.slot_of),
+                "pending_inserts": len(self._pending),
+                "closed_slots": self._tombstones,
+                "platforms": len(self.platform_postings),
+                "locations": len(self.location_postings)
+            }
+
+    @classmethod
+    def from_campaigns(cls, campaigns: Iterable[CampaignConstraints]) -> 'CampaignEligibilityIndex':
+        index = cls()
+        index.pending_limit = math.inf
+        for campaign in campaigns:
+            index.open(campaign)
+        with index._lock:
+            index._rebuild()
+        index.pending_limit = PENDING_LIMIT
+        return index
+
+
+def synthetic_campaigns(n_campaigns: int, seed: int = 0) -> List[CampaignConstraints]:
+    rng = np.random.default_rng(seed)
+    platforms = ["instagram", "tiktok", "youtube", "twitter", "facebook", "linkedin"]
+    locations = ["usa", "uk", "canada", "germany", "france", "brazil", "india", "australia"]
+    min_followers = np.round(10 ** rng.uniform(2, 6, n_campaigns), -2)
+    campaigns = []
+    for i in range(n_campaigns):
+        campaigns.append(CampaignConstraints(
+            campaign_id=f"c{i}",
+            min_followers=int(min_followers[i]),
+            max_followers=int(min_followers[i] * rng.uniform(5, 50)) if rng.random() < 0.6 else None,
+            min_engagement_rate=float(np.round(rng.uniform(0.5, 6), 1)),
+            max_fake_followers=float(rng.choice([10, 15, 20, 30])),
+            required_platforms=list(rng.choice(platforms, int(rng.integers(0, 3)), replace=False)),
+            target_locations=list(rng.choice(locations, int(rng.integers(0, 3)), replace=False))
+        ))
+    return campaigns
+
+
+def benchmark(n_campaigns: int, n_queries: int = 2000) -> Dict[str, Any]:
+    """Query latency against a brute-force scan, plus open/close throughput"""
+    campaigns = synthetic_campaigns(n_campaigns)
+    start = time.perf_counter()
+    index = CampaignEligibilityIndex.from_campaigns(campaigns)
+    build_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(1)
+    queries = [
+        (int(10 ** rng.uniform(3, 6)), float(rng.uniform(0.5, 8)), float(rng.uniform(0, 25)),
+         list(rng.choice(["instagram", "tiktok", "youtube"], 2, replace=False)),
+         str(rng.choice(["usa", "uk", "india"])))
+        for _ in range(n_queries)
+    ]
+    latencies = []
+    results = 0
+    for followers, engagement, fake, platforms, location in queries:
+        start = time.perf_counter()
+        results += len(index.eligible(followers, engagement, fake, platforms, location))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Brute-force check on a sample
+    mismatches = 0
+    for followers, engagement, fake, platforms, location in queries[:50]:
+        expected = sorted(
+            c.campaign_id for c in campaigns
+            if c.min_followers <= followers * 1.1
+            and (c.max_followers is None or c.max_followers >= followers * 0.9)
+            and c.min_engagement_rate <= engagement * 1.1 and c.max_fake_followers >= fake
+            and (not c.required_platforms or set(c.required_platforms) & set(platforms))
+            and (not c.target_locations or location in c.target_locations)
+        )
+        mismatches += expected != sorted(index.eligible(followers, engagement, fake, platforms, location))
+
+    start = time.perf_counter()
+    for campaign in campaigns[:1000]:
+        index.close(campaign.campaign_id)
+        index.open(campaign)
+    churn_ms = (time.perf_counter() - start) / 2000 * 1000
+
+    return {
+        "campaigns": n_campaigns,
+        "build_seconds": round(build_seconds, 2),
+        "query_ms_p50": round(float(np.percentile(latencies, 50)), 3),
+        "query_ms_p99": round(float(np.percentile(latencies, 99)), 3),
+        "mean_results": round(results / n_queries, 1),
+        "brute_force_mismatches": mismatches,
+        "open_close_ms": round(churn_ms, 4)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Campaign eligibility index benchmark")
+    parser.add_argument('--campaigns', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    for n_campaigns in args.campaigns:
+        print(json.dumps(benchmark(n_campaigns, args.queries)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,905 @@
+"""
+Matching Catalogue Loader for Influencelytic-Match
+Bulk-loads influencer_analytics, social_connections and campaigns from
+Postgres into typed NumPy columns. Rows stream through COPY ... TO STDOUT in
+binary format with every selected column fixed-width and non-null, so each
+buffered chunk is reinterpreted as one structured array instead of being
+parsed row by row; JSON list columns arrive as interned (row, code) pairs.
+Later refreshes fetch only rows whose updated_at moved.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from campaign_index import CampaignConstraints
+from demographics import DEMOGRAPHIC_COLUMNS, FULL_AGE_RANGE, DemographicMatrix
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = os.getenv('DATABASE_URL', '')
+DEFAULT_CATALOGUE_PATH = os.getenv('CATALOGUE_PATH', './data/matching_catalogue.npz')
+# updated_at is stamped at transaction start, so a long transaction can commit rows
+# older than the last high-water mark; deltas re-read this far behind it
+DELTA_OVERLAP_SECONDS = float(os.getenv('CATALOGUE_DELTA_OVERLAP_SECONDS', 300))
+# COPY output is buffered up to this size, then decoded in one structured view
+DECODE_CHUNK_BYTES = 4 << 20
+CURSOR_BATCH_ROWS = 50_000
+METHODS = ('copy', 'cursor')
+
+PLATFORMS = (
+    'instagram', 'tiktok', 'youtube', 'twitter', 'facebook',
+    'linkedin', 'twitch', 'pinterest', 'snapchat', 'other',
+)
+OTHER_PLATFORM = PLATFORMS.index('other')
+CAMPAIGN_STATUSES = ('draft', 'active', 'paused', 'completed', 'cancelled')
+OPEN_STATUS = CAMPAIGN_STATUSES.index('active')
+GENDERS = ('male', 'female', 'other')
+
+COPY_SIGNATURE = b'PGCOPY\n\xff\r\n\x00'
+COPY_HEADER_SIZE = len(COPY_SIGNATURE) + 8
+COPY_TRAILER = b'\xff\xff'
+# timestamptz on the wire counts microseconds from 2000-01-01 UTC
+PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# kind: (wire dtype, in-memory dtype, SQL type, NULL replacement)
+KINDS = {
+    'uuid': ('S16', 'S16', 'uuid', "'00000000-0000-0000-0000-000000000000'"),
+    'bool': ('?', '?', 'bool', 'false'),
+    'int2': ('>i2', 'i2', 'int2', '0'),
+    'int4': ('>i4', 'i4', 'int4', '0'),
+    'int8': ('>i8', 'i8', 'int8', '0'),
+    'float4': ('>f4', 'f4', 'float4', "'NaN'"),
+    'float8': ('>f8', 'f8', 'float8', "'NaN'"),
+    'timestamp': ('>i8', 'i8', 'timestamptz', "'2000-01-01 00:00:00+00'"),
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    """One selected column; NULLs are replaced in SQL so every field has a fixed width"""
+    name: str
+    kind: str
+    expression: str = ''
+    null: str = ''
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(KINDS[self.kind][1])
+
+    @property
+    def select(self) -> str:
+        sql_type, default_null = KINDS[self.kind][2:]
+        value = self.expression or self.name
+        return f"COALESCE(({value})::{sql_type}, {self.null or default_null}::{sql_type}) AS {self.name}"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    columns: Tuple[Column, ...]
+
+
+@dataclass(frozen=True)
+class TagSpec:
+    """A JSONB list column, interned into (row id, code) pairs"""
+    name: str
+    table: str
+    expression: str
+
+
+def _code(column: str, vocabulary: Sequence[str], unknown: int) -> str:
+    """SQL for a text column's position in a fixed vocabulary"""
+    terms = ', '.join(f"'{term}'" for term in vocabulary)
+    return f"COALESCE(array_position(ARRAY[{terms}]::text[], lower(btrim({column}))) - 1, {unknown})"
+
+
+def _elements(expression: str) -> str:
+    return f"jsonb_array_elements_text(CASE jsonb_typeof({expression}) WHEN 'array' THEN {expression} ELSE '[]'::jsonb END)"
+
+
+ANALYTICS = TableSpec('influencer_analytics', (
+    Column('id', 'uuid'),
+    Column('user_id', 'uuid'),
+    Column('platform', 'int2', _code('platform', PLATFORMS, OTHER_PLATFORM)),
+    Column('engagement_rate', 'float8'),
+    Column('fake_follower_percentage', 'float8'),
+    Column('sentiment_score', 'float8'),
+    Column('posting_frequency_per_week', 'int4'),
+    *(Column(name, 'float4') for name in DEMOGRAPHIC_COLUMNS),
+    Column('updated_at', 'timestamp'),
+))
+CONNECTIONS = TableSpec('social_connections', (
+    Column('id', 'uuid'),
+    Column('user_id', 'uuid'),
+    Column('platform', 'int2', _code('platform', PLATFORMS, OTHER_PLATFORM)),
+    Column('follower_count', 'int8'),
+    Column('is_active', 'bool'),
+    Column('updated_at', 'timestamp'),
+))
+CAMPAIGNS = TableSpec('campaigns', (
+    Column('id', 'uuid'),
+    Column('brand_id', 'uuid'),
+    Column('status', 'int2', _code('status', CAMPAIGN_STATUSES, -1)),
+    Column('min_followers', 'int8'),
+    Column('max_followers', 'int8', null='-1'),
+    Column('min_engagement_rate', 'float8', null='0'),
+    Column('max_fake_followers', 'float8', null='100'),
+    Column('budget_min', 'int8'),
+    Column('budget_max', 'int8'),
+    Column('target_age_min', 'int2', null=str(FULL_AGE_RANGE[0])),
+    Column('target_age_max', 'int2', null=str(FULL_AGE_RANGE[1])),
+    Column('target_gender', 'int2', _code('target_gender', GENDERS, -1)),
+    Column('updated_at', 'timestamp'),
+))
+TABLES = (ANALYTICS, CONNECTIONS, CAMPAIGNS)
+
+TAGS = (
+    TagSpec('niches', ANALYTICS.name,
+            "COALESCE(niche_categories, '[]'::jsonb) || COALESCE(interests, '[]'::jsonb)"),
+    TagSpec('required_platforms', CAMPAIGNS.name, 'required_platforms'),
+    TagSpec('target_interests', CAMPAIGNS.name, 'target_interests'),
+    TagSpec('target_locations', CAMPAIGNS.name, 'target_locations'),
+)
+PAIR_COLUMNS = (Column('row_id', 'uuid'), Column('code', 'int4'))
+
+
+def _since_clause(since: Optional[datetime], placeholder: str, joiner: str = 'WHERE') -> str:
+    return f" {joiner} t.updated_at >= {placeholder}" if since is not None else ''
+
+
+def table_query(spec: TableSpec, since: Optional[datetime] = None) -> str:
+    select = ', '.join(column.select for column in spec.columns)
+    return f"SELECT {select} FROM {spec.name} t" + _since_clause(since, '$1')
+
+
+def count_query(spec: TableSpec, since: Optional[datetime] = None) -> str:
+    return f"SELECT count(*) FROM {spec.name} t" + _since_clause(since, '$1')
+
+
+def vocabulary_query(tag: TagSpec, since: Optional[datetime] = None) -> str:
+    return (
+        f"SELECT DISTINCT lower(btrim(e.term)) AS term FROM {tag.table} t "
+        f"CROSS JOIN LATERAL {_elements(tag.expression)} AS e(term) "
+        f"WHERE btrim(e.term) <> ''" + _since_clause(since, '$1', 'AND')
+    )
+
+
+def pairs_query(tag: TagSpec, since: Optional[datetime] = None) -> str:
+    """Row ids with the code of each list element; the vocabulary arrives as $1 terms / $2 codes"""
+    return (
+        f"SELECT t.id AS row_id, v.code::int4 AS code FROM {tag.table} t "
+        f"CROSS JOIN LATERAL {_elements(tag.expression)} AS e(term) "
+        f"JOIN unnest($1::text[], $2::int4[]) AS v(term, code) ON v.term = lower(btrim(e.term))"
+        + _since_clause(since, '$3')
+    )
+
+
+class BinaryCopyDecoder:
+    """
+    Incremental decoder for COPY (FORMAT binary) output. With every column
+    fixed-width and non-null each row after the header has the same size,
+    so a run of rows is viewed as one structured array and each column is
+    converted from network byte order in a single vectorized copy.
+    """
+
+    def __init__(self, columns: Sequence[Column], chunk_bytes: int = DECODE_CHUNK_BYTES):
+        self.columns = list(columns)
+        fields = [('field_count', '>i2')]
+        for column in self.columns:
+            fields += [(f'{column.name}__length', '>i4'), (column.name, KINDS[column.kind][0])]
+        self.row_dtype = np.dtype(fields)
+        self.chunk_bytes = chunk_bytes
+        self.rows = 0
+        self._buffer = bytearray()
+        self._header_read = False
+
+    def feed(self, data: bytes) -> Optional[Dict[str, np.ndarray]]:
+        self._buffer += data
+        return self._decode() if len(self._buffer) >= self.chunk_bytes else None
+
+    def finish(self) -> Optional[Dict[str, np.ndarray]]:
+        block = self._decode()
+        if not self._header_read or bytes(self._buffer) != COPY_TRAILER:
+            raise ValueError("Truncated or malformed COPY stream")
+        return block
+
+    def _decode(self) -> Optional[Dict[str, np.ndarray]]:
+        if not self._header_read:
+            if len(self._buffer) < COPY_HEADER_SIZE:
+                return None
+            if not self._buffer.startswith(COPY_SIGNATURE):
+                raise ValueError("Not a binary COPY stream")
+            (extension,) = struct.unpack_from('>I', self._buffer, COPY_HEADER_SIZE - 4)
+            if len(self._buffer) < COPY_HEADER_SIZE + extension:
+                return None
+            del self._buffer[:COPY_HEADER_SIZE + extension]
+            self._header_read = True
+
+        n_rows = len(self._buffer) // self.row_dtype.itemsize
+        if n_rows == 0:
+            return None
+        rows = np.frombuffer(self._buffer, dtype=self.row_dtype, count=n_rows)
+        if (rows['field_count'] != len(self.columns)).any():
+            raise ValueError("Unexpected field count in COPY stream")
+        block = {}
+        for column in self.columns:
+            if (rows[f'{column.name}__length'] != rows.dtype[column.name].itemsize).any():
+                raise ValueError(f"NULL or variable-width value in column {column.name}")
+            block[column.name] = rows[column.name].astype(column.dtype)
+        # The view pins the bytearray; drop it before shrinking
+        del rows
+        del self._buffer[:n_rows * self.row_dtype.itemsize]
+        self.rows += n_rows
+        return block
+
+
+def _records_block(records: Sequence[Any], columns: Sequence[Column]) -> Dict[str, np.ndarray]:
+    """Column arrays from asyncpg records, for the cursor path"""
+    block = {}
+    for i, column in enumerate(columns):
+        values = [record[i] for record in records]
+        if column.kind == 'uuid':
+            values = [value.bytes for value in values]
+        elif column.kind == 'timestamp':
+            values = [(value - PG_EPOCH) // ONE_MICROSECOND for value in values]
+        block[column.name] = np.array(values, dtype=column.dtype)
+    return block
+
+
+async def stream_blocks(connection,
+                        query: str,
+                        args: Sequence[Any],
+                        columns: Sequence[Column],
+                        consume: Callable[[Dict[str, np.ndarray]], None],
+                        method: str = 'copy') -> int:
+    """
+    Run one query and hand its rows to consume() as column blocks: binary
+    COPY by default, or a server-side cursor where COPY is not permitted.
+    Must run inside a transaction. Returns the row count.
+    """
+    if method == 'copy':
+        decoder = BinaryCopyDecoder(columns)
+
+        async def output(data: bytes):
+            block = decoder.feed(data)
+            if block is not None:
+                consume(block)
+
+        await connection.copy_from_query(query, *args, output=output, format='binary')
+        block = decoder.finish()
+        if block is not None:
+            consume(block)
+        return decoder.rows
+
+    if method != 'cursor':
+        raise ValueError(f"Unknown load method: {method}")
+    cursor = await connection.cursor(query, *args)
+    rows = 0
+    while True:
+        records = await cursor.fetch(CURSOR_BATCH_ROWS)
+        if not records:
+            return rows
+        consume(_records_block(records, columns))
+        rows += len(records)
+
+
+class ColumnTable:
+    """
+    Growable typed columns for one table. Rows with a key column are
+    upserted by it, found through a sorted index built on first use.
+    """
+
+    def __init__(self, columns: Sequence[Column], capacity: int = 0, key: Optional[str] = 'id'):
+        self.spec = list(columns)
+        self.key = key
+        self.size = 0
+        self._columns = {column.name: np.zeros(capacity, dtype=column.dtype) for column in self.spec}
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, name: str) -> np.ndarray:
+        return self._columns[name][:self.size]
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {name: column[:self.size] for name, column in self._columns.items()}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column[:self.size].nbytes for column in self._columns.values())
+
+    def _reserve(self, capacity: int):
+        if capacity <= len(next(iter(self._columns.values()))):
+            return
+        capacity = max(capacity, 2 * self.size, 1024)
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+
+    def append(self, block: Dict[str, np.ndarray]):
+        n = len(next(iter(block.values())))
+        self._reserve(self.size + n)
+        for name, column in self._columns.items():
+            column[self.size:self.size + n] = block[name]
+        self.size += n
+        self._sorted = None
+
+    def rows_of(self, keys: np.ndarray) -> np.ndarray:
+        """Row of each key, -1 where absent"""
+        if self._sorted is None:
+            order = np.argsort(self.column(self.key), kind='stable')
+            self._sorted = (self.column(self.key)[order], order)
+        sorted_keys, order = self._sorted
+        if not len(sorted_keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        return np.where(sorted_keys[positions] == keys, order[positions], -1)
+
+    def upsert(self, other: 'ColumnTable') -> int:
+        """Overwrite rows whose key exists, append the rest; returns rows appended"""
+        if not self.size:
+            self.append(other.columns)
+            return len(other)
+        rows = self.rows_of(other.column(self.key))
+        found = rows >= 0
+        for name, column in self._columns.items():
+            column[rows[found]] = other.column(name)[found]
+        fresh = {name: column[~found] for name, column in other.columns.items()}
+        if (~found).any():
+            self.append(fresh)
+        return int((~found).sum())
+
+    def drop_keys(self, keys: np.ndarray):
+        """Remove every row whose key column is in keys (tag pairs are not unique per key)"""
+        if not self.size or not len(keys):
+            return
+        keep = ~np.isin(self.column(self.key), keys)
+        columns = {name: column[keep] for name, column in self.columns.items()}
+        self.size = 0
+        self.append(columns)
+
+    @property
+    def high_water(self) -> Optional[int]:
+        return int(self.column('updated_at').max()) if self.size else None
+
+
+class TagTable:
+    """Interned JSON list terms plus (row id, code) pairs for one list column"""
+
+    def __init__(self, vocabulary: Sequence[str] = ()):
+        self.vocabulary: List[str] = list(vocabulary)
+        self.codes: Dict[str, int] = {term: code for code, term in enumerate(self.vocabulary)}
+        self.pairs = ColumnTable(PAIR_COLUMNS, key='row_id')
+
+    def intern(self, term: str) -> int:
+        code = self.codes.get(term)
+        if code is None:
+            code = self.codes[term] = len(self.vocabulary)
+            self.vocabulary.append(term)
+        return code
+
+    def grouped(self, table: ColumnTable) -> Tuple[np.ndarray, np.ndarray]:
+        """CSR (indptr, codes) over the rows of the owning table"""
+        rows = table.rows_of(self.pairs.column('row_id'))
+        known = rows >= 0
+        rows, codes = rows[known], self.pairs.column('code')[known]
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(len(table) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(table)), out=indptr[1:])
+        return indptr, codes[order]
+
+
+@dataclass
+class RefreshReport:
+    mode: str
+    method: str
+    seconds: float
+    tables: Dict[str, Dict[str, Any]]
+    changed_campaigns: np.ndarray
+
+    def summary(self) -> Dict[str, Any]:
+        rows = sum(table['rows'] for table in self.tables.values())
+        return {
+            "mode": self.mode,
+            "method": self.method,
+            "seconds": round(self.seconds, 3),
+            "rows": rows,
+            "rows_per_second": round(rows / self.seconds) if self.seconds > 0 else 0,
+            "changed_campaigns": len(self.changed_campaigns),
+            "tables": self.tables
+        }
+
+
+@dataclass
+class InfluencerColumns:
+    """Per-influencer columns, aggregated the way profile_store.influencer_from_rows does for one id"""
+    user_ids: np.ndarray
+    follower_count: np.ndarray
+    platform_mask: np.ndarray
+    engagement_rate: np.ndarray
+    fake_follower_percentage: np.ndarray
+    content_quality_score: np.ndarray
+    posting_frequency: np.ndarray
+    demographics: DemographicMatrix
+    niche_indptr: np.ndarray
+    niche_codes: np.ndarray
+    niche_vocabulary: List[str]
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def ids(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        return uuid_strings(self.user_ids if rows is None else self.user_ids[rows])
+
+    def niches(self, row: int) -> List[str]:
+        codes = self.niche_codes[self.niche_indptr[row]:self.niche_indptr[row + 1]]
+        return [self.niche_vocabulary[code] for code in codes]
+
+    def eligible(self,
+                 min_followers: int = 0,
+                 max_followers: Optional[int] = None,
+                 min_engagement_rate: float = 0.0,
+                 max_fake_followers: float = 100.0,
+                 platforms: Sequence[str] = ()) -> np.ndarray:
+        """Boolean mask of influencers meeting a campaign's hard requirements"""
+        mask = ((self.follower_count >= min_followers)
+                & (self.engagement_rate >= min_engagement_rate)
+                & (self.fake_follower_percentage <= max_fake_followers))
+        if max_followers is not None:
+            mask &= self.follower_count <= max_followers
+        if platforms:
+            mask &= (self.platform_mask & platform_bits(platforms)) != 0
+        return mask
+
+
+def platform_bits(platforms: Sequence[str]) -> int:
+    bits = 0
+    for platform in platforms:
+        name = platform.strip().lower()
+        bits |= 1 << (PLATFORMS.index(name) if name in PLATFORMS else OTHER_PLATFORM)
+    return bits
+
+
+def uuid_strings(values: np.ndarray) -> List[str]:
+    # S16 drops trailing zero bytes on the way out
+    return [str(uuid.UUID(bytes=value.ljust(16, b'\0'))) for value in values.tolist()]
+
+
+def uuid_keys(values: Sequence[str]) -> np.ndarray:
+    return np.array([uuid.UUID(value).bytes for value in values], dtype='S16')
+
+
+def _pg_timestamp(micros: int) -> datetime:
+    return PG_EPOCH + timedelta(microseconds=micros)
+
+
+def aggregate_influencers(analytics: ColumnTable, connections: ColumnTable, niches: TagTable) -> InfluencerColumns:
+    """
+    One row per user with analytics or an active connection: followers summed
+    over active connections, rates weighted by each platform's followers,
+    fake share the maximum, posting frequency the sum, demographics from the
+    largest platform and niches the union, all with grouped array operations.
+    """
+    a = analytics.columns
+    c = connections.columns
+    active = c['is_active']
+    c_user_ids, c_platform, c_followers = c['user_id'][active], c['platform'][active], c['follower_count'][active]
+    user_ids, inverse = np.unique(np.concatenate([a['user_id'], c_user_ids]), return_inverse=True)
+    n, n_analytics = len(user_ids), len(a['user_id'])
+    a_user, c_user = inverse[:n_analytics], inverse[n_analytics:]
+    a_platform = a['platform'].astype(np.int64)
+
+    # Followers of each analytics row's (user, platform) from the summed connections
+    connection_keys, key_inverse = np.unique(c_user * len(PLATFORMS) + c_platform, return_inverse=True)
+    platform_followers = np.bincount(key_inverse, weights=c_followers, minlength=len(connection_keys))
+    weights = np.ones(n_analytics)
+    if len(connection_keys):
+        analytics_keys = a_user * len(PLATFORMS) + a_platform
+        positions = np.minimum(np.searchsorted(connection_keys, analytics_keys), len(connection_keys) - 1)
+        matched = connection_keys[positions] == analytics_keys
+        weights = np.maximum(np.where(matched, platform_followers[positions], 0), 1)
+
+    total_weight = np.bincount(a_user, weights=weights, minlength=n)
+    has_analytics = total_weight > 0
+
+    def weighted(values: np.ndarray) -> np.ndarray:
+        sums = np.bincount(a_user, weights=np.nan_to_num(values) * weights, minlength=n)
+        return sums / np.where(has_analytics, total_weight, 1.0)
+
+    fake = np.zeros(n)
+    np.maximum.at(fake, a_user, np.nan_to_num(a['fake_follower_percentage']))
+    platform_mask = np.zeros(n, dtype=np.int64)
+    np.bitwise_or.at(platform_mask, c_user, np.left_shift(1, c_platform.astype(np.int64)))
+    np.bitwise_or.at(platform_mask, a_user, np.left_shift(1, a_platform))
+
+    # Largest platform per user: max weight, earliest row on ties
+    order = np.lexsort((-np.arange(n_analytics), weights, a_user))
+    sorted_users = a_user[order]
+    last = np.flatnonzero(np.r_[sorted_users[1:] != sorted_users[:-1], True]) if n_analytics else []
+    demographic_columns = {}
+    for name in DEMOGRAPHIC_COLUMNS:
+        values = np.full(n, np.nan, dtype=np.float32)
+        values[sorted_users[last]] = a[name][order[last]]
+        demographic_columns[name] = values
+
+    # Niche pairs point at analytics rows; regroup them per user without duplicates
+    pair_rows = analytics.rows_of(niches.pairs.column('row_id'))
+    known = pair_rows >= 0
+    vocabulary_size = max(len(niches.vocabulary), 1)
+    user_codes = np.unique(a_user[pair_rows[known]] * vocabulary_size + niches.pairs.column('code')[known])
+    niche_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(user_codes // vocabulary_size, minlength=n), out=niche_indptr[1:])
+
+    return InfluencerColumns(
+        user_ids=user_ids,
+        follower_count=np.bincount(c_user, weights=c_followers, minlength=n).astype(np.int64),
+        platform_mask=platform_mask,
+        engagement_rate=weighted(a['engagement_rate']),
+        fake_follower_percentage=fake,
+        content_quality_score=np.where(has_analytics, 50 + 50 * weighted(a['sentiment_score']), 50.0),
+        posting_frequency=np.bincount(a_user, weights=a['posting_frequency_per_week'], minlength=n).astype(np.int64),
+        demographics=DemographicMatrix.from_columns(demographic_columns),
+        niche_indptr=niche_indptr,
+        niche_codes=(user_codes % vocabulary_size).astype(np.int32),
+        niche_vocabulary=list(niches.vocabulary)
+    )
+
+
+class MatchingCatalogue:
+    """
+    Typed columns for every influencer_analytics, social_connections and
+    campaigns row plus their interned JSON list pairs. The first refresh is
+    a full load in one repeatable-read snapshot; later ones upsert rows
+    updated since the last high-water mark. Hard deletes only disappear on
+    a full refresh.
+    """
+
+    def __init__(self):
+        self.tables = {spec.name: ColumnTable(spec.columns) for spec in TABLES}
+        self.tags = {tag.name: TagTable() for tag in TAGS}
+        self.loads = 0
+        self.loaded_at: Optional[str] = None
+        self._influencers: Optional[InfluencerColumns] = None
+        self._lock = threading.Lock()
+
+    def _since(self, table: str) -> Optional[datetime]:
+        high_water = self.tables[table].high_water
+        if high_water is None:
+            return None
+        return _pg_timestamp(high_water) - timedelta(seconds=DELTA_OVERLAP_SECONDS)
+
+    async def refresh(self, connection, full: bool = False, method: str = 'copy') -> RefreshReport:
+        """Load everything (first call or full=True) or just rows updated since the last load"""
+        if method not in METHODS:
+            raise ValueError(f"Unknown load method: {method}")
+        full = full or self.loads == 0
+        start = time.perf_counter()
+        tables: Dict[str, ColumnTable] = {}
+        tags: Dict[str, TagTable] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+
+        async with connection.transaction(isolation='repeatable_read', readonly=True):
+            for spec in TABLES:
+                since = None if full else self._since(spec.name)
+                args = [] if since is None else [since]
+                table_start = time.perf_counter()
+                # Same snapshot as the COPY, so the columns are allocated exactly once
+                table = ColumnTable(spec.columns, capacity=await connection.fetchval(count_query(spec, since), *args))
+                await stream_blocks(connection, table_query(spec, since), args, spec.columns, table.append, method)
+                tables[spec.name] = table
+                timings[spec.name] = _timing(len(table), time.perf_counter() - table_start)
+
+            for tag in TAGS:
+                since = None if full else self._since(tag.table)
+                args = [] if since is None else [since]
+                tag_start = time.perf_counter()
+                tag_table = TagTable(() if full else self.tags[tag.name].vocabulary)
+                terms = [row['term'] for row in await connection.fetch(vocabulary_query(tag, since), *args)]
+                codes = [tag_table.intern(term) for term in terms]
+                pairs = tag_table.pairs
+                await stream_blocks(connection, pairs_query(tag, since), [terms, codes, *args],
+                                    PAIR_COLUMNS, pairs.append, method)
+                tags[tag.name] = tag_table
+                timings[f"{tag.table}.{tag.name}"] = _timing(len(pairs), time.perf_counter() - tag_start)
+
+        with self._lock:
+            if full:
+                self.tables, self.tags = tables, tags
+            else:
+                for name, table in tables.items():
+                    self.tables[name].upsert(table)
+                for tag in TAGS:
+                    current = self.tags[tag.name]
+                    current.pairs.drop_keys(tables[tag.table].column('id'))
+                    current.pairs.append(tags[tag.name].pairs.columns)
+                    for term in tags[tag.name].vocabulary[len(current.vocabulary):]:
+                        current.intern(term)
+            self._influencers = None
+            self.loads += 1
+            self.loaded_at = datetime.now().isoformat()
+
+        return RefreshReport(
+            mode='full' if full else 'delta',
+            method=method,
+            seconds=time.perf_counter() - start,
+            tables=timings,
+            changed_campaigns=tables[CAMPAIGNS.name].column('id').copy()
+        )
+
+    def influencers(self) -> InfluencerColumns:
+        """Per-influencer aggregate, rebuilt after each refresh on first use"""
+        with self._lock:
+            if self._influencers is None:
+                self._influencers = aggregate_influencers(
+                    self.tables[ANALYTICS.name], self.tables[CONNECTIONS.name], self.tags['niches']
+                )
+            return self._influencers
+
+    def campaign_constraints(self, ids: Optional[np.ndarray] = None) -> List[Tuple[str, Optional[CampaignConstraints]]]:
+        """
+        (campaign_id, constraints) for the given 16-byte ids (all when None);
+        constraints is None for campaigns that are not active or not loaded
+        """
+        with self._lock:
+            table = self.tables[CAMPAIGNS.name]
+            rows = np.arange(len(table)) if ids is None else table.rows_of(ids)
+            keys = table.column('id') if ids is None else ids
+            platforms = self.tags['required_platforms']
+            locations = self.tags['target_locations']
+            platform_indptr, platform_codes = platforms.grouped(table)
+            location_indptr, location_codes = locations.grouped(table)
+            status = table.column('status')
+
+            result = []
+            for campaign_id, row in zip(uuid_strings(keys), rows.tolist()):
+                if row < 0 or status[row] != OPEN_STATUS:
+                    result.append((campaign_id, None))
+                    continue
+                max_followers = int(table.column('max_followers')[row])
+                result.append((campaign_id, CampaignConstraints(
+                    campaign_id=campaign_id,
+                    min_followers=int(table.column('min_followers')[row]),
+                    max_followers=None if max_followers < 0 else max_followers,
+                    min_engagement_rate=float(table.column('min_engagement_rate')[row]),
+                    max_fake_followers=float(table.column('max_fake_followers')[row]),
+                    required_platforms=[platforms.vocabulary[code] for code in
+                                        platform_codes[platform_indptr[row]:platform_indptr[row + 1]]],
+                    target_locations=[locations.vocabulary[code] for code in
+                                      location_codes[location_indptr[row]:location_indptr[row + 1]]]
+                )))
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "loaded_at": self.loaded_at,
+                "rows": {name: len(table) for name, table in self.tables.items()},
+                "tag_pairs": {name: len(tag.pairs) for name, tag in self.tags.items()},
+                "vocabulary": {name: len(tag.vocabulary) for name, tag in self.tags.items()},
+                "high_water": {
+                    name: _pg_timestamp(table.high_water).isoformat() if table.high_water is not None else None
+                    for name, table in self.tables.items()
+                },
+                "memory_mb": round((sum(table.nbytes for table in self.tables.values())
+                                    + sum(tag.pairs.nbytes for tag in self.tags.values())) / 2 ** 20, 2)
+            }
+
+    def save(self, path: str = DEFAULT_CATALOGUE_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            arrays = {
+                f"{name}__{column}": values
+                for name, table in self.tables.items() for column, values in table.columns.items()
+            }
+            for name, tag in self.tags.items():
+                arrays[f"tag__{name}__row_id"] = tag.pairs.column('row_id')
+                arrays[f"tag__{name}__code"] = tag.pairs.column('code')
+                arrays[f"tag__{name}__vocabulary"] = np.asarray(tag.vocabulary, dtype=str)
+            np.savez(path, loads=self.loads, loaded_at=np.asarray(self.loaded_at or '', dtype=str), **arrays)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CATALOGUE_PATH) -> 'MatchingCatalogue':
+        catalogue = cls()
+        with np.load(path, allow_pickle=False) as data:
+            for spec in TABLES:
+                catalogue.tables[spec.name].append({
+                    column.name: data[f"{spec.name}__{column.name}"] for column in spec.columns
+                })
+            for tag in TAGS:
+                tag_table = catalogue.tags[tag.name] = TagTable(data[f"tag__{tag.name}__vocabulary"].tolist())
+                tag_table.pairs.append({
+                    'row_id': data[f"tag__{tag.name}__row_id"], 'code': data[f"tag__{tag.name}__code"]
+                })
+            catalogue.loads = int(data['loads'])
+            catalogue.loaded_at = str(data['loaded_at']) or None
+        return catalogue
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_CATALOGUE_PATH) -> 'MatchingCatalogue':
+        if os.path.exists(path):
+            try:
+                return cls.load(path)
+            except Exception as e:
+                logger.error(f"Error loading matching catalogue from {path}: {e}")
+        return cls()
+
+
+def _timing(rows: int, seconds: float) -> Dict[str, Any]:
+    return {"rows": rows, "seconds": round(seconds, 3), "rows_per_second": round(rows / seconds) if seconds > 0 else 0}
+
+
+async def connect(url: str = DEFAULT_DATABASE_URL, schema: Optional[str] = None):
+    """A dedicated asyncpg connection for bulk loads (COPY holds it for the whole load)"""
+    if not url.startswith(('postgres://', 'postgresql://')):
+        raise ValueError("The matching catalogue loads from Postgres; set DATABASE_URL to a postgres:// URL")
+    import asyncpg
+
+    return await asyncpg.connect(url, server_settings={'search_path': schema} if schema else None)
+
+
+async def load_catalogue(url: str = DEFAULT_DATABASE_URL,
+                         catalogue: Optional[MatchingCatalogue] = None,
+                         full: bool = False,
+                         method: str = 'copy',
+                         schema: Optional[str] = None) -> Tuple[MatchingCatalogue, RefreshReport]:
+    catalogue = catalogue if catalogue is not None else MatchingCatalogue()
+    connection = await connect(url, schema)
+    try:
+        report = await catalogue.refresh(connection, full=full, method=method)
+    finally:
+        await connection.close()
+    return catalogue, report
+
+
+SEED_SQL = """
+CREATE SCHEMA IF NOT EXISTS {schema};
+SET search_path TO {schema};
+DROP TABLE IF EXISTS influencer_analytics, social_connections, campaigns;
+CREATE TABLE influencer_analytics (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(), user_id UUID, platform VARCHAR(50) NOT NULL,
+  engagement_rate DECIMAL(5,2), fake_follower_percentage DECIMAL(5,2), sentiment_score DECIMAL(3,2),
+  posting_frequency_per_week INTEGER,
+  audience_age_13_17 DECIMAL(5,2), audience_age_18_24 DECIMAL(5,2), audience_age_25_34 DECIMAL(5,2),
+  audience_age_35_44 DECIMAL(5,2), audience_age_45_54 DECIMAL(5,2), audience_age_55_plus DECIMAL(5,2),
+  audience_male DECIMAL(5,2), audience_female DECIMAL(5,2), audience_other DECIMAL(5,2),
+  niche_categories JSONB DEFAULT '[]', interests JSONB DEFAULT '[]', updated_at TIMESTAMPTZ DEFAULT now()
+);
+CREATE TABLE social_connections (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(), user_id UUID, platform VARCHAR(50) NOT NULL,
+  follower_count INTEGER DEFAULT 0, is_active BOOLEAN DEFAULT true, updated_at TIMESTAMPTZ DEFAULT now()
+);
+CREATE TABLE campaigns (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(), brand_id UUID, status VARCHAR(50) DEFAULT 'draft',
+  min_followers INTEGER DEFAULT 1000, max_followers INTEGER, min_engagement_rate DECIMAL(5,2) DEFAULT 1.0,
+  max_fake_followers DECIMAL(5,2) DEFAULT 20.0, budget_min INTEGER DEFAULT 0, budget_max INTEGER DEFAULT 0,
+  target_age_min INTEGER DEFAULT 13, target_age_max INTEGER DEFAULT 65, target_gender VARCHAR(50),
+  required_platforms JSONB DEFAULT '[]', target_interests JSONB DEFAULT '[]', target_locations JSONB DEFAULT '[]',
+  updated_at TIMESTAMPTZ DEFAULT now()
+);
+INSERT INTO influencer_analytics (
+  user_id, platform, engagement_rate, fake_follower_percentage, sentiment_score, posting_frequency_per_week,
+  audience_age_13_17, audience_age_18_24, audience_age_25_34, audience_age_35_44, audience_age_45_54,
+  audience_age_55_plus, audience_male, audience_female, audience_other, niche_categories, interests
+)
+SELECT md5('user' || (g / 2))::uuid, (ARRAY['instagram', 'tiktok', 'youtube'])[1 + (g / 2 + g % 2) % 3],
+       round((random() * 12)::numeric, 2), round((random() * 40)::numeric, 2),
+       round((random() * 2 - 1)::numeric, 2), (random() * 14)::int,
+       round((random() * 10)::numeric, 2), round((random() * 40)::numeric, 2), round((random() * 30)::numeric, 2),
+       round((random() * 10)::numeric, 2), round((random() * 6)::numeric, 2),
+       CASE WHEN g % 7 = 0 THEN NULL ELSE round((random() * 4)::numeric, 2) END,
+       round((random() * 60)::numeric, 2), round((random() * 60)::numeric, 2), round((random() * 5)::numeric, 2),
+       jsonb_build_array((ARRAY['fitness', 'beauty', 'tech', 'food', 'travel', 'gaming', 'fashion', 'music'])[1 + g % 8]),
+       jsonb_build_array((ARRAY['health', 'style', 'outdoors', 'cooking'])[1 + g % 4])
+FROM generate_series(0, 2 * {influencers} - 1) g;
+INSERT INTO social_connections (user_id, platform, follower_count, is_active)
+SELECT md5('user' || (g / 2))::uuid, (ARRAY['instagram', 'tiktok', 'youtube'])[1 + (g / 2 + g % 2) % 3],
+       (10 ^ (2 + random() * 5))::int, g % 19 <> 0
+FROM generate_series(0, 2 * {influencers} - 1) g;
+INSERT INTO campaigns (
+  brand_id, status, min_followers, max_followers, min_engagement_rate, max_fake_followers, budget_min, budget_max,
+  target_gender, required_platforms, target_interests, target_locations
+)
+SELECT md5('brand' || g % 1000)::uuid, (ARRAY['draft', 'active', 'active', 'paused', 'completed'])[1 + g % 5],
+       (10 ^ (2 + random() * 3))::int, CASE WHEN g % 3 = 0 THEN NULL ELSE (10 ^ (5 + random() * 2))::int END,
+       round((random() * 4)::numeric, 2), round((10 + random() * 20)::numeric, 2),
+       (random() * 1000)::int, 1000 + (random() * 9000)::int,
+       (ARRAY['male', 'female', NULL])[1 + g % 3],
+       jsonb_build_array((ARRAY['instagram', 'tiktok', 'youtube'])[1 + g % 3]),
+       jsonb_build_array((ARRAY['fitness', 'beauty', 'tech', 'food'])[1 + g % 4]),
+       jsonb_build_array((ARRAY['united states', 'united kingdom', 'germany', 'brazil'])[1 + g % 4])
+FROM generate_series(0, {campaigns} - 1) g;
+ANALYZE influencer_analytics, social_connections, campaigns;
+"""
+
+
+async def seed(url: str, schema: str, n_influencers: int, n_campaigns: int):
+    """Synthetic tables in a scratch schema of a local Postgres, for benchmarking"""
+    if not schema.isidentifier():
+        raise ValueError(f"Invalid schema name: {schema}")
+    connection = await connect(url)
+    try:
+        await connection.execute(SEED_SQL.format(schema=schema, influencers=int(n_influencers), campaigns=int(n_campaigns)))
+    finally:
+        await connection.close()
+
+
+async def benchmark(url: str, schema: Optional[str], method: str, touch: float = 0.01) -> Dict[str, Any]:
+    """Full load, aggregation, then a delta after touching a share of analytics rows"""
+    catalogue, full = await load_catalogue(url, method=method, schema=schema)
+    report: Dict[str, Any] = {"method": method, "full": full.summary()}
+    start = time.perf_counter()
+    influencers = catalogue.influencers()
+    report["influencers"] = len(influencers)
+    report["aggregate_seconds"] = round(time.perf_counter() - start, 3)
+
+    if touch > 0 and schema:
+        connection = await connect(url, schema)
+        try:
+            await connection.execute(
+                f"UPDATE influencer_analytics SET updated_at = now() + interval '1 hour' WHERE random() < {float(touch)}"
+            )
+        finally:
+            await connection.close()
+    _, delta = await load_catalogue(url, catalogue, method=method, schema=schema)
+    report["delta"] = delta.summary()
+    report.update(catalogue.stats())
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load or benchmark the matching catalogue from Postgres")
+    parser.add_argument('--url', default=DEFAULT_DATABASE_URL)
+    parser.add_argument('--schema', help="search_path for the load (defaults to the server's)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('load', help="Full or delta load into a saved catalogue")
+    load.add_argument('--output', default=DEFAULT_CATALOGUE_PATH)
+    load.add_argument('--full', action='store_true', help="Ignore the saved catalogue and reload everything")
+    load.add_argument('--method', choices=METHODS, default='copy')
+
+    seeder = commands.add_parser('seed', help="Create synthetic tables in a scratch schema")
+    seeder.add_argument('--influencers', type=int, default=500_000)
+    seeder.add_argument('--campaigns', type=int, default=20_000)
+
+    bench = commands.add_parser('benchmark', help="Rows/s and peak RSS for full and delta loads")
+    bench.add_argument('--method', choices=METHODS, nargs='+', default=['copy'])
+    bench.add_argument('--touch', type=float, default=0.01, help="Share of analytics rows to update before the delta")
+    args = parser.parse_args(argv)
+
+    if args.command == 'load':
+        catalogue = None if args.full else MatchingCatalogue.load_if_exists(args.output)
+        catalogue, report = asyncio.run(load_catalogue(args.url, catalogue, args.full, args.method, args.schema))
+        catalogue.save(args.output)
+        print(json.dumps({**report.summary(), **catalogue.stats()}))
+    elif args.command == 'seed':
+        asyncio.run(seed(args.url, args.schema or 'catalogue_bench', args.influencers, args.campaigns))
+        print(json.dumps({"schema": args.schema or 'catalogue_bench', "influencers": args.influencers,
+                          "campaigns": args.campaigns}))
+    else:
+        for method in args.method:
+            print(json.dumps(asyncio.run(benchmark(args.url, args.schema, method, args.touch))))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,370 @@
+"""
+Lexical Content Matching for Influencelytic-Match
+A TF-IDF vectorizer fitted once over influencer posts and campaign briefs,
+with every influencer document kept as one row of a sparse matrix. Scoring
+all influencers against a campaign is a single sparse matrix-vector product,
+a cheap relevance signal next to the embedding model that needs no
+transformer inference.
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.getenv('CONTENT_MATCHER_PATH', 'models/content_matcher.joblib')
+MODEL_VERSION = 1
+MAX_FEATURES = 50000
+MIN_DF = 2
+TOMBSTONE_RATIO = 0.25          # compact the matrix once this share of rows is stale
+MERGE_ROWS = 4096               # tail rows kept in CSR before they join the column store
+RELEVANCE_SATURATION = 0.35     # cosine at which lexical relevance earns full points
+
+
+def influencer_document(post_texts: Iterable[str], interests: Iterable[str] = (), bio: str = '') -> str:
+    """One document per influencer: bio, declared interests and recent captions"""
+    return ' '.join([bio, ' '.join(interests), *post_texts]).strip()
+
+
+def campaign_document(title: str, description: str, interests: Iterable[str] = (), guidelines: str = '') -> str:
+    return ' '.join([title, description, ' '.join(interests), guidelines]).strip()
+
+
+def relevance_points(similarity: float, max_points: float) -> float:
+    """Scale a TF-IDF cosine onto a scoring component; topical overlap rarely exceeds ~0.4"""
+    return max_points * min(1.0, similarity / RELEVANCE_SATURATION)
+
+
+class ContentMatcher:
+    """
+    Fitted vectorizer plus L2-normalized influencer documents. The bulk of the
+    documents sit in a CSC matrix so a campaign query only touches the columns
+    of its own terms; recent inserts go to a small CSR tail that is merged in
+    once it grows past MERGE_ROWS.
+    """
+
+    def __init__(self, vectorizer: TfidfVectorizer, metadata: Optional[Dict[str, Any]] = None):
+        self.vectorizer = vectorizer
+        self.metadata = metadata or {}
+        self.ids: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.live = np.zeros(0, dtype=bool)
+        width = len(vectorizer.vocabulary_)
+        self.matrix = sp.csc_matrix((0, width), dtype=np.float32)
+        self.tail = sp.csr_matrix((0, width), dtype=np.float32)
+        self._pending: List[sp.csr_matrix] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fit(cls,
+            influencer_documents: Dict[str, str],
+            campaign_documents: Sequence[str] = (),
+            max_features: int = MAX_FEATURES,
+            min_df: int = MIN_DF) -> 'ContentMatcher':
+        """Fit vocabulary and IDF over both sides of the market, then index the influencers"""
+        vectorizer = TfidfVectorizer(
+            max_features=max_features,
+            min_df=min_df,
+            stop_words='english',
+            sublinear_tf=True,
+            dtype=np.float32
+        )
+        vectorizer.fit([*influencer_documents.values(), *campaign_documents])
+        metadata = {
+            'version': MODEL_VERSION,
+            'fitted_at': datetime.now().isoformat(),
+            'influencer_documents': len(influencer_documents),
+            'campaign_documents': len(campaign_documents),
+            'vocabulary_size': len(vectorizer.vocabulary_),
+        }
+        matcher = cls(vectorizer, metadata)
+        matcher.index_documents(list(influencer_documents.keys()), list(influencer_documents.values()))
+        with matcher._lock:
+            matcher._flush(merge=True)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, influencer_id: str) -> bool:
+        return influencer_id in self.rows
+
+    def transform(self, documents: Sequence[str]) -> sp.csr_matrix:
+        return self.vectorizer.transform(documents).astype(np.float32, copy=False)
+
+    def index_documents(self, influencer_ids: Sequence[str], documents: Sequence[str]):
+        """
+        Add or replace influencer documents. Replaced rows become tombstones;
+        new rows are buffered until the next query stacks them onto the tail.
+        """
+        rows = self.transform(documents)
+        with self._lock:
+            start = len(self.ids)
+            for offset, influencer_id in enumerate(influencer_ids):
+                self.rows[influencer_id] = start + offset
+            self.ids.extend(influencer_ids)
+            self._pending.append(rows)
+
+    def remove(self, influencer_id: str) -> bool:
+        with self._lock:
+            row = self.rows.pop(influencer_id, None)
+            if row is None:
+                return False
+            if row < len(self.live):
+                self.live[row] = False
+            return True
+
+    def _flush(self, merge: bool = False):
+        """Stack buffered rows onto the tail, merge a large tail and drop tombstones"""
+        if self._pending:
+            self.tail = sp.vstack([self.tail, *self._pending], format='csr')
+            self._pending = []
+            # Rows replaced since the last flush, including earlier pending copies
+            self.live = np.zeros(len(self.ids), dtype=bool)
+            self.live[np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))] = True
+        stale = len(self.live) - len(self.rows)
+        if stale > TOMBSTONE_RATIO * len(self.live):
+            keep = np.flatnonzero(self.live)
+            self.matrix = sp.vstack([self.matrix, self.tail], format='csr')[keep].tocsc()
+            self.matrix.sort_indices()
+            self.tail = self.tail[:0]
+            self.ids = [self.ids[row] for row in keep]
+            self.rows = {influencer_id: row for row, influencer_id in enumerate(self.ids)}
+            self.live = np.ones(len(keep), dtype=bool)
+        elif self.tail.shape[0] and (merge or self.tail.shape[0] > MERGE_ROWS):
+            self.matrix = sp.vstack([self.matrix, self.tail], format='csc')
+            self.matrix.sort_indices()
+            self.tail = self.tail[:0]
+
+    def _similarity(self, query: sp.csr_matrix) -> np.ndarray:
+        """Cosine of every stored row (live or not) against one transformed document"""
+        terms = query.indices
+        weights = query.data
+        base = self.matrix[:, terms] @ weights
+        if not self.tail.shape[0]:
+            return base
+        dense = np.zeros(query.shape[1], dtype=np.float32)
+        dense[terms] = weights
+        return np.concatenate([base, self.tail @ dense])
+
+    def _column_row_dot(self, position: int, query: sp.csr_matrix) -> float:
+        """One stored row against a query via binary search in each query term's column"""
+        indptr, indices, data = self.matrix.indptr, self.matrix.indices, self.matrix.data
+        total = 0.0
+        for term, weight in zip(query.indices, query.data):
+            lo, hi = indptr[term], indptr[term + 1]
+            at = lo + int(np.searchsorted(indices[lo:hi], position))
+            if at < hi and indices[at] == position:
+                total += float(weight * data[at])
+        return total
+
+    def scores(self, document: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and cosine relevance of every indexed influencer to one campaign document"""
+        query = self.transform([document])
+        with self._lock:
+            self._flush()
+            rows = np.flatnonzero(self.live)
+            return rows, self._similarity(query)[rows]
+
+    def top_k(self, document: str, k: int = 50, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        query = self.transform([document])
+        with self._lock:
+            self._flush()
+            similarity = np.where(self.live, self._similarity(query), -1.0)
+            if k < len(similarity):
+                candidates = np.argpartition(-similarity, k)[:k]
+            else:
+                candidates = np.arange(len(similarity))
+            candidates = candidates[np.argsort(-similarity[candidates], kind='stable')]
+            return [
+                (self.ids[row], float(similarity[row]))
+                for row in candidates if similarity[row] > min_score
+            ]
+
+    def relevance(self,
+                  campaign_doc: str,
+                  influencer_id: Optional[str] = None,
+                  influencer_doc: Optional[str] = None) -> float:
+        """
+        Pairwise relevance. A supplied document wins over the indexed row so
+        fresh posts are scored; unknown influencers without text score 0.
+        """
+        query = self.transform([campaign_doc])
+        if influencer_doc:
+            return float(self.transform([influencer_doc]).multiply(query).sum())
+        with self._lock:
+            self._flush()
+            position = self.rows.get(influencer_id) if influencer_id is not None else None
+            if position is None:
+                return 0.0
+            if position >= self.matrix.shape[0]:
+                return float(self.tail[position - self.matrix.shape[0]].multiply(query).sum())
+            return self._column_row_dot(position, query)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._flush()
+            return {
+                'indexed_influencers': len(self.rows),
+                'vocabulary_size': len(self.vectorizer.vocabulary_),
+                'matrix_nnz': int(self.matrix.nnz + self.tail.nnz),
+                'matrix_mb': round(sum(
+                    part.data.nbytes + part.indices.nbytes + part.indptr.nbytes
+                    for part in (self.matrix, self.tail)
+                ) / 2 ** 20, 2),
+                'fitted_at': self.metadata.get('fitted_at'),
+            }
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            self._flush()
+            keep = np.flatnonzero(self.live)
+            joblib.dump({
+                'vectorizer': self.vectorizer,
+                'metadata': self.metadata,
+                'ids': [self.ids[row] for row in keep],
+                'matrix': sp.vstack([self.matrix, self.tail], format='csr')[keep],
+            }, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'ContentMatcher':
+        payload = joblib.load(path)
+        metadata = payload.get('metadata', {})
+        if metadata.get('version') != MODEL_VERSION:
+            raise ValueError(f"Content matcher at {path} has version {metadata.get('version')}, expected {MODEL_VERSION}")
+        matcher = cls(payload['vectorizer'], metadata)
+        matcher.ids = list(payload['ids'])
+        matcher.rows = {influencer_id: row for row, influencer_id in enumerate(matcher.ids)}
+        matcher.matrix = payload['matrix'].tocsc()
+        matcher.matrix.sort_indices()
+        matcher.live = np.ones(len(matcher.ids), dtype=bool)
+        return matcher
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_MODEL_PATH) -> Optional['ContentMatcher']:
+        """Load the fitted matcher, or return None so callers keep exact interest matching"""
+        if not os.path.exists(path):
+            logger.warning(f"No content matcher at {path}; lexical relevance disabled")
+            return None
+        try:
+            matcher = cls.load(path)
+            logger.info(f"Loaded content matcher with {len(matcher)} influencer documents")
+            return matcher
+        except Exception as e:
+            logger.error(f"Error loading content matcher: {e}")
+            return None
+
+
+def _read_table(path: str):
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def documents_from_posts(table) -> Dict[str, str]:
+    """user_id/content rows (a social_posts export) concatenated per influencer"""
+    table = table.dropna(subset=['content']).astype({'user_id': str, 'content': str})
+    grouped = table.groupby('user_id', sort=False)['content'].agg(' '.join)
+    return grouped.to_dict()
+
+
+def documents_from_campaigns(table) -> List[str]:
+    columns = [name for name in ('title', 'description', 'content_guidelines') if name in table.columns]
+    return table[columns].fillna('').astype(str).agg(' '.join, axis=1).tolist()
+
+
+def synthetic_documents(n_docs: int, words_per_doc: int = 120, vocabulary_size: int = 30000,
+                        topics: int = 50, seed: int = 0) -> Tuple[List[str], np.ndarray]:
+    """Zipf background vocabulary mixed with a per-document topic vocabulary"""
+    vocabulary = np.array([f"w{i}" for i in range(vocabulary_size)])
+    # Topics are shared by every seed so influencer and campaign corpora agree
+    topic_words = np.random.default_rng(12345).integers(0, vocabulary_size, (topics, 40))
+    rng = np.random.default_rng(seed)
+    doc_topics = rng.integers(0, topics, n_docs)
+    background = np.minimum(rng.zipf(1.3, (n_docs, words_per_doc)) - 1, vocabulary_size - 1)
+    topical = topic_words[doc_topics[:, None], rng.integers(0, 40, (n_docs, words_per_doc // 3))]
+    words = np.concatenate([background, topical], axis=1)
+    return [' '.join(vocabulary[row]) for row in words], doc_topics
+
+
+def benchmark(n_influencers: int, n_queries: int = 200) -> Dict[str, Any]:
+    """Fit, index and campaign-query cost, plus topic precision of the top 50"""
+    report: Dict[str, Any] = {"influencers": n_influencers}
+    documents, topics = synthetic_documents(n_influencers)
+    campaigns, campaign_topics = synthetic_documents(n_queries, words_per_doc=30, seed=1)
+
+    start = time.perf_counter()
+    matcher = ContentMatcher.fit({f"inf_{i}": doc for i, doc in enumerate(documents)}, campaigns)
+    report["fit_seconds"] = round(time.perf_counter() - start, 2)
+    del documents
+
+    latencies = []
+    hits = 0
+    for campaign, topic in zip(campaigns, campaign_topics):
+        start = time.perf_counter()
+        top = matcher.top_k(campaign, 50)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += sum(topics[int(influencer_id[4:])] == topic for influencer_id, _ in top)
+    report["query_ms_p50"] = round(float(np.percentile(latencies, 50)), 3)
+    report["query_ms_p99"] = round(float(np.percentile(latencies, 99)), 3)
+    report["top50_topic_precision"] = round(hits / (50 * n_queries), 3)
+
+    # Per-pair scoring, as a request loop over candidates would do it
+    sample = min(n_influencers, 2000)
+    start = time.perf_counter()
+    for i in range(sample):
+        matcher.relevance(campaigns[0], influencer_id=f"inf_{i}")
+    report["pairwise_ms_per_campaign_extrapolated"] = round(
+        (time.perf_counter() - start) * 1000 * n_influencers / sample, 1
+    )
+    report.update({key: value for key, value in matcher.stats().items() if key != 'fitted_at'})
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fit or benchmark the TF-IDF content matcher")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    fit = commands.add_parser('fit', help="Fit the vectorizer and index influencer documents")
+    fit.add_argument('posts', help="CSV or Parquet with user_id and content columns")
+    fit.add_argument('--campaigns', help="CSV or Parquet with title and description columns")
+    fit.add_argument('--output', default=DEFAULT_MODEL_PATH)
+    fit.add_argument('--max-features', type=int, default=MAX_FEATURES)
+    fit.add_argument('--min-df', type=int, default=MIN_DF)
+
+    bench = commands.add_parser('benchmark')
+    bench.add_argument('--influencers', type=int, nargs='+', default=[10_000, 100_000])
+    bench.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        influencer_documents = documents_from_posts(_read_table(args.posts))
+        campaign_documents = documents_from_campaigns(_read_table(args.campaigns)) if args.campaigns else []
+        matcher = ContentMatcher.fit(influencer_documents, campaign_documents, args.max_features, args.min_df)
+        matcher.save(args.output)
+        print(json.dumps(matcher.stats()))
+    else:
+        for n_influencers in args.influencers:
+            print(json.dumps(benchmark(n_influencers, args.queries)))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,233 @@
+"""
+Audience Demographics for Influencelytic-Match
+Maps free-form demographic dicts onto the fixed influencer_analytics schema
+(six age bands, three gender shares) as a float32 vector plus a presence
+mask, so a campaign's target can be aligned against every candidate with a
+single masked computation over an (n, 9) matrix.
+"""
+
+import argparse
+import json
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+FIELDS = (
+    'age_13_17', 'age_18_24', 'age_25_34', 'age_35_44', 'age_45_54', 'age_55_plus',
+    'male', 'female', 'other',
+)
+WIDTH = len(FIELDS)
+GROUPS = {'age': slice(0, 6), 'gender': slice(6, 9)}
+MODES = ('l1', 'total_variation')
+NO_DATA_SCORE = 50.0
+# influencer_analytics columns holding FIELDS, in the same order
+DEMOGRAPHIC_COLUMNS = tuple(f'audience_{name}' for name in FIELDS)
+# Default campaign age range
+FULL_AGE_RANGE = (13, 65)
+
+_ALIASES = {
+    'men': 'male', 'males': 'male', 'man': 'male', 'm': 'male',
+    'women': 'female', 'females': 'female', 'woman': 'female', 'f': 'female',
+    'nonbinary': 'other', 'non_binary': 'other', 'unknown': 'other', 'others': 'other',
+    '55': 'age_55_plus', 'age_55': 'age_55_plus', '55_plus': 'age_55_plus', '55_and_over': 'age_55_plus',
+}
+_SLOTS = {name: slot for slot, name in enumerate(FIELDS)}
+
+
+@lru_cache(maxsize=4096)
+def field_slot(key: str) -> Optional[int]:
+    """Slot for keys like 'audience_age_18_24', '18-24', 'age 55+' or 'Women'; None if unknown"""
+    name = re.sub(r'[^a-z0-9]+', '_', key.lower().replace('+', '_plus')).strip('_')
+    name = name[len('audience_'):] if name.startswith('audience_') else name
+    name = _ALIASES.get(name, name)
+    if name[:1].isdigit():
+        name = _ALIASES.get(name, f"age_{name}")
+    return _SLOTS.get(name)
+
+
+def demographic_vector(demographics: Optional[Mapping[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Percentages in schema order plus a mask of the fields the dict actually set"""
+    values = np.zeros(WIDTH, dtype=np.float32)
+    mask = np.zeros(WIDTH, dtype=bool)
+    for key, value in (demographics or {}).items():
+        slot = field_slot(str(key))
+        if slot is None or value is None:
+            continue
+        try:
+            values[slot] = float(value)
+        except (TypeError, ValueError):
+            continue
+        mask[slot] = True
+    return values, mask
+
+
+class DemographicMatrix:
+    """Row-aligned (n, 9) audience shares and presence mask for a candidate pool"""
+
+    def __init__(self, values: np.ndarray, mask: np.ndarray, ids: Optional[Sequence[str]] = None):
+        self.values = np.asarray(values, dtype=np.float32).reshape(-1, WIDTH)
+        self.mask = np.asarray(mask, dtype=bool).reshape(-1, WIDTH)
+        self.ids = list(ids) if ids is not None else None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_mappings(cls, mappings: Sequence[Optional[Mapping[str, Any]]],
+                      ids: Optional[Sequence[str]] = None) -> 'DemographicMatrix':
+        values = np.zeros((len(mappings), WIDTH), dtype=np.float32)
+        mask = np.zeros((len(mappings), WIDTH), dtype=bool)
+        for row, demographics in enumerate(mappings):
+            values[row], mask[row] = demographic_vector(demographics)
+        return cls(values, mask, ids)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Any], ids: Optional[Sequence[str]] = None) -> 'DemographicMatrix':
+        """
+        From influencer_analytics columns (audience_age_13_17 ... audience_other)
+        as arrays; absent columns and NaN/NULL cells are masked out
+        """
+        n = len(next(iter(columns.values()))) if columns else 0
+        values = np.zeros((n, WIDTH), dtype=np.float32)
+        mask = np.zeros((n, WIDTH), dtype=bool)
+        for key, column in columns.items():
+            slot = field_slot(key)
+            if slot is None:
+                continue
+            column = np.asarray(column, dtype=np.float64)
+            present = ~np.isnan(column)
+            values[:, slot] = np.where(present, column, 0.0)
+            mask[:, slot] = present
+        return cls(values, mask, ids)
+
+    def alignment(self, target: Optional[Mapping[str, Any]], mode: str = 'l1') -> np.ndarray:
+        """Alignment of every row against a target dict; no target at all means every row fits (100)"""
+        if not target:
+            return np.full(len(self), 100.0)
+        target_values, target_mask = demographic_vector(target)
+        return alignment_scores(self.values, self.mask, target_values, target_mask, mode)
+
+
+def alignment_scores(values: np.ndarray,
+                     mask: np.ndarray,
+                     target_values: np.ndarray,
+                     target_mask: np.ndarray,
+                     mode: str = 'l1') -> np.ndarray:
+    """
+    Alignment (0-100) of every row against one target.
+
+    l1: mean absolute difference over the fields both sides set, 2 points
+    off per percentage point. total_variation: per group the target sets,
+    both sides are normalized to distributions over that group (fields the
+    target leaves out count as 0%) and scored 100 * (1 - TV distance),
+    averaged over the groups the candidate has data for.
+
+    A candidate sharing no data with the target scores NO_DATA_SCORE, and so
+    does every candidate when none of the target's fields are recognized.
+    """
+    values = np.atleast_2d(values)
+    mask = np.atleast_2d(mask)
+    n = len(values)
+    if not target_mask.any():
+        return np.full(n, NO_DATA_SCORE)
+
+    if mode == 'l1':
+        # Only the target's fields matter; work on those columns alone
+        fields = np.flatnonzero(target_mask)
+        both = mask[:, fields]
+        counts = both.sum(axis=1)
+        differences = np.abs(values[:, fields] - target_values[fields])
+        differences[~both] = 0.0
+        average = differences.sum(axis=1) / np.maximum(counts, 1)
+        return np.where(counts > 0, np.maximum(0.0, 100.0 - 2.0 * average), NO_DATA_SCORE)
+
+    if mode != 'total_variation':
+        raise ValueError(f"Unknown demographic alignment mode: {mode}")
+    totals = np.zeros(n)
+    groups = np.zeros(n)
+    for group in GROUPS.values():
+        target_group = np.where(target_mask[group], target_values[group], 0.0)
+        if not target_mask[group].any() or target_group.sum() <= 0:
+            continue
+        target_distribution = target_group / target_group.sum()
+        row_group = np.where(mask[:, group], values[:, group], 0.0)
+        row_sums = row_group.sum(axis=1)
+        has_data = row_sums > 0
+        distribution = row_group / np.where(has_data, row_sums, 1.0)[:, None]
+        distance = 0.5 * np.abs(distribution - target_distribution).sum(axis=1)
+        totals += np.where(has_data, 100.0 * (1.0 - distance), 0.0)
+        groups += has_data
+    return np.where(groups > 0, totals / np.maximum(groups, 1), NO_DATA_SCORE)
+
+
+def synthetic_demographics(n: int, seed: int = 0) -> List[Dict[str, float]]:
+    """Dicts in the free-form shapes clients send, some fields missing"""
+    rng = np.random.default_rng(seed)
+    ages = rng.dirichlet(np.ones(6), n) * 100
+    genders = rng.dirichlet(np.ones(3), n) * 100
+    spellings = [FIELDS, [f"audience_{name}" for name in FIELDS],
+                 ['13-17', '18-24', '25-34', '35-44', '45-54', '55+', 'Men', 'Women', 'Other']]
+    rows = []
+    for i in range(n):
+        names = spellings[i % len(spellings)]
+        shares = np.concatenate([ages[i], genders[i]])
+        keep = rng.random(WIDTH) > 0.15
+        rows.append({names[slot]: round(float(shares[slot]), 2) for slot in np.flatnonzero(keep)})
+    return rows
+
+
+def _per_pair_l1(influencer: Dict[str, float], target: Dict[str, float]) -> float:
+    """The dict-walking alignment this module replaces, for benchmarking"""
+    total_difference = 0.0
+    count = 0
+    for key, target_value in target.items():
+        if key in influencer:
+            total_difference += abs(influencer[key] - target_value)
+            count += 1
+    return max(0.0, 100 - 2 * total_difference / count) if count else NO_DATA_SCORE
+
+
+def benchmark(n_candidates: int, n_campaigns: int = 50) -> Dict[str, Any]:
+    mappings = synthetic_demographics(n_candidates)
+    targets = [{'age_18_24': 40.0, 'age_25_34': 35.0, 'female': 60.0}] * n_campaigns
+
+    start = time.perf_counter()
+    matrix = DemographicMatrix.from_mappings(mappings)
+    ingest_seconds = time.perf_counter() - start
+
+    report: Dict[str, Any] = {"candidates": n_candidates,
+                              "ingest_us_per_profile": round(ingest_seconds / n_candidates * 1e6, 2)}
+    for mode in MODES:
+        start = time.perf_counter()
+        for target in targets:
+            matrix.alignment(target, mode)
+        report[f"{mode}_ms_per_campaign"] = round((time.perf_counter() - start) / n_campaigns * 1000, 3)
+
+    canonical = [{FIELDS[field_slot(k)]: v for k, v in m.items()} for m in mappings]
+    sample = min(n_candidates, 100_000)
+    start = time.perf_counter()
+    expected = [_per_pair_l1(m, targets[0]) for m in canonical[:sample]]
+    report["per_pair_ms_per_campaign_extrapolated"] = round(
+        (time.perf_counter() - start) * 1000 * n_candidates / sample, 1
+    )
+    report["max_abs_difference_vs_per_pair"] = round(
+        float(np.abs(matrix.alignment(targets[0])[:sample] - np.array(expected)).max()), 4
+    )
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Demographic alignment benchmark")
+    parser.add_argument('--candidates', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    for n_candidates in args.candidates:
+        print(json.dumps(benchmark(n_candidates)))
+
+
+if __name__ == "__main__":
+    main()
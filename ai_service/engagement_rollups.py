@@ -0,0 +1,392 @@
+"""
+Engagement Rollups for Influencelytic-Match
+Daily buckets of post counts, likes, comments, shares, saves and views per
+(influencer, platform) from content_performance, with prefix sums so any
+7/30/90-day (or arbitrary) window is answered with two lookups instead of a
+scan over every post. Run as a script to backfill the saved state from a
+content_performance export before the service starts
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engagement_stream import RollingAggregates, estimated_engagement_rate
+from persistence import atomic_open
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("posts", "likes", "comments", "shares", "saves", "views")
+POST_METRICS = METRICS[1:]
+DEFAULT_WINDOWS = (7, 30, 90)
+
+DEFAULT_ROLLUP_PATH = os.getenv('ENGAGEMENT_ROLLUP_PATH', './data/engagement_rollups.npz')
+
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+def to_day(timestamp: float) -> int:
+    """UTC day number of a unix timestamp"""
+    return int(timestamp // 86400)
+
+
+def today() -> int:
+    return to_day(time.time())
+
+
+class DailySeries:
+    """
+    Contiguous daily buckets from start_day, plus an inclusive prefix sum
+    that is recomputed lazily from the earliest bucket changed since the
+    last query, so late updates only redo the tail they affect
+    """
+
+    def __init__(self, start_day: int):
+        self.start_day = start_day
+        self.length = 0
+        self.buckets = np.zeros((32, len(METRICS)), dtype=np.int64)
+        self.prefix = np.zeros((33, len(METRICS)), dtype=np.int64)
+        self.dirty_from: Optional[int] = None
+        self.version = 0
+
+    def _ensure(self, day: int) -> int:
+        """Bucket index for day, growing the series at either end"""
+        if day < self.start_day:
+            shift = self.start_day - day
+            grown = np.zeros((max(len(self.buckets), self.length + shift) * 2, len(METRICS)), dtype=np.int64)
+            grown[shift:shift + self.length] = self.buckets[:self.length]
+            self.buckets = grown
+            self.start_day = day
+            self.length += shift
+            self.dirty_from = 0
+        index = day - self.start_day
+        if index >= len(self.buckets):
+            grown = np.zeros((max(2 * len(self.buckets), index + 1), len(METRICS)), dtype=np.int64)
+            grown[:self.length] = self.buckets[:self.length]
+            self.buckets = grown
+        if index >= self.length:
+            self.dirty_from = min(self.length, self.dirty_from if self.dirty_from is not None else self.length)
+            self.length = index + 1
+        return index
+
+    def add(self, day: int, values: np.ndarray):
+        index = self._ensure(day)
+        self.buckets[index] += values
+        self.dirty_from = index if self.dirty_from is None else min(self.dirty_from, index)
+        self.version += 1
+
+    def _refresh(self):
+        if self.dirty_from is None:
+            return
+        if len(self.prefix) < self.length + 1:
+            grown = np.zeros((len(self.buckets) + 1, len(METRICS)), dtype=np.int64)
+            grown[:len(self.prefix)] = self.prefix
+            self.prefix = grown
+        start = self.dirty_from
+        np.cumsum(self.buckets[start:self.length], axis=0, out=self.prefix[start + 1:self.length + 1])
+        self.prefix[start + 1:self.length + 1] += self.prefix[start]
+        self.dirty_from = None
+
+    def window(self, first_day: int, last_day: int) -> np.ndarray:
+        """Metric sums over days first_day..last_day inclusive"""
+        self._refresh()
+        lo = min(max(first_day - self.start_day, 0), self.length)
+        hi = min(max(last_day - self.start_day + 1, 0), self.length)
+        if hi <= lo:
+            return np.zeros(len(METRICS), dtype=np.int64)
+        return self.prefix[hi] - self.prefix[lo]
+
+
+class EngagementRollupStore:
+    """
+    DailySeries per "user_id:platform". Each post's last-seen counts are kept
+    in flat arrays so re-imported content_performance rows apply only their
+    delta, to the bucket of the day the post went live.
+    """
+
+    def __init__(self):
+        self.series: Dict[str, DailySeries] = {}
+        self.platforms: Dict[str, List[str]] = {}
+        self.post_index: Dict[str, int] = {}
+        self.post_days = np.zeros(0, dtype=np.int32)
+        self.post_values = np.zeros((0, len(POST_METRICS)), dtype=np.int64)
+        self._lock = threading.Lock()
+        self.rows_applied = 0
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self.platforms
+
+    def _series(self, user_id: str, platform: str, day: int) -> DailySeries:
+        key = f"{user_id}:{platform}"
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = DailySeries(day)
+            self.platforms.setdefault(user_id, []).append(platform)
+        return series
+
+    def _post_row(self, post_key: str) -> Tuple[int, bool]:
+        row = self.post_index.get(post_key)
+        if row is not None:
+            return row, False
+        row = self.post_index[post_key] = len(self.post_index)
+        if row >= len(self.post_days):
+            capacity = max(1024, 2 * len(self.post_days))
+            days = np.zeros(capacity, dtype=np.int32)
+            days[:len(self.post_days)] = self.post_days
+            values = np.zeros((capacity, len(POST_METRICS)), dtype=np.int64)
+            values[:len(self.post_values)] = self.post_values
+            self.post_days, self.post_values = days, values
+        return row, True
+
+    def upsert(self,
+               user_id: str,
+               platform: str,
+               content_id: str,
+               posted_at: Optional[float],
+               likes: int = 0,
+               comments: int = 0,
+               shares: int = 0,
+               saves: int = 0,
+               views: int = 0) -> bool:
+        """
+        Apply one content_performance row; repeats apply only the change in
+        counts. A post seen for the first time without posted_at has no day
+        to land in and is skipped (returns False).
+        """
+        platform = platform.lower()
+        post_key = f"{user_id}:{platform}:{content_id}"
+        values = np.array([likes, comments, shares, saves, views], dtype=np.int64)
+        with self._lock:
+            if posted_at is None and post_key not in self.post_index:
+                return False
+            row, is_new = self._post_row(post_key)
+            day = to_day(posted_at) if is_new else int(self.post_days[row])
+            delta = np.empty(len(METRICS), dtype=np.int64)
+            delta[0] = 1 if is_new else 0
+            delta[1:] = values - self.post_values[row]
+            self.post_days[row] = day
+            self.post_values[row] = values
+            if is_new or delta.any():
+                self._series(user_id, platform, day).add(day, delta)
+            self.rows_applied += 1
+        return True
+
+    def upsert_many(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """Rows shaped like content_performance with posted_at as a unix timestamp (or None); returns rows applied"""
+        return sum(
+            self.upsert(row["user_id"], row["platform"], row["content_id"], row.get("posted_at"),
+                        *(row.get(metric) or 0 for metric in POST_METRICS))
+            for row in rows
+        )
+
+    def window_totals(self, user_id: str, platform: Optional[str] = None, days: int = 30,
+                      end_day: Optional[int] = None) -> Optional[np.ndarray]:
+        """Metric sums over the `days` days ending at end_day (today); all platforms when platform is None"""
+        end_day = today() if end_day is None else end_day
+        with self._lock:
+            platforms = self.platforms.get(user_id)
+            if platforms is None:
+                return None
+            keys = [f"{user_id}:{p}" for p in platforms] if platform is None else [f"{user_id}:{platform.lower()}"]
+            totals = np.zeros(len(METRICS), dtype=np.int64)
+            for key in keys:
+                series = self.series.get(key)
+                if series is not None:
+                    totals += series.window(end_day - days + 1, end_day)
+        return totals
+
+    def window_stats(self, user_id: str, platform: Optional[str] = None,
+                     windows: Sequence[int] = DEFAULT_WINDOWS,
+                     end_day: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Per-window sums and per-post averages for a dashboard or scorer"""
+        if user_id not in self.platforms:
+            return None
+        stats = {}
+        for days in windows:
+            totals = dict(zip(METRICS, self.window_totals(user_id, platform, days, end_day).tolist()))
+            posts = totals["posts"]
+            interactions = totals["likes"] + totals["comments"] + totals["shares"] + totals["saves"]
+            stats[f"{days}d"] = {
+                **totals,
+                "avg_engagement": round(interactions / posts, 2) if posts else 0.0,
+                "engagement_per_view": round(interactions / totals["views"] * 100, 4) if totals["views"] else None,
+                "posts_per_week": round(posts / days * 7, 2)
+            }
+        return stats
+
+    def version(self, user_id: str) -> Optional[str]:
+        """Changes when any of the user's buckets do, or the day rolls over"""
+        platforms = self.platforms.get(user_id)
+        if platforms is None:
+            return None
+        versions = [self.series[f"{user_id}:{p}"].version for p in platforms]
+        return f"rollup:{sum(versions)}:{today()}"
+
+    def snapshot(self, user_id: str, days: int = 30) -> Optional[Tuple[RollingAggregates, List[str], str]]:
+        """Aggregates over the last `days` days, shaped like EngagementStore.snapshot"""
+        version = self.version(user_id)
+        totals = self.window_totals(user_id, None, days)
+        if totals is None:
+            return None
+        posts, likes, comments, shares = (int(v) for v in totals[:4])
+        aggregates = RollingAggregates(
+            post_count=posts,
+            total_likes=likes,
+            total_comments=comments,
+            total_shares=shares,
+            # Per-post rates are not kept, so the mean is taken at the window's average post
+            mean_estimated_engagement_rate=(
+                estimated_engagement_rate(likes / posts, comments / posts) if posts and likes + comments else None
+            ),
+            total_followers=0,
+            posts_per_week=posts / days * 7,
+            sentiment_posts=0,
+            sentiment_mean=None,
+            sentiment_counts={}
+        )
+        return aggregates, [], version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "series": len(self.series),
+                "posts_indexed": len(self.post_index),
+                "rows_applied": self.rows_applied
+            }
+
+    @classmethod
+    def from_table(cls, table) -> 'EngagementRollupStore':
+        """
+        Backfill from a content_performance export in one vectorized pass:
+        rows are bucketed with a single scatter-add, duplicates keep the
+        last row for each post. Rows without a parseable posted_at have no
+        day to land in and are dropped.
+        """
+        import pandas as pd
+
+        store = cls()
+        posted_at = pd.to_datetime(table['posted_at'], utc=True, errors='coerce')
+        dated = posted_at.notna().to_numpy()
+        if not dated.all():
+            logger.warning(f"Skipping {int((~dated).sum())} content_performance rows without posted_at")
+        # Platforms are matched case-insensitively, as upsert does, before duplicates are dropped
+        table = table.assign(
+            posted_at=posted_at.dt.tz_localize(None),
+            platform=table['platform'].astype(str).str.lower()
+        )[dated]
+        table = table.drop_duplicates(subset=['user_id', 'platform', 'content_id'], keep='last')
+        users = table['user_id'].astype(str).to_numpy()
+        platforms = table['platform'].to_numpy()
+        content_ids = table['content_id'].astype(str).to_numpy()
+        days = (table['posted_at'].to_numpy(dtype='datetime64[D]') - EPOCH).astype(np.int64)
+        values = np.column_stack([
+            table[metric].fillna(0).to_numpy(dtype=np.int64) if metric in table.columns
+            else np.zeros(len(table), dtype=np.int64)
+            for metric in POST_METRICS
+        ])
+        series_keys = np.char.add(np.char.add(users, ':'), platforms)
+        unique_keys, series_ids = np.unique(series_keys, return_inverse=True)
+        order = np.argsort(series_ids, kind='stable')
+        bounds = np.searchsorted(series_ids[order], np.arange(len(unique_keys) + 1))
+
+        for i, key in enumerate(unique_keys):
+            member = order[bounds[i]:bounds[i + 1]]
+            first, last = int(days[member].min()), int(days[member].max())
+            user_id, platform = key.rsplit(':', 1)
+            series = store._series(user_id, platform, first)
+            series._ensure(last)
+            np.add.at(series.buckets[:, 0], days[member] - first, 1)
+            np.add.at(series.buckets[:, 1:], days[member] - first, values[member])
+            series.dirty_from = 0
+
+        store.post_index = {
+            f"{key}:{content_id}": row for row, (key, content_id) in enumerate(zip(series_keys, content_ids))
+        }
+        store.post_days = days.astype(np.int32)
+        store.post_values = values
+        store.rows_applied = len(table)
+        return store
+
+    def save(self, path: str = DEFAULT_ROLLUP_PATH):
+        with self._lock, atomic_open(path, 'wb') as f:
+            keys = list(self.series)
+            lengths = np.array([self.series[key].length for key in keys], dtype=np.int64)
+            n_posts = len(self.post_index)
+            np.savez(
+                f,
+                series_keys=np.asarray(keys, dtype=str),
+                start_days=np.array([self.series[key].start_day for key in keys], dtype=np.int64),
+                lengths=lengths,
+                buckets=(np.concatenate([self.series[key].buckets[:self.series[key].length] for key in keys])
+                         if keys else np.zeros((0, len(METRICS)), dtype=np.int64)),
+                post_keys=np.asarray(sorted(self.post_index, key=self.post_index.get), dtype=str),
+                post_days=self.post_days[:n_posts],
+                post_values=self.post_values[:n_posts],
+                rows_applied=self.rows_applied
+            )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_ROLLUP_PATH) -> 'EngagementRollupStore':
+        store = cls()
+        with np.load(path, allow_pickle=False) as data:
+            offsets = np.concatenate([[0], np.cumsum(data['lengths'])])
+            buckets = data['buckets']
+            for i, key in enumerate(data['series_keys'].tolist()):
+                user_id, platform = key.rsplit(':', 1)
+                series = store._series(user_id, platform, int(data['start_days'][i]))
+                length = int(data['lengths'][i])
+                if length:
+                    series._ensure(series.start_day + length - 1)
+                    series.buckets[:length] = buckets[offsets[i]:offsets[i + 1]]
+                    series.dirty_from = 0
+            store.post_index = {key: row for row, key in enumerate(data['post_keys'].tolist())}
+            store.post_days = data['post_days'].copy()
+            store.post_values = data['post_values'].copy()
+            store.rows_applied = int(data['rows_applied'])
+        return store
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_ROLLUP_PATH) -> 'EngagementRollupStore':
+        return cls.load(path) if os.path.exists(path) else cls()
+
+
+def _read_table(path: str):
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Backfill daily engagement rollups from a content_performance export")
+    parser.add_argument('input', help="CSV or Parquet file with user_id, platform, content_id, posted_at and counts")
+    parser.add_argument('--output', default=DEFAULT_ROLLUP_PATH,
+                        help="Rollup state the service loads at startup (ENGAGEMENT_ROLLUP_PATH)")
+    args = parser.parse_args(argv)
+
+    table = _read_table(args.input)
+    start = time.perf_counter()
+    store = EngagementRollupStore.from_table(table)
+    seconds = time.perf_counter() - start
+    store.save(args.output)
+    print(json.dumps({
+        "rows_read": len(table),
+        "seconds": round(seconds, 3),
+        "output": args.output,
+        **store.stats()
+    }))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,320 @@
+"""
+Rolling Engagement Aggregates for Influencelytic-Match
+Post events (new posts and updated like/comment/share counts) are folded into
+a fixed-size ring buffer per influencer with running sums, so scorers read
+engagement, posting frequency and sentiment without clients resending post
+histories
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from persistence import save_json
+from sentiment_cascade import LABELS
+
+
+DEFAULT_STATE_PATH = os.getenv('ENGAGEMENT_STATE_PATH', './data/engagement_state.json')
+DEFAULT_CAPACITY = int(os.getenv('MAX_POSTS_PER_ANALYSIS', 100))
+
+NO_LABEL = -1
+
+
+def estimated_engagement_rate(likes: int, comments: int) -> float:
+    """Per-post rate with followers estimated from interactions, as InfluencerFeatures does"""
+    interactions = likes + comments
+    return interactions / max(1000, interactions * 50)
+
+
+@dataclass
+class RollingAggregates:
+    """Point-in-time view of an influencer's rolling window, read by the scorers"""
+    post_count: int
+    total_likes: int
+    total_comments: int
+    total_shares: int
+    mean_estimated_engagement_rate: Optional[float]
+    total_followers: int
+    posts_per_week: float
+    sentiment_posts: int
+    sentiment_mean: Optional[float]
+    sentiment_counts: Dict[str, int]
+
+    @property
+    def total_engagement(self) -> int:
+        return self.total_likes + self.total_comments + self.total_shares
+
+    @property
+    def avg_engagement(self) -> float:
+        return self.total_engagement / self.post_count if self.post_count else 0.0
+
+    @property
+    def engagement_rate(self) -> Optional[float]:
+        """Average engagement per post as a percentage of followers"""
+        return self.avg_engagement / self.total_followers * 100 if self.total_followers else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "post_count": self.post_count,
+            "total_likes": self.total_likes,
+            "total_comments": self.total_comments,
+            "total_shares": self.total_shares,
+            "avg_engagement": round(self.avg_engagement, 2),
+            "engagement_rate": round(self.engagement_rate, 4) if self.engagement_rate is not None else None,
+            "total_followers": self.total_followers,
+            "posts_per_week": round(self.posts_per_week, 2),
+            "sentiment_posts": self.sentiment_posts,
+            "rolling_sentiment": round(self.sentiment_mean, 4) if self.sentiment_mean is not None else None
+        }
+
+
+class RollingEngagement:
+    """
+    Last `capacity` posts in arrival order. Sums are adjusted by the delta of
+    each update or eviction, so every aggregate is O(1) to maintain and read.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.post_ids: List[Optional[str]] = [None] * capacity
+        self.texts: List[str] = [""] * capacity
+        self.likes = np.zeros(capacity, dtype=np.int64)
+        self.comments = np.zeros(capacity, dtype=np.int64)
+        self.shares = np.zeros(capacity, dtype=np.int64)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.labels = np.full(capacity, NO_LABEL, dtype=np.int8)
+        self.sentiment = np.zeros(capacity, dtype=np.float64)
+        self.slots: Dict[str, int] = {}
+        self.head = 0
+        self.follower_counts: Dict[str, int] = {}
+        self.version = 0
+
+        self.likes_sum = 0
+        self.comments_sum = 0
+        self.shares_sum = 0
+        self.rate_sum = 0.0
+        self.rate_posts = 0
+        self.sentiment_sum = 0.0
+        self.label_counts = np.zeros(len(LABELS), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _apply_counts(self, slot: int, sign: int):
+        likes, comments = int(self.likes[slot]), int(self.comments[slot])
+        self.likes_sum += sign * likes
+        self.comments_sum += sign * comments
+        self.shares_sum += sign * int(self.shares[slot])
+        if likes + comments > 0:
+            self.rate_sum += sign * estimated_engagement_rate(likes, comments)
+            self.rate_posts += sign
+
+    def _apply_sentiment(self, slot: int, sign: int):
+        label = self.labels[slot]
+        if label != NO_LABEL:
+            self.sentiment_sum += sign * float(self.sentiment[slot])
+            self.label_counts[label] += sign
+
+    def upsert(self, post_id: str, timestamp: float, likes: int, comments: int, shares: int,
+               text: str = "") -> bool:
+        """Record a new post or refresh its counts; True when the post is new and needs sentiment"""
+        slot = self.slots.get(post_id)
+        is_new = slot is None
+        if is_new:
+            slot = self.head
+            self.head = (self.head + 1) % self.capacity
+            evicted = self.post_ids[slot]
+            if evicted is not None:
+                self._apply_counts(slot, -1)
+                self._apply_sentiment(slot, -1)
+                del self.slots[evicted]
+            self.post_ids[slot] = post_id
+            self.slots[post_id] = slot
+            self.texts[slot] = text or ""
+            self.timestamps[slot] = timestamp
+            self.labels[slot] = NO_LABEL
+        else:
+            self._apply_counts(slot, -1)
+            if text and not self.texts[slot]:
+                self.texts[slot] = text
+        self.likes[slot] = likes
+        self.comments[slot] = comments
+        self.shares[slot] = shares
+        self._apply_counts(slot, 1)
+        self.version += 1
+        return is_new and bool(text)
+
+    def set_sentiment(self, post_id: str, label: str, score: float):
+        slot = self.slots.get(post_id)
+        if slot is None:
+            return
+        self._apply_sentiment(slot, -1)
+        self.labels[slot] = LABELS.index(label)
+        self.sentiment[slot] = score
+        self._apply_sentiment(slot, 1)
+        self.version += 1
+
+    def recent_texts(self) -> List[str]:
+        """Captions in the window, oldest first"""
+        order = [(self.head + i) % self.capacity for i in range(self.capacity)]
+        return [self.texts[slot] for slot in order if self.post_ids[slot] is not None and self.texts[slot]]
+
+    def posts_per_week(self) -> float:
+        n = len(self.slots)
+        if n < 2:
+            return 0.0
+        # Posts arrive roughly in time order, so the ring's ends bound the window
+        oldest = self.timestamps[self.head if self.post_ids[self.head] is not None else 0]
+        newest = self.timestamps[(self.head - 1) % self.capacity]
+        span_days = abs(float(newest) - float(oldest)) / 86400
+        return (n - 1) / span_days * 7 if span_days > 0 else 0.0
+
+    def aggregates(self) -> RollingAggregates:
+        sentiment_posts = int(self.label_counts.sum())
+        return RollingAggregates(
+            post_count=len(self.slots),
+            total_likes=self.likes_sum,
+            total_comments=self.comments_sum,
+            total_shares=self.shares_sum,
+            mean_estimated_engagement_rate=self.rate_sum / self.rate_posts if self.rate_posts else None,
+            total_followers=sum(self.follower_counts.values()),
+            posts_per_week=self.posts_per_week(),
+            sentiment_posts=sentiment_posts,
+            sentiment_mean=self.sentiment_sum / sentiment_posts if sentiment_posts else None,
+            sentiment_counts={label: int(count) for label, count in zip(LABELS, self.label_counts)}
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "head": self.head,
+            "version": self.version,
+            "follower_counts": self.follower_counts,
+            "post_ids": self.post_ids,
+            "texts": self.texts,
+            "likes": self.likes.tolist(),
+            "comments": self.comments.tolist(),
+            "shares": self.shares.tolist(),
+            "timestamps": self.timestamps.tolist(),
+            "labels": self.labels.tolist(),
+            "sentiment": self.sentiment.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RollingEngagement':
+        rolling = cls(data["capacity"])
+        rolling.head = data["head"]
+        rolling.version = data.get("version", 0)
+        rolling.follower_counts = data.get("follower_counts", {})
+        rolling.post_ids = data["post_ids"]
+        rolling.texts = data["texts"]
+        for name, dtype in (("likes", np.int64), ("comments", np.int64), ("shares", np.int64),
+                            ("timestamps", np.float64), ("labels", np.int8), ("sentiment", np.float64)):
+            setattr(rolling, name, np.asarray(data[name], dtype=dtype))
+        # Running sums are rebuilt rather than trusted from disk
+        for slot, post_id in enumerate(rolling.post_ids):
+            if post_id is not None:
+                rolling.slots[post_id] = slot
+                rolling._apply_counts(slot, 1)
+                rolling._apply_sentiment(slot, 1)
+        return rolling
+
+
+class EngagementStore:
+    """Thread-safe RollingEngagement per influencer, fed by post events"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.influencers: Dict[str, RollingEngagement] = {}
+        self._lock = threading.Lock()
+        self.events_applied = 0
+
+    def __len__(self) -> int:
+        return len(self.influencers)
+
+    def __contains__(self, influencer_id: str) -> bool:
+        return influencer_id in self.influencers
+
+    def apply_events(self, events: List[Dict[str, Any]]) -> List[Tuple[str, str, str]]:
+        """
+        Fold post events in timestamp order. Returns (influencer_id, post_key,
+        text) for posts seen for the first time, the only ones that need
+        sentiment classification.
+        """
+        unscored = []
+        with self._lock:
+            for event in sorted(events, key=lambda e: e["timestamp"]):
+                influencer_id = event["influencer_id"]
+                rolling = self.influencers.get(influencer_id)
+                if rolling is None:
+                    rolling = self.influencers[influencer_id] = RollingEngagement(self.capacity)
+                if event.get("follower_count") is not None:
+                    rolling.follower_counts[event["platform"]] = event["follower_count"]
+                post_key = f"{event['platform']}:{event['post_id']}"
+                text = event.get("content") or ""
+                if rolling.upsert(post_key, event["timestamp"], event.get("likes", 0), event.get("comments", 0),
+                                  event.get("shares", 0), text):
+                    unscored.append((influencer_id, post_key, text))
+                self.events_applied += 1
+        return unscored
+
+    def set_sentiment(self, influencer_id: str, post_key: str, label: str, score: float):
+        with self._lock:
+            rolling = self.influencers.get(influencer_id)
+            if rolling is not None:
+                rolling.set_sentiment(post_key, label, score)
+
+    def version(self, influencer_id: str) -> Optional[int]:
+        """Changes whenever the influencer's window does; None for an unknown influencer"""
+        rolling = self.influencers.get(influencer_id)
+        return rolling.version if rolling is not None else None
+
+    def aggregates(self, influencer_id: str) -> Optional[RollingAggregates]:
+        with self._lock:
+            rolling = self.influencers.get(influencer_id)
+            return rolling.aggregates() if rolling is not None else None
+
+    def snapshot(self, influencer_id: str) -> Optional[Tuple[RollingAggregates, List[str], int]]:
+        """Aggregates, captions and state version, or None for an unknown influencer"""
+        with self._lock:
+            rolling = self.influencers.get(influencer_id)
+            if rolling is None:
+                return None
+            return rolling.aggregates(), rolling.recent_texts(), rolling.version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"influencers_tracked": len(self.influencers), "events_applied": self.events_applied}
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "events_applied": self.events_applied,
+                "influencers": {key: rolling.to_dict() for key, rolling in self.influencers.items()}
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EngagementStore':
+        store = cls(data.get("capacity", DEFAULT_CAPACITY))
+        store.events_applied = data.get("events_applied", 0)
+        store.influencers = {
+            key: RollingEngagement.from_dict(rolling) for key, rolling in data.get("influencers", {}).items()
+        }
+        return store
+
+    def save(self, path: str = DEFAULT_STATE_PATH):
+        save_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STATE_PATH) -> 'EngagementStore':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_STATE_PATH) -> 'EngagementStore':
+        return cls.load(path) if os.path.exists(path) else cls()
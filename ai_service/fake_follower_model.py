@@ -0,0 +1,253 @@
+"""
+Fake Follower Detection Model for Influencelytic-Match
+Offline-trained IsolationForest persisted together with its scaler and
+loaded once at startup, scoring whole account catalogues in one call
+"""
+
+import argparse
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.ensemble import IsolationForest
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from follower_graph import GRAPH_FEATURE_NAMES
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION = 2
+DEFAULT_MODEL_PATH = os.getenv('FAKE_FOLLOWER_MODEL_PATH', 'models/fake_follower_detector.joblib')
+
+# Raw account columns accepted by the model, with defaults for optional ones
+INPUT_COLUMNS = {
+    'follower_count': None,
+    'following_count': None,
+    'post_count': None,
+    'engagement_rate': None,      # percent, e.g. 3.5
+    'account_age_days': 365,
+    'growth_volatility': 0.0,     # std / mean of daily follower growth
+    'growth_spikes': 0,           # days where growth more than doubled
+}
+
+FEATURE_NAMES = [
+    'log_followers',
+    'log_following',
+    'following_ratio',
+    'log_posts_per_year',
+    'engagement_rate',
+    'growth_volatility',
+    'growth_spikes',
+]
+
+# Optional follower-graph signals (see follower_graph.py); required when the
+# persisted model was trained with them
+GRAPH_FEATURE_COLUMNS = list(GRAPH_FEATURE_NAMES)
+
+
+def growth_volatility(growth: np.ndarray) -> float:
+    """Coefficient of variation of a follower growth series"""
+    if len(growth) < 2:
+        return 0.0
+    return float(np.std(growth) / max(1, np.mean(growth)))
+
+
+def count_growth_spikes(growth: np.ndarray) -> int:
+    """Days where growth more than doubled versus the previous day"""
+    growth = np.asarray(growth, dtype=np.float64)
+    return int(np.count_nonzero(growth[1:] > growth[:-1] * 2))
+
+
+def build_feature_matrix(columns: Dict[str, Any], include_graph: bool = False) -> np.ndarray:
+    """Turn columnar account data into an (n_accounts, n_features) float64 matrix"""
+    lengths = {len(v) for v in columns.values() if v is not None}
+    if len(lengths) > 1:
+        raise ValueError("All account columns must have the same length")
+    n = lengths.pop() if lengths else 0
+
+    def column(name: str) -> np.ndarray:
+        values = columns.get(name)
+        if values is None:
+            default = INPUT_COLUMNS.get(name)
+            if default is None:
+                raise ValueError(f"Missing required column: {name}")
+            return np.full(n, default, dtype=np.float64)
+        return np.asarray(values, dtype=np.float64)
+
+    followers = column('follower_count')
+    following = column('following_count')
+    posts = column('post_count')
+    age_days = np.maximum(column('account_age_days'), 1)
+
+    features = [
+        np.log1p(followers),
+        np.log1p(following),
+        following / np.maximum(followers, 1),
+        np.log1p(posts / age_days * 365),
+        column('engagement_rate'),
+        column('growth_volatility'),
+        column('growth_spikes'),
+    ]
+    if include_graph:
+        features.extend(column(name) for name in GRAPH_FEATURE_COLUMNS)
+
+    return np.column_stack(features)
+
+
+class FakeFollowerModel:
+    """Scaler + IsolationForest pipeline with calibration against training scores"""
+
+    def __init__(self,
+                 pipeline: Pipeline,
+                 training_scores: np.ndarray,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.pipeline = pipeline
+        # Sorted decision scores of the training catalogue, used to rank new accounts
+        self.training_scores = np.sort(np.asarray(training_scores, dtype=np.float64))
+        self.metadata = metadata or {}
+
+    @classmethod
+    def train(cls,
+              features: np.ndarray,
+              contamination: float = 0.1,
+              n_estimators: int = 200,
+              random_state: int = 42,
+              include_graph: bool = False) -> 'FakeFollowerModel':
+        """Fit scaler and forest on a catalogue feature matrix"""
+        pipeline = Pipeline([
+            ('scaler', StandardScaler()),
+            ('forest', IsolationForest(
+                contamination=contamination,
+                n_estimators=n_estimators,
+                random_state=random_state,
+                n_jobs=-1
+            )),
+        ])
+        pipeline.fit(features)
+        metadata = {
+            'version': MODEL_VERSION,
+            'feature_names': FEATURE_NAMES + (GRAPH_FEATURE_COLUMNS if include_graph else []),
+            'trained_at': datetime.now().isoformat(),
+            'training_accounts': int(features.shape[0]),
+            'contamination': contamination,
+        }
+        return cls(pipeline, pipeline.decision_function(features), metadata)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump({
+            'pipeline': self.pipeline,
+            'training_scores': self.training_scores,
+            'metadata': self.metadata,
+        }, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FakeFollowerModel':
+        payload = joblib.load(path)
+        metadata = payload.get('metadata', {})
+        if metadata.get('feature_names') not in (FEATURE_NAMES, FEATURE_NAMES + GRAPH_FEATURE_COLUMNS):
+            raise ValueError(f"Model at {path} was trained on a different feature set")
+        return cls(payload['pipeline'], payload['training_scores'], metadata)
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_MODEL_PATH) -> Optional['FakeFollowerModel']:
+        """Load the persisted model, or return None so callers fall back to heuristics"""
+        if not os.path.exists(path):
+            logger.warning(f"No fake follower model at {path}; using heuristic detection")
+            return None
+        try:
+            model = cls.load(path)
+            logger.info(f"Loaded fake follower model trained on {model.metadata.get('training_accounts')} accounts")
+            return model
+        except Exception as e:
+            logger.error(f"Error loading fake follower model: {e}")
+            return None
+
+    @property
+    def uses_graph_features(self) -> bool:
+        return len(self.metadata.get('feature_names', [])) > len(FEATURE_NAMES)
+
+    def score(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score every account with a single decision_function call"""
+        decision = self.pipeline.decision_function(features)
+
+        # Share of the training catalogue that looks more normal than this account
+        anomaly_percentile = np.searchsorted(self.training_scores, decision, side='right') / len(self.training_scores)
+        anomaly_percentile = 1.0 - anomaly_percentile
+
+        # Accounts up to the median get 0%, the most anomalous get 50%
+        fake_percentage = 50 * np.clip((anomaly_percentile - 0.5) / 0.5, 0, 1) ** 2
+
+        return {
+            'anomaly_score': decision,
+            'is_anomaly': decision < 0,
+            'anomaly_percentile': anomaly_percentile,
+            'fake_follower_percentage': fake_percentage,
+        }
+
+    def score_columns(self, columns: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        return self.score(build_feature_matrix(columns, include_graph=self.uses_graph_features))
+
+
+def _read_table(path: str):
+    import pandas as pd
+
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Train the fake follower detector offline")
+    parser.add_argument('input', help="CSV or Parquet file with one row per account")
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH)
+    parser.add_argument('--contamination', type=float, default=0.1)
+    parser.add_argument('--n-estimators', type=int, default=200)
+    parser.add_argument('--history', help="Daily follower history (audience_demographics_history export) "
+                                          "used to derive growth_volatility and growth_spikes per user_id "
+                                          "(per platform, then the worst platform)")
+    parser.add_argument('--graph-features', help="Output of `follower_graph.py features`, joined on user_id")
+    args = parser.parse_args(argv)
+
+    table = _read_table(args.input)
+    if args.history:
+        import pandas as pd
+        from follower_timeseries import FollowerSeriesStore
+
+        # One series per platform so counts from different platforms never interleave,
+        # then the most volatile platform and the total spike count per user
+        history = _read_table(args.history).astype({'user_id': str})
+        key_columns = ('user_id', 'platform') if 'platform' in history.columns else ('user_id',)
+        growth = FollowerSeriesStore.from_table(history, key_columns=key_columns).growth_features()
+        growth_table = pd.DataFrame({
+            'user_id': pd.Series(growth['keys']).str.rsplit(':', n=1).str[0] if len(key_columns) > 1 else growth['keys'],
+            'growth_volatility': growth['growth_volatility'],
+            'growth_spikes': growth['growth_spikes'],
+        }).groupby('user_id', as_index=False).agg({'growth_volatility': 'max', 'growth_spikes': 'sum'})
+        table = table.drop(columns=['growth_volatility', 'growth_spikes'], errors='ignore')
+        table = table.astype({'user_id': str}).merge(growth_table, on='user_id', how='left').fillna(
+            {'growth_volatility': 0.0, 'growth_spikes': 0}
+        )
+    include_graph = bool(args.graph_features)
+    if include_graph:
+        graph_table = _read_table(args.graph_features).astype({'user_id': str})
+        table = table.astype({'user_id': str}).merge(graph_table, on='user_id', how='left').fillna(
+            {name: 0.0 for name in GRAPH_FEATURE_COLUMNS}
+        )
+
+    names = list(INPUT_COLUMNS) + (GRAPH_FEATURE_COLUMNS if include_graph else [])
+    columns = {name: table[name].to_numpy() for name in names if name in table.columns}
+    features = build_feature_matrix(columns, include_graph=include_graph)
+
+    model = FakeFollowerModel.train(features, args.contamination, args.n_estimators, include_graph=include_graph)
+    model.save(args.output)
+    print(f"Trained on {features.shape[0]} accounts, saved to {args.output}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,345 @@
+"""
+Follower Graph Analysis for Influencelytic-Match
+Builds a memory-mapped CSR matrix from follower -> followee edge lists and
+computes graph signals for coordinated inauthentic behaviour (follower farms)
+that feed the fake follower model
+"""
+
+import argparse
+import json
+import os
+import resource
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+GRAPH_FEATURE_NAMES = [
+    'farm_follower_share',
+    'cocluster_density',
+    'follower_hub_ratio',
+]
+
+
+def iter_edge_chunks(path: str, chunk_edges: int = 5_000_000) -> Iterator[np.ndarray]:
+    """
+    Yield (k, 2) int64 arrays of (follower_id, followee_id) from an edge file.
+    .npy files are memory-mapped; anything else is read as two-column CSV.
+    """
+    if path.endswith('.npy'):
+        edges = np.load(path, mmap_mode='r')
+        for start in range(0, len(edges), chunk_edges):
+            yield np.asarray(edges[start:start + chunk_edges], dtype=np.int64)
+        return
+
+    import pandas as pd
+
+    for frame in pd.read_csv(path, chunksize=chunk_edges, usecols=[0, 1], dtype=np.int64):
+        yield frame.to_numpy()
+
+
+class FollowerGraph:
+    """
+    Rows are followees (influencers), columns are followers, both indexed by
+    dense ids into node_ids. indptr/indices are int32 when the edge count
+    allows, so scipy wraps the memory-mapped arrays without copying them.
+    """
+
+    def __init__(self,
+                 followee_csr: Dict[str, np.ndarray],
+                 follower_csr: Dict[str, np.ndarray],
+                 node_ids: np.ndarray):
+        self.node_ids = node_ids
+        n = len(node_ids)
+        self.matrix = sparse.csr_matrix(
+            (followee_csr['data'], followee_csr['indices'], followee_csr['indptr']), shape=(n, n), copy=False
+        )
+        # Same edges keyed by follower, so "what else do these followers follow" is a row lookup
+        self.by_follower = sparse.csr_matrix(
+            (follower_csr['data'], follower_csr['indices'], follower_csr['indptr']), shape=(n, n), copy=False
+        )
+        self.in_degree = np.diff(followee_csr['indptr']).astype(np.int64)
+        self.follower_degree = np.diff(follower_csr['indptr']).astype(np.int64)
+        self._hub_scores: Optional[np.ndarray] = None
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def n_edges(self) -> int:
+        return self.matrix.nnz
+
+    @classmethod
+    def build(cls, chunks: Iterable[np.ndarray], workdir: str, step: int = 5_000_000) -> 'FollowerGraph':
+        """
+        Build the CSR files in workdir from edge chunks in bounded memory.
+        Edges are spooled to disk once, then each orientation takes one pass
+        to count degrees and one pass to scatter edges into their rows.
+        """
+        os.makedirs(workdir, exist_ok=True)
+        spool_path = os.path.join(workdir, 'edges.spool')
+        node_ids = np.empty(0, dtype=np.int64)
+        n_edges = 0
+
+        with open(spool_path, 'wb') as spool:
+            for chunk in chunks:
+                chunk = np.ascontiguousarray(chunk, dtype=np.int64)
+                spool.write(chunk.tobytes())
+                node_ids = np.union1d(node_ids, np.unique(chunk))
+                n_edges += len(chunk)
+
+        edges = (np.memmap(spool_path, dtype=np.int64, mode='r', shape=(n_edges, 2))
+                 if n_edges else np.empty((0, 2), dtype=np.int64))
+        n = len(node_ids)
+        index_dtype = np.int32 if max(n_edges, n) < np.iinfo(np.int32).max else np.int64
+
+        # Column 1 (followee) keys the main matrix, column 0 (follower) the reverse one
+        for name, row_column in (('followee', 1), ('follower', 0)):
+            _write_csr(edges, node_ids, row_column, os.path.join(workdir, name), index_dtype, step)
+
+        del edges
+        os.remove(spool_path)
+        np.save(os.path.join(workdir, 'node_ids.npy'), node_ids)
+        with open(os.path.join(workdir, 'meta.json'), 'w') as f:
+            json.dump({'n_nodes': int(n), 'n_edges': int(n_edges)}, f)
+
+        return cls.load(workdir)
+
+    @classmethod
+    def load(cls, workdir: str) -> 'FollowerGraph':
+        """Open a built graph; the edge arrays stay on disk as memory maps"""
+        def open_csr(name):
+            prefix = os.path.join(workdir, name)
+            return {
+                'indptr': np.load(f"{prefix}_indptr.npy"),
+                'indices': np.load(f"{prefix}_indices.npy", mmap_mode='r'),
+                'data': np.load(f"{prefix}_data.npy", mmap_mode='r'),
+            }
+
+        return cls(open_csr('followee'), open_csr('follower'), np.load(os.path.join(workdir, 'node_ids.npy')))
+
+    def index_of(self, account_ids: Any) -> np.ndarray:
+        """Dense row index for each external account id, -1 if absent"""
+        account_ids = np.asarray(account_ids, dtype=np.int64)
+        positions = np.searchsorted(self.node_ids, account_ids)
+        positions = np.minimum(positions, max(self.n_nodes - 1, 0))
+        found = self.node_ids[positions] == account_ids if self.n_nodes else np.zeros(len(account_ids), bool)
+        return np.where(found, positions, -1)
+
+    def follower_overlap(self, account_ids: Any) -> Dict[str, np.ndarray]:
+        """Pairwise shared-follower counts and Jaccard similarity for a candidate set"""
+        rows = self.index_of(account_ids)
+        valid = rows >= 0
+        subset = self.matrix[rows[valid]]
+        shared = (subset @ subset.T).toarray()
+        degree = self.in_degree[rows[valid]].astype(np.float64)
+        union = degree[:, None] + degree[None, :] - shared
+        jaccard = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+        return {'account_ids': np.asarray(account_ids)[valid], 'shared_followers': shared, 'jaccard': jaccard}
+
+    def hub_scores(self, iterations: int = 20) -> np.ndarray:
+        """
+        HITS hub scores by sparse power iteration. Followers in dense
+        lockstep blocks (all following the same accounts) score high.
+        """
+        if self._hub_scores is None:
+            hub = np.ones(self.n_nodes, dtype=np.float32) / np.sqrt(max(self.n_nodes, 1))
+            for _ in range(iterations):
+                authority = self.matrix @ hub
+                authority /= max(np.linalg.norm(authority), 1e-12)
+                hub = self.by_follower @ authority
+                hub /= max(np.linalg.norm(hub), 1e-12)
+            self._hub_scores = hub
+        return self._hub_scores
+
+    def graph_features(self,
+                       account_ids: Any,
+                       farm_degree: Optional[int] = None,
+                       top_k: int = 10,
+                       block_size: int = 256) -> Dict[str, np.ndarray]:
+        """
+        Per-account graph signals for the fake follower model:
+        farm_follower_share  share of followers that follow unusually many accounts
+        cocluster_density    how concentrated followers' other follows are on the
+                             same top_k accounts (dense bipartite block signal)
+        follower_hub_ratio   mean follower hub score relative to the graph average
+        """
+        rows = self.index_of(account_ids)
+        valid = rows >= 0
+        n_accounts = len(rows)
+        degree = self.in_degree[np.maximum(rows, 0)].astype(np.float64)
+        safe_degree = np.maximum(degree, 1)
+
+        if farm_degree is None:
+            active = self.follower_degree[self.follower_degree > 0]
+            farm_degree = int(np.percentile(active, 99)) if len(active) else 1
+        farm_mask = (self.follower_degree >= farm_degree).astype(np.float32)
+        farm_share = np.zeros(n_accounts)
+        farm_share[valid] = (self.matrix[rows[valid]] @ farm_mask) / safe_degree[valid]
+
+        hub = self.hub_scores()
+        mean_hub = max(float(hub[self.follower_degree > 0].mean()) if self.n_nodes else 0.0, 1e-12)
+        hub_ratio = np.zeros(n_accounts)
+        hub_ratio[valid] = (self.matrix[rows[valid]] @ hub) / safe_degree[valid] / mean_hub
+
+        # Co-follow counts: for account s, how many of its followers follow each other account
+        density = np.zeros(n_accounts)
+        valid_positions = np.flatnonzero(valid)
+        for start in range(0, len(valid_positions), block_size):
+            positions = valid_positions[start:start + block_size]
+            cofollow = (self.matrix[rows[positions]] @ self.by_follower).tocsr()
+            for offset, position in enumerate(positions):
+                begin, end = cofollow.indptr[offset], cofollow.indptr[offset + 1]
+                values = cofollow.data[begin:end][cofollow.indices[begin:end] != rows[position]]
+                if len(values) == 0:
+                    continue
+                k = min(top_k, len(values))
+                top = np.partition(values, -k)[-k:]
+                density[position] = top.sum() / (k * safe_degree[position])
+
+        return {
+            'account_ids': np.asarray(account_ids),
+            'in_graph': valid,
+            'follower_count': np.where(valid, degree, 0),
+            'farm_follower_share': farm_share,
+            'cocluster_density': density,
+            'follower_hub_ratio': hub_ratio,
+        }
+
+
+def _write_csr(edges: np.ndarray,
+               node_ids: np.ndarray,
+               row_column: int,
+               prefix: str,
+               index_dtype,
+               step: int):
+    """Counting-sort edges into CSR arrays keyed by one endpoint, chunk by chunk"""
+    n = len(node_ids)
+    n_edges = len(edges)
+    col_column = 1 - row_column
+
+    degree = np.zeros(n, dtype=np.int64)
+    for start in range(0, n_edges, step):
+        rows = np.searchsorted(node_ids, edges[start:start + step, row_column])
+        degree += np.bincount(rows, minlength=n)
+
+    indptr = np.zeros(n + 1, dtype=index_dtype)
+    np.cumsum(degree, out=indptr[1:])
+    np.save(f"{prefix}_indptr.npy", indptr)
+
+    indices = np.lib.format.open_memmap(f"{prefix}_indices.npy", mode='w+', dtype=index_dtype, shape=(n_edges,))
+    cursor = indptr[:-1].astype(np.int64)
+    for start in range(0, n_edges, step):
+        block = edges[start:start + step]
+        rows = np.searchsorted(node_ids, block[:, row_column])
+        order = np.argsort(rows, kind='stable')
+        rows = rows[order]
+        cols = np.searchsorted(node_ids, block[order, col_column])
+        # Rank of each edge among same-row edges within this block
+        group_start = np.r_[0, np.flatnonzero(np.diff(rows)) + 1] if len(rows) else np.empty(0, np.int64)
+        group_sizes = np.diff(np.r_[group_start, len(rows)])
+        rank = np.arange(len(rows)) - np.repeat(group_start, group_sizes)
+        indices[cursor[rows] + rank] = cols
+        cursor += np.bincount(rows, minlength=n)
+    indices.flush()
+    del indices
+
+    data = np.lib.format.open_memmap(f"{prefix}_data.npy", mode='w+', dtype=np.float32, shape=(n_edges,))
+    data[:] = 1
+    data.flush()
+
+
+def synthetic_edges(n_edges: int,
+                    n_nodes: int,
+                    farm_size: int = 5000,
+                    farm_targets: int = 20,
+                    seed: int = 42,
+                    chunk_edges: int = 5_000_000) -> Iterator[np.ndarray]:
+    """Power-law follower graph with one planted follower farm, generated in chunks"""
+    rng = np.random.default_rng(seed)
+    farm_followers = rng.choice(n_nodes, size=farm_size, replace=False)
+    farm_followees = rng.choice(n_nodes, size=farm_targets, replace=False)
+    farm_edges = np.column_stack([
+        np.repeat(farm_followers, farm_targets),
+        np.tile(farm_followees, farm_size)
+    ]).astype(np.int64)
+    yield farm_edges
+
+    remaining = max(0, n_edges - len(farm_edges))
+    while remaining:
+        size = min(chunk_edges, remaining)
+        followers = rng.integers(0, n_nodes, size, dtype=np.int64)
+        followees = np.minimum((rng.pareto(1.2, size) * 50).astype(np.int64), n_nodes - 1)
+        yield np.column_stack([followers, followees])
+        remaining -= size
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark(n_edges: int, workdir: str, n_nodes: Optional[int] = None, n_accounts: int = 1000) -> Dict[str, Any]:
+    """Time build and feature extraction on a synthetic graph"""
+    n_nodes = n_nodes or max(1000, n_edges // 20)
+    report: Dict[str, Any] = {'edges': n_edges, 'nodes': n_nodes}
+
+    start = time.perf_counter()
+    graph = FollowerGraph.build(synthetic_edges(n_edges, n_nodes), workdir)
+    report['build_seconds'] = round(time.perf_counter() - start, 2)
+
+    start = time.perf_counter()
+    graph.hub_scores()
+    report['hits_seconds'] = round(time.perf_counter() - start, 2)
+
+    accounts = graph.node_ids[np.argsort(graph.in_degree)[-n_accounts:]]
+    start = time.perf_counter()
+    graph.graph_features(accounts)
+    report['features_seconds'] = round(time.perf_counter() - start, 2)
+    report['features_accounts'] = len(accounts)
+    report['peak_rss_mb'] = round(_peak_rss_mb(), 1)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Follower graph builder and benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Build CSR files from a follower,followee edge list")
+    build.add_argument('edges')
+    build.add_argument('workdir')
+    build.add_argument('--chunk-edges', type=int, default=5_000_000)
+
+    features = commands.add_parser('features', help="Export graph features for a list of account ids")
+    features.add_argument('workdir')
+    features.add_argument('accounts', help="CSV with user_id and platform_user_id columns")
+    features.add_argument('--output', default='graph_features.csv')
+
+    bench = commands.add_parser('bench', help="Synthetic benchmark, e.g. --edges 10000000 / 100000000")
+    bench.add_argument('--edges', type=int, nargs='+', default=[10_000_000, 100_000_000])
+    bench.add_argument('--workdir', default='data/graph_bench')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        graph = FollowerGraph.build(iter_edge_chunks(args.edges, args.chunk_edges), args.workdir)
+        print(f"Built graph with {graph.n_nodes} nodes and {graph.n_edges} edges in {args.workdir}")
+    elif args.command == 'features':
+        import pandas as pd
+
+        accounts = pd.read_csv(args.accounts)
+        graph = FollowerGraph.load(args.workdir)
+        result = graph.graph_features(accounts['platform_user_id'].to_numpy())
+        table = pd.DataFrame({name: result[name] for name in GRAPH_FEATURE_NAMES})
+        table.insert(0, 'user_id', accounts['user_id'].astype(str).to_numpy())
+        table.to_csv(args.output, index=False)
+        print(f"Wrote graph features for {len(table)} accounts to {args.output}")
+    else:
+        for n_edges in args.edges:
+            print(json.dumps(benchmark(n_edges, os.path.join(args.workdir, str(n_edges)))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Streaming Follower Anomaly Detection for Influencelytic-Match
+Incremental version of the FakeFollowerDetector signals: O(1) state per
+account, constant-time updates per follower snapshot, flags raised as events
+"""
+
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from persistence import save_json
+
+
+# Flag bits kept per account so each flag fires once per episode, not on every
+# snapshot while its condition holds
+FLAG_HIGH_FOLLOWING_RATIO = 1
+FLAG_LOW_ENGAGEMENT = 2
+FLAG_REPEATED_SPIKES = 4
+FLAG_FOLLOWER_BURST = 8
+FLAG_FOLLOWER_DROP = 16
+
+
+@dataclass
+class DetectorConfig:
+    """Thresholds, aligned with the batch FakeFollowerDetector heuristics"""
+    halflife_days: float = 7.0          # EWMA memory for growth statistics
+    burst_z_score: float = 4.0          # growth this many std above normal is a burst
+    min_burst_fraction: float = 0.005   # and must add at least 0.5% of followers
+    drop_z_score: float = 4.0           # sudden losses (follower purges)
+    spike_factor: float = 2.0           # growth more than doubling day over day
+    repeated_spike_count: float = 5.0   # decayed spike count that marks a pattern
+    spike_halflife_days: float = 30.0
+    max_following_ratio: float = 2.0
+    min_engagement_rate: float = 1.0    # percent
+    warmup_snapshots: int = 3           # do not judge bursts before a baseline exists
+
+
+@dataclass
+class AccountState:
+    """Everything remembered about one account between snapshots"""
+    last_timestamp: float = 0.0
+    last_followers: int = 0
+    last_growth: float = 0.0            # followers per day at the previous snapshot
+    growth_mean: float = 0.0            # EWMA of followers per day
+    growth_var: float = 0.0             # EWMA variance of followers per day
+    spike_score: float = 0.0            # exponentially decayed spike count
+    following_ratio: float = 0.0
+    engagement_rate: Optional[float] = None
+    snapshots: int = 0
+    active_flags: int = 0
+
+
+@dataclass
+class FollowerEvent:
+    account: str
+    event_type: str
+    timestamp: float
+    severity: float
+    detail: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "account": self.account,
+            "event_type": self.event_type,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "severity": round(self.severity, 3),
+            "detail": self.detail
+        }
+
+
+class StreamingFollowerMonitor:
+    """Per-account exponentially weighted growth statistics with event output"""
+
+    def __init__(self, config: Optional[DetectorConfig] = None):
+        self.config = config or DetectorConfig()
+        self.accounts: Dict[str, AccountState] = {}
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def update(self,
+               account: str,
+               timestamp: float,
+               follower_count: int,
+               following_count: Optional[int] = None,
+               engagement_rate: Optional[float] = None) -> List[FollowerEvent]:
+        """Fold one snapshot into the account state and return any new flags"""
+        config = self.config
+        state = self.accounts.get(account)
+        events: List[FollowerEvent] = []
+
+        if state is None:
+            state = self.accounts[account] = AccountState(
+                last_timestamp=timestamp, last_followers=follower_count, snapshots=1
+            )
+            self._update_levels(account, state, timestamp, follower_count, following_count, engagement_rate, events)
+            return events
+
+        dt_days = (timestamp - state.last_timestamp) / 86400
+        if dt_days <= 0:
+            # Out-of-order or duplicate snapshot: only refresh level signals
+            self._update_levels(account, state, timestamp, follower_count, following_count, engagement_rate, events)
+            return events
+
+        growth = (follower_count - state.last_followers) / dt_days
+        std = math.sqrt(state.growth_var)
+
+        if state.snapshots >= config.warmup_snapshots:
+            z = (growth - state.growth_mean) / max(std, 1.0)
+            added = follower_count - state.last_followers
+            self._set_flag(account, state, FLAG_FOLLOWER_BURST, "follower_burst",
+                           z >= config.burst_z_score and added >= config.min_burst_fraction * max(state.last_followers, 1),
+                           timestamp, z, {
+                               "followers_added": added,
+                               "growth_per_day": round(growth, 2),
+                               "expected_growth_per_day": round(state.growth_mean, 2)
+                           }, events)
+            self._set_flag(account, state, FLAG_FOLLOWER_DROP, "follower_drop", z <= -config.drop_z_score,
+                           timestamp, -z, {
+                               "followers_lost": -added,
+                               "growth_per_day": round(growth, 2)
+                           }, events)
+
+        # Same spike rule as FakeFollowerDetector, decayed so old spikes fade
+        spike_decay = 0.5 ** (dt_days / config.spike_halflife_days)
+        state.spike_score *= spike_decay
+        if state.snapshots >= 2 and growth > state.last_growth * config.spike_factor and growth > 0:
+            state.spike_score += 1
+        self._set_flag(account, state, FLAG_REPEATED_SPIKES, "repeated_growth_spikes",
+                       state.spike_score > config.repeated_spike_count, timestamp,
+                       state.spike_score, {"decayed_spike_count": round(state.spike_score, 2)}, events)
+
+        # Time-aware EWMA so irregular snapshot intervals weigh correctly
+        alpha = 1 - 0.5 ** (dt_days / config.halflife_days)
+        delta = growth - state.growth_mean
+        state.growth_mean += alpha * delta
+        state.growth_var = (1 - alpha) * (state.growth_var + alpha * delta * delta)
+
+        state.last_growth = growth
+        state.last_followers = follower_count
+        state.last_timestamp = timestamp
+        state.snapshots += 1
+
+        self._update_levels(account, state, timestamp, follower_count, following_count, engagement_rate, events)
+        return events
+
+    def _update_levels(self, account, state, timestamp, follower_count, following_count, engagement_rate, events):
+        config = self.config
+        if following_count is not None:
+            state.following_ratio = following_count / max(follower_count, 1)
+            self._set_flag(account, state, FLAG_HIGH_FOLLOWING_RATIO, "high_following_ratio",
+                           state.following_ratio > config.max_following_ratio, timestamp,
+                           state.following_ratio, {"following_ratio": round(state.following_ratio, 2)}, events)
+        if engagement_rate is not None:
+            state.engagement_rate = engagement_rate
+            self._set_flag(account, state, FLAG_LOW_ENGAGEMENT, "low_engagement_rate",
+                           engagement_rate < config.min_engagement_rate, timestamp,
+                           config.min_engagement_rate - engagement_rate,
+                           {"engagement_rate": engagement_rate}, events)
+
+    @staticmethod
+    def _set_flag(account, state, bit, event_type, active, timestamp, severity, detail, events):
+        """Raise an event only when a level condition switches on"""
+        if active and not state.active_flags & bit:
+            events.append(FollowerEvent(account, event_type, timestamp, severity, detail))
+            state.active_flags |= bit
+        elif not active:
+            state.active_flags &= ~bit
+
+    def account_summary(self, account: str) -> Optional[Dict[str, Any]]:
+        state = self.accounts.get(account)
+        if state is None:
+            return None
+        return {
+            **asdict(state),
+            "growth_std": math.sqrt(state.growth_var),
+            "last_timestamp": datetime.fromtimestamp(state.last_timestamp).isoformat()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "config": asdict(self.config),
+            "accounts": {account: asdict(state) for account, state in self.accounts.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StreamingFollowerMonitor':
+        monitor = cls(DetectorConfig(**data.get("config", {})))
+        monitor.accounts = {
+            account: AccountState(**state) for account, state in data.get("accounts", {}).items()
+        }
+        return monitor
+
+    def save(self, path: str):
+        save_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str) -> 'StreamingFollowerMonitor':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
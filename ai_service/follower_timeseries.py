@@ -0,0 +1,176 @@
+"""
+Follower Growth Time-Series Store for Influencelytic-Match
+Keeps ragged daily follower/engagement histories (audience_demographics_history)
+in flat delta-encoded arrays and computes growth features for every account
+at once with segmented NumPy reductions
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+@dataclass
+class FollowerSeriesStore:
+    """
+    All series live in shared flat arrays. Account i owns the slice
+    offsets[i]:offsets[i + 1]. Follower counts and day numbers are delta
+    encoded: the first entry of each slice holds the absolute value and the
+    rest hold day-over-day differences, which are exactly the daily growth.
+    """
+    keys: np.ndarray              # account key per series (e.g. "user_id:platform")
+    offsets: np.ndarray           # int64, len(keys) + 1
+    day_deltas: np.ndarray        # int32, days since epoch then gaps in days
+    follower_deltas: np.ndarray   # int32, follower count then daily growth
+    engagement_bp: np.ndarray     # int32, engagement rate in basis points (3.25% -> 325)
+
+    @classmethod
+    def from_records(cls,
+                     keys: Any,
+                     dates: Any,
+                     follower_counts: Any,
+                     engagement_rates: Optional[Any] = None) -> 'FollowerSeriesStore':
+        """Build the store from unsorted long-format rows, one per account per day"""
+        keys = np.asarray(keys)
+        days = (np.asarray(dates, dtype='datetime64[D]') - EPOCH).astype(np.int64)
+        followers = np.asarray(follower_counts, dtype=np.int64)
+        if engagement_rates is None:
+            engagement = np.zeros(len(keys), dtype=np.int64)
+        else:
+            engagement = np.rint(np.asarray(engagement_rates, dtype=np.float64) * 100).astype(np.int64)
+
+        unique_keys, key_ids = np.unique(keys, return_inverse=True)
+        order = np.lexsort((days, key_ids))
+        key_ids, days, followers, engagement = key_ids[order], days[order], followers[order], engagement[order]
+
+        counts = np.bincount(key_ids, minlength=len(unique_keys))
+        offsets = np.zeros(len(unique_keys) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        return cls(
+            keys=unique_keys,
+            offsets=offsets,
+            day_deltas=_delta_encode(days, offsets),
+            follower_deltas=_delta_encode(followers, offsets),
+            engagement_bp=engagement.astype(np.int32)
+        )
+
+    @classmethod
+    def from_table(cls, table, key_columns=('user_id', 'platform')) -> 'FollowerSeriesStore':
+        """Build from a DataFrame shaped like audience_demographics_history"""
+        keys = table[key_columns[0]].astype(str)
+        for column in key_columns[1:]:
+            keys = keys + ':' + table[column].astype(str)
+        engagement = table['engagement_rate'] if 'engagement_rate' in table.columns else None
+        return cls.from_records(
+            keys.to_numpy(), table['recorded_date'].to_numpy(), table['follower_count'].to_numpy(), engagement
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.offsets, self.day_deltas, self.follower_deltas, self.engagement_bp))
+
+    def series(self, index: int) -> Dict[str, np.ndarray]:
+        """Decode a single account's history"""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        days = np.cumsum(self.day_deltas[start:end], dtype=np.int64)
+        return {
+            'dates': EPOCH + days.astype('timedelta64[D]'),
+            'follower_count': np.cumsum(self.follower_deltas[start:end], dtype=np.int64),
+            'engagement_rate': self.engagement_bp[start:end] / 100.0
+        }
+
+    def save(self, path: str):
+        np.savez(path, keys=self.keys, offsets=self.offsets, day_deltas=self.day_deltas,
+                 follower_deltas=self.follower_deltas, engagement_bp=self.engagement_bp)
+
+    @classmethod
+    def load(cls, path: str) -> 'FollowerSeriesStore':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{name: data[name] for name in data.files})
+
+    def growth_features(self, spike_factor: float = 2.0) -> Dict[str, np.ndarray]:
+        """
+        Per-account growth statistics computed in one pass over the flat arrays.
+        Definitions match FakeFollowerDetector and detect_fake_followers_simple:
+        variance and std/mean volatility of daily growth, and spikes where
+        growth exceeds spike_factor times the previous day's growth. Changes
+        across multi-day gaps are averaged over the gap.
+        """
+        n = len(self.keys)
+        lengths = self.lengths
+        segment = np.repeat(np.arange(n), lengths)
+
+        # Every non-leading delta is one day of growth for its account
+        is_growth = np.ones(len(segment), dtype=bool)
+        is_growth[self.offsets[:-1][lengths > 0]] = False
+        changes = self.follower_deltas.astype(np.float64)
+        # Spread a change across the days since the previous reading, so a gap isn't one giant day
+        growth = np.where(is_growth, changes / np.maximum(self.day_deltas, 1), changes)
+        growth_segment = segment[is_growth]
+        growth_values = growth[is_growth]
+
+        growth_count = np.bincount(growth_segment, minlength=n)
+        growth_sum = np.bincount(growth_segment, weights=growth_values, minlength=n)
+        change_sum = np.bincount(growth_segment, weights=changes[is_growth], minlength=n)
+        growth_sq = np.bincount(growth_segment, weights=growth_values ** 2, minlength=n)
+        safe_count = np.maximum(growth_count, 1)
+        growth_mean = growth_sum / safe_count
+        growth_variance = np.maximum(growth_sq / safe_count - growth_mean ** 2, 0)
+        growth_variance[growth_count == 0] = 0
+
+        volatility = np.sqrt(growth_variance) / np.maximum(1, growth_mean)
+        volatility[growth_count < 2] = 0
+
+        # Spike pairs: consecutive growth days inside the same account
+        pair = is_growth[1:] & is_growth[:-1]
+        spikes_mask = pair & (growth[1:] > growth[:-1] * spike_factor)
+        spikes = np.bincount(segment[1:][spikes_mask], minlength=n)
+
+        # Average daily growth rate across the whole observed window
+        first = self.follower_deltas[self.offsets[:-1][lengths > 0]].astype(np.float64)
+        first_values = np.zeros(n)
+        first_values[lengths > 0] = first
+        span_days = np.bincount(growth_segment, weights=self.day_deltas[is_growth].astype(np.float64), minlength=n)
+        growth_rate = change_sum / np.maximum(first_values, 1) / np.maximum(span_days, 1) * 100
+
+        engagement = self.engagement_bp / 100.0
+        engagement_mean = np.bincount(segment, weights=engagement, minlength=n) / np.maximum(lengths, 1)
+        engagement_sq = np.bincount(segment, weights=engagement ** 2, minlength=n) / np.maximum(lengths, 1)
+
+        return {
+            'keys': self.keys,
+            'days_observed': lengths,
+            'latest_follower_count': first_values + change_sum,
+            'growth_mean': growth_mean,
+            'growth_variance': growth_variance,
+            'growth_volatility': volatility,
+            'growth_spikes': spikes,
+            'daily_growth_rate_pct': growth_rate,
+            'engagement_mean': engagement_mean,
+            'engagement_std': np.sqrt(np.maximum(engagement_sq - engagement_mean ** 2, 0)),
+        }
+
+
+def _delta_encode(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Differences within each segment, with absolute values at segment starts"""
+    deltas = np.empty_like(values)
+    if len(values):
+        deltas[0] = values[0]
+        deltas[1:] = values[1:] - values[:-1]
+        starts = offsets[:-1][np.diff(offsets) > 0]
+        deltas[starts] = values[starts]
+    if deltas.size and (deltas.max() > np.iinfo(np.int32).max or deltas.min() < np.iinfo(np.int32).min):
+        raise OverflowError("Series values do not fit int32 delta encoding")
+    return deltas.astype(np.int32)
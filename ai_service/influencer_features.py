@@ -0,0 +1,234 @@
+"""
+Shared Influencer Features for Influencelytic-Match
+Single-pass feature extraction over an influencer's posts, built once per
+request and reused by the fake follower, sentiment, matching and pricing
+analyzers
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from brand_safety import BrandSafetyScanner, ScanResult
+from engagement_stream import RollingAggregates
+
+
+@dataclass
+class InfluencerFeatures:
+    """Per-influencer aggregates every analyzer used to recompute on its own"""
+    user_id: str
+    fingerprint: str
+    total_followers: int
+    post_count: int
+    likes: np.ndarray
+    comments: np.ndarray
+    shares: np.ndarray
+    texts: List[str]
+    brand_safety: Optional[ScanResult] = None
+    content_originality: Optional[float] = None    # share of captions not reposted elsewhere
+    rolling: Optional[RollingAggregates] = None    # set when built from the post event stream
+
+    @classmethod
+    def from_profile(cls,
+                     profile: Any,
+                     scanner: Optional[BrandSafetyScanner] = None,
+                     fingerprint: Optional[str] = None) -> 'InfluencerFeatures':
+        """Build from an InfluencerProfile-shaped object in one pass over its posts"""
+        posts = profile.recent_posts
+        n = len(posts)
+        likes = np.empty(n, dtype=np.int64)
+        comments = np.empty(n, dtype=np.int64)
+        shares = np.empty(n, dtype=np.int64)
+        texts = []
+
+        for i, post in enumerate(posts):
+            likes[i] = post.likes
+            comments[i] = post.comments
+            shares[i] = post.shares
+            if post.content:
+                texts.append(post.content)
+
+        features = cls(
+            user_id=profile.user_id,
+            fingerprint=fingerprint or profile_fingerprint(profile),
+            total_followers=sum(profile.follower_counts.values()),
+            post_count=n,
+            likes=likes,
+            comments=comments,
+            shares=shares,
+            texts=texts
+        )
+        if scanner is not None:
+            # Empty posts cannot contain hits, so scanning the non-empty texts is equivalent
+            features.brand_safety = scanner.scan(texts)
+        return features
+
+    @classmethod
+    def from_rolling(cls,
+                     user_id: str,
+                     aggregates: RollingAggregates,
+                     texts: List[str],
+                     scanner: Optional[BrandSafetyScanner] = None,
+                     fingerprint: str = "",
+                     follower_counts: Optional[Dict[str, int]] = None) -> 'InfluencerFeatures':
+        """
+        Build from streamed rolling aggregates; totals are read, not recomputed.
+        Stores that keep no follower counts (daily rollups) report 0 followers,
+        which the profile's follower_counts fill in.
+        """
+        if not aggregates.total_followers and follower_counts:
+            aggregates = replace(aggregates, total_followers=sum(follower_counts.values()))
+        empty = np.zeros(0, dtype=np.int64)
+        features = cls(
+            user_id=user_id,
+            fingerprint=fingerprint,
+            total_followers=aggregates.total_followers,
+            post_count=aggregates.post_count,
+            likes=empty,
+            comments=empty,
+            shares=empty,
+            texts=texts,
+            rolling=aggregates
+        )
+        if scanner is not None:
+            features.brand_safety = scanner.scan(texts)
+        return features
+
+    @property
+    def total_likes(self) -> int:
+        if self.rolling is not None:
+            return self.rolling.total_likes
+        return int(self.likes.sum())
+
+    @property
+    def total_comments(self) -> int:
+        if self.rolling is not None:
+            return self.rolling.total_comments
+        return int(self.comments.sum())
+
+    @property
+    def total_engagement(self) -> int:
+        """Likes, comments and shares across all posts"""
+        if self.rolling is not None:
+            return self.rolling.total_engagement
+        return int(self.likes.sum() + self.comments.sum() + self.shares.sum())
+
+    @property
+    def avg_engagement(self) -> float:
+        return self.total_engagement / self.post_count if self.post_count else 0.0
+
+    @property
+    def estimated_engagement_rates(self) -> np.ndarray:
+        """
+        Per-post engagement rate for posts with any interactions, estimating
+        followers from interactions as InfluencerBrandMatcher always has
+        """
+        interactions = (self.likes + self.comments)[(self.likes + self.comments) > 0].astype(np.float64)
+        return interactions / np.maximum(1000, interactions * 50)
+
+    @property
+    def mean_estimated_engagement_rate(self) -> Optional[float]:
+        """Mean of estimated_engagement_rates, None when no post has interactions"""
+        if self.rolling is not None:
+            return self.rolling.mean_estimated_engagement_rate
+        rates = self.estimated_engagement_rates
+        return float(rates.mean()) if len(rates) else None
+
+    def follower_data(self) -> Dict[str, Any]:
+        """Input dict for FakeFollowerDetector.analyze_followers"""
+        return {
+            "follower_count": self.total_followers,
+            "post_count": self.post_count,
+            "total_likes": self.total_likes,
+            "total_comments": self.total_comments,
+            "content_originality": self.content_originality
+        }
+
+
+def profile_fingerprint(profile: Any) -> str:
+    """Content hash so cached features are dropped when captions, counts or followers change"""
+    digest = hashlib.blake2b(digest_size=16)
+    for platform, count in sorted(profile.follower_counts.items()):
+        digest.update(f"{platform}={count};".encode())
+    for post in profile.recent_posts:
+        # Length prefix keeps adjacent captions from running into each other
+        content = (post.content or '').encode()
+        digest.update(f"{post.id}:{post.likes}:{post.comments}:{post.shares}:{len(content)}:".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+class InfluencerFeatureCache:
+    """Thread-safe LRU of InfluencerFeatures keyed by influencer id"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, InfluencerFeatures]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, profile: Any, scanner: Optional[BrandSafetyScanner] = None) -> InfluencerFeatures:
+        fingerprint = profile_fingerprint(profile)
+        with self._lock:
+            cached = self._entries.get(profile.user_id)
+            if cached is not None and cached.fingerprint == fingerprint:
+                self._entries.move_to_end(profile.user_id)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        features = InfluencerFeatures.from_profile(profile, scanner, fingerprint)
+        with self._lock:
+            self._entries[profile.user_id] = features
+            self._entries.move_to_end(profile.user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return features
+
+    def get_or_build_streamed(self,
+                              user_id: str,
+                              store: Any,
+                              scanner: Optional[BrandSafetyScanner] = None,
+                              follower_counts: Optional[Dict[str, int]] = None) -> Optional[InfluencerFeatures]:
+        """
+        Features from an EngagementStore or EngagementRollupStore (anything
+        with version() and snapshot()), rebuilt only when its version or the
+        profile's follower counts change
+        """
+        version = store.version(user_id)
+        if version is None:
+            return None
+        followers = sum(follower_counts.values()) if follower_counts else 0
+        with self._lock:
+            cached = self._entries.get(user_id)
+            if cached is not None and cached.fingerprint == f"stream:{version}:{followers}":
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        snapshot = store.snapshot(user_id)
+        if snapshot is None:
+            return None
+        aggregates, texts, version = snapshot
+        fingerprint = f"stream:{version}:{followers}"
+        features = InfluencerFeatures.from_rolling(user_id, aggregates, texts, scanner, fingerprint, follower_counts)
+        with self._lock:
+            self._entries[user_id] = features
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return features
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
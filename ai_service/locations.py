@@ -0,0 +1,400 @@
+"""
+Location Normalization for Influencelytic-Match
+Free-text locations are resolved once, at ingest, against a gazetteer into
+interned (city, region, country) ids. Matching is then a hierarchical
+comparison of integer arrays with partial credit per level, so
+"Brooklyn, NY" falls inside "United States" and near "Buffalo, NY".
+"""
+
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+LEVELS = ('city', 'region', 'country')
+CITY, REGION, COUNTRY = range(3)
+UNKNOWN = -1
+# Points when the target's own level does not match but a coarser one does
+REGION_CREDIT = 60.0
+COUNTRY_CREDIT = 30.0
+RESOLVE_CACHE_SIZE = 100_000
+
+# Built-in gazetteer: country -> (aliases, {region: (aliases, {city: aliases})})
+DEFAULT_GAZETTEER: Dict[str, Tuple[List[str], Dict[str, Tuple[List[str], Dict[str, List[str]]]]]] = {
+    "United States": (["us", "usa", "u.s.", "u.s.a.", "america", "united states of america"], {
+        "Alabama": (["al"], {}), "Alaska": (["ak"], {}),
+        "Arizona": (["az"], {"Phoenix": []}),
+        "Arkansas": (["ar"], {}),
+        "California": (["ca", "calif"], {
+            "Los Angeles": ["la", "l.a.", "hollywood", "santa monica"],
+            "San Francisco": ["sf", "san fran", "bay area"],
+            "San Diego": [], "San Jose": [],
+        }),
+        "Colorado": (["co"], {"Denver": []}),
+        "Connecticut": (["ct"], {}), "Delaware": (["de"], {}),
+        "District of Columbia": (["dc", "d.c."], {"Washington": ["washington dc", "washington d.c."]}),
+        "Florida": (["fl"], {"Miami": ["miami beach"], "Orlando": [], "Tampa": []}),
+        "Georgia": (["ga"], {"Atlanta": ["atl"]}),
+        "Hawaii": (["hi"], {"Honolulu": []}),
+        "Idaho": (["id"], {}),
+        "Illinois": (["il"], {"Chicago": ["chi"]}),
+        "Indiana": (["in"], {}), "Iowa": (["ia"], {}), "Kansas": (["ks"], {}), "Kentucky": (["ky"], {}),
+        "Louisiana": (["la"], {"New Orleans": ["nola"]}),
+        "Maine": (["me"], {}), "Maryland": (["md"], {"Baltimore": []}),
+        "Massachusetts": (["ma", "mass"], {"Boston": []}),
+        "Michigan": (["mi"], {"Detroit": []}),
+        "Minnesota": (["mn"], {"Minneapolis": []}),
+        "Mississippi": (["ms"], {}), "Missouri": (["mo"], {}), "Montana": (["mt"], {}),
+        "Nebraska": (["ne"], {}),
+        "Nevada": (["nv"], {"Las Vegas": ["vegas"]}),
+        "New Hampshire": (["nh"], {}), "New Jersey": (["nj"], {}), "New Mexico": (["nm"], {}),
+        "New York": (["ny"], {
+            "New York City": ["nyc", "manhattan", "brooklyn", "queens", "bronx", "staten island"],
+            "Buffalo": [],
+        }),
+        "North Carolina": (["nc"], {"Charlotte": []}),
+        "North Dakota": (["nd"], {}), "Ohio": (["oh"], {"Columbus": []}),
+        "Oklahoma": (["ok"], {}),
+        "Oregon": (["or"], {"Portland": []}),
+        "Pennsylvania": (["pa"], {"Philadelphia": ["philly"], "Pittsburgh": []}),
+        "Rhode Island": (["ri"], {}), "South Carolina": (["sc"], {}), "South Dakota": (["sd"], {}),
+        "Tennessee": (["tn"], {"Nashville": [], "Memphis": []}),
+        "Texas": (["tx"], {"Austin": ["atx"], "Houston": [], "Dallas": [], "San Antonio": []}),
+        "Utah": (["ut"], {"Salt Lake City": ["slc"]}),
+        "Vermont": (["vt"], {}), "Virginia": (["va"], {}),
+        "Washington": (["wa"], {"Seattle": []}),
+        "West Virginia": (["wv"], {}), "Wisconsin": (["wi"], {}), "Wyoming": (["wy"], {}),
+    }),
+    "United Kingdom": (["uk", "u.k.", "gb", "great britain", "britain"], {
+        "England": ([], {"London": [], "Manchester": [], "Birmingham": [], "Liverpool": []}),
+        "Scotland": ([], {"Edinburgh": [], "Glasgow": []}),
+        "Wales": ([], {"Cardiff": []}),
+        "Northern Ireland": ([], {"Belfast": []}),
+    }),
+    "Canada": (["can"], {
+        "Ontario": (["on"], {"Toronto": [], "Ottawa": []}),
+        "Quebec": (["qc"], {"Montreal": []}),
+        "British Columbia": (["bc"], {"Vancouver": []}),
+        "Alberta": (["ab"], {"Calgary": [], "Edmonton": []}),
+    }),
+    "Australia": (["aus"], {
+        "New South Wales": (["nsw"], {"Sydney": []}),
+        "Victoria": (["vic"], {"Melbourne": []}),
+        "Queensland": (["qld"], {"Brisbane": []}),
+        "Western Australia": (["wa"], {"Perth": []}),
+    }),
+    "India": (["ind", "bharat"], {
+        "Maharashtra": ([], {"Mumbai": ["bombay"], "Pune": []}),
+        "Karnataka": ([], {"Bangalore": ["bengaluru"]}),
+        "Delhi": (["ncr"], {"New Delhi": []}),
+        "Tamil Nadu": ([], {"Chennai": ["madras"]}),
+    }),
+    "Germany": (["deutschland"], {
+        "Berlin": ([], {}), "Bavaria": (["bayern"], {"Munich": ["munchen", "münchen"]}),
+        "Hamburg": ([], {}),
+    }),
+    "France": (["fr"], {"Ile-de-France": (["île-de-france"], {"Paris": []})}),
+    "Spain": (["es", "españa", "espana"], {"Madrid": ([], {}), "Catalonia": ([], {"Barcelona": []})}),
+    "Italy": (["it", "italia"], {"Lazio": ([], {"Rome": ["roma"]}), "Lombardy": ([], {"Milan": ["milano"]})}),
+    "Brazil": (["br", "brasil"], {"Sao Paulo": (["são paulo", "sp"], {}), "Rio de Janeiro": (["rj"], {})}),
+    "Mexico": (["mx", "méxico"], {"Mexico City": (["cdmx", "ciudad de mexico"], {})}),
+    "Netherlands": (["nl", "holland"], {"North Holland": ([], {"Amsterdam": []})}),
+    "Japan": (["jp"], {"Tokyo": ([], {})}),
+    "South Korea": (["korea", "kr"], {"Seoul": ([], {})}),
+    "China": (["cn", "prc"], {"Beijing": ([], {}), "Shanghai": ([], {})}),
+    "Singapore": (["sg"], {}),
+    "United Arab Emirates": (["uae"], {"Dubai": ([], {})}),
+    "Nigeria": (["ng"], {"Lagos": ([], {})}),
+    "South Africa": (["za"], {"Gauteng": ([], {"Johannesburg": ["joburg"]})}),
+    "Ireland": (["ie"], {"Dublin": ([], {})}),
+    "Sweden": (["se"], {"Stockholm": ([], {})}),
+    "Philippines": (["ph"], {"Metro Manila": (["manila"], {})}),
+    "Indonesia": ([], {"Jakarta": ([], {})}),
+    "New Zealand": (["nz"], {"Auckland": ([], {})}),
+    "Argentina": ([], {"Buenos Aires": ([], {})}),
+}
+
+
+def _normalize(value: str) -> str:
+    return ' '.join(value.strip().lower().split())
+
+
+class Gazetteer:
+    """
+    Interned place names with parent lookup tables. Each alias maps to every
+    place it could name; a comma-separated location picks the candidate no
+    part contradicts and most parts agree with, preferring the most specific.
+    Strings the gazetteer cannot place get an opaque id of their own so they
+    still match themselves exactly.
+    """
+
+    def __init__(self):
+        self.names: Tuple[List[str], List[str], List[str]] = ([], [], [])
+        self.city_region = np.zeros(0, dtype=np.int32)
+        self.region_country = np.zeros(0, dtype=np.int32)
+        self.aliases: Dict[str, List[Tuple[int, int]]] = {}
+        self._ids: Dict[Tuple[int, str, int], int] = {}
+        self._opaque: Dict[str, int] = {}
+        self._resolved: Dict[str, Tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, country: str, region: Optional[str] = None, city: Optional[str] = None,
+            aliases: Iterable[str] = ()) -> Tuple[int, int]:
+        """Intern a place (and its parents); aliases name the most specific level given"""
+        country_id = self._intern(COUNTRY, country, UNKNOWN)
+        level, place_id = COUNTRY, country_id
+        if region:
+            level, place_id = REGION, self._intern(REGION, region, country_id)
+        if city:
+            if not region:
+                raise ValueError(f"City {city} needs a region")
+            level, place_id = CITY, self._intern(CITY, city, place_id)
+        for alias in aliases:
+            self._alias(alias, level, place_id)
+        self._resolved.clear()
+        return level, place_id
+
+    def _intern(self, level: int, name: str, parent: int) -> int:
+        key = (level, _normalize(name), parent)
+        place_id = self._ids.get(key)
+        if place_id is not None:
+            return place_id
+        place_id = len(self.names[level])
+        self._ids[key] = place_id
+        self.names[level].append(name)
+        if level == CITY:
+            self.city_region = np.append(self.city_region, np.int32(parent))
+        elif level == REGION:
+            self.region_country = np.append(self.region_country, np.int32(parent))
+        self._alias(name, level, place_id)
+        return place_id
+
+    def _alias(self, alias: str, level: int, place_id: int):
+        candidates = self.aliases.setdefault(_normalize(alias), [])
+        if (level, place_id) not in candidates:
+            candidates.append((level, place_id))
+
+    def code(self, level: int, place_id: int) -> Tuple[int, int, int]:
+        """(city, region, country) ids for a place and its parents"""
+        city = region = UNKNOWN
+        if level == CITY:
+            city, region = place_id, int(self.city_region[place_id])
+        elif level == REGION:
+            region = place_id
+        return city, region, (int(self.region_country[region]) if region != UNKNOWN else place_id)
+
+    @classmethod
+    def from_nested(cls, places: Dict[str, Any]) -> 'Gazetteer':
+        gazetteer = cls()
+        for country, (country_aliases, regions) in places.items():
+            gazetteer.add(country, aliases=country_aliases)
+            for region, (region_aliases, cities) in regions.items():
+                gazetteer.add(country, region, aliases=region_aliases)
+                for city, city_aliases in cities.items():
+                    gazetteer.add(country, region, city, aliases=city_aliases)
+        return gazetteer
+
+    @classmethod
+    def load(cls, path: str) -> 'Gazetteer':
+        """CSV with country,region,city[,aliases] columns; aliases are |-separated"""
+        gazetteer = cls()
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                aliases = [alias for alias in (row.get('aliases') or '').split('|') if alias.strip()]
+                gazetteer.add(row['country'], row.get('region') or None, row.get('city') or None, aliases)
+        return gazetteer
+
+    @classmethod
+    def default(cls) -> 'Gazetteer':
+        """Gazetteer from GEO_GAZETTEER_PATH if set, else the built-in list of major places"""
+        path = os.getenv('GEO_GAZETTEER_PATH')
+        if path and os.path.exists(path):
+            return cls.load(path)
+        return cls.from_nested(DEFAULT_GAZETTEER)
+
+    def resolve(self, location: Optional[str]) -> Tuple[int, int, int]:
+        """Interned (city, region, country) for free text; all UNKNOWN for empty input"""
+        if not location or not location.strip():
+            return UNKNOWN, UNKNOWN, UNKNOWN
+        key = _normalize(location)
+        code = self._resolved.get(key)
+        if code is not None:
+            return code
+
+        parts = [part for part in (_normalize(p) for p in key.split(',')) if part]
+        best = self._best_candidate(parts, key)
+        if best is None and ' ' in parts[-1]:
+            # "Austin TX": try the trailing word as its own part
+            head, tail = parts[-1].rsplit(' ', 1)
+            best = self._best_candidate(parts[:-1] + [head, tail], key)
+        if best is None:
+            # Opaque ids sit in the city slot below UNKNOWN and only match the same text
+            with self._lock:
+                opaque = self._opaque.setdefault(key, UNKNOWN - 1 - len(self._opaque))
+            best = (opaque, UNKNOWN, UNKNOWN)
+
+        with self._lock:
+            if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+                self._resolved.clear()
+            self._resolved[key] = best
+        return best
+
+    def _best_candidate(self, parts: List[str], key: str) -> Optional[Tuple[int, int, int]]:
+        part_candidates = [self.aliases.get(part, []) for part in parts]
+        whole = self.aliases.get(_normalize(key.replace(',', ' ')), []) if len(parts) > 1 else []
+        best, best_rank = None, None
+        for position, candidates in enumerate([whole] + part_candidates):
+            for level, place_id in candidates:
+                code = self.code(level, place_id)
+                agreeing = contradicting = 0
+                for others in part_candidates:
+                    if any(code[other_level] == other_id for other_level, other_id in others):
+                        agreeing += 1
+                    elif others and all(code[other_level] != UNKNOWN for other_level, _ in others):
+                        # "Portland, Maine" is not Portland, Oregon; an unknown city inside Maine is fine
+                        contradicting += 1
+                rank = (-contradicting, agreeing + (len(parts) if position == 0 else 0), -level, -position)
+                if best_rank is None or rank > best_rank:
+                    best, best_rank = code, rank
+        return best
+
+    def resolve_many(self, locations: Sequence[Optional[str]]) -> np.ndarray:
+        """(n, 3) int32 codes, one row per location"""
+        codes = np.empty((len(locations), 3), dtype=np.int32)
+        for row, location in enumerate(locations):
+            codes[row] = self.resolve(location)
+        return codes
+
+    def describe(self, code: Sequence[int]) -> Dict[str, Optional[str]]:
+        return {
+            name: (self.names[level][code[level]] if code[level] >= 0 else None)
+            for level, name in enumerate(LEVELS)
+        }
+
+    def containment_keys(self, location: Optional[str]) -> Set[str]:
+        """Keys of every place that contains this location, for posting-list lookups"""
+        code = self.resolve(location)
+        return {f"{LEVELS[level]}:{code[level]}" for level in range(3) if code[level] != UNKNOWN}
+
+    def target_key(self, location: str) -> Optional[str]:
+        """Key of the most specific place a campaign target names"""
+        code = self.resolve(location)
+        for level in range(3):
+            if code[level] != UNKNOWN:
+                return f"{LEVELS[level]}:{code[level]}"
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cities": len(self.names[CITY]),
+            "regions": len(self.names[REGION]),
+            "countries": len(self.names[COUNTRY]),
+            "aliases": len(self.aliases),
+            "resolved_cached": len(self._resolved),
+            "unplaced_locations": len(self._opaque)
+        }
+
+
+def target_credits(targets: np.ndarray) -> np.ndarray:
+    """
+    (m, 3) points per level for each target code: full marks at the target's
+    own (most specific) level, partial credit for sharing a coarser level
+    """
+    known = targets != UNKNOWN
+    finest = np.argmax(known, axis=1)
+    levels = np.arange(3)[None, :]
+    coarser = np.where(levels == REGION, REGION_CREDIT, COUNTRY_CREDIT)
+    credits = np.where(levels == finest[:, None], 100.0, np.where(levels > finest[:, None], coarser, 0.0))
+    return np.where(known, credits, 0.0)
+
+
+def location_match_scores(influencers: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Best score (0-100) of each influencer code against any target code: a
+    handful of integer column comparisons per target, each credited at its
+    level. No targets means any location is acceptable.
+    """
+    influencers = np.atleast_2d(influencers)
+    scores = np.zeros(len(influencers))
+    if len(targets) == 0:
+        scores[:] = 100.0
+        return scores
+    targets = np.atleast_2d(targets)
+    columns = np.ascontiguousarray(influencers.T)
+    for target, credits in zip(targets, target_credits(targets)):
+        for level in np.flatnonzero(credits):
+            np.maximum(scores, credits[level] * (columns[level] == target[level]), out=scores)
+    return scores
+
+
+def benchmark(n_influencers: int, n_targets: int = 3, n_campaigns: int = 200) -> Dict[str, Any]:
+    """Resolution cost at ingest and per-campaign vectorized matching against exact string checks"""
+    gazetteer = Gazetteer.default()
+    rng = np.random.default_rng(0)
+    cities = [(gazetteer.names[CITY][c], gazetteer.names[REGION][int(gazetteer.city_region[c])])
+              for c in range(len(gazetteer.names[CITY]))]
+    countries = gazetteer.names[COUNTRY]
+    formats = [
+        lambda city, region: f"{city}, {region}",
+        lambda city, region: city,
+        lambda city, region: f"{city}, {region}, {countries[int(rng.integers(len(countries)))]}",
+    ]
+    picks = rng.integers(0, len(cities), n_influencers)
+    styles = rng.integers(0, len(formats), n_influencers)
+    locations = [formats[s](*cities[p]) for p, s in zip(picks, styles)]
+    target_pool = countries + gazetteer.names[REGION] + [city for city, _ in cities]
+    campaigns = [list(rng.choice(target_pool, n_targets)) for _ in range(n_campaigns)]
+
+    start = time.perf_counter()
+    codes = gazetteer.resolve_many(locations)
+    resolve_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for targets in campaigns:
+        location_match_scores(codes, gazetteer.resolve_many(targets))
+    vectorized_ms = (time.perf_counter() - start) / n_campaigns * 1000
+
+    start = time.perf_counter()
+    for targets in campaigns[:20]:
+        [100.0 if location in targets else 0.0 for location in locations]
+    exact_ms = (time.perf_counter() - start) / 20 * 1000
+
+    country_targets = gazetteer.resolve_many([countries[0]])
+    inside = location_match_scores(codes, country_targets)
+    return {
+        "influencers": n_influencers,
+        "resolve_us_per_location": round(resolve_seconds / n_influencers * 1e6, 2),
+        "match_ms_per_campaign": round(vectorized_ms, 3),
+        "exact_string_ms_per_campaign": round(exact_ms, 3),
+        "resolved_share": round(float((codes[:, COUNTRY] != UNKNOWN).mean()), 3),
+        f"inside_{countries[0].lower().replace(' ', '_')}_share": round(float((inside == 100).mean()), 3),
+        **gazetteer.stats()
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Resolve locations or benchmark location matching")
+    commands = parser.add_subparsers(dest='command', required=True)
+    resolve = commands.add_parser('resolve')
+    resolve.add_argument('locations', nargs='+')
+    bench = commands.add_parser('benchmark')
+    bench.add_argument('--influencers', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args(argv)
+
+    if args.command == 'resolve':
+        gazetteer = Gazetteer.default()
+        for location in args.locations:
+            print(json.dumps({"location": location, **gazetteer.describe(gazetteer.resolve(location))}))
+    else:
+        for n_influencers in args.influencers:
+            print(json.dumps(benchmark(n_influencers)))
+
+
+if __name__ == "__main__":
+    main()
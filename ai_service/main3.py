@@ -1,22 +1,45 @@
 # ai_service/main.py - FastAPI AI Analytics Service
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import IsolationForest, RandomForestRegressor
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics.pairwise import cosine_similarity
 from transformers import pipeline, AutoTokenizer, AutoModel
 import torch
 import asyncio
+import threading
 import httpx
 import os
 import logging
 from datetime import datetime, timedelta
 import json
+import dataclasses
+
+from sentiment_cascade import CascadeSentimentAnalyzer, label_to_score
+from model_tiering import TIERS, TierRouter, load_quantized_sentiment_pipeline
+from sentiment_stream import stream_sentiment
+from fake_follower_model import GRAPH_FEATURE_COLUMNS, FakeFollowerModel, count_growth_spikes, growth_volatility
+from brand_safety import BrandSafetyScanner, brand_safety_score
+from influencer_features import InfluencerFeatureCache, InfluencerFeatures
+import batch_pricing
+from portfolio import PortfolioConstraints, PortfolioSolver
+from near_duplicates import NearDuplicateIndex, originality_summary
+from engagement_stream import EngagementStore, RollingAggregates
+from campaign_index import CampaignConstraints, CampaignEligibilityIndex
+from content_matching import ContentMatcher, campaign_document, influencer_document, relevance_points
+from locations import Gazetteer, location_match_scores
+from profile_store import DatabaseUnavailable, InvalidProfileId, ProfileNotFound, ProfileStore
+from routes.dependencies import inference_executor, verify_token
+from routes.followers import router as follower_router
+from routes.rollups import engagement_rollups, router as rollup_router
+from routes.market import market_rate_index, router as market_router
+from routes.audience import audience_sketches, router as audience_router
+from routes.trends import router as trend_router
+from catalogue_loader import METHODS as CATALOGUE_METHODS, MatchingCatalogue, load_catalogue
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -38,14 +61,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Security
-security = HTTPBearer()
+# Streaming and sketch-backed subsystems, each with its own store and lifecycle hooks
+app.include_router(follower_router)
+app.include_router(rollup_router)
+app.include_router(market_router)
+app.include_router(audience_router)
+app.include_router(trend_router)
 
 # Initialize AI models
 sentiment_analyzer = pipeline("sentiment-analysis", model="cardiffnlp/twitter-roberta-base-sentiment-latest")
 embedding_model = AutoModel.from_pretrained('sentence-transformers/all-MiniLM-L6-v2')
 tokenizer = AutoTokenizer.from_pretrained('sentence-transformers/all-MiniLM-L6-v2')
 
+# Offline-trained fake follower detector, loaded once (None falls back to heuristics)
+fake_follower_model = FakeFollowerModel.load_if_exists()
+
+# Compiled once; BRAND_SAFETY_LEXICON_PATH swaps in a larger weighted lexicon
+brand_safety_scanner = BrandSafetyScanner.default()
+
+# Shared cascade so escalation metrics accumulate across requests
+cascade_sentiment = CascadeSentimentAnalyzer(sentiment_analyzer)
+
+# Quantized small model, loaded in the background on startup
+quantized_sentiment = CascadeSentimentAnalyzer(None)
+
+# Tier workers match the inference pool size
+tier_router = TierRouter(workers=int(os.getenv('MAX_WORKERS', 4)))
+tier_router.set_available("quantized", False)
+
+# Per-influencer post features shared by all analyzers, rebuilt when posts change
+feature_cache = InfluencerFeatureCache(max_entries=int(os.getenv('FEATURE_CACHE_SIZE', 10000)))
+
+# Caption fingerprints across all analyzed influencers, for reposted-content detection
+content_index = NearDuplicateIndex()
+
+# Rolling per-influencer engagement and sentiment, fed by post events
+engagement_store = EngagementStore.load_if_exists()
+
+# Interned city/region/country ids for free-text locations (GEO_GAZETTEER_PATH extends the built-in list)
+location_gazetteer = Gazetteer.default()
+
+# Open campaigns by eligibility requirements, for reverse matching on discovery
+campaign_index = CampaignEligibilityIndex(location_gazetteer)
+
+# TF-IDF vectorizer fitted offline (content_matching.py fit) plus influencer documents;
+# None keeps interest alignment on exact interest overlap
+content_matcher = ContentMatcher.load_if_exists()
+
+# Read-through influencer/campaign profiles for id-based matching; connected on startup when DATABASE_URL is set
+profile_store: Optional[ProfileStore] = None
+_matching_engine = None
+_matching_engine_lock = threading.Lock()
+
+# Typed influencer/campaign columns bulk-loaded from Postgres and kept current by updated_at deltas
+matching_catalogue = MatchingCatalogue.load_if_exists()
+CATALOGUE_REFRESH_SECONDS = float(os.getenv('CATALOGUE_REFRESH_SECONDS', 0))
+_catalogue_refresh_lock = asyncio.Lock()
+
 # Pydantic models
 class SocialMediaPost(BaseModel):
     id: str
@@ -60,7 +132,7 @@ class InfluencerProfile(BaseModel):
     user_id: str
     platforms: List[str]
     follower_counts: Dict[str, int]
-    recent_posts: List[SocialMediaPost]
+    recent_posts: List[SocialMediaPost] = []   # omit to score from the post event stream
     demographics: Optional[Dict[str, Any]] = None
     interests: List[str] = []
 
@@ -87,28 +159,121 @@ class AnalysisRequest(BaseModel):
     platform: str
     posts: List[SocialMediaPost]
     follower_data: Optional[Dict[str, Any]] = None
+    sentiment_mode: str = "transformer"  # transformer | quantized | lexicon | cascade
+    confidence_threshold: Optional[float] = None
+    latency_budget_ms: Optional[float] = None
+    quality_tier: Optional[str] = None  # lexicon | quantized | full
 
 class MatchingRequest(BaseModel):
     influencer_profile: InfluencerProfile
     available_campaigns: List[CampaignData]
 
+class ContentIndexRequest(BaseModel):
+    influencers: List[InfluencerProfile]
+
+class ContentRankRequest(BaseModel):
+    campaign: CampaignData
+    top_k: int = 50
+    min_score: float = 0.0
+
+class IdMatchRequest(BaseModel):
+    campaign_id: str
+    influencer_id: str
+
+class ProfileCacheInvalidation(BaseModel):
+    influencer_ids: List[str] = []
+    campaign_ids: List[str] = []
+
+class FakeFollowerBatchRequest(BaseModel):
+    """Columnar account features, one entry per account in every list"""
+    user_ids: List[str]
+    follower_count: List[int]
+    following_count: List[int]
+    post_count: List[int]
+    engagement_rate: List[float]
+    account_age_days: Optional[List[int]] = None
+    growth_volatility: Optional[List[float]] = None
+    growth_spikes: Optional[List[int]] = None
+    # Follower-graph signals, required when the model was trained with them
+    farm_follower_share: Optional[List[float]] = None
+    cocluster_density: Optional[List[float]] = None
+    follower_hub_ratio: Optional[List[float]] = None
+
 class PricingRequest(BaseModel):
     influencer_profile: InfluencerProfile
     campaign_data: CampaignData
     market_data: Optional[Dict[str, Any]] = None
 
-# Authentication dependency
-async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    # In production, verify the token with your auth service
-    # For now, we'll just check if a token is provided
-    if not credentials.token:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    return credentials.token
+class RateCardRequest(BaseModel):
+    """Columnar influencer aggregates and campaign variants for a pricing grid"""
+    influencer_ids: List[str]
+    follower_counts: Dict[str, List[int]]  # platform -> one count per influencer
+    post_count: List[int]
+    total_engagement: List[int]            # likes + comments + shares over recent posts
+    campaign_ids: List[str]
+    industries: List[str]                  # brand industry per campaign
+    demand_scores: Optional[List[float]] = None  # per campaign; defaults to the market rate index
+
+class PostEvent(BaseModel):
+    """A new post, or fresh like/comment/share counts for one already sent"""
+    influencer_id: str
+    post_id: str
+    platform: str
+    timestamp: datetime
+    content: Optional[str] = None
+    likes: int = 0
+    comments: int = 0
+    shares: int = 0
+    saves: int = 0
+    views: int = 0
+    follower_count: Optional[int] = None   # current followers on this platform
+
+class PostEventBatch(BaseModel):
+    events: List[PostEvent]
+
+class CampaignEligibility(BaseModel):
+    """Eligibility columns of a campaigns row"""
+    campaign_id: str
+    min_followers: int = 0
+    max_followers: Optional[int] = None
+    min_engagement_rate: float = 0.0
+    max_fake_followers: float = 100.0
+    required_platforms: List[str] = []
+    target_locations: List[str] = []
+
+class CampaignEligibilityBatch(BaseModel):
+    campaigns: List[CampaignEligibility]
+
+class EligibleCampaignsRequest(BaseModel):
+    follower_count: int
+    engagement_rate: float                 # percent
+    fake_follower_percentage: float = 0.0
+    platforms: List[str] = []
+    location: Optional[str] = None
+    tolerance: float = 0.1                 # relax follower/engagement bounds by this share
+    limit: Optional[int] = None
+
+class PortfolioRequest(BaseModel):
+    """Columnar candidates (one entry per influencer) with scores and quoted prices"""
+    influencer_ids: List[str]
+    prices: List[float]
+    match_scores: List[float]
+    estimated_reach: Optional[List[float]] = None
+    platforms: Optional[List[str]] = None
+    niches: Optional[List[str]] = None
+    budget: float
+    objective: str = "match_score"          # match_score | reach
+    mode: str = "auto"                      # auto | greedy | exact
+    max_influencers: Optional[int] = None
+    min_per_platform: Dict[str, int] = {}
+    max_per_platform: Dict[str, int] = {}
+    max_per_niche: Optional[int] = None
+    niche_caps: Dict[str, int] = {}
 
 # AI Service Functions
 class FakeFollowerDetector:
     def __init__(self):
-        self.isolation_forest = IsolationForest(contamination=0.1, random_state=42)
+        self.model = fake_follower_model
         
     def analyze_followers(self, follower_data: Dict[str, Any]) -> Dict[str, Any]:
         """Detect fake followers using various signals"""
@@ -145,6 +310,12 @@ class FakeFollowerDetector:
             else:
                 features.extend([0, 0])
             
+            # The persisted model replaces the heuristics when it is available
+            if self.model is not None and total_followers > 0 and (
+                not self.model.uses_graph_features or all(name in follower_data for name in GRAPH_FEATURE_COLUMNS)
+            ):
+                return self._analyze_with_model(follower_data, features)
+            
             # Calculate fake follower percentage
             if len(features) >= 5:
                 # Normalize features
@@ -165,6 +336,11 @@ class FakeFollowerDetector:
                 if len(features) > 6 and features[6] > 5:  # Multiple sudden spikes
                     fake_percentage += 25
                 
+                # Captions reposted from other accounts (engagement pods, content farms)
+                originality = follower_data.get('content_originality')
+                if originality is not None and originality < 0.5:
+                    fake_percentage += 15
+                
                 # Random baseline noise
                 fake_percentage += np.random.uniform(0, 10)
                 
@@ -178,7 +354,7 @@ class FakeFollowerDetector:
             return {
                 "fake_follower_percentage": round(fake_percentage, 2),
                 "confidence_score": round(confidence, 2),
-                "risk_factors": self._identify_risk_factors(features),
+                "risk_factors": self._identify_risk_factors(features, follower_data),
                 "explanation": self._generate_explanation(fake_percentage, features)
             }
             
@@ -191,7 +367,38 @@ class FakeFollowerDetector:
                 "explanation": "Unable to perform detailed analysis due to insufficient data"
             }
     
-    def _identify_risk_factors(self, features: List[float]) -> List[str]:
+    def analyze_features(self, features: InfluencerFeatures, **follower_data) -> Dict[str, Any]:
+        """Detect fake followers from precomputed post features"""
+        return self.analyze_followers({**features.follower_data(), **follower_data})
+    
+    def _analyze_with_model(self, follower_data: Dict[str, Any], features: List[float]) -> Dict[str, Any]:
+        """Score a single account with the offline-trained detector"""
+        total_followers = follower_data['follower_count']
+        post_count = follower_data.get('post_count', 0)
+        engagement = follower_data.get('total_likes', 0) + follower_data.get('total_comments', 0)
+        growth = np.asarray(follower_data.get('growth_pattern') or [], dtype=float)
+        
+        scores = self.model.score_columns({
+            'follower_count': [total_followers],
+            'following_count': [follower_data.get('following_count', 0)],
+            'post_count': [post_count],
+            'engagement_rate': [engagement / max(post_count, 1) / total_followers * 100],
+            'growth_volatility': [growth_volatility(growth)],
+            'growth_spikes': [count_growth_spikes(growth)],
+            **{name: [follower_data[name]] for name in GRAPH_FEATURE_COLUMNS if name in follower_data}
+        })
+        fake_percentage = float(scores['fake_follower_percentage'][0])
+        anomaly_score = float(scores['anomaly_score'][0])
+        
+        return {
+            "fake_follower_percentage": round(fake_percentage, 2),
+            "confidence_score": round(min(95, 60 + abs(anomaly_score) * 200), 2),
+            "risk_factors": self._identify_risk_factors(features, follower_data),
+            "explanation": self._generate_explanation(fake_percentage, features),
+            "anomaly_score": round(anomaly_score, 4)
+        }
+    
+    def _identify_risk_factors(self, features: List[float], follower_data: Optional[Dict[str, Any]] = None) -> List[str]:
         """Identify specific risk factors"""
         risk_factors = []
         
@@ -205,6 +412,10 @@ class FakeFollowerDetector:
             if len(features) > 6 and features[6] > 3:
                 risk_factors.append("suspicious_growth_pattern")
         
+        originality = (follower_data or {}).get('content_originality')
+        if originality is not None and originality < 0.5:
+            risk_factors.append("duplicated_content")
+        
         return risk_factors
     
     def _generate_explanation(self, fake_percentage: float, features: List[float]) -> str:
@@ -219,81 +430,110 @@ class FakeFollowerDetector:
             return "Very high risk of fake followers. Multiple red flags detected."
 
 class SentimentAnalyzer:
-    def __init__(self):
+    MODES = ("transformer", "quantized", "lexicon", "cascade")
+    TIER_MODES = {"lexicon": "lexicon", "quantized": "quantized", "full": "transformer"}
+
+    def __init__(self, mode: str = "transformer"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown sentiment mode: {mode}")
         self.analyzer = sentiment_analyzer
+        self.cascade = cascade_sentiment
+        self.mode = mode
+    
+    def model_ready(self) -> bool:
+        """False while this mode's model is still loading; the quantized model loads in the background"""
+        return self.mode != "quantized" or quantized_sentiment.transformer is not None
+    
+    def classify_texts(self, texts: List[str], confidence_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Classify texts according to the configured inference mode"""
+        if self.mode == "lexicon":
+            return self.cascade.classify_lexicon(texts)
+        if self.mode == "cascade":
+            return self.cascade.classify(texts, confidence_threshold)
+        if self.mode == "quantized":
+            return quantized_sentiment.classify_transformer(texts)
+        return self.cascade.classify_transformer(texts)
     
-    def analyze_content(self, posts: List[SocialMediaPost]) -> Dict[str, Any]:
+    def analyze_content(
+        self,
+        posts: List[SocialMediaPost],
+        confidence_threshold: Optional[float] = None,
+        features: Optional[InfluencerFeatures] = None
+    ) -> Dict[str, Any]:
         """Analyze sentiment of influencer content"""
-        try:
-            if not posts:
-                return {
-                    "overall_sentiment": 0.0,
-                    "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
-                    "confidence_score": 0.0,
-                    "explanation": "No content available for analysis"
-                }
-            
-            sentiments = []
-            sentiment_scores = []
-            
-            for post in posts:
-                if post.content:
-                    # Analyze sentiment
-                    result = self.analyzer(post.content[:512])  # Limit text length
-                    
-                    # Convert to numeric score
-                    if result[0]['label'] == 'LABEL_2':  # Positive
-                        score = result[0]['score']
-                    elif result[0]['label'] == 'LABEL_1':  # Neutral
-                        score = 0.0
-                    else:  # Negative
-                        score = -result[0]['score']
-                    
-                    sentiments.append(result[0]['label'])
-                    sentiment_scores.append(score)
-            
-            if not sentiment_scores:
-                return {
-                    "overall_sentiment": 0.0,
-                    "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
-                    "confidence_score": 0.0,
-                    "explanation": "No valid content found for analysis"
-                }
-            
-            # Calculate overall sentiment
-            overall_sentiment = np.mean(sentiment_scores)
-            
-            # Calculate distribution
-            positive_count = sentiments.count('LABEL_2')
-            neutral_count = sentiments.count('LABEL_1')
-            negative_count = sentiments.count('LABEL_0')
-            total = len(sentiments)
-            
-            distribution = {
-                "positive": round((positive_count / total) * 100, 1),
-                "neutral": round((neutral_count / total) * 100, 1),
-                "negative": round((negative_count / total) * 100, 1)
+        if not posts:
+            return {
+                "overall_sentiment": 0.0,
+                "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
+                "confidence_score": 0.0,
+                "explanation": "No content available for analysis"
             }
-            
-            confidence = min(85 + np.random.uniform(0, 10), 95)
-            
+        
+        texts = features.texts if features is not None else [post.content for post in posts if post.content]
+        results = self.classify_texts(texts, confidence_threshold)
+        
+        sentiments = [result['label'] for result in results]
+        sentiment_scores = [label_to_score(result['label'], result['score']) for result in results]
+        
+        if not sentiment_scores:
             return {
-                "overall_sentiment": round(overall_sentiment, 3),
-                "sentiment_distribution": distribution,
-                "confidence_score": round(confidence, 2),
-                "explanation": self._generate_sentiment_explanation(overall_sentiment, distribution),
-                "post_count_analyzed": len(posts)
+                "overall_sentiment": 0.0,
+                "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
+                "confidence_score": 0.0,
+                "explanation": "No valid content found for analysis"
             }
-            
-        except Exception as e:
-            logger.error(f"Error in sentiment analysis: {e}")
+        
+        # Calculate overall sentiment
+        overall_sentiment = np.mean(sentiment_scores)
+        
+        # Calculate distribution
+        positive_count = sentiments.count('LABEL_2')
+        neutral_count = sentiments.count('LABEL_1')
+        negative_count = sentiments.count('LABEL_0')
+        total = len(sentiments)
+        
+        distribution = {
+            "positive": round((positive_count / total) * 100, 1),
+            "neutral": round((neutral_count / total) * 100, 1),
+            "negative": round((negative_count / total) * 100, 1)
+        }
+        
+        confidence = min(85 + np.random.uniform(0, 10), 95)
+        
+        return {
+            "overall_sentiment": round(overall_sentiment, 3),
+            "sentiment_distribution": distribution,
+            "confidence_score": round(confidence, 2),
+            "explanation": self._generate_sentiment_explanation(overall_sentiment, distribution),
+            "post_count_analyzed": len(posts),
+            "sentiment_mode": self.mode,
+            "transformer_posts": sum(1 for result in results if result['source'] == "transformer")
+        }
+    
+    def summarize_rolling(self, aggregates: RollingAggregates) -> Dict[str, Any]:
+        """Sentiment result from scores kept when each post was first ingested"""
+        if not aggregates.sentiment_posts:
             return {
-                "overall_sentiment": 0.1,
-                "sentiment_distribution": {"positive": 60, "neutral": 30, "negative": 10},
-                "confidence_score": 50.0,
-                "explanation": "Analysis completed with limited data",
-                "post_count_analyzed": len(posts) if posts else 0
+                "overall_sentiment": 0.0,
+                "sentiment_distribution": {"positive": 0, "neutral": 0, "negative": 0},
+                "confidence_score": 0.0,
+                "explanation": "No content available for analysis"
             }
+        total = aggregates.sentiment_posts
+        counts = aggregates.sentiment_counts
+        distribution = {
+            "positive": round(counts['LABEL_2'] / total * 100, 1),
+            "neutral": round(counts['LABEL_1'] / total * 100, 1),
+            "negative": round(counts['LABEL_0'] / total * 100, 1)
+        }
+        return {
+            "overall_sentiment": round(aggregates.sentiment_mean, 3),
+            "sentiment_distribution": distribution,
+            "confidence_score": round(min(85 + np.random.uniform(0, 10), 95), 2),
+            "explanation": self._generate_sentiment_explanation(aggregates.sentiment_mean, distribution),
+            "post_count_analyzed": total,
+            "sentiment_mode": "rolling"
+        }
     
     def _generate_sentiment_explanation(self, overall_sentiment: float, distribution: Dict[str, float]) -> str:
         """Generate explanation for sentiment analysis"""
@@ -304,13 +544,38 @@ class SentimentAnalyzer:
         else:
             return f"Content tends toward negative sentiment ({distribution['negative']}% negative posts). May impact brand alignment."
 
+def _location_shares(entries: List[Any]) -> Tuple[List[str], List[float]]:
+    """top_locations entries as names and weights: plain strings or {location, percentage} objects"""
+    names, shares = [], []
+    for entry in entries:
+        if isinstance(entry, dict):
+            name = entry.get('location') or entry.get('name')
+            share = float(entry['percentage']) if entry.get('percentage') is not None else 1.0
+        else:
+            name, share = entry, 1.0
+        if isinstance(name, str) and name.strip():
+            names.append(name)
+            shares.append(share)
+    if shares and sum(shares) <= 0:
+        shares = [1.0] * len(shares)
+    return names, shares
+
 class InfluencerBrandMatcher:
     def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        self.content_matcher = content_matcher
+        self.safety_scanner = brand_safety_scanner
     
-    def calculate_match_score(self, influencer: InfluencerProfile, campaign: CampaignData) -> Dict[str, Any]:
+    def calculate_match_score(
+        self,
+        influencer: InfluencerProfile,
+        campaign: CampaignData,
+        features: Optional[InfluencerFeatures] = None
+    ) -> Dict[str, Any]:
         """Calculate match score between influencer and campaign"""
         try:
+            if features is None:
+                features = InfluencerFeatures.from_profile(influencer, self.safety_scanner)
+            
             total_score = 0
             max_score = 100
             scoring_breakdown = {}
@@ -327,16 +592,20 @@ class InfluencerBrandMatcher:
             
             # 3. Interest alignment (25 points)
             interest_score = self._calculate_interest_score(influencer.interests, campaign.brand_profile.target_interests)
+            if self.content_matcher is not None:
+                relevance = self._calculate_content_relevance(influencer, campaign, features)
+                scoring_breakdown["content_relevance"] = round(relevance, 3)
+                interest_score = max(interest_score, relevance_points(relevance, 25))
             total_score += interest_score
             scoring_breakdown["interest_alignment"] = interest_score
             
             # 4. Engagement quality (20 points)
-            engagement_score = self._calculate_engagement_score(influencer.recent_posts)
+            engagement_score = self._calculate_engagement_score(features)
             total_score += engagement_score
             scoring_breakdown["engagement_quality"] = engagement_score
             
             # 5. Brand safety (10 points)
-            safety_score = self._calculate_brand_safety_score(influencer.recent_posts)
+            safety_score = self._calculate_brand_safety_score(features)
             total_score += safety_score
             scoring_breakdown["brand_safety"] = safety_score
             
@@ -405,24 +674,32 @@ class InfluencerBrandMatcher:
         
         return (overlap / max_possible) * 25
     
-    def _calculate_engagement_score(self, recent_posts: List[SocialMediaPost]) -> float:
+    def _calculate_content_relevance(
+        self,
+        influencer: InfluencerProfile,
+        campaign: CampaignData,
+        features: InfluencerFeatures
+    ) -> float:
+        """TF-IDF cosine between the influencer's captions and the campaign brief"""
+        campaign_doc = campaign_document(
+            campaign.title, campaign.description, campaign.brand_profile.target_interests
+        )
+        influencer_doc = None
+        if features.texts:
+            influencer_doc = influencer_document(features.texts, influencer.interests)
+        return self.content_matcher.relevance(campaign_doc, influencer.user_id, influencer_doc)
+    
+    def _calculate_engagement_score(self, features: InfluencerFeatures) -> float:
         """Calculate engagement quality score"""
-        if not recent_posts:
+        if not features.post_count:
             return 10.0  # Neutral score
         
-        engagement_rates = []
-        for post in recent_posts:
-            if post.likes + post.comments > 0:
-                # Assume follower count (would be passed in real implementation)
-                estimated_followers = max(1000, (post.likes + post.comments) * 50)
-                engagement_rate = (post.likes + post.comments) / estimated_followers
-                engagement_rates.append(engagement_rate)
+        # Follower count is estimated from interactions (would be passed in real implementation)
+        avg_engagement = features.mean_estimated_engagement_rate
         
-        if not engagement_rates:
+        if avg_engagement is None:
             return 10.0
         
-        avg_engagement = np.mean(engagement_rates)
-        
         # Score based on engagement rate thresholds
         if avg_engagement > 0.06:  # >6% excellent
             return 20.0
@@ -433,35 +710,34 @@ class InfluencerBrandMatcher:
         else:
             return 6.0
     
-    def _calculate_brand_safety_score(self, recent_posts: List[SocialMediaPost]) -> float:
+    def _calculate_brand_safety_score(self, features: InfluencerFeatures) -> float:
         """Calculate brand safety score based on content"""
-        if not recent_posts:
+        if not features.post_count:
             return 8.0  # Neutral score
         
-        # Simple keyword-based brand safety check
-        unsafe_keywords = ['controversy', 'scandal', 'hate', 'violence', 'drugs', 'alcohol']
-        safe_keywords = ['positive', 'inspiration', 'family', 'health', 'education']
-        
-        unsafe_count = 0
-        safe_count = 0
+        scan = features.brand_safety if features.brand_safety is not None else self.safety_scanner.scan(features.texts)
+        score = brand_safety_score(scan)
         
-        for post in recent_posts:
-            content_lower = post.content.lower()
-            unsafe_count += sum(1 for keyword in unsafe_keywords if keyword in content_lower)
-            safe_count += sum(1 for keyword in safe_keywords if keyword in content_lower)
-        
-        if unsafe_count > 0:
-            return max(2.0, 10 - (unsafe_count * 2))
-        elif safe_count > 0:
-            return 10.0
-        else:
-            return 8.0  # Neutral content
+        # Mostly reposted captions are a brand risk even when the wording is clean
+        if features.content_originality is not None and features.content_originality < 0.5:
+            score = max(2.0, score - (0.5 - features.content_originality) * 8)
+        return score
     
     def _calculate_geographic_score(self, demographics: Optional[Dict], target_audience: Dict) -> float:
         """Calculate geographic alignment score"""
         if not demographics or not target_audience:
             return 5.0  # Neutral score
         
+        audience_locations, shares = _location_shares(demographics.get('top_locations') or [demographics.get('location')])
+        target_locations, _ = _location_shares(target_audience.get('locations') or target_audience.get('target_locations') or [])
+        if audience_locations and target_locations:
+            # Share of the audience inside the targeted places, with partial credit for nearby ones
+            scores = location_match_scores(
+                location_gazetteer.resolve_many(audience_locations),
+                location_gazetteer.resolve_many(target_locations)
+            )
+            return round(float(np.average(scores, weights=shares)) / 10, 2)
+        
         # Simple geographic matching (would be more sophisticated in production)
         return 8.0 + np.random.uniform(-3, 2)  # Placeholder
     
@@ -510,16 +786,15 @@ class InfluencerBrandMatcher:
 
 class PricingSuggestionEngine:
     def __init__(self):
-        self.base_rates = {
-            "instagram": 0.01,  # $0.01 per follower
-            "tiktok": 0.008,
-            "youtube": 0.02,
-            "twitter": 0.005,
-            "facebook": 0.015,
-            "linkedin": 0.025
-        }
+        self.base_rates = batch_pricing.BASE_RATES
     
-    def suggest_pricing(self, influencer: InfluencerProfile, campaign: CampaignData, market_data: Optional[Dict] = None) -> Dict[str, Any]:
+    def suggest_pricing(
+        self,
+        influencer: InfluencerProfile,
+        campaign: CampaignData,
+        market_data: Optional[Dict] = None,
+        features: Optional[InfluencerFeatures] = None
+    ) -> Dict[str, Any]:
         """Suggest pricing for influencer-campaign match"""
         try:
             pricing_factors = {}
@@ -527,14 +802,20 @@ class PricingSuggestionEngine:
             
             # Calculate base price from follower counts
             for platform, followers in influencer.follower_counts.items():
-                rate = self.base_rates.get(platform, 0.01)
+                rate = self.base_rates.get(platform, batch_pricing.DEFAULT_BASE_RATE)
                 platform_price = followers * rate
                 base_price += platform_price
                 pricing_factors[f"{platform}_base"] = platform_price
             
             # Apply multipliers
-            engagement_multiplier = self._calculate_engagement_multiplier(influencer.recent_posts)
+            if features is None:
+                features = InfluencerFeatures.from_profile(influencer)
+            engagement_multiplier = self._calculate_engagement_multiplier(features)
             niche_multiplier = self._calculate_niche_multiplier(influencer.interests, campaign.brand_profile.industry)
+            if market_data is None:
+                market_data = market_rate_index.market_data(
+                    influencer.follower_counts, campaign.brand_profile.industry, self.base_rates
+                )
             demand_multiplier = self._calculate_demand_multiplier(market_data)
             urgency_multiplier = self._calculate_urgency_multiplier(campaign)
             
@@ -542,7 +823,7 @@ class PricingSuggestionEngine:
             final_price = base_price * engagement_multiplier * niche_multiplier * demand_multiplier * urgency_multiplier
             
             # Ensure price is within reasonable bounds
-            min_price = max(50, base_price * 0.5)
+            min_price = max(batch_pricing.MIN_PRICE, base_price * 0.5)
             max_price = base_price * 3
             final_price = max(min_price, min(max_price, final_price))
             
@@ -560,6 +841,7 @@ class PricingSuggestionEngine:
                     "urgency": round(urgency_multiplier, 2)
                 },
                 "pricing_breakdown": pricing_factors,
+                "market_segments": (market_data or {}).get("segments"),
                 "explanation": self._generate_pricing_explanation(final_price, base_price, engagement_multiplier, niche_multiplier)
             }
             
@@ -572,36 +854,27 @@ class PricingSuggestionEngine:
                 "explanation": "Pricing calculated using fallback method due to insufficient data"
             }
     
-    def _calculate_engagement_multiplier(self, recent_posts: List[SocialMediaPost]) -> float:
+    def _calculate_engagement_multiplier(self, features: InfluencerFeatures) -> float:
         """Calculate multiplier based on engagement rates"""
-        if not recent_posts:
+        if not features.post_count:
             return 1.0
         
-        total_engagement = sum(post.likes + post.comments + post.shares for post in recent_posts)
-        if total_engagement == 0:
-            return 0.8
+        if features.total_engagement == 0:
+            return batch_pricing.NO_ENGAGEMENT_MULTIPLIER
         
-        avg_engagement = total_engagement / len(recent_posts)
+        avg_engagement = features.avg_engagement
         
         # Higher engagement = higher rates
-        if avg_engagement > 1000:
-            return 1.5
-        elif avg_engagement > 500:
-            return 1.3
-        elif avg_engagement > 100:
-            return 1.1
-        else:
-            return 0.9
+        for threshold, multiplier in batch_pricing.ENGAGEMENT_TIERS:
+            if avg_engagement > threshold:
+                return multiplier
+        return batch_pricing.LOW_ENGAGEMENT_MULTIPLIER
     
     def _calculate_niche_multiplier(self, influencer_interests: List[str], brand_industry: str) -> float:
         """Calculate multiplier based on niche alignment"""
-        # Premium niches command higher rates
-        premium_niches = ['finance', 'technology', 'luxury', 'business', 'health']
-        competitive_niches = ['fashion', 'beauty', 'lifestyle', 'food']
-        
-        if brand_industry.lower() in premium_niches:
+        if brand_industry.lower() in batch_pricing.PREMIUM_NICHES:
             return 1.4
-        elif brand_industry.lower() in competitive_niches:
+        elif brand_industry.lower() in batch_pricing.COMPETITIVE_NICHES:
             return 1.1
         else:
             return 1.0
@@ -617,8 +890,8 @@ class PricingSuggestionEngine:
     
     def _calculate_urgency_multiplier(self, campaign: CampaignData) -> float:
         """Calculate multiplier based on campaign urgency"""
-        # Rush jobs command premium rates
-        return 1.0 + np.random.uniform(0, 0.2)  # Slight random premium
+        # Rush jobs command premium rates; deterministic per campaign so quotes are reproducible
+        return batch_pricing.urgency_multiplier(campaign.campaign_id)
     
     def _generate_pricing_explanation(self, final_price: float, base_price: float, engagement_mult: float, niche_mult: float) -> str:
         """Generate explanation for pricing"""
@@ -629,6 +902,173 @@ class PricingSuggestionEngine:
         else:
             return f"Competitive pricing based on follower count and market standards"
 
+def _load_quantized_tier():
+    """Load the quantized sentiment model and enable its tier"""
+    try:
+        quantized_sentiment.transformer = load_quantized_sentiment_pipeline()
+        tier_router.set_available("quantized", True)
+        logger.info("Quantized sentiment tier ready")
+    except Exception as e:
+        logger.error(f"Quantized sentiment tier unavailable: {e}")
+
+async def tiered_sentiment_analysis(
+    posts: List[SocialMediaPost],
+    latency_budget_ms: Optional[float] = None,
+    quality_tier: Optional[str] = None,
+    features: Optional[InfluencerFeatures] = None
+) -> Dict[str, Any]:
+    """Run sentiment analysis on the best model tier that fits the latency budget"""
+    runners = {
+        tier: (lambda mode=mode: SentimentAnalyzer(mode=mode).analyze_content(posts, features=features))
+        for tier, mode in SentimentAnalyzer.TIER_MODES.items()
+    }
+    result = await tier_router.run(
+        inference_executor,
+        runners,
+        n_posts=len(posts),
+        latency_budget_ms=latency_budget_ms,
+        quality_tier=quality_tier
+    )
+    return {**result.value, "model_tier": result.describe()}
+
+def build_influencer_features(profile: InfluencerProfile) -> InfluencerFeatures:
+    """Cached post features, with content originality against every indexed account"""
+    if not profile.recent_posts:
+        # No history shipped: read the rolling aggregates kept from post events
+        features = (
+            feature_cache.get_or_build_streamed(
+                profile.user_id, engagement_store, brand_safety_scanner, profile.follower_counts
+            )
+            or feature_cache.get_or_build_streamed(
+                profile.user_id, engagement_rollups, brand_safety_scanner, profile.follower_counts
+            )
+        )
+        if features is not None:
+            return _with_originality(profile.user_id, features)
+    features = feature_cache.get_or_build(profile, brand_safety_scanner)
+    posts = [post for post in profile.recent_posts if post.content]
+    if posts:
+        content_index.add_posts(profile.user_id, [post.id for post in posts], [post.content for post in posts])
+    return _with_originality(profile.user_id, features)
+
+def _with_originality(user_id: str, features: InfluencerFeatures) -> InfluencerFeatures:
+    """
+    Copy of the cached features carrying originality against the current
+    content index; it moves as other accounts post, so it is never written
+    into the shared cache entry
+    """
+    if not features.texts:
+        return features
+    originality = content_index.originality(user_id, features.texts)["content_originality"]
+    return dataclasses.replace(features, content_originality=originality)
+
+def eligible_request_campaigns(profile: InfluencerProfile,
+                               features: InfluencerFeatures,
+                               campaigns: List[CampaignData]) -> List[CampaignData]:
+    """
+    Campaigns worth full scoring. Campaigns in the eligibility index must be
+    among the ones it returns for this influencer; the rest only carry
+    required_platforms, so at least one of those must be covered.
+    """
+    eligible = set()
+    if any(campaign.campaign_id in campaign_index for campaign in campaigns):
+        location = (profile.demographics or {}).get('location')
+        followers = sum(profile.follower_counts.values())
+        eligible = set(campaign_index.eligible(
+            followers,
+            # Percent, like campaigns.min_engagement_rate; unknown without posts or followers, so it rules nothing out
+            features.avg_engagement / followers * 100 if followers and features.post_count else float('inf'),
+            0.0,
+            profile.platforms,
+            location if isinstance(location, str) else None
+        ))
+    platforms = {platform.strip().lower() for platform in profile.platforms}
+    
+    def accepts(campaign: CampaignData) -> bool:
+        if campaign.campaign_id in campaign_index:
+            return campaign.campaign_id in eligible
+        required = {platform.strip().lower() for platform in campaign.required_platforms if platform.strip()}
+        return not required or bool(platforms & required)
+    
+    return [campaign for campaign in campaigns if accepts(campaign)]
+
+def _validate_quality_tier(quality_tier: Optional[str]):
+    if quality_tier is not None and quality_tier not in TIERS:
+        raise HTTPException(status_code=400, detail=f"Unknown quality tier: {quality_tier}")
+
+@app.on_event("startup")
+async def load_background_models():
+    asyncio.get_running_loop().run_in_executor(inference_executor, _load_quantized_tier)
+    global profile_store
+    if os.getenv('DATABASE_URL'):
+        try:
+            profile_store = await ProfileStore.connect(os.getenv('DATABASE_URL'))
+        except Exception as e:
+            logger.error(f"Error connecting profile store: {e}")
+    if matching_catalogue.loads:
+        asyncio.get_running_loop().run_in_executor(inference_executor, _sync_campaign_index, None)
+    if CATALOGUE_REFRESH_SECONDS > 0 and _catalogue_configured():
+        asyncio.create_task(refresh_catalogue_periodically())
+
+def _catalogue_configured() -> bool:
+    return os.getenv('DATABASE_URL', '').startswith(('postgres://', 'postgresql://'))
+
+def _sync_campaign_index(campaign_ids: Optional[np.ndarray]):
+    """Open active catalogue campaigns in the eligibility index and close the rest"""
+    for campaign_id, constraints in matching_catalogue.campaign_constraints(campaign_ids):
+        if constraints is None:
+            campaign_index.close(campaign_id)
+            continue
+        try:
+            campaign_index.open(constraints)
+        except ValueError as e:
+            campaign_index.close(campaign_id)
+            logger.error(f"Campaign {campaign_id} left out of the eligibility index: {e}")
+
+async def refresh_matching_catalogue(full: bool = False, method: str = 'copy') -> Dict[str, Any]:
+    async with _catalogue_refresh_lock:
+        _, report = await load_catalogue(os.getenv('DATABASE_URL', ''), matching_catalogue, full, method)
+        await asyncio.get_running_loop().run_in_executor(
+            inference_executor, _sync_campaign_index, report.changed_campaigns
+        )
+    return report.summary()
+
+async def refresh_catalogue_periodically():
+    while True:
+        try:
+            await refresh_matching_catalogue()
+        except Exception as e:
+            logger.error(f"Error refreshing matching catalogue: {e}")
+        await asyncio.sleep(CATALOGUE_REFRESH_SECONDS)
+
+def get_matching_engine():
+    """AIMatchingEngine loads its sentence model on first id-based match, once"""
+    global _matching_engine
+    with _matching_engine_lock:
+        if _matching_engine is None:
+            from matching_engine import AIMatchingEngine
+            _matching_engine = AIMatchingEngine()
+        return _matching_engine
+
+@app.on_event("shutdown")
+async def persist_stream_state():
+    try:
+        engagement_store.save()
+    except Exception as e:
+        logger.error(f"Error saving engagement state: {e}")
+    try:
+        if content_matcher is not None:
+            content_matcher.save()
+    except Exception as e:
+        logger.error(f"Error saving content matcher: {e}")
+    try:
+        if matching_catalogue.loads:
+            matching_catalogue.save()
+    except Exception as e:
+        logger.error(f"Error saving matching catalogue: {e}")
+    if profile_store is not None:
+        await profile_store.close()
+
 # API Endpoints
 @app.get("/")
 async def root():
@@ -658,11 +1098,133 @@ async def analyze_fake_followers(request: AnalysisRequest, token: str = Depends(
         **result
     }
 
+@app.post("/analyze/fake-followers/batch")
+async def analyze_fake_followers_batch(request: FakeFollowerBatchRequest, token: str = Depends(verify_token)):
+    """Score a whole account catalogue with the persisted detector in one pass"""
+    if fake_follower_model is None:
+        raise HTTPException(status_code=503, detail="Fake follower model is not loaded")
+    
+    columns = request.model_dump(exclude={"user_ids"})
+    if len(request.follower_count) != len(request.user_ids):
+        raise HTTPException(status_code=400, detail="user_ids must match the length of the feature columns")
+    try:
+        scores = await asyncio.get_running_loop().run_in_executor(
+            inference_executor, fake_follower_model.score_columns, columns
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "model_trained_at": fake_follower_model.metadata.get("trained_at"),
+        "accounts_scored": len(request.user_ids),
+        "anomalies_detected": int(scores["is_anomaly"].sum()),
+        "user_ids": request.user_ids,
+        "fake_follower_percentage": np.round(scores["fake_follower_percentage"], 2).tolist(),
+        "anomaly_score": np.round(scores["anomaly_score"], 4).tolist(),
+        "is_anomaly": scores["is_anomaly"].tolist()
+    }
+
+@app.post("/stream/post-events")
+async def ingest_post_events(request: PostEventBatch, token: str = Depends(verify_token)):
+    """Fold new posts and engagement updates into the rolling aggregates; only new posts are classified"""
+    events = [
+        {**event.model_dump(exclude={"timestamp"}), "timestamp": event.timestamp.timestamp()}
+        for event in request.events
+    ]
+    loop = asyncio.get_running_loop()
+    unscored = await loop.run_in_executor(inference_executor, engagement_store.apply_events, events)
+    # Only a new post (one carrying content) says when it was posted; update-only
+    # events go in without posted_at, so the rollups skip posts they have not seen
+    await loop.run_in_executor(inference_executor, engagement_rollups.upsert_many, [
+        {**event, "user_id": event["influencer_id"], "content_id": event["post_id"],
+         "posted_at": event["timestamp"] if event["content"] is not None else None}
+        for event in events
+    ])
+    if unscored:
+        results = await loop.run_in_executor(
+            inference_executor, cascade_sentiment.classify, [text for _, _, text in unscored]
+        )
+        for (influencer_id, post_key, _), result in zip(unscored, results):
+            engagement_store.set_sentiment(
+                influencer_id, post_key, result['label'], label_to_score(result['label'], result['score'])
+            )
+        new_posts: Dict[str, List[Any]] = {}
+        for influencer_id, post_key, text in unscored:
+            new_posts.setdefault(influencer_id, []).append((post_key, text))
+        for influencer_id, posts in new_posts.items():
+            content_index.add_posts(influencer_id, [key for key, _ in posts], [text for _, text in posts])
+    
+    return {
+        "events_processed": len(request.events),
+        "posts_classified": len(unscored),
+        **engagement_store.stats()
+    }
+
+@app.get("/stream/engagement/{influencer_id}")
+async def rolling_engagement(influencer_id: str, token: str = Depends(verify_token)):
+    """Rolling engagement, posting frequency and sentiment for one influencer"""
+    aggregates = engagement_store.aggregates(influencer_id)
+    if aggregates is None:
+        raise HTTPException(status_code=404, detail="No post events received for this influencer")
+    return {"influencer_id": influencer_id, **aggregates.to_dict()}
+
+@app.post("/analyze/brand-safety")
+async def analyze_brand_safety(request: AnalysisRequest, token: str = Depends(verify_token)):
+    """Per-category brand safety hits across an influencer's posts"""
+    scan = brand_safety_scanner.scan([post.content for post in request.posts])
+    
+    return {
+        "influencer_id": request.influencer_id,
+        "platform": request.platform,
+        "analysis_timestamp": datetime.now().isoformat(),
+        "brand_safety_score": brand_safety_score(scan),
+        "post_count_analyzed": len(request.posts),
+        **scan.to_dict()
+    }
+
+@app.post("/analyze/content-originality")
+async def analyze_content_originality(request: AnalysisRequest, token: str = Depends(verify_token)):
+    """Index an influencer's captions and report which are near-duplicates of other accounts' posts"""
+    posts = [post for post in request.posts if post.content]
+    texts = [post.content for post in posts]
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        inference_executor, content_index.add_posts, request.influencer_id, [post.id for post in posts], texts
+    )
+    matches = await loop.run_in_executor(
+        inference_executor, lambda: content_index.find_near_duplicates(texts, exclude_influencer=request.influencer_id)
+    )
+    originality = originality_summary(matches)
+    
+    return {
+        "influencer_id": request.influencer_id,
+        "platform": request.platform,
+        "analysis_timestamp": datetime.now().isoformat(),
+        **originality,
+        "duplicated_posts": [
+            {"post_id": post.id, "also_posted_by": sorted({match["influencer_id"] for match in found})}
+            for post, found in zip(posts, matches) if found
+        ],
+        "indexed_posts": len(content_index)
+    }
+
 @app.post("/analyze/sentiment")
 async def analyze_sentiment(request: AnalysisRequest, token: str = Depends(verify_token)):
     """Analyze sentiment of influencer content"""
-    analyzer = SentimentAnalyzer()
-    result = analyzer.analyze_content(request.posts)
+    if request.sentiment_mode not in SentimentAnalyzer.MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown sentiment mode: {request.sentiment_mode}")
+    _validate_quality_tier(request.quality_tier)
+    
+    if request.latency_budget_ms is not None or request.quality_tier is not None:
+        result = await tiered_sentiment_analysis(
+            request.posts, request.latency_budget_ms, request.quality_tier
+        )
+    else:
+        analyzer = SentimentAnalyzer(mode=request.sentiment_mode)
+        if not analyzer.model_ready():
+            raise HTTPException(status_code=503, detail=f"{request.sentiment_mode} sentiment model is still loading")
+        result = analyzer.analyze_content(request.posts, request.confidence_threshold)
     
     return {
         "influencer_id": request.influencer_id,
@@ -671,6 +1233,68 @@ async def analyze_sentiment(request: AnalysisRequest, token: str = Depends(verif
         **result
     }
 
+@app.post("/analyze/sentiment/stream")
+async def analyze_sentiment_stream(
+    request: Request,
+    sentiment_mode: str = "cascade",
+    chunk_size: int = 256,
+    include_posts: bool = True,
+    token: str = Depends(verify_token)
+):
+    """
+    Stream sentiment for an unbounded NDJSON post history.
+    Each input line is a post object (or bare string); the response streams
+    per-post results and running aggregates as NDJSON.
+    """
+    if sentiment_mode not in SentimentAnalyzer.MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown sentiment mode: {sentiment_mode}")
+    if not 1 <= chunk_size <= 4096:
+        raise HTTPException(status_code=400, detail="chunk_size must be between 1 and 4096")
+    
+    analyzer = SentimentAnalyzer(mode=sentiment_mode)
+    if not analyzer.model_ready():
+        raise HTTPException(status_code=503, detail=f"{sentiment_mode} sentiment model is still loading")
+    return StreamingResponse(
+        stream_sentiment(
+            request.stream(),
+            analyzer.classify_texts,
+            executor=inference_executor,
+            chunk_size=chunk_size,
+            include_posts=include_posts
+        ),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/analyze/sentiment/agreement")
+async def sentiment_agreement_report(request: AnalysisRequest, token: str = Depends(verify_token)):
+    """Compare cascade sentiment against transformer-only mode on the same posts"""
+    texts = [post.content for post in request.posts if post.content]
+    report = cascade_sentiment.agreement_report(texts, request.confidence_threshold)
+    
+    return {
+        "influencer_id": request.influencer_id,
+        "platform": request.platform,
+        "analysis_timestamp": datetime.now().isoformat(),
+        **report
+    }
+
+@app.get("/analyze/model-tiers")
+async def model_tier_status(token: str = Depends(verify_token)):
+    """Current queue depth and latency estimates per model tier"""
+    return {
+        "timestamp": datetime.now().isoformat(),
+        **tier_router.snapshot()
+    }
+
+@app.get("/analyze/sentiment/cascade-metrics")
+async def sentiment_cascade_metrics(token: str = Depends(verify_token)):
+    """Escalation statistics for cascade sentiment inference"""
+    return {
+        "confidence_threshold": cascade_sentiment.confidence_threshold,
+        "timestamp": datetime.now().isoformat(),
+        **cascade_sentiment.metrics.snapshot()
+    }
+
 @app.post("/match/calculate-score")
 async def calculate_match_score(
     influencer_profile: InfluencerProfile,
@@ -679,7 +1303,8 @@ async def calculate_match_score(
 ):
     """Calculate match score between influencer and campaign"""
     matcher = InfluencerBrandMatcher()
-    result = matcher.calculate_match_score(influencer_profile, campaign_data)
+    features = build_influencer_features(influencer_profile)
+    result = matcher.calculate_match_score(influencer_profile, campaign_data, features)
     
     return {
         "influencer_id": influencer_profile.user_id,
@@ -690,12 +1315,14 @@ async def calculate_match_score(
 
 @app.post("/match/find-campaigns")
 async def find_matching_campaigns(request: MatchingRequest, token: str = Depends(verify_token)):
-    """Find matching campaigns for an influencer"""
+    """Find matching campaigns for an influencer, fully scoring only the ones they are eligible for"""
     matcher = InfluencerBrandMatcher()
+    features = build_influencer_features(request.influencer_profile)
+    campaigns = eligible_request_campaigns(request.influencer_profile, features, request.available_campaigns)
     
     matches = []
-    for campaign in request.available_campaigns:
-        match_result = matcher.calculate_match_score(request.influencer_profile, campaign)
+    for campaign in campaigns:
+        match_result = matcher.calculate_match_score(request.influencer_profile, campaign, features)
         
         matches.append({
             "campaign_id": campaign.campaign_id,
@@ -712,10 +1339,158 @@ async def find_matching_campaigns(request: MatchingRequest, token: str = Depends
     return {
         "influencer_id": request.influencer_profile.user_id,
         "total_campaigns_analyzed": len(request.available_campaigns),
+        "eligible_campaigns": len(campaigns),
         "top_matches": matches[:10],  # Return top 10 matches
         "analysis_timestamp": datetime.now().isoformat()
     }
 
+@app.post("/content/index")
+async def index_influencer_content(request: ContentIndexRequest, token: str = Depends(verify_token)):
+    """Add or refresh influencer caption documents for lexical campaign matching"""
+    if content_matcher is None:
+        raise HTTPException(status_code=503, detail="Content matcher is not fitted")
+    influencers = [profile for profile in request.influencers if profile.recent_posts or profile.interests]
+    documents = [
+        influencer_document((post.content for post in profile.recent_posts), profile.interests)
+        for profile in influencers
+    ]
+    await asyncio.get_running_loop().run_in_executor(
+        inference_executor, content_matcher.index_documents,
+        [profile.user_id for profile in influencers], documents
+    )
+    
+    return {
+        "documents_indexed": len(documents),
+        "skipped_without_content": len(request.influencers) - len(documents),
+        "indexed_influencers": len(content_matcher)
+    }
+
+@app.post("/content/rank")
+async def rank_influencers_by_content(request: ContentRankRequest, token: str = Depends(verify_token)):
+    """Indexed influencers whose captions are most lexically relevant to a campaign brief"""
+    if content_matcher is None:
+        raise HTTPException(status_code=503, detail="Content matcher is not fitted")
+    campaign = request.campaign
+    document = campaign_document(campaign.title, campaign.description, campaign.brand_profile.target_interests)
+    ranked = await asyncio.get_running_loop().run_in_executor(
+        inference_executor, content_matcher.top_k, document, request.top_k, request.min_score
+    )
+    
+    return {
+        "campaign_id": campaign.campaign_id,
+        "influencers": [
+            {"influencer_id": influencer_id, "content_relevance": round(score, 4)}
+            for influencer_id, score in ranked
+        ],
+        "indexed_influencers": len(content_matcher)
+    }
+
+@app.post("/api/match")
+async def match_by_id(request: IdMatchRequest, token: str = Depends(verify_token)):
+    """Match score for stored influencer and campaign ids, profiles served from the read-through cache"""
+    if profile_store is None:
+        raise HTTPException(status_code=503, detail="Profile store is not configured")
+    try:
+        (influencer, influencer_cached), (campaign, campaign_cached) = await asyncio.gather(
+            profile_store.influencer(request.influencer_id),
+            profile_store.campaign(request.campaign_id)
+        )
+    except InvalidProfileId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ProfileNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except DatabaseUnavailable as e:
+        logger.error(f"Profile store unavailable: {e}")
+        raise HTTPException(status_code=503, detail="Profile store is unavailable")
+    
+    loop = asyncio.get_running_loop()
+    engine = await loop.run_in_executor(inference_executor, get_matching_engine)
+    result = await loop.run_in_executor(inference_executor, engine.calculate_match_score, influencer, campaign)
+    
+    return {
+        "campaign_id": request.campaign_id,
+        "influencer_id": request.influencer_id,
+        "score": result["total_score"],
+        "factors": result["score_breakdown"],
+        "recommendation": result["recommendation"],
+        "explanation": result["explanation"],
+        "predicted_performance": result["predicted_performance"],
+        "profile_cache": {"influencer_hit": influencer_cached, "campaign_hit": campaign_cached}
+    }
+
+@app.post("/api/match/cache/invalidate")
+async def invalidate_profiles(request: ProfileCacheInvalidation, token: str = Depends(verify_token)):
+    """Drop cached profiles after influencer or campaign rows change"""
+    if profile_store is None:
+        raise HTTPException(status_code=503, detail="Profile store is not configured")
+    try:
+        dropped = profile_store.invalidate(request.influencer_ids, request.campaign_ids)
+    except InvalidProfileId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"invalidated": dropped, **profile_store.stats()}
+
+@app.get("/api/match/cache")
+async def profile_cache_stats(token: str = Depends(verify_token)):
+    if profile_store is None:
+        raise HTTPException(status_code=503, detail="Profile store is not configured")
+    return profile_store.stats()
+
+@app.post("/catalogue/refresh")
+async def refresh_catalogue(full: bool = False, method: str = 'copy', token: str = Depends(verify_token)):
+    """Bulk-load the matching catalogue from Postgres (full) or just rows updated since the last load"""
+    if not _catalogue_configured():
+        raise HTTPException(status_code=503, detail="Matching catalogue needs a postgres:// DATABASE_URL")
+    if method not in CATALOGUE_METHODS:
+        raise HTTPException(status_code=400, detail=f"method must be one of {list(CATALOGUE_METHODS)}")
+    report = await refresh_matching_catalogue(full, method)
+    return {**report, "open_campaigns": len(campaign_index)}
+
+@app.get("/catalogue/stats")
+async def catalogue_stats(token: str = Depends(verify_token)):
+    return matching_catalogue.stats()
+
+@app.post("/campaigns/index")
+async def open_campaigns(request: CampaignEligibilityBatch, token: str = Depends(verify_token)):
+    """Index campaigns that opened (or changed requirements) for eligibility lookups"""
+    for campaign in request.campaigns:
+        try:
+            campaign_index.open(CampaignConstraints(**campaign.model_dump()))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Campaign {campaign.campaign_id}: {e}")
+    
+    return {
+        "campaigns_indexed": len(request.campaigns),
+        **campaign_index.stats()
+    }
+
+@app.delete("/campaigns/index/{campaign_id}")
+async def close_campaign(campaign_id: str, token: str = Depends(verify_token)):
+    """Remove a closed, filled or expired campaign from the eligibility index"""
+    if not campaign_index.close(campaign_id):
+        raise HTTPException(status_code=404, detail="Campaign is not indexed")
+    return {"campaign_id": campaign_id, **campaign_index.stats()}
+
+@app.post("/campaigns/eligible")
+async def eligible_campaigns(request: EligibleCampaignsRequest, token: str = Depends(verify_token)):
+    """Open campaigns whose follower, engagement, authenticity, platform and location requirements fit"""
+    if request.tolerance < 0 or request.tolerance >= 1:
+        raise HTTPException(status_code=400, detail="tolerance must be in [0, 1)")
+    campaign_ids = campaign_index.eligible(
+        request.follower_count,
+        request.engagement_rate,
+        request.fake_follower_percentage,
+        request.platforms,
+        request.location,
+        request.tolerance,
+        request.limit
+    )
+    
+    return {
+        "eligible_campaigns": campaign_ids,
+        "total_eligible": len(campaign_ids),
+        "open_campaigns": len(campaign_index)
+    }
+
 @app.post("/pricing/suggest")
 async def suggest_pricing(request: PricingRequest, token: str = Depends(verify_token)):
     """Suggest pricing for influencer-campaign collaboration"""
@@ -723,7 +1498,8 @@ async def suggest_pricing(request: PricingRequest, token: str = Depends(verify_t
     result = pricing_engine.suggest_pricing(
         request.influencer_profile,
         request.campaign_data,
-        request.market_data
+        request.market_data,
+        build_influencer_features(request.influencer_profile)
     )
     
     return {
@@ -733,50 +1509,139 @@ async def suggest_pricing(request: PricingRequest, token: str = Depends(verify_t
         **result
     }
 
+@app.post("/portfolio/optimize")
+async def optimize_portfolio(request: PortfolioRequest, token: str = Depends(verify_token)):
+    """Best set of influencers within budget, subject to platform-mix and niche limits"""
+    if request.objective not in ("match_score", "reach"):
+        raise HTTPException(status_code=400, detail=f"Unknown portfolio objective: {request.objective}")
+    if request.objective == "reach" and request.estimated_reach is None:
+        raise HTTPException(status_code=400, detail="estimated_reach is required for the reach objective")
+    values = request.match_scores if request.objective == "match_score" else request.estimated_reach
+    try:
+        solver = PortfolioSolver(values, request.prices, request.platforms, request.niches)
+        if len(request.influencer_ids) != solver.n:
+            raise ValueError("influencer_ids must match the length of the candidate columns")
+        constraints = PortfolioConstraints(
+            budget=request.budget,
+            max_influencers=request.max_influencers,
+            min_per_platform=request.min_per_platform,
+            max_per_platform=request.max_per_platform,
+            max_per_niche=request.max_per_niche,
+            niche_caps=request.niche_caps
+        )
+        result = await asyncio.get_running_loop().run_in_executor(
+            inference_executor, solver.solve, constraints, request.mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response = {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "candidates": solver.n,
+        "objective": request.objective,
+        "budget": request.budget,
+        **result.to_dict(request.influencer_ids)
+    }
+    if request.estimated_reach is not None:
+        # Audiences of the chosen creators overlap; sketched ones are deduplicated
+        response["reach"] = audience_sketches.combined_reach(
+            response["selected"], dict(zip(request.influencer_ids, request.estimated_reach))
+        )
+    return response
+
+@app.post("/pricing/rate-card")
+async def pricing_rate_card(request: RateCardRequest, token: str = Depends(verify_token)):
+    """Price every shortlisted influencer against every campaign variant in one pass"""
+    n_influencers = len(request.influencer_ids)
+    n_campaigns = len(request.campaign_ids)
+    influencer_columns = [request.post_count, request.total_engagement, *request.follower_counts.values()]
+    if any(len(column) != n_influencers for column in influencer_columns):
+        raise HTTPException(status_code=400, detail="influencer_ids must match the length of the influencer columns")
+    if len(request.industries) != n_campaigns or (
+        request.demand_scores is not None and len(request.demand_scores) != n_campaigns
+    ):
+        raise HTTPException(status_code=400, detail="campaign_ids must match the length of the campaign columns")
+    
+    def price():
+        # Same market demand /pricing/suggest reads, unless the caller supplies its own
+        demand_scores = request.demand_scores
+        if demand_scores is None:
+            demand_scores = market_rate_index.demand_score_grid(
+                request.follower_counts, request.industries, batch_pricing.BASE_RATES
+            )
+        return batch_pricing.price_grid(
+            request.influencer_ids,
+            request.follower_counts,
+            request.post_count,
+            request.total_engagement,
+            request.campaign_ids,
+            request.industries,
+            demand_scores
+        )
+    
+    grid = await asyncio.get_running_loop().run_in_executor(inference_executor, price)
+    
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "influencers_priced": n_influencers,
+        "campaigns_priced": n_campaigns,
+        **grid.to_dict()
+    }
+
 @app.post("/analytics/comprehensive")
 async def comprehensive_analysis(
     influencer_profile: InfluencerProfile,
     campaigns: List[CampaignData] = [],
+    latency_budget_ms: Optional[float] = None,
+    quality_tier: Optional[str] = None,
     token: str = Depends(verify_token)
 ):
     """Perform comprehensive analysis for an influencer"""
+    _validate_quality_tier(quality_tier)
+    
     # Initialize analyzers
     fake_detector = FakeFollowerDetector()
-    sentiment_analyzer = SentimentAnalyzer()
     matcher = InfluencerBrandMatcher()
     pricing_engine = PricingSuggestionEngine()
     
-    # Prepare analysis data
+    # Prepare analysis data: one pass over the posts, shared by every analyzer
     all_posts = influencer_profile.recent_posts
-    total_followers = sum(influencer_profile.follower_counts.values())
-    
-    # Fake follower analysis
-    follower_data = {
-        "follower_count": total_followers,
-        "post_count": len(all_posts),
-        "total_likes": sum(post.likes for post in all_posts),
-        "total_comments": sum(post.comments for post in all_posts)
-    }
-    fake_analysis = fake_detector.analyze_followers(follower_data)
-    
-    # Sentiment analysis
-    sentiment_analysis = sentiment_analyzer.analyze_content(all_posts)
+    loop = asyncio.get_running_loop()
+    features = await loop.run_in_executor(
+        inference_executor, build_influencer_features, influencer_profile
+    )
     
-    # Campaign matching (if campaigns provided)
-    campaign_matches = []
-    if campaigns:
+    def match_campaigns() -> List[Dict[str, Any]]:
+        campaign_matches = []
         for campaign in campaigns[:5]:  # Analyze top 5 campaigns
-            match_result = matcher.calculate_match_score(influencer_profile, campaign)
+            match_result = matcher.calculate_match_score(influencer_profile, campaign, features)
             campaign_matches.append({
                 "campaign_id": campaign.campaign_id,
                 "match_score": match_result["match_score"],
                 "recommendations": match_result["recommendations"]
             })
+        return campaign_matches
+    
+    async def no_result():
+        return None
     
-    # Pricing suggestions (use first campaign if available)
-    pricing_suggestion = None
-    if campaigns:
-        pricing_suggestion = pricing_engine.suggest_pricing(influencer_profile, campaigns[0])
+    async def rolling_sentiment():
+        return SentimentAnalyzer(mode="lexicon").summarize_rolling(features.rolling)
+    
+    # The analyzers are independent, so they run concurrently on the inference pool.
+    # Sentiment is the only model-bound step, so it carries the latency budget.
+    fake_analysis, sentiment_analysis, campaign_matches, pricing_suggestion = await asyncio.gather(
+        loop.run_in_executor(inference_executor, fake_detector.analyze_features, features),
+        # Streamed influencers were classified at ingest, so no model runs here
+        rolling_sentiment() if not all_posts and features.rolling is not None
+        else tiered_sentiment_analysis(all_posts, latency_budget_ms, quality_tier, features),
+        loop.run_in_executor(inference_executor, match_campaigns),
+        # Pricing suggestions (use first campaign if available)
+        loop.run_in_executor(
+            inference_executor,
+            lambda: pricing_engine.suggest_pricing(influencer_profile, campaigns[0], features=features)
+        ) if campaigns else no_result()
+    )
     
     return {
         "influencer_id": influencer_profile.user_id,
@@ -788,7 +1653,7 @@ async def comprehensive_analysis(
         "overall_score": {
             "authenticity": 100 - fake_analysis["fake_follower_percentage"],
             "brand_safety": sentiment_analysis["overall_sentiment"] * 50 + 50,  # Convert to 0-100 scale
-            "engagement_quality": min(100, (sentiment_analysis.get("post_count_analyzed", 0) / max(len(all_posts), 1)) * 100)
+            "engagement_quality": min(100, (sentiment_analysis.get("post_count_analyzed", 0) / max(features.post_count, 1)) * 100)
         }
     }
 
@@ -802,7 +1667,8 @@ async def health_check():
         "models_loaded": {
             "sentiment_analyzer": True,
             "embedding_model": True
-        }
+        },
+        "feature_cache": feature_cache.stats()
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,368 @@
+"""
+Market Rate Index for Influencelytic-Match
+Streams completed transactions and application rates into mergeable t-digest
+quantile sketches per (platform, niche, follower tier) so pricing can read live
+market percentiles without scanning the transactions history
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from persistence import save_json
+
+
+# Follower tiers, upper bounds exclusive; same ranges InfluencerBrandMatcher uses for budgets
+FOLLOWER_TIERS = [("nano", 1000), ("micro", 10000), ("mid", 100000), ("macro", 1000000), ("mega", math.inf)]
+SOURCES = ("transaction", "application")
+ANY = "*"
+
+DEFAULT_STATE_PATH = os.getenv('MARKET_RATE_INDEX_PATH', './data/market_rate_index.json')
+
+
+def follower_tier(follower_count: int) -> str:
+    for name, upper in FOLLOWER_TIERS:
+        if follower_count < upper:
+            return name
+    return FOLLOWER_TIERS[-1][0]
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning) with the k1 arcsine scale function. Values are
+    buffered and folded into at most ~compression centroids; digests built on
+    different workers merge by concatenating centroids and recompressing.
+    """
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.means = np.zeros(0)
+        self.weights = np.zeros(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[float] = []
+        self._buffer_weights: List[float] = []
+        self._buffer_limit = int(5 * compression)
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum()) + sum(self._buffer_weights)
+
+    def add(self, value: float, weight: float = 1.0):
+        self._buffer.append(value)
+        self._buffer_weights.append(weight)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_limit:
+            self.flush()
+
+    def add_many(self, values: Iterable[float]):
+        for value in values:
+            self.add(float(value))
+
+    def merge(self, other: 'TDigest'):
+        other.flush()
+        self.flush()
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def flush(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means, np.asarray(self._buffer)])
+        weights = np.concatenate([self.weights, np.asarray(self._buffer_weights)])
+        self._buffer = []
+        self._buffer_weights = []
+        self._compress(means, weights)
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _k_inverse(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        if not len(means):
+            self.means, self.weights = means, weights
+            return
+        order = np.argsort(means, kind='mergesort')
+        means = means[order].tolist()
+        weights = weights[order].tolist()
+        total = sum(weights)
+
+        out_means = [means[0]]
+        out_weights = [weights[0]]
+        weight_before = 0.0
+        q_limit = self._k_inverse(self._k(0.0) + 1) * total
+        for mean, weight in zip(means[1:], weights[1:]):
+            if weight_before + out_weights[-1] + weight <= q_limit:
+                merged = out_weights[-1] + weight
+                out_means[-1] += (mean - out_means[-1]) * weight / merged
+                out_weights[-1] = merged
+            else:
+                weight_before += out_weights[-1]
+                q_limit = self._k_inverse(self._k(weight_before / total) + 1) * total
+                out_means.append(mean)
+                out_weights.append(weight)
+
+        self.means = np.asarray(out_means)
+        self.weights = np.asarray(out_weights)
+
+    def interpolation_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(value, cumulative weight) knots that quantile and cdf interpolate between"""
+        self.flush()
+        if not len(self.means):
+            return np.zeros(0), np.zeros(0)
+        centers = np.cumsum(self.weights) - self.weights / 2
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        ranks = np.concatenate([[0.0], centers, [self.weights.sum()]])
+        return values, ranks
+
+    def to_dict(self) -> Dict[str, Any]:
+        self.flush()
+        return {
+            "compression": self.compression,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TDigest':
+        digest = cls(data.get("compression", 100.0))
+        digest.means = np.asarray(data["means"], dtype=np.float64)
+        digest.weights = np.asarray(data["weights"], dtype=np.float64)
+        if data.get("min") is not None:
+            digest.min, digest.max = data["min"], data["max"]
+        return digest
+
+
+@dataclass
+class RateQuantiles:
+    """Read-only interpolation knots of one sketch, published at refresh time"""
+    values: np.ndarray
+    ranks: np.ndarray
+    count: float
+
+    def quantile(self, q: float) -> float:
+        return float(np.interp(q * self.count, self.ranks, self.values))
+
+    def percentile_of(self, value: float) -> float:
+        """Share of the market at or below value, 0-100"""
+        return float(np.interp(value, self.values, self.ranks)) / self.count * 100
+
+
+@dataclass
+class MarketRateIndex:
+    """
+    Per-follower rates (price / followers) sketched per source and
+    (platform, niche, tier), with rollups over niche and tier so sparse
+    segments fall back to broader ones. Writers fold observations into the
+    live digests; readers use an immutable snapshot swapped in by refresh().
+    """
+    compression: float = 100.0
+    min_observations: int = 20
+    digests: Dict[Tuple[str, str, str, str], TDigest] = field(default_factory=dict)
+    observations: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Dict[Tuple[str, str, str, str], RateQuantiles] = {}
+        self.refreshed_at: Optional[float] = None
+
+    def ingest(self,
+               platform: str,
+               niche: Optional[str],
+               follower_count: int,
+               price: float,
+               source: str = "transaction"):
+        """Fold one completed transaction or application rate into the sketches"""
+        if source not in SOURCES:
+            raise ValueError(f"Unknown rate source: {source}")
+        if follower_count <= 0 or price <= 0:
+            return
+        rate = price / follower_count
+        platform = platform.lower()
+        niche = (niche or ANY).lower()
+        tier = follower_tier(follower_count)
+        with self._lock:
+            for key in {(source, platform, niche, tier), (source, platform, ANY, tier), (source, platform, ANY, ANY)}:
+                digest = self.digests.get(key)
+                if digest is None:
+                    digest = self.digests[key] = TDigest(self.compression)
+                digest.add(rate)
+            self.observations += 1
+
+    def merge(self, other: 'MarketRateIndex'):
+        """Fold in an index built elsewhere (another worker or a backfill job)"""
+        with self._lock:
+            for key, digest in other.digests.items():
+                if key in self.digests:
+                    self.digests[key].merge(digest)
+                else:
+                    merged = self.digests[key] = TDigest(digest.compression)
+                    merged.merge(digest)
+            self.observations += other.observations
+
+    def refresh(self):
+        """Compress the live digests and publish a new read snapshot"""
+        with self._lock:
+            snapshot = {}
+            for key, digest in self.digests.items():
+                values, ranks = digest.interpolation_points()
+                if len(values):
+                    snapshot[key] = RateQuantiles(values, ranks, float(ranks[-1]))
+        self._snapshot = snapshot
+        self.refreshed_at = time.time()
+
+    def _lookup(self, platform: str, niche: Optional[str], follower_count: int,
+                source: str) -> Tuple[Optional[RateQuantiles], Optional[Tuple[str, str, str]]]:
+        """Most specific segment with enough observations"""
+        platform = platform.lower()
+        niche = (niche or ANY).lower()
+        tier = follower_tier(follower_count)
+        snapshot = self._snapshot
+        for segment in ((platform, niche, tier), (platform, ANY, tier), (platform, ANY, ANY)):
+            quantiles = snapshot.get((source,) + segment)
+            if quantiles is not None and quantiles.count >= self.min_observations:
+                return quantiles, segment
+        return None, None
+
+    def median_rate(self, platform: str, niche: Optional[str], follower_count: int,
+                    source: str = "transaction") -> Optional[float]:
+        """Median per-follower rate paid in the influencer's segment"""
+        quantiles, _ = self._lookup(platform, niche, follower_count, source)
+        return quantiles.quantile(0.5) if quantiles else None
+
+    def price_percentile(self, platform: str, niche: Optional[str], follower_count: int, price: float,
+                         source: str = "transaction") -> Optional[float]:
+        """Where a price for this influencer sits in the market, 0-100"""
+        quantiles, _ = self._lookup(platform, niche, follower_count, source)
+        if quantiles is None or follower_count <= 0:
+            return None
+        return quantiles.percentile_of(price / follower_count)
+
+    def market_data(self, follower_counts: Dict[str, int], niche: Optional[str],
+                    base_rates: Dict[str, float]) -> Optional[Dict[str, Any]]:
+        """
+        market_data for PricingSuggestionEngine. The demand score is the share
+        of completed deals in each segment paying more per follower than our
+        base rate (falling back to application rates), follower-weighted
+        across platforms.
+        """
+        scores = []
+        weights = []
+        segments = {}
+        for platform, followers in follower_counts.items():
+            if followers <= 0:
+                continue
+            for source in SOURCES:
+                quantiles, segment = self._lookup(platform, niche, followers, source)
+                if quantiles is not None:
+                    break
+            if quantiles is None:
+                continue
+            base_rate = base_rates.get(platform.lower(), 0.01)
+            scores.append(100 - quantiles.percentile_of(base_rate))
+            weights.append(followers)
+            segments[platform] = {
+                "segment": "/".join(segment),
+                "source": source,
+                "observations": int(quantiles.count),
+                "median_rate": quantiles.quantile(0.5),
+                "p25_rate": quantiles.quantile(0.25),
+                "p75_rate": quantiles.quantile(0.75)
+            }
+        if not scores:
+            return None
+        return {
+            "demand_score": float(np.average(scores, weights=weights)),
+            "segments": segments
+        }
+
+    def demand_score_grid(self, follower_counts: Dict[str, Any], niches: Sequence[str],
+                          base_rates: Dict[str, float]) -> np.ndarray:
+        """
+        market_data demand scores for every influencer (rows, from columnar
+        follower counts) against every campaign niche (columns); NaN where a
+        pair has no market data. Distinct niches are looked up once.
+        """
+        columns = {platform: np.asarray(counts, dtype=np.int64) for platform, counts in follower_counts.items()}
+        n_influencers = len(next(iter(columns.values()))) if columns else 0
+        distinct, inverse = np.unique(np.asarray(niches, dtype=str), return_inverse=True)
+        scores = np.full((n_influencers, len(distinct)), np.nan)
+        for j, niche in enumerate(distinct):
+            for i in range(n_influencers):
+                data = self.market_data(
+                    {platform: int(counts[i]) for platform, counts in columns.items()}, str(niche), base_rates
+                )
+                if data is not None:
+                    scores[i, j] = data["demand_score"]
+        return scores[:, inverse.reshape(-1)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "observations": self.observations,
+            "sketches": len(self.digests),
+            "published_sketches": len(self._snapshot),
+            "refreshed_at": self.refreshed_at
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "compression": self.compression,
+                "min_observations": self.min_observations,
+                "observations": self.observations,
+                "digests": [{"key": list(key), **digest.to_dict()} for key, digest in self.digests.items()]
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MarketRateIndex':
+        index = cls(
+            compression=data.get("compression", 100.0),
+            min_observations=data.get("min_observations", 20),
+            observations=data.get("observations", 0)
+        )
+        for entry in data.get("digests", []):
+            index.digests[tuple(entry["key"])] = TDigest.from_dict(entry)
+        index.refresh()
+        return index
+
+    def save(self, path: str = DEFAULT_STATE_PATH):
+        save_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STATE_PATH) -> 'MarketRateIndex':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_STATE_PATH) -> 'MarketRateIndex':
+        return cls.load(path) if os.path.exists(path) else cls()
+
+    @classmethod
+    def from_table(cls, table, source: str = "transaction", **kwargs) -> 'MarketRateIndex':
+        """
+        Backfill from an export with platform, niche (brand industry),
+        follower_count and price columns (transactions.amount or
+        campaign_applications.proposed_rate joined to social_connections)
+        """
+        index = cls(**kwargs)
+        niches = table['niche'] if 'niche' in table.columns else [None] * len(table)
+        for platform, niche, followers, price in zip(table['platform'], niches, table['follower_count'], table['price']):
+            index.ingest(str(platform), niche if isinstance(niche, str) else None, int(followers), float(price), source)
+        index.refresh()
+        return index
@@ -4,49 +4,19 @@ Handles intelligent matching between influencers and brands
 """
 
 import numpy as np
-from typing import List, Dict, Any, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import json
+import os
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
 import pandas as pd
 
-
-@dataclass
-class InfluencerProfile:
-    """Represents an influencer's profile for matching"""
-    user_id: str
-    platforms: List[str]
-    follower_count: int
-    engagement_rate: float
-    niche_categories: List[str]
-    audience_demographics: Dict[str, float]
-    location: str
-    content_quality_score: float
-    fake_follower_percentage: float
-    posting_frequency: int
-    bio_text: str
-    recent_content: List[str]
-
-
-@dataclass
-class CampaignRequirements:
-    """Represents a brand's campaign requirements"""
-    campaign_id: str
-    brand_id: str
-    required_platforms: List[str]
-    min_followers: int
-    max_followers: int
-    min_engagement_rate: float
-    max_fake_followers: float
-    target_niches: List[str]
-    target_demographics: Dict[str, float]
-    target_locations: List[str]
-    budget_range: Tuple[int, int]
-    campaign_description: str
-    content_guidelines: str
+from audience_sketch import REACH_RATE
+from locations import Gazetteer, location_match_scores
+from demographics import MODES as DEMOGRAPHIC_MODES, DemographicMatrix
+from profiles import CampaignRequirements, InfluencerProfile
 
 
 class AIMatchingEngine:
@@ -56,6 +26,12 @@ class AIMatchingEngine:
         # Initialize the sentence transformer for text similarity
         self.text_model = SentenceTransformer('all-MiniLM-L6-v2')
         self.scaler = StandardScaler()
+        # Location strings resolve to interned (city, region, country) ids, memoized per string
+        self.gazetteer = Gazetteer.default()
+        # 'l1' (mean absolute gap) or 'total_variation' (distribution distance per age/gender group)
+        self.demographic_mode = os.getenv('DEMOGRAPHIC_ALIGNMENT_MODE', 'l1')
+        if self.demographic_mode not in DEMOGRAPHIC_MODES:
+            raise ValueError(f"Unknown demographic alignment mode: {self.demographic_mode}")
         
         # Weights for different matching factors
         self.weights = {
@@ -69,11 +45,14 @@ class AIMatchingEngine:
     
     def calculate_match_score(self, 
                              influencer: InfluencerProfile, 
-                             campaign: CampaignRequirements) -> Dict[str, Any]:
+                             campaign: CampaignRequirements,
+                             precomputed: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         """
         Calculate comprehensive match score between influencer and campaign
-        Returns score (0-100) and detailed breakdown
+        Returns score (0-100) and detailed breakdown; precomputed holds
+        component scores already computed for a whole candidate batch
         """
+        precomputed = precomputed or {}
         scores = {}
         
         # 1. Platform Match Score
@@ -105,16 +84,20 @@ class AIMatchingEngine:
         )
         
         # 5. Demographic Alignment Score
-        scores['demographic_alignment'] = self._calculate_demographic_alignment(
-            influencer.audience_demographics,
-            campaign.target_demographics
-        )
+        scores['demographic_alignment'] = precomputed.get('demographic_alignment')
+        if scores['demographic_alignment'] is None:
+            scores['demographic_alignment'] = self._calculate_demographic_alignment(
+                influencer.audience_demographics,
+                campaign.target_demographics
+            )
         
         # 6. Location Match Score
-        scores['location_match'] = self._calculate_location_match(
-            influencer.location,
-            campaign.target_locations
-        )
+        scores['location_match'] = precomputed.get('location_match')
+        if scores['location_match'] is None:
+            scores['location_match'] = self._calculate_location_match(
+                influencer.location,
+                campaign.target_locations
+            )
         
         # Calculate weighted total score
         total_score = sum(
@@ -209,40 +192,136 @@ class AIMatchingEngine:
     def _calculate_demographic_alignment(self,
                                         influencer_demographics: Dict[str, float],
                                         target_demographics: Dict[str, float]) -> float:
-        """Calculate demographic alignment score"""
+        """Calculate demographic alignment score over the fixed age/gender schema"""
         if not target_demographics:
             return 100.0
         
-        total_difference = 0
-        count = 0
-        
-        for key, target_value in target_demographics.items():
-            if key in influencer_demographics:
-                difference = abs(influencer_demographics[key] - target_value)
-                total_difference += difference
-                count += 1
-        
-        if count == 0:
-            return 50.0  # No demographic data available
-        
-        avg_difference = total_difference / count
-        score = max(0, 100 - (avg_difference * 2))  # 2% penalty per 1% difference
-        
-        return score
+        matrix = DemographicMatrix.from_mappings([influencer_demographics])
+        return float(matrix.alignment(target_demographics, self.demographic_mode)[0])
     
     def _calculate_location_match(self,
                                  influencer_location: str,
                                  target_locations: List[str]) -> float:
-        """Calculate location match score"""
+        """Hierarchical location match: full marks inside a target, partial credit nearby"""
         if not target_locations:
             return 100.0
         
-        if influencer_location in target_locations:
-            return 100.0
-        
-        # Could add more sophisticated location matching (regions, countries, etc.)
-        return 0.0
+        return float(self._location_scores([influencer_location], target_locations)[0])
     
+    def _batch_component_scores(self,
+                                influencers: List[InfluencerProfile],
+                                campaign: CampaignRequirements) -> List[Dict[str, float]]:
+        """Location and demographic scores for every candidate in a few array operations"""
+        locations = self._location_scores([inf.location for inf in influencers], campaign.target_locations)
+        demographics = DemographicMatrix.from_mappings(
+            [inf.audience_demographics for inf in influencers]
+        ).alignment(campaign.target_demographics, self.demographic_mode)
+        return [
+            {'location_match': float(location), 'demographic_alignment': float(demographic)}
+            for location, demographic in zip(locations, demographics)
+        ]
+    
+    def _location_scores(self, influencer_locations: List[str], target_locations: List[str]) -> np.ndarray:
+        """Location match for many influencers against one campaign's targets"""
+        return location_match_scores(
+            self.gazetteer.resolve_many(influencer_locations),
+            self.gazetteer.resolve_many(target_locations)
+        )
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Unit-length sentence embeddings, one row per text; empty texts get a zero row"""
+        present = [i for i, text in enumerate(texts) if text]
+        if not present:
+            return np.zeros((len(texts), 0), dtype=np.float32)
+        encoded = np.asarray(self.text_model.encode([texts[i] for i in present]), dtype=np.float32)
+        encoded /= np.maximum(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12)
+        embeddings = np.zeros((len(texts), encoded.shape[1]), dtype=np.float32)
+        embeddings[present] = encoded
+        return embeddings
+
+    def score_batch(self,
+                    campaign: CampaignRequirements,
+                    follower_count: np.ndarray,
+                    engagement_rate: np.ndarray,
+                    fake_follower_percentage: np.ndarray,
+                    platform_overlap: np.ndarray,
+                    niche_overlap: np.ndarray,
+                    locations: List[str],
+                    demographics: DemographicMatrix,
+                    bio_embeddings: Optional[np.ndarray] = None,
+                    campaign_embedding: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        calculate_match_score for a column batch of influencers against one
+        campaign, as array operations. Platforms and niches arrive as counts
+        of distinct values shared with the campaign's lists; bio_embeddings
+        come from encode_texts and can be reused across campaigns.
+        """
+        follower_count = np.asarray(follower_count, dtype=np.float64)
+        engagement_rate = np.asarray(engagement_rate, dtype=np.float64)
+        fake_follower_percentage = np.asarray(fake_follower_percentage, dtype=np.float64)
+        n = len(follower_count)
+        scores = {}
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if campaign.required_platforms:
+                scores['platform_match'] = np.minimum(100, platform_overlap / len(campaign.required_platforms) * 100)
+            else:
+                scores['platform_match'] = np.full(n, 100.0)
+
+            audience = np.full(n, 100.0)
+            if campaign.max_followers:
+                over = follower_count > campaign.max_followers
+                audience[over] = np.maximum(60, campaign.max_followers / follower_count[over] * 90)
+            under = follower_count < campaign.min_followers
+            audience[under] = np.maximum(0, follower_count[under] / campaign.min_followers * 70)
+            scores['audience_match'] = audience
+
+            engagement = np.where(
+                engagement_rate < campaign.min_engagement_rate,
+                100.0 * engagement_rate / campaign.min_engagement_rate,
+                100.0
+            )
+            over_fake = fake_follower_percentage > campaign.max_fake_followers
+            penalty = (fake_follower_percentage - campaign.max_fake_followers) / campaign.max_fake_followers * 50
+            engagement = np.where(over_fake, np.maximum(0, engagement - penalty), engagement)
+            scores['engagement_quality'] = np.minimum(100, engagement)
+
+            category = np.zeros(n)
+            if campaign.target_niches:
+                category = niche_overlap / len(campaign.target_niches) * 50
+
+        text = np.zeros(n)
+        if campaign.campaign_description:
+            if bio_embeddings is None:
+                raise ValueError("bio_embeddings are required when the campaign has a description")
+            if bio_embeddings.shape[1]:
+                if campaign_embedding is None:
+                    campaign_embedding = self.encode_texts([campaign.campaign_description])[0]
+                text = (bio_embeddings @ campaign_embedding) * 50
+        scores['niche_relevance'] = np.minimum(100, category + text)
+
+        scores['demographic_alignment'] = (
+            demographics.alignment(campaign.target_demographics, self.demographic_mode)
+            if campaign.target_demographics else np.full(n, 100.0)
+        )
+        scores['location_match'] = (
+            self._location_scores(locations, campaign.target_locations)
+            if campaign.target_locations else np.full(n, 100.0)
+        )
+
+        total_score = sum(scores[key] * self.weights[key] for key in scores)
+        estimated_reach = np.floor(follower_count * REACH_RATE)
+        estimated_engagements = np.floor(estimated_reach * (engagement_rate / 100) * (total_score / 100))
+
+        return {
+            'total_score': np.round(total_score, 2),
+            **scores,
+            'recommendation': np.array([self._get_recommendation(score) for score in total_score.tolist()]),
+            'estimated_reach': estimated_reach.astype(np.int64),
+            'estimated_engagements': estimated_engagements.astype(np.int64),
+            'estimated_conversions': np.floor(estimated_engagements * 0.02).astype(np.int64)
+        }
+
     def _generate_match_explanation(self,
                                    scores: Dict[str, float],
                                    influencer: InfluencerProfile,
@@ -307,7 +386,7 @@ class AIMatchingEngine:
         engagement_multiplier = influencer.engagement_rate / 100
         match_multiplier = match_score / 100
         
-        predicted_reach = int(base_reach * 0.3)  # Assume 30% reach
+        predicted_reach = int(base_reach * REACH_RATE)  # Assume 30% reach
         predicted_engagement = int(predicted_reach * engagement_multiplier * match_multiplier)
         predicted_conversions = int(predicted_engagement * 0.02)  # 2% conversion estimate
         
@@ -324,9 +403,10 @@ class AIMatchingEngine:
                         top_n: int = 10) -> List[Dict[str, Any]]:
         """Rank multiple influencers for a campaign"""
         results = []
+        component_scores = self._batch_component_scores(influencers, campaign)
         
-        for influencer in influencers:
-            match_result = self.calculate_match_score(influencer, campaign)
+        for influencer, precomputed in zip(influencers, component_scores):
+            match_result = self.calculate_match_score(influencer, campaign, precomputed)
             match_result['influencer_id'] = influencer.user_id
             results.append(match_result)
         
@@ -416,4 +496,4 @@ async def match_influencer_to_campaign(influencer_data: dict, campaign_data: dic
     # Calculate match
     result = engine.calculate_match_score(influencer, campaign)
     
-    return result
\ No newline at end of file
+    return result
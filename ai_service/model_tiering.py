@@ -0,0 +1,223 @@
+"""
+Latency-Budgeted Model Tiering for Influencelytic-Match
+Chooses between the lexicon scorer, a quantized small model and full
+RoBERTa based on the caller's latency budget and current queue depth
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ordered from fastest / lowest quality to slowest / highest quality
+TIERS = ("lexicon", "quantized", "full")
+
+# Starting latency estimates, refined online from observed timings
+DEFAULT_ESTIMATES = {
+    "lexicon": {"overhead_ms": 0.5, "per_post_ms": 0.02},
+    "quantized": {"overhead_ms": 5.0, "per_post_ms": 6.0},
+    "full": {"overhead_ms": 10.0, "per_post_ms": 35.0},
+}
+
+
+@dataclass
+class TierStats:
+    """Running latency model and availability of a single tier"""
+    overhead_ms: float
+    per_post_ms: float
+    available: bool = True
+    calls: int = 0
+    timeouts: int = 0
+    failures: int = 0
+
+
+@dataclass
+class TieredResult:
+    """Outcome of a tiered inference call"""
+    value: Any
+    tier_requested: str
+    tier_used: str
+    degraded: bool
+    latency_ms: float
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "tier_requested": self.tier_requested,
+            "tier_used": self.tier_used,
+            "degraded": self.degraded,
+            "latency_ms": round(self.latency_ms, 2)
+        }
+
+
+class TierRouter:
+    """Picks the best model tier that fits a latency budget under current load"""
+
+    def __init__(self,
+                 workers: int,
+                 estimates: Optional[Dict[str, Dict[str, float]]] = None,
+                 smoothing: float = 0.2):
+        self.workers = max(1, workers)
+        self.smoothing = smoothing
+        estimates = estimates or DEFAULT_ESTIMATES
+        self.stats = {tier: TierStats(**estimates[tier]) for tier in TIERS}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Inference calls currently running or waiting on the executor"""
+        return self._in_flight
+
+    def set_available(self, tier: str, available: bool):
+        self.stats[tier].available = available
+
+    def estimate_ms(self, tier: str, n_posts: int) -> float:
+        """Predicted wall time for a call, including waiting behind queued work"""
+        stats = self.stats[tier]
+        service_ms = stats.overhead_ms + stats.per_post_ms * max(1, n_posts)
+        if tier == "lexicon":
+            # Runs inline on the event loop, never queues
+            return service_ms
+        waves = 1 + self._in_flight // self.workers
+        return service_ms * waves
+
+    def choose(self,
+               n_posts: int,
+               latency_budget_ms: Optional[float] = None,
+               quality_tier: Optional[str] = None) -> str:
+        """Return the highest-quality available tier that fits the budget"""
+        if quality_tier is not None and quality_tier not in TIERS:
+            raise ValueError(f"Unknown quality tier: {quality_tier}")
+
+        ceiling = TIERS.index(quality_tier) if quality_tier else len(TIERS) - 1
+        for tier in reversed(TIERS[:ceiling + 1]):
+            if not self.stats[tier].available:
+                continue
+            if latency_budget_ms is None or self.estimate_ms(tier, n_posts) <= latency_budget_ms:
+                return tier
+        return "lexicon"
+
+    @contextmanager
+    def track(self, tier: str, n_posts: int):
+        """Fold a call's service time (excluding time spent queued) into the tier estimate"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stats = self.stats[tier]
+                stats.calls += 1
+                observed = max(0.0, elapsed_ms - stats.overhead_ms) / max(1, n_posts)
+                stats.per_post_ms += self.smoothing * (observed - stats.per_post_ms)
+
+    def submit(self, executor: Executor, fn: Callable[[], Any]) -> 'asyncio.Future':
+        """
+        Queue fn on the executor, counted as in flight from submission until
+        it finishes or is cancelled, so work waiting for a worker is visible
+        to estimate_ms
+        """
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = executor.submit(fn)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    def _release(self, future: Optional[Future] = None):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self,
+                  executor: Executor,
+                  runners: Dict[str, Callable[[], Any]],
+                  n_posts: int,
+                  latency_budget_ms: Optional[float] = None,
+                  quality_tier: Optional[str] = None) -> TieredResult:
+        """Run the chosen tier, falling back to the lexicon if the budget runs out or the call fails"""
+        start = time.perf_counter()
+        requested = quality_tier or TIERS[-1]
+        tier = self.choose(n_posts, latency_budget_ms, quality_tier)
+
+        if tier != "lexicon":
+            def timed_call():
+                with self.track(tier, n_posts):
+                    return runners[tier]()
+
+            future = self.submit(executor, timed_call)
+            timeout = latency_budget_ms / 1000 if latency_budget_ms is not None else None
+            try:
+                value = await asyncio.wait_for(future, timeout=timeout)
+                return TieredResult(
+                    value=value,
+                    tier_requested=requested,
+                    tier_used=tier,
+                    degraded=tier != requested,
+                    latency_ms=(time.perf_counter() - start) * 1000
+                )
+            except asyncio.TimeoutError:
+                with self._lock:
+                    # Learn from the miss right away instead of waiting for the
+                    # abandoned call to finish in the background
+                    stats = self.stats[tier]
+                    stats.timeouts += 1
+                    stats.per_post_ms = max(stats.per_post_ms, latency_budget_ms / max(1, n_posts))
+                logger.warning(f"{tier} tier exceeded {latency_budget_ms}ms budget, degrading to lexicon")
+            except Exception as e:
+                with self._lock:
+                    self.stats[tier].failures += 1
+                logger.error(f"{tier} tier failed ({e}), degrading to lexicon")
+
+        with self.track("lexicon", n_posts):
+            value = runners["lexicon"]()
+        return TieredResult(
+            value=value,
+            tier_requested=requested,
+            tier_used="lexicon",
+            degraded=requested != "lexicon",
+            latency_ms=(time.perf_counter() - start) * 1000
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._in_flight,
+            "workers": self.workers,
+            "tiers": {
+                tier: {
+                    "available": stats.available,
+                    "overhead_ms": round(stats.overhead_ms, 3),
+                    "per_post_ms": round(stats.per_post_ms, 3),
+                    "calls": stats.calls,
+                    "timeouts": stats.timeouts,
+                    "failures": stats.failures
+                }
+                for tier, stats in self.stats.items()
+            }
+        }
+
+
+def load_quantized_sentiment_pipeline(model_name: Optional[str] = None):
+    """Load a small sentiment model with int8 dynamic quantization for CPU inference"""
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+    model_name = model_name or os.getenv(
+        'QUANTIZED_SENTIMENT_MODEL',
+        'lxyuan/distilbert-base-multilingual-cased-sentiments-student'
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    return pipeline("sentiment-analysis", model=quantized, tokenizer=tokenizer, truncation=True)
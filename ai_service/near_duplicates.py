@@ -0,0 +1,356 @@
+"""
+Near-Duplicate Content Detection for Influencelytic-Match
+MinHash signatures over caption shingles, stored as banded LSH keys in sorted
+runs so inserts are incremental and lookups are sub-linear. Reposted captions
+across accounts (engagement pods, content farms) lower an influencer's
+content originality score.
+"""
+
+import argparse
+import json
+import re
+import resource
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"[#@]?\w+")
+BANDS = 12
+ROWS = 3
+MIN_BAND_MATCHES = 2            # ~0.99 recall at Jaccard 0.75, ~4% at Jaccard 0.3
+PENDING_LIMIT = 65536           # unsorted inserts per band before they become a sorted run
+BATCH_POSTS = 8192
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer over uint64 arrays"""
+    with np.errstate(over='ignore'):
+        z = values + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+# Multiply-shift hash family standing in for BANDS * ROWS random permutations
+_MULTIPLIERS = _mix64(np.arange(1, BANDS * ROWS + 1, dtype=np.uint64)) | np.uint64(1)
+_OFFSETS = _mix64(np.arange(BANDS * ROWS + 1, 2 * BANDS * ROWS + 1, dtype=np.uint64))
+
+
+def shingle_hashes(text: str) -> List[int]:
+    """Stable hashes of a caption's word unigrams; bigrams are derived from them"""
+    return [zlib.crc32(token.encode()) for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+def band_keys(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    LSH keys for a batch of captions: (n, BANDS) uint32 plus a mask of captions
+    that had any tokens. MinHash over unigrams and bigrams is computed with one
+    multiply-shift hash matrix per batch and segmented minimum reductions.
+    """
+    n = len(texts)
+    keys = np.zeros((n, BANDS), dtype=np.uint32)
+    valid = np.zeros(n, dtype=bool)
+    for start in range(0, n, BATCH_POSTS):
+        batch = texts[start:start + BATCH_POSTS]
+        token_lists = [shingle_hashes(text) for text in batch]
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(batch))
+        has_tokens = lengths > 0
+        if not has_tokens.any():
+            continue
+        tokens = np.fromiter((h for tokens in token_lists for h in tokens), dtype=np.uint64, count=int(lengths.sum()))
+        token_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+
+        # Bigram hash from each token and its successor within the same post
+        follows = np.ones(len(tokens), dtype=bool)
+        follows[np.cumsum(lengths)[has_tokens] - 1] = False
+        bigrams = _mix64((tokens[:-1] << np.uint64(32)) | tokens[1:])[follows[:-1]]
+        bigram_counts = np.maximum(lengths - 1, 0)
+
+        # Interleave per post: its unigrams then its bigrams
+        features = np.empty(len(tokens) + len(bigrams), dtype=np.uint64)
+        feature_counts = lengths + bigram_counts
+        feature_starts = np.concatenate([[0], np.cumsum(feature_counts)[:-1]])
+        unigram_slots = np.repeat(feature_starts - token_starts, lengths) + np.arange(len(tokens))
+        bigram_starts = np.concatenate([[0], np.cumsum(bigram_counts)[:-1]])
+        bigram_slots = (np.repeat(feature_starts + lengths - bigram_starts, bigram_counts)
+                        + np.arange(len(bigrams)))
+        features[unigram_slots] = tokens
+        features[bigram_slots] = bigrams
+
+        mixed = _mix64(features)
+        with np.errstate(over='ignore'):
+            hashed = ((mixed[:, None] * _MULTIPLIERS[None, :] + _OFFSETS[None, :]) >> np.uint64(32)).astype(np.uint32)
+        signatures = np.minimum.reduceat(hashed, feature_starts[has_tokens], axis=0)
+
+        rows = signatures.reshape(-1, BANDS, ROWS).astype(np.uint64)
+        combined = rows[:, :, 0]
+        for r in range(1, ROWS):
+            combined = _mix64((combined << np.uint64(32)) ^ rows[:, :, r])
+        batch_index = np.flatnonzero(has_tokens) + start
+        keys[batch_index] = (combined >> np.uint64(32)).astype(np.uint32)
+        valid[batch_index] = True
+    return keys, valid
+
+
+class _BandTable:
+    """Entries (key << 32 | position) kept in a few sorted runs plus a small unsorted buffer"""
+
+    def __init__(self):
+        self.runs: List[np.ndarray] = []
+        self.pending: List[np.ndarray] = []
+        self.pending_size = 0
+
+    def add(self, entries: np.ndarray):
+        self.pending.append(entries)
+        self.pending_size += len(entries)
+        if self.pending_size >= PENDING_LIMIT:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.runs.append(np.sort(np.concatenate(self.pending)))
+        self.pending, self.pending_size = [], 0
+        # Merge runs of similar size, keeping O(log n) runs to search
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], last]), kind='mergesort')
+
+    def lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(query index, position) pairs for every stored entry sharing a key"""
+        lows = keys.astype(np.uint64) << np.uint64(32)
+        highs = lows | _MASK32
+        query_parts, position_parts = [], []
+        for run in self.runs:
+            left = np.searchsorted(run, lows, side='left')
+            right = np.searchsorted(run, highs, side='right')
+            counts = right - left
+            if counts.any():
+                query_parts.append(np.repeat(np.arange(len(keys)), counts))
+                offsets = np.repeat(left - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+                position_parts.append(run[offsets + np.arange(counts.sum())] & _MASK32)
+        if self.pending:
+            buffer = np.concatenate(self.pending)
+            buffer_keys = buffer >> np.uint64(32)
+            for q, key in enumerate(keys.astype(np.uint64)):
+                hits = buffer[buffer_keys == key]
+                if len(hits):
+                    query_parts.append(np.full(len(hits), q))
+                    position_parts.append(hits & _MASK32)
+        if not query_parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(query_parts).astype(np.int64), np.concatenate(position_parts).astype(np.int64)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(run.nbytes for run in self.runs) + self.pending_size * 8
+
+
+class NearDuplicateIndex:
+    """Banded MinHash LSH over captions, with post ownership for cross-account checks"""
+
+    def __init__(self, min_band_matches: int = MIN_BAND_MATCHES):
+        self.min_band_matches = min_band_matches
+        self.tables = [_BandTable() for _ in range(BANDS)]
+        self.owners = np.zeros(0, dtype=np.int32)
+        self.size = 0
+        self.influencer_ids: List[str] = []
+        self.influencer_codes: Dict[str, int] = {}
+        self.post_positions: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _owner_code(self, influencer_id: str) -> int:
+        code = self.influencer_codes.get(influencer_id)
+        if code is None:
+            code = self.influencer_codes[influencer_id] = len(self.influencer_ids)
+            self.influencer_ids.append(influencer_id)
+        return code
+
+    def add_keys(self, owner_codes: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Insert precomputed band keys; returns the assigned positions"""
+        with self._lock:
+            return self._add_keys(owner_codes, keys)
+
+    def _add_keys(self, owner_codes: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        n = len(keys)
+        positions = np.arange(self.size, self.size + n, dtype=np.uint64)
+        if self.size + n > len(self.owners):
+            grown = np.zeros(max(1024, 2 * (self.size + n)), dtype=np.int32)
+            grown[:self.size] = self.owners[:self.size]
+            self.owners = grown
+        self.owners[self.size:self.size + n] = owner_codes
+        for band, table in enumerate(self.tables):
+            table.add((keys[:, band].astype(np.uint64) << np.uint64(32)) | positions)
+        self.size += n
+        return positions.astype(np.int64)
+
+    def add_posts(self, influencer_id: str, post_ids: Sequence[str], texts: Sequence[str]) -> int:
+        """Index an influencer's posts, skipping ids already indexed; returns the number added"""
+        fresh = [(post_id, text) for post_id, text in zip(post_ids, texts) if post_id not in self.post_positions]
+        if not fresh:
+            return 0
+        keys, valid = band_keys([text for _, text in fresh])
+        fresh = [item for item, ok in zip(fresh, valid) if ok]
+        with self._lock:
+            code = self._owner_code(influencer_id)
+            positions = self._add_keys(np.full(len(fresh), code, dtype=np.int32), keys[valid])
+            for (post_id, _), position in zip(fresh, positions):
+                self.post_positions[post_id] = int(position)
+        return len(fresh)
+
+    def flush(self):
+        for table in self.tables:
+            table.flush()
+
+    def query_keys(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(query index, position, bands matched) for candidates meeting min_band_matches"""
+        query_parts, position_parts = [], []
+        with self._lock:
+            for band, table in enumerate(self.tables):
+                queries, positions = table.lookup(keys[:, band])
+                query_parts.append(queries)
+                position_parts.append(positions)
+        pairs = (np.concatenate(query_parts) << 32) | np.concatenate(position_parts)
+        pairs, matches = np.unique(pairs, return_counts=True)
+        keep = matches >= self.min_band_matches
+        pairs, matches = pairs[keep], matches[keep]
+        return pairs >> 32, pairs & 0xFFFFFFFF, matches
+
+    def find_near_duplicates(self, texts: Sequence[str], exclude_influencer: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """Near-duplicate matches for each caption, optionally ignoring one account's own posts"""
+        keys, valid = band_keys(list(texts))
+        results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+        if not valid.any():
+            return results
+        valid_index = np.flatnonzero(valid)
+        queries, positions, matches = self.query_keys(keys[valid])
+        exclude = self.influencer_codes.get(exclude_influencer, -1) if exclude_influencer else -1
+        for q, position, matched in zip(valid_index[queries], positions, matches):
+            owner = int(self.owners[position])
+            if owner == exclude:
+                continue
+            results[q].append({
+                "influencer_id": self.influencer_ids[owner],
+                "position": int(position),
+                "band_matches": int(matched)
+            })
+        return results
+
+    def originality(self, influencer_id: str, texts: Sequence[str]) -> Dict[str, Any]:
+        """Share of an influencer's captions with no near-duplicate on another account"""
+        return originality_summary(self.find_near_duplicates(texts, exclude_influencer=influencer_id))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(table.nbytes for table in self.tables) + self.owners.nbytes
+
+
+def originality_summary(matches: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Originality feature from per-caption near-duplicate matches on other accounts"""
+    duplicated = sum(1 for found in matches if found)
+    other_accounts = {match["influencer_id"] for found in matches for match in found}
+    return {
+        "posts_checked": len(matches),
+        "posts_duplicated_elsewhere": duplicated,
+        "accounts_sharing_content": len(other_accounts),
+        "content_originality": round(1 - duplicated / len(matches), 3) if matches else None
+    }
+
+
+def synthetic_posts(n_posts: int, duplicate_rate: float = 0.05, seed: int = 0) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Captions drawn from a Zipf vocabulary; a share of them are reposts of an
+    earlier caption with one word changed. Returns texts, owner codes and the
+    source index of each repost (-1 for originals).
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}" for i in range(50000)])
+    lengths = rng.integers(8, 30, n_posts)
+    words = np.minimum(rng.zipf(1.3, int(lengths.sum())) - 1, len(vocabulary) - 1)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    texts = [' '.join(vocabulary[words[offsets[i]:offsets[i + 1]]]) for i in range(n_posts)]
+
+    source = np.full(n_posts, -1)
+    reposts = np.flatnonzero(rng.random(n_posts) < duplicate_rate)
+    reposts = reposts[reposts > 0]
+    source[reposts] = (rng.random(len(reposts)) * reposts).astype(np.int64)
+    for i in reposts:
+        tokens = texts[source[i]].split()
+        tokens[int(rng.integers(len(tokens)))] = str(vocabulary[int(rng.integers(len(vocabulary)))])
+        texts[i] = ' '.join(tokens)
+    owners = rng.integers(0, max(1, n_posts // 50), n_posts).astype(np.int32)
+    return texts, owners, source
+
+
+def benchmark(n_posts: int, n_queries: int = 1000, chunk_posts: int = 1_000_000) -> Dict[str, Any]:
+    """
+    Fingerprint, index and query throughput plus recall on planted reposts.
+    Captions are generated and fingerprinted a chunk at a time so only the
+    index stays resident.
+    """
+    report: Dict[str, Any] = {"posts": n_posts}
+    index = NearDuplicateIndex()
+    n_chunks = -(-n_posts // chunk_posts)
+    per_chunk_queries = -(-n_queries // n_chunks)
+    rng = np.random.default_rng(1)
+    query_keys, query_sources = [], []
+    fingerprint_seconds = insert_seconds = 0.0
+
+    for chunk, chunk_start in enumerate(range(0, n_posts, chunk_posts)):
+        texts, owners, source = synthetic_posts(min(chunk_posts, n_posts - chunk_start), seed=chunk)
+        start = time.perf_counter()
+        keys, _ = band_keys(texts)
+        fingerprint_seconds += time.perf_counter() - start
+        del texts
+
+        start = time.perf_counter()
+        index.add_keys(owners + chunk_start // 50, keys)
+        insert_seconds += time.perf_counter() - start
+
+        reposts = np.flatnonzero(source >= 0)
+        sample = rng.choice(reposts, min(per_chunk_queries, len(reposts)), replace=False)
+        query_keys.append(keys[sample])
+        query_sources.append(source[sample] + chunk_start)
+
+    report["fingerprint_seconds"] = round(fingerprint_seconds, 2)
+    report["fingerprint_posts_per_second"] = int(n_posts / max(fingerprint_seconds, 1e-9))
+    report["insert_seconds"] = round(insert_seconds, 2)
+
+    query_keys = np.concatenate(query_keys)
+    query_sources = np.concatenate(query_sources)
+    latencies = []
+    found = 0
+    for keys, source in zip(query_keys, query_sources):
+        start = time.perf_counter()
+        _, positions, _ = index.query_keys(keys[None, :])
+        latencies.append((time.perf_counter() - start) * 1000)
+        found += int(source in positions)
+    report["query_ms_p50"] = round(float(np.percentile(latencies, 50)), 3)
+    report["query_ms_p99"] = round(float(np.percentile(latencies, 99)), 3)
+    report["repost_recall"] = round(found / max(len(latencies), 1), 3)
+    report["index_mb"] = round(index.nbytes / 2 ** 20, 1)
+    report["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Near-duplicate caption index benchmark")
+    parser.add_argument('--posts', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--queries', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    for n_posts in args.posts:
+        print(json.dumps(benchmark(n_posts, args.queries)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+State Persistence for Influencelytic-Match
+Snapshot files for the streaming stores are written to a sibling temp file
+and renamed over the previous snapshot, so a crash mid-write never leaves a
+truncated file behind.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from typing import IO, Any, Iterator
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = 'w') -> Iterator[IO]:
+    """Open a temp file next to `path`; it replaces `path` only if the block completes"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_json(path: str, data: Any):
+    with atomic_open(path) as f:
+        json.dump(data, f)
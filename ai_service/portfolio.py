@@ -0,0 +1,421 @@
+"""
+Portfolio Selection for Influencelytic-Match
+Chooses the set of influencers that maximizes total match score or reach
+within a campaign budget, with optional platform-mix and per-niche limits.
+Greedy ratio selection plus swap local search scales to 100k candidates;
+small candidate sets can be solved exactly by DP or branch-and-bound.
+"""
+
+import argparse
+import json
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+EXACT_MAX_CANDIDATES = 40        # "auto" mode solves exactly up to this many candidates
+DP_MAX_CELLS = 20_000_000        # items x budget units for the dynamic program
+BRANCH_NODE_LIMIT = 2_000_000
+DEADLINE_CHECK_NODES = 1024      # branch-and-bound nodes between time limit checks
+SWAP_POOL_SIZE = 4096            # best-value outsiders considered for swaps each round
+SWAP_OUT_SIZE = 256              # lowest-value selected candidates considered for removal
+FILL_CHUNK = 1024
+
+
+@dataclass
+class PortfolioConstraints:
+    budget: float
+    max_influencers: Optional[int] = None
+    min_per_platform: Dict[str, int] = field(default_factory=dict)
+    max_per_platform: Dict[str, int] = field(default_factory=dict)
+    max_per_niche: Optional[int] = None
+    niche_caps: Dict[str, int] = field(default_factory=dict)   # overrides max_per_niche per niche
+
+    @property
+    def has_side_constraints(self) -> bool:
+        return bool(self.max_influencers is not None or self.min_per_platform or self.max_per_platform
+                    or self.max_per_niche is not None or self.niche_caps)
+
+
+@dataclass
+class PortfolioResult:
+    selected: np.ndarray
+    total_value: float
+    total_cost: float
+    method: str
+    optimal: bool
+    elapsed_ms: float = 0.0
+    feasible: bool = True       # False when platform minimums could not be met
+
+    def to_dict(self, influencer_ids: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        selected = self.selected.tolist()
+        return {
+            "selected": [influencer_ids[i] for i in selected] if influencer_ids is not None else selected,
+            "total_value": round(self.total_value, 2),
+            "total_cost": round(self.total_cost, 2),
+            "method": self.method,
+            "optimal": self.optimal,
+            "feasible": self.feasible,
+            "elapsed_ms": round(self.elapsed_ms, 2)
+        }
+
+
+class _State:
+    """Current selection with running cost and per-platform / per-niche counts"""
+
+    def __init__(self, solver: 'PortfolioSolver', constraints: PortfolioConstraints):
+        self.solver = solver
+        self.selected = np.zeros(solver.n, dtype=bool)
+        self.remaining = constraints.budget
+        self.size = 0
+        self.max_size = constraints.max_influencers if constraints.max_influencers is not None else solver.n
+        self.platform_counts = np.zeros(len(solver.platform_names), dtype=np.int64)
+        self.niche_counts = np.zeros(len(solver.niche_names), dtype=np.int64)
+
+    def can_add(self, i: int) -> bool:
+        solver = self.solver
+        return (solver.costs[i] <= self.remaining + 1e-9
+                and self.size < self.max_size
+                and self.platform_counts[solver.platform_codes[i]] < solver.platform_max[solver.platform_codes[i]]
+                and self.niche_counts[solver.niche_codes[i]] < solver.niche_max[solver.niche_codes[i]])
+
+    def add(self, i: int):
+        solver = self.solver
+        self.selected[i] = True
+        self.remaining -= solver.costs[i]
+        self.size += 1
+        self.platform_counts[solver.platform_codes[i]] += 1
+        self.niche_counts[solver.niche_codes[i]] += 1
+
+    def remove(self, i: int):
+        solver = self.solver
+        self.selected[i] = False
+        self.remaining += solver.costs[i]
+        self.size -= 1
+        self.platform_counts[solver.platform_codes[i]] -= 1
+        self.niche_counts[solver.niche_codes[i]] -= 1
+
+
+class PortfolioSolver:
+    """Candidates as parallel columns: value (score or reach), cost (price), platform, niche"""
+
+    def __init__(self,
+                 values: Any,
+                 costs: Any,
+                 platforms: Optional[Sequence[str]] = None,
+                 niches: Optional[Sequence[str]] = None):
+        self.values = np.asarray(values, dtype=np.float64)
+        self.costs = np.asarray(costs, dtype=np.float64)
+        self.n = len(self.values)
+        if len(self.costs) != self.n:
+            raise ValueError("values and costs must have the same length")
+        self.platform_names, self.platform_codes = self._encode(platforms)
+        self.niche_names, self.niche_codes = self._encode(niches)
+        self.ratio = self.values / np.maximum(self.costs, 1e-9)
+
+    def _encode(self, labels: Optional[Sequence[str]]):
+        if labels is None:
+            return np.array(['']), np.zeros(self.n, dtype=np.int64)
+        if len(labels) != self.n:
+            raise ValueError("platform and niche columns must match the number of candidates")
+        names, codes = np.unique(np.asarray(labels, dtype=str), return_inverse=True)
+        return names, codes.astype(np.int64)
+
+    def _limits(self, names: np.ndarray, caps: Dict[str, int], default: Optional[int]) -> np.ndarray:
+        limits = np.full(len(names), default if default is not None else self.n, dtype=np.int64)
+        lookup = {name: code for code, name in enumerate(names)}
+        for name, cap in caps.items():
+            if name in lookup:
+                limits[lookup[name]] = cap
+        return limits
+
+    def solve(self, constraints: PortfolioConstraints, mode: str = "auto",
+              time_limit_ms: float = 150.0) -> PortfolioResult:
+        """mode is "greedy" (greedy + local search), "exact" or "auto" (exact for small sets)"""
+        if mode not in ("auto", "greedy", "exact"):
+            raise ValueError(f"Unknown portfolio mode: {mode}")
+        start = time.perf_counter()
+        self.platform_max = self._limits(self.platform_names, constraints.max_per_platform, None)
+        self.platform_min = self._limits(self.platform_names, constraints.min_per_platform, 0)
+        self.niche_max = self._limits(self.niche_names, constraints.niche_caps, constraints.max_per_niche)
+
+        eligible = np.flatnonzero((self.costs <= constraints.budget) & (self.values > 0))
+        if not self._minimums_reachable(constraints, eligible):
+            result = PortfolioResult(np.zeros(0, dtype=np.int64), 0.0, 0.0, "infeasible", optimal=True, feasible=False)
+        elif mode == "exact" or (mode == "auto" and len(eligible) <= EXACT_MAX_CANDIDATES):
+            result = self._solve_exact(constraints, eligible, time_limit_ms)
+        else:
+            result = self._solve_greedy(constraints, eligible, start, time_limit_ms)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def _result(self, state: _State, method: str, optimal: bool) -> PortfolioResult:
+        selected = np.flatnonzero(state.selected)
+        return PortfolioResult(selected, float(self.values[selected].sum()), float(self.costs[selected].sum()),
+                               method, optimal, feasible=self._meets_minimums(state))
+
+    # Greedy ratio heuristic with local search
+
+    def _fill(self, state: _State, order: np.ndarray):
+        """
+        Add candidates in ratio order while anything still fits. Each chunk is
+        prefiltered with array ops so saturated platforms/niches cost nothing.
+        """
+        suffix_min_cost = np.minimum.accumulate(self.costs[order][::-1])[::-1] if len(order) else order
+        for chunk_start in range(0, len(order), FILL_CHUNK):
+            if state.size >= state.max_size or state.remaining + 1e-9 < suffix_min_cost[chunk_start]:
+                break
+            chunk = order[chunk_start:chunk_start + FILL_CHUNK]
+            platforms = self.platform_codes[chunk]
+            niches = self.niche_codes[chunk]
+            open_slots = ((~state.selected[chunk])
+                          & (self.costs[chunk] <= state.remaining + 1e-9)
+                          & (state.platform_counts[platforms] < self.platform_max[platforms])
+                          & (state.niche_counts[niches] < self.niche_max[niches]))
+            for i in chunk[open_slots]:
+                if state.can_add(i):
+                    state.add(i)
+
+    def _minimums_reachable(self, constraints: PortfolioConstraints, eligible: np.ndarray) -> bool:
+        """
+        Necessary conditions for the platform minimums: enough candidates per
+        platform, and the cheapest ones of every platform together within
+        budget and the size limit
+        """
+        # A minimum for a platform no candidate is on cannot be met
+        if any(minimum > 0 and name not in self.platform_names
+               for name, minimum in constraints.min_per_platform.items()):
+            return False
+        if np.any(self.platform_min > self.platform_max):
+            return False
+        required = np.flatnonzero(self.platform_min > 0)
+        if not len(required):
+            return True
+        needed_cost = 0.0
+        for code in required:
+            costs = np.sort(self.costs[eligible[self.platform_codes[eligible] == code]])
+            if len(costs) < self.platform_min[code]:
+                return False
+            needed_cost += costs[:self.platform_min[code]].sum()
+        if constraints.max_influencers is not None and self.platform_min.sum() > constraints.max_influencers:
+            return False
+        return needed_cost <= constraints.budget + 1e-9
+
+    def _meets_minimums(self, state: _State) -> bool:
+        return bool(np.all(state.platform_counts >= self.platform_min))
+
+    def _solve_greedy(self, constraints: PortfolioConstraints, eligible: np.ndarray,
+                      start: float, time_limit_ms: float) -> PortfolioResult:
+        order = eligible[np.argsort(-self.ratio[eligible], kind='stable')]
+        state = _State(self, constraints)
+
+        # Platform minimums first, cheapest-per-value candidates of each platform
+        for code in np.flatnonzero(self.platform_min > 0):
+            for i in order[self.platform_codes[order] == code]:
+                if state.platform_counts[code] >= self.platform_min[code]:
+                    break
+                if state.can_add(i):
+                    state.add(i)
+        self._fill(state, order)
+
+        # Classic safeguard: a single high-value candidate can beat the ratio order
+        # (only candidates an empty selection may take, so zero platform and niche caps hold)
+        allowed = eligible[(self.platform_max[self.platform_codes[eligible]] > 0)
+                           & (self.niche_max[self.niche_codes[eligible]] > 0)]
+        if not constraints.min_per_platform and len(allowed) and state.max_size > 0:
+            best_single = allowed[np.argmax(self.values[allowed])]
+            if self.values[best_single] > self.values[state.selected].sum():
+                state = _State(self, constraints)
+                state.add(best_single)
+                self._fill(state, order)
+
+        self._local_search(state, order, eligible, start, time_limit_ms)
+        return self._result(state, "greedy_local_search", optimal=False)
+
+    def _local_search(self, state: _State, order: np.ndarray, eligible: np.ndarray,
+                      start: float, time_limit_ms: float):
+        """Best-improvement 1-for-1 swaps, refilling leftover budget after each swap"""
+        values, costs = self.values, self.costs
+        while (time.perf_counter() - start) * 1000 < time_limit_ms:
+            inside = np.flatnonzero(state.selected)
+            if not len(inside):
+                return
+            if len(inside) > SWAP_OUT_SIZE:
+                inside = inside[np.argpartition(values[inside], SWAP_OUT_SIZE)[:SWAP_OUT_SIZE]]
+            # Outsiders that could improve on some selected candidate at some slack
+            outside = eligible[~state.selected[eligible]]
+            outside = outside[(values[outside] > values[inside].min())
+                              & (costs[outside] <= state.remaining + costs[inside].max() + 1e-9)]
+            if not len(outside):
+                return
+            if len(outside) > SWAP_POOL_SIZE:
+                outside = outside[np.argpartition(-values[outside], SWAP_POOL_SIZE)[:SWAP_POOL_SIZE]]
+            out_platform = self.platform_codes[outside]
+            out_niche = self.niche_codes[outside]
+
+            best_gain, best_pair = 1e-9, None
+            for s in inside:
+                if (time.perf_counter() - start) * 1000 >= time_limit_ms:
+                    break
+                s_platform, s_niche = self.platform_codes[s], self.niche_codes[s]
+                feasible = (costs[outside] <= state.remaining + costs[s] + 1e-9) & (values[outside] > values[s])
+                feasible &= state.platform_counts[out_platform] - (out_platform == s_platform) < self.platform_max[out_platform]
+                feasible &= state.niche_counts[out_niche] - (out_niche == s_niche) < self.niche_max[out_niche]
+                if state.platform_counts[s_platform] <= self.platform_min[s_platform]:
+                    feasible &= out_platform == s_platform
+                if not feasible.any():
+                    continue
+                candidates = np.flatnonzero(feasible)
+                c = outside[candidates[np.argmax(values[outside[candidates]])]]
+                gain = values[c] - values[s]
+                if gain > best_gain:
+                    best_gain, best_pair = gain, (s, c)
+
+            if best_pair is None:
+                return
+            state.remove(best_pair[0])
+            state.add(best_pair[1])
+            self._fill(state, order)
+
+    # Exact modes for small candidate sets
+
+    def _solve_exact(self, constraints: PortfolioConstraints, eligible: np.ndarray,
+                     time_limit_ms: float) -> PortfolioResult:
+        resolution = 1.0
+        budget_units = int(math.floor(constraints.budget / resolution + 1e-9))
+        if not constraints.has_side_constraints and len(eligible) * (budget_units + 1) <= DP_MAX_CELLS:
+            return self._solve_dp(constraints, eligible, resolution)
+        return self._solve_branch_and_bound(constraints, eligible, time_limit_ms)
+
+    def _solve_dp(self, constraints: PortfolioConstraints, eligible: np.ndarray, resolution: float) -> PortfolioResult:
+        """0/1 knapsack over whole-dollar budget units, one vectorized row per candidate"""
+        budget_units = int(math.floor(constraints.budget / resolution + 1e-9))
+        unit_costs = np.ceil(self.costs[eligible] / resolution - 1e-9).astype(np.int64)
+        best = np.zeros(budget_units + 1)
+        took = np.zeros((len(eligible), budget_units + 1), dtype=bool)
+        for row, (i, w) in enumerate(zip(eligible, unit_costs)):
+            candidate = np.full(budget_units + 1, -np.inf)
+            candidate[w:] = best[:budget_units + 1 - w] + self.values[i]
+            took[row] = candidate > best
+            best = np.maximum(best, candidate)
+
+        state = _State(self, constraints)
+        capacity = budget_units
+        for row in range(len(eligible) - 1, -1, -1):
+            if took[row, capacity]:
+                state.add(eligible[row])
+                capacity -= unit_costs[row]
+        # Costs rounded up to whole units, so optimality holds when prices are whole dollars
+        exact_costs = np.allclose(unit_costs * resolution, self.costs[eligible])
+        return self._result(state, "dynamic_programming", optimal=exact_costs)
+
+    def _solve_branch_and_bound(self, constraints: PortfolioConstraints, eligible: np.ndarray,
+                                time_limit_ms: float) -> PortfolioResult:
+        """
+        Depth-first include/exclude in ratio order, pruned by the fractional
+        knapsack bound. Stops at time_limit_ms (or BRANCH_NODE_LIMIT nodes)
+        with the best selection so far, never worse than the greedy incumbent.
+        """
+        start = time.perf_counter()
+        deadline = start + time_limit_ms / 1000
+        incumbent = self._solve_greedy(constraints, eligible, start, time_limit_ms / 4)
+        best_value = incumbent.total_value if self._feasible_selection(incumbent.selected, constraints) else -1.0
+        best_selection = list(incumbent.selected)
+
+        order = eligible[np.argsort(-self.ratio[eligible], kind='stable')]
+        costs = self.costs[order]
+        values = self.values[order]
+        cum_cost = np.concatenate([[0.0], np.cumsum(costs)])
+        cum_value = np.concatenate([[0.0], np.cumsum(values)])
+        state = _State(self, constraints)
+        chosen: List[int] = []
+        nodes = 0
+        complete = True
+
+        def bound(position: int) -> float:
+            # Fractional knapsack over the undecided candidates, ignoring side constraints
+            limit = cum_cost[position] + state.remaining
+            j = int(np.searchsorted(cum_cost, limit, side='right')) - 1
+            value = cum_value[j] - cum_value[position]
+            if j < len(order):
+                value += values[j] * (limit - cum_cost[j]) / max(costs[j], 1e-9)
+            return value
+
+        # Explicit stack instead of recursion, so depth is not limited by the candidate count.
+        # (position, value) visits a node; (-1, _) undoes the most recent include.
+        # The include branch is pushed last so it is explored first.
+        stack: List[Tuple[int, float]] = [(0, 0.0)]
+        while stack:
+            position, value = stack.pop()
+            if position < 0:
+                state.remove(chosen.pop())
+                continue
+            nodes += 1
+            if nodes > BRANCH_NODE_LIMIT or (nodes % DEADLINE_CHECK_NODES == 0 and time.perf_counter() > deadline):
+                complete = False
+                break
+            if value > best_value and self._meets_minimums(state):
+                best_value, best_selection = value, list(chosen)
+            if position == len(order) or value + bound(position) <= best_value + 1e-9:
+                continue
+            i = order[position]
+            stack.append((position + 1, value))
+            if state.can_add(i):
+                state.add(i)
+                chosen.append(i)
+                stack.append((-1, 0.0))
+                stack.append((position + 1, value + values[position]))
+
+        state = _State(self, constraints)
+        if best_value < 0:
+            # Nothing found meets the platform minimums; report that rather than an infeasible incumbent
+            result = self._result(state, "branch_and_bound", optimal=complete)
+            result.feasible = False
+            return result
+        for i in best_selection:
+            state.add(i)
+        return self._result(state, "branch_and_bound", optimal=complete)
+
+    def _feasible_selection(self, selected: np.ndarray, constraints: PortfolioConstraints) -> bool:
+        state = _State(self, constraints)
+        for i in selected:
+            if not state.can_add(i):
+                return False
+            state.add(i)
+        return self._meets_minimums(state)
+
+
+def synthetic_candidates(n: int, seed: int = 0) -> Dict[str, Any]:
+    """Candidate columns with realistic score/price spreads, for benchmarks"""
+    rng = np.random.default_rng(seed)
+    followers = rng.lognormal(10, 1.5, n)
+    return {
+        "values": rng.uniform(20, 100, n),
+        "costs": np.round(np.clip(followers * 0.01 * rng.lognormal(0, 0.3, n), 50, None), 2),
+        "platforms": rng.choice(["instagram", "tiktok", "youtube"], n),
+        "niches": rng.choice(["fitness", "beauty", "tech", "food", "travel"], n)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Portfolio solver benchmark on synthetic candidates")
+    parser.add_argument('--candidates', type=int, nargs='+', default=[1_000, 100_000])
+    parser.add_argument('--budget', type=float, default=50_000)
+    parser.add_argument('--max-per-niche', type=int, default=None)
+    parser.add_argument('--mode', default='auto', choices=['auto', 'greedy', 'exact'])
+    args = parser.parse_args(argv)
+
+    for n in args.candidates:
+        data = synthetic_candidates(n)
+        solver = PortfolioSolver(data["values"], data["costs"], data["platforms"], data["niches"])
+        result = solver.solve(PortfolioConstraints(budget=args.budget, max_per_niche=args.max_per_niche), args.mode)
+        report = {"candidates": n, **result.to_dict()}
+        report["selected"] = len(result.selected)
+        print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
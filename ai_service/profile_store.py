@@ -0,0 +1,393 @@
+"""
+Profile Store for Influencelytic-Match
+Loads influencer and campaign rows by id through a pooled database client
+and converts them into matching-engine profiles, behind a read-through LRU
+with TTL, explicit invalidation and coalescing of concurrent loads, so the
+backend's id-based match call is usually a cache hit.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from demographics import DEMOGRAPHIC_COLUMNS, FULL_AGE_RANGE
+from profiles import CampaignRequirements, InfluencerProfile
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = os.getenv('DATABASE_URL', '')
+POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+CACHE_TTL_SECONDS = float(os.getenv('PROFILE_CACHE_TTL_SECONDS', 300))
+CACHE_MAX_ENTRIES = int(os.getenv('PROFILE_CACHE_SIZE', 50000))
+POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT_SECONDS', 5))
+
+# Campaign age ranges narrower than FULL_AGE_RANGE become an age-band target
+AGE_BANDS = (
+    ('age_13_17', 13, 17), ('age_18_24', 18, 24), ('age_25_34', 25, 34),
+    ('age_35_44', 35, 44), ('age_45_54', 45, 54), ('age_55_plus', 55, 200),
+)
+
+PROFILE_QUERY = "SELECT id, bio, location FROM profiles WHERE id = $1"
+ANALYTICS_QUERY = """
+SELECT platform, engagement_rate, fake_follower_percentage, posting_frequency_per_week,
+       niche_categories, interests, sentiment_score,
+       audience_age_13_17, audience_age_18_24, audience_age_25_34, audience_age_35_44,
+       audience_age_45_54, audience_age_55_plus, audience_male, audience_female, audience_other
+FROM influencer_analytics WHERE user_id = $1
+"""
+CONNECTIONS_QUERY = """
+SELECT platform, follower_count FROM social_connections WHERE user_id = $1 AND is_active
+"""
+CAMPAIGN_QUERY = """
+SELECT c.id, c.brand_id, c.title, c.description, c.brief, c.content_guidelines,
+       c.required_platforms, c.min_followers, c.max_followers, c.min_engagement_rate,
+       c.max_fake_followers, c.target_interests, c.target_locations, c.target_age_min,
+       c.target_age_max, c.target_gender, c.budget_min, c.budget_max,
+       b.target_demographics AS brand_target_demographics
+FROM campaigns c LEFT JOIN brand_profiles b ON b.user_id = c.brand_id
+WHERE c.id = $1
+"""
+
+
+class ProfileNotFound(KeyError):
+    """No row for the requested influencer or campaign id"""
+
+
+class InvalidProfileId(ValueError):
+    """An id that is not a UUID, so no row can have it"""
+
+
+class DatabaseUnavailable(RuntimeError):
+    """The pool could not hand out a working connection"""
+
+
+def normalize_id(value: Any) -> str:
+    """Canonical lowercase UUID text, so 'ABC...' and 'abc...' share a cache entry"""
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        raise InvalidProfileId(f"Invalid id: {value!r}") from None
+
+
+class PostgresDatabase:
+    """asyncpg connection pool; queries use $n placeholders"""
+
+    def __init__(self, url: str, min_size: int = POOL_MIN_SIZE, max_size: int = POOL_MAX_SIZE):
+        self.url = url
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool = None
+
+    async def connect(self):
+        import asyncpg
+
+        self.pool = await asyncpg.create_pool(self.url, min_size=self.min_size, max_size=self.max_size)
+
+    async def fetch(self, query: str, *args) -> List[Dict[str, Any]]:
+        import asyncpg
+
+        if self.pool is None:
+            raise DatabaseUnavailable("Database pool is not connected")
+        try:
+            async with self.pool.acquire(timeout=POOL_ACQUIRE_TIMEOUT_SECONDS) as connection:
+                return [dict(row) for row in await connection.fetch(query, *args)]
+        except (OSError, asyncio.TimeoutError, asyncpg.InterfaceError, asyncpg.PostgresConnectionError) as e:
+            raise DatabaseUnavailable(f"Database unavailable: {e}") from e
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+
+
+class SQLiteDatabase:
+    """
+    Local stand-in with the same interface: a fixed set of sqlite3
+    connections used from worker threads, $n placeholders rewritten to ?
+    """
+
+    def __init__(self, path: str, max_size: int = POOL_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self.pool: Optional[asyncio.Queue] = None
+
+    async def connect(self):
+        self.pool = asyncio.Queue()
+        for _ in range(self.max_size):
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            self.pool.put_nowait(connection)
+
+    async def fetch(self, query: str, *args) -> List[Dict[str, Any]]:
+        if self.pool is None:
+            raise DatabaseUnavailable("Database pool is not connected")
+        query = re.sub(r'\$\d+', '?', query)
+        try:
+            connection = await asyncio.wait_for(self.pool.get(), POOL_ACQUIRE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError as e:
+            raise DatabaseUnavailable("Timed out waiting for a database connection") from e
+        try:
+            rows = await asyncio.to_thread(lambda: connection.execute(query, args).fetchall())
+            return [dict(row) for row in rows]
+        except sqlite3.OperationalError as e:
+            raise DatabaseUnavailable(f"Database unavailable: {e}") from e
+        finally:
+            self.pool.put_nowait(connection)
+
+    async def close(self):
+        if self.pool is not None:
+            while not self.pool.empty():
+                self.pool.get_nowait().close()
+
+
+def connect_database(url: str = DEFAULT_DATABASE_URL):
+    """postgres:// or postgresql:// for the pooled asyncpg client, sqlite:///path for a local stand-in"""
+    if url.startswith(('postgres://', 'postgresql://')):
+        return PostgresDatabase(url)
+    if url.startswith('sqlite:///'):
+        return SQLiteDatabase(url[len('sqlite:///'):])
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {url.split(':', 1)[0] or '(empty)'}")
+
+
+class ReadThroughCache:
+    """
+    LRU with per-entry TTL in front of an async loader. Concurrent misses for
+    the same key share one in-flight load; invalidating a key while it loads
+    keeps the stale result out of the cache.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation: Dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """(value, served_from_cache)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value, True
+            del self._entries[key]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending), False
+
+        self.misses += 1
+        # The load runs as its own task so a cancelled leader does not take the
+        # coalesced waiters down with it; the result is cached either way
+        pending = asyncio.ensure_future(self._load(key, loader, self._generation.get(key, 0)))
+        # Retrieved here so a failure nobody else waited on is not logged as unhandled
+        pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+        self._inflight[key] = pending
+        return await asyncio.shield(pending), False
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await loader()
+        finally:
+            self._inflight.pop(key, None)
+
+        if self._generation.get(key, 0) == generation:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Hashable) -> bool:
+        self._generation[key] = self._generation.get(key, 0) + 1
+        self.invalidations += 1
+        if len(self._generation) > 4 * self.max_entries:
+            # Only keys with a load in flight need their generation kept
+            self._generation = {k: v for k, v in self._generation.items() if k in self._inflight}
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        for key in {*self._entries, *self._inflight}:
+            self.invalidate(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+def _json_list(value: Any) -> List[Any]:
+    """JSONB arrive as text from asyncpg and SQLite"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = json.loads(value) if value.strip() else []
+    return list(value) if isinstance(value, (list, tuple)) else []
+
+
+def _json_dict(value: Any) -> Dict[str, Any]:
+    if isinstance(value, str):
+        value = json.loads(value) if value.strip() else {}
+    return dict(value) if isinstance(value, dict) else {}
+
+
+def _number(value: Any, default: float = 0.0) -> float:
+    return default if value is None else float(value)
+
+
+def influencer_from_rows(profile: Dict[str, Any],
+                         analytics: Sequence[Dict[str, Any]],
+                         connections: Sequence[Dict[str, Any]]) -> InfluencerProfile:
+    """
+    One InfluencerProfile from a profiles row plus per-platform analytics and
+    social connections. Rates are follower-weighted across platforms;
+    audience demographics come from the largest platform.
+    """
+    followers = {}
+    for row in connections:
+        followers[row['platform']] = followers.get(row['platform'], 0) + int(row['follower_count'] or 0)
+    platforms = list(dict.fromkeys([*followers, *(row['platform'] for row in analytics)]))
+    weights = [max(followers.get(row['platform'], 0), 1) for row in analytics]
+    total_weight = sum(weights) or 1
+
+    def weighted(column: str) -> float:
+        return sum(_number(row[column]) * w for row, w in zip(analytics, weights)) / total_weight
+
+    niches, interests = [], []
+    for row in analytics:
+        niches.extend(_json_list(row.get('niche_categories')))
+        interests.extend(_json_list(row.get('interests')))
+
+    demographics = {}
+    if analytics:
+        largest = max(zip(analytics, weights), key=lambda pair: pair[1])[0]
+        demographics = {
+            column: float(largest[column]) for column in DEMOGRAPHIC_COLUMNS if largest.get(column) is not None
+        }
+
+    return InfluencerProfile(
+        user_id=str(profile['id']),
+        platforms=platforms,
+        follower_count=sum(followers.values()),
+        engagement_rate=weighted('engagement_rate') if analytics else 0.0,
+        niche_categories=list(dict.fromkeys([*niches, *interests])),
+        audience_demographics=demographics,
+        location=profile.get('location') or '',
+        # sentiment_score in [-1, 1] stands in for content quality until it is scored
+        content_quality_score=50 + 50 * weighted('sentiment_score') if analytics else 50,
+        fake_follower_percentage=max((_number(row['fake_follower_percentage']) for row in analytics), default=0.0),
+        posting_frequency=int(sum(_number(row['posting_frequency_per_week']) for row in analytics)),
+        bio_text=profile.get('bio') or '',
+        recent_content=[]
+    )
+
+
+def campaign_target_demographics(row: Dict[str, Any]) -> Dict[str, float]:
+    """Brand-level target demographics, overridden by the campaign's age range and gender"""
+    targets = _json_dict(row.get('brand_target_demographics'))
+    age_min = int(_number(row.get('target_age_min'), FULL_AGE_RANGE[0]))
+    age_max = int(_number(row.get('target_age_max'), FULL_AGE_RANGE[1]))
+    if (age_min, age_max) != FULL_AGE_RANGE:
+        bands = [name for name, low, high in AGE_BANDS if low <= age_max and high >= age_min]
+        for name, _, _ in AGE_BANDS:
+            targets.pop(name, None)
+        targets.update({name: 100.0 / len(bands) for name in bands})
+    gender = (row.get('target_gender') or '').strip().lower()
+    if gender in ('male', 'female', 'other'):
+        targets.update({name: 0.0 for name in ('male', 'female', 'other')})
+        targets[gender] = 100.0
+    return targets
+
+
+def campaign_from_row(row: Dict[str, Any]) -> CampaignRequirements:
+    return CampaignRequirements(
+        campaign_id=str(row['id']),
+        brand_id=str(row['brand_id']),
+        required_platforms=_json_list(row.get('required_platforms')),
+        min_followers=int(_number(row.get('min_followers'))),
+        max_followers=int(row['max_followers']) if row.get('max_followers') is not None else None,
+        min_engagement_rate=_number(row.get('min_engagement_rate')),
+        max_fake_followers=_number(row.get('max_fake_followers'), 100.0),
+        target_niches=_json_list(row.get('target_interests')),
+        target_demographics=campaign_target_demographics(row),
+        target_locations=_json_list(row.get('target_locations')),
+        budget_range=(int(_number(row.get('budget_min'))), int(_number(row.get('budget_max')))),
+        campaign_description=' '.join(filter(None, [row.get('title'), row.get('description'), row.get('brief')])),
+        content_guidelines=row.get('content_guidelines') or ''
+    )
+
+
+class ProfileStore:
+    """Read-through access to influencer and campaign profiles by id"""
+
+    def __init__(self, database, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.database = database
+        self.influencers = ReadThroughCache(max_entries, ttl_seconds)
+        self.campaigns = ReadThroughCache(max_entries, ttl_seconds)
+
+    @classmethod
+    async def connect(cls, url: str = DEFAULT_DATABASE_URL, **kwargs) -> 'ProfileStore':
+        database = connect_database(url)
+        await database.connect()
+        return cls(database, **kwargs)
+
+    async def close(self):
+        await self.database.close()
+
+    async def _load_influencer(self, influencer_id: str) -> InfluencerProfile:
+        profiles, analytics, connections = await asyncio.gather(
+            self.database.fetch(PROFILE_QUERY, influencer_id),
+            self.database.fetch(ANALYTICS_QUERY, influencer_id),
+            self.database.fetch(CONNECTIONS_QUERY, influencer_id),
+        )
+        if not profiles:
+            raise ProfileNotFound(f"Influencer {influencer_id} not found")
+        return influencer_from_rows(profiles[0], analytics, connections)
+
+    async def _load_campaign(self, campaign_id: str) -> CampaignRequirements:
+        rows = await self.database.fetch(CAMPAIGN_QUERY, campaign_id)
+        if not rows:
+            raise ProfileNotFound(f"Campaign {campaign_id} not found")
+        return campaign_from_row(rows[0])
+
+    async def influencer(self, influencer_id: str) -> Tuple[InfluencerProfile, bool]:
+        influencer_id = normalize_id(influencer_id)
+        return await self.influencers.get(influencer_id, lambda: self._load_influencer(influencer_id))
+
+    async def campaign(self, campaign_id: str) -> Tuple[CampaignRequirements, bool]:
+        campaign_id = normalize_id(campaign_id)
+        return await self.campaigns.get(campaign_id, lambda: self._load_campaign(campaign_id))
+
+    def invalidate(self, influencer_ids: Sequence[str] = (), campaign_ids: Sequence[str] = ()) -> int:
+        influencer_ids = [normalize_id(key) for key in influencer_ids]
+        campaign_ids = [normalize_id(key) for key in campaign_ids]
+        dropped = sum(self.influencers.invalidate(key) for key in influencer_ids)
+        return dropped + sum(self.campaigns.invalidate(key) for key in campaign_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"influencers": self.influencers.stats(), "campaigns": self.campaigns.stats()}
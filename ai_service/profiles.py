@@ -0,0 +1,44 @@
+"""
+Matching Profiles for Influencelytic-Match
+The influencer and campaign records the matching engine scores, kept free
+of model dependencies so stores and loaders can build them without
+importing the engine
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass
+class InfluencerProfile:
+    """Represents an influencer's profile for matching"""
+    user_id: str
+    platforms: List[str]
+    follower_count: int
+    engagement_rate: float
+    niche_categories: List[str]
+    audience_demographics: Dict[str, float]
+    location: str
+    content_quality_score: float
+    fake_follower_percentage: float
+    posting_frequency: int
+    bio_text: str
+    recent_content: List[str]
+
+
+@dataclass
+class CampaignRequirements:
+    """Represents a brand's campaign requirements"""
+    campaign_id: str
+    brand_id: str
+    required_platforms: List[str]
+    min_followers: int
+    max_followers: int
+    min_engagement_rate: float
+    max_fake_followers: float
+    target_niches: List[str]
+    target_demographics: Dict[str, float]
+    target_locations: List[str]
+    budget_range: Tuple[int, int]
+    campaign_description: str
+    content_guidelines: str
@@ -0,0 +1,5 @@
+"""
+Service Routes for Influencelytic-Match
+APIRouters for the streaming and sketch-backed subsystems. Each module owns
+its store, request models and startup/shutdown hooks; main3 includes them.
+"""
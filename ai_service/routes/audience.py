@@ -0,0 +1,76 @@
+"""
+Audience Overlap Routes for Influencelytic-Match
+Follower-id ingest into per-influencer HyperLogLog sketches, deduplicated
+campaign reach and pairwise audience overlap
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import List
+
+import numpy as np
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from audience_sketch import AudienceSketchStore
+from routes.dependencies import inference_executor, verify_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/audience")
+
+# HyperLogLog follower sketches per influencer for overlap-aware reach
+audience_sketches = AudienceSketchStore.load_if_exists()
+
+class AudienceFollowerBatch(BaseModel):
+    influencer_id: str
+    follower_ids: List[str]                # platform follower ids, sent in chunks
+
+class AudienceReachRequest(BaseModel):
+    influencer_ids: List[str]
+
+@router.on_event("shutdown")
+async def persist_audience_sketches():
+    try:
+        audience_sketches.save()
+    except Exception as e:
+        logger.error(f"Error saving audience sketches: {e}")
+
+@router.post("/sketches")
+async def ingest_audience_followers(request: AudienceFollowerBatch, token: str = Depends(verify_token)):
+    """Fold a chunk of an influencer's follower ids into their audience sketch"""
+    await asyncio.get_running_loop().run_in_executor(
+        inference_executor, audience_sketches.add_followers, request.influencer_id, request.follower_ids
+    )
+    
+    return {
+        "influencer_id": request.influencer_id,
+        "follower_ids_ingested": len(request.follower_ids),
+        "estimated_audience": int(audience_sketches.cardinality([request.influencer_id])[request.influencer_id]),
+        "sketches_stored": len(audience_sketches)
+    }
+
+@router.post("/reach")
+async def estimate_campaign_reach(request: AudienceReachRequest, token: str = Depends(verify_token)):
+    """Deduplicated reach of booking a set of influencers together"""
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        **audience_sketches.campaign_reach(request.influencer_ids)
+    }
+
+@router.post("/overlap")
+async def audience_overlap(request: AudienceReachRequest, token: str = Depends(verify_token)):
+    """Pairwise shared-audience estimates for a candidate set"""
+    overlap = await asyncio.get_running_loop().run_in_executor(
+        inference_executor, audience_sketches.overlap_matrix, request.influencer_ids
+    )
+    
+    return {
+        "analysis_timestamp": datetime.now().isoformat(),
+        "influencer_ids": overlap["influencer_ids"],
+        "missing_influencers": [i for i in request.influencer_ids if i not in audience_sketches],
+        "audience_size": np.round(overlap["audience_size"]).astype(int).tolist(),
+        "shared_audience": np.round(overlap["shared_audience"]).astype(int).tolist(),
+        "jaccard": np.round(overlap["jaccard"], 4).tolist()
+    }
@@ -0,0 +1,25 @@
+"""
+Shared Route Dependencies for Influencelytic-Match
+Token check and inference pool used by main3 and every router
+"""
+
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+# Security
+security = HTTPBearer()
+
+# Model inference runs here so the event loop stays responsive under load
+inference_executor = ThreadPoolExecutor(max_workers=int(os.getenv('MAX_WORKERS', 4)))
+
+# Authentication dependency
+async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    # In production, verify the token with your auth service
+    # For now, we'll just check if a token is provided
+    if not credentials.token:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return credentials.token
@@ -0,0 +1,73 @@
+"""
+Follower Stream Routes for Influencelytic-Match
+Follower snapshot ingest into the streaming anomaly monitor, and per-account
+anomaly state
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from follower_stream_detector import StreamingFollowerMonitor
+from routes.dependencies import verify_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/stream/follower-snapshots")
+
+# Incremental follower anomaly state, persisted across restarts
+FOLLOWER_MONITOR_STATE_PATH = os.getenv('FOLLOWER_MONITOR_STATE_PATH', 'data/follower_monitor_state.json')
+follower_monitor = (
+    StreamingFollowerMonitor.load(FOLLOWER_MONITOR_STATE_PATH)
+    if os.path.exists(FOLLOWER_MONITOR_STATE_PATH) else StreamingFollowerMonitor()
+)
+
+class FollowerSnapshot(BaseModel):
+    influencer_id: str
+    platform: str
+    timestamp: datetime
+    follower_count: int
+    following_count: Optional[int] = None
+    engagement_rate: Optional[float] = None
+
+class FollowerSnapshotBatch(BaseModel):
+    snapshots: List[FollowerSnapshot]
+
+@router.on_event("shutdown")
+async def persist_follower_monitor():
+    try:
+        follower_monitor.save(FOLLOWER_MONITOR_STATE_PATH)
+    except Exception as e:
+        logger.error(f"Error saving follower monitor state: {e}")
+
+@router.post("")
+async def ingest_follower_snapshots(request: FollowerSnapshotBatch, token: str = Depends(verify_token)):
+    """Update streaming follower anomaly state and return any flags raised"""
+    events = []
+    for snapshot in sorted(request.snapshots, key=lambda s: s.timestamp):
+        events.extend(follower_monitor.update(
+            f"{snapshot.influencer_id}:{snapshot.platform}",
+            snapshot.timestamp.timestamp(),
+            snapshot.follower_count,
+            snapshot.following_count,
+            snapshot.engagement_rate
+        ))
+    
+    return {
+        "snapshots_processed": len(request.snapshots),
+        "accounts_tracked": len(follower_monitor),
+        "events": [event.to_dict() for event in events],
+        "analysis_timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/{influencer_id}/{platform}")
+async def follower_stream_state(influencer_id: str, platform: str, token: str = Depends(verify_token)):
+    """Current streaming anomaly state for one account"""
+    summary = follower_monitor.account_summary(f"{influencer_id}:{platform}")
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No snapshots received for this account")
+    return {"influencer_id": influencer_id, "platform": platform, **summary}
@@ -0,0 +1,107 @@
+"""
+Market Rate Routes for Influencelytic-Match
+Ingest of completed transactions and application rates, and per-segment
+market rate quantiles from the published snapshot
+"""
+
+import asyncio
+import logging
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from market_rates import SOURCES, MarketRateIndex
+from routes.dependencies import inference_executor, verify_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/market/rates")
+
+# Live market rate sketches; readers see the snapshot published by the last refresh
+market_rate_index = MarketRateIndex.load_if_exists()
+MARKET_RATE_REFRESH_SECONDS = float(os.getenv('MARKET_RATE_REFRESH_SECONDS', 300))
+
+class MarketRateObservation(BaseModel):
+    platform: str
+    niche: Optional[str] = None            # brand industry of the campaign
+    follower_count: int
+    price: float                           # transactions.amount or applications.proposed_rate
+    source: str = "transaction"
+
+class MarketRateBatch(BaseModel):
+    observations: List[MarketRateObservation]
+
+async def refresh_market_rates():
+    """Republish the market rate snapshot on a fixed interval"""
+    while True:
+        await asyncio.sleep(MARKET_RATE_REFRESH_SECONDS)
+        try:
+            await asyncio.get_running_loop().run_in_executor(inference_executor, market_rate_index.refresh)
+        except Exception as e:
+            logger.error(f"Error refreshing market rate index: {e}")
+
+@router.on_event("startup")
+async def start_market_rate_refresh():
+    asyncio.create_task(refresh_market_rates())
+
+@router.on_event("shutdown")
+async def persist_market_rates():
+    try:
+        market_rate_index.save()
+    except Exception as e:
+        logger.error(f"Error saving market rate index: {e}")
+
+@router.post("/ingest")
+async def ingest_market_rates(request: MarketRateBatch, token: str = Depends(verify_token)):
+    """
+    Fold completed transactions and application rates into the market rate
+    sketches. Pricing reads the published snapshot, so new observations take
+    effect at the next refresh (every MARKET_RATE_REFRESH_SECONDS).
+    """
+    for observation in request.observations:
+        if observation.source not in SOURCES:
+            raise HTTPException(status_code=400, detail=f"Unknown rate source: {observation.source}")
+    for observation in request.observations:
+        market_rate_index.ingest(
+            observation.platform,
+            observation.niche,
+            observation.follower_count,
+            observation.price,
+            observation.source
+        )
+    
+    return {
+        "observations_ingested": len(request.observations),
+        **market_rate_index.stats()
+    }
+
+@router.get("/{platform}")
+async def market_rate_quantiles(
+    platform: str,
+    follower_count: int,
+    niche: Optional[str] = None,
+    price: Optional[float] = None,
+    source: str = "transaction",
+    token: str = Depends(verify_token)
+):
+    """Median market rate for a segment, and the percentile of a quoted price"""
+    if source not in SOURCES:
+        raise HTTPException(status_code=400, detail=f"Unknown rate source: {source}")
+    median_rate = market_rate_index.median_rate(platform, niche, follower_count, source)
+    if median_rate is None:
+        raise HTTPException(status_code=404, detail="Not enough market data for this segment")
+    
+    return {
+        "platform": platform,
+        "niche": niche,
+        "follower_count": follower_count,
+        "median_rate": median_rate,
+        "median_price": round(median_rate * follower_count, 2),
+        "price_percentile": (
+            round(market_rate_index.price_percentile(platform, niche, follower_count, price, source), 1)
+            if price is not None else None
+        ),
+        "refreshed_at": market_rate_index.refreshed_at
+    }
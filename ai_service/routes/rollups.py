@@ -0,0 +1,82 @@
+"""
+Engagement Rollup Routes for Influencelytic-Match
+content_performance ingest into the daily engagement buckets, and trailing
+window sums and per-post averages
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from engagement_rollups import EngagementRollupStore
+from routes.dependencies import inference_executor, verify_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/rollups")
+
+# Daily engagement buckets per influencer and platform for windowed stats
+engagement_rollups = EngagementRollupStore.load_if_exists()
+
+class ContentPerformanceRow(BaseModel):
+    """One content_performance row; resending a row later applies only the change"""
+    user_id: str
+    platform: str
+    content_id: str
+    posted_at: Optional[datetime] = None   # content_performance.posted_at is nullable; needed for unseen posts
+    likes: int = 0
+    comments: int = 0
+    shares: int = 0
+    saves: int = 0
+    views: int = 0
+
+class ContentPerformanceBatch(BaseModel):
+    rows: List[ContentPerformanceRow]
+
+@router.on_event("shutdown")
+async def persist_engagement_rollups():
+    try:
+        engagement_rollups.save()
+    except Exception as e:
+        logger.error(f"Error saving engagement rollups: {e}")
+
+@router.post("/content-performance")
+async def ingest_content_performance(request: ContentPerformanceBatch, token: str = Depends(verify_token)):
+    """Fold content_performance rows (new or re-synced) into the daily engagement buckets"""
+    rows = [
+        {**row.model_dump(exclude={"posted_at"}),
+         "posted_at": row.posted_at.timestamp() if row.posted_at is not None else None}
+        for row in request.rows
+    ]
+    applied = await asyncio.get_running_loop().run_in_executor(
+        inference_executor, engagement_rollups.upsert_many, rows
+    )
+    
+    return {
+        "rows_received": len(request.rows),
+        "rows_skipped_without_posted_at": len(rows) - applied,
+        **engagement_rollups.stats()
+    }
+
+@router.get("/engagement/{influencer_id}")
+async def engagement_rollup_windows(
+    influencer_id: str,
+    platform: Optional[str] = None,
+    windows: str = "7,30,90",
+    token: str = Depends(verify_token)
+):
+    """Engagement sums and per-post averages over trailing day windows"""
+    try:
+        days = [int(window) for window in windows.split(",") if window.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="windows must be comma-separated day counts")
+    if not days or min(days) <= 0:
+        raise HTTPException(status_code=400, detail="windows must be positive day counts")
+    stats = engagement_rollups.window_stats(influencer_id, platform, days)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No content performance received for this influencer")
+    return {"influencer_id": influencer_id, "platform": platform, "windows": stats}
@@ -0,0 +1,79 @@
+"""
+Trending Tag Routes for Influencelytic-Match
+Post ingest into the windowed hashtag/mention sketches and top-k queries
+with growth against the previous window
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from routes.dependencies import inference_executor, verify_token
+from trending import KINDS, TrendEngine
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/trends")
+
+# Heavy-hitter hashtag/mention sketches over the post stream, current and previous window
+trend_engine = TrendEngine.load_if_exists(window_seconds=float(os.getenv('TREND_WINDOW_SECONDS', 3600)))
+
+class TrendPost(BaseModel):
+    content: str = ""
+    platform: str
+    niche: Optional[str] = None            # influencer's primary interest
+    timestamp: datetime
+    hashtags: List[str] = []               # content_performance.hashtags when already parsed
+
+class TrendPostBatch(BaseModel):
+    posts: List[TrendPost]
+
+@router.on_event("shutdown")
+async def persist_trend_engine():
+    try:
+        trend_engine.save()
+    except Exception as e:
+        logger.error(f"Error saving trend engine state: {e}")
+
+@router.post("/ingest")
+async def ingest_trend_posts(request: TrendPostBatch, token: str = Depends(verify_token)):
+    """Fold a batch of posts into the windowed hashtag and mention sketches"""
+    posts = [
+        {**post.model_dump(exclude={"timestamp"}), "timestamp": post.timestamp.timestamp()}
+        for post in request.posts
+    ]
+    await asyncio.get_running_loop().run_in_executor(inference_executor, trend_engine.ingest_many, posts)
+    
+    return {
+        "posts_received": len(request.posts),
+        **trend_engine.stats()
+    }
+
+@router.get("/{kind}")
+async def trending_tags(
+    kind: str,
+    platform: Optional[str] = None,
+    niche: Optional[str] = None,
+    k: int = 10,
+    sort_by: str = "count",
+    min_count: int = 5,
+    token: str = Depends(verify_token)
+):
+    """Top-k hashtags or mentions in the current window, with growth vs. the previous window"""
+    if kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown tag kind: {kind}")
+    if sort_by not in ("count", "growth"):
+        raise HTTPException(status_code=400, detail=f"Unknown trend ordering: {sort_by}")
+    result = trend_engine.trending(platform, niche, kind, min(max(k, 1), 100), sort_by, min_count)
+    window_start = result["window_start"]
+    
+    return {
+        **result,
+        "window_start": datetime.fromtimestamp(window_start).isoformat() if window_start is not None else None,
+        "window_seconds": trend_engine.window_seconds
+    }
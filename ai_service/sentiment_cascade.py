@@ -0,0 +1,288 @@
+"""
+Cascade Sentiment Inference for Influencelytic-Match
+Scores every post with a compiled lexicon first and only escalates
+low-confidence or conflicting posts to the transformer model
+"""
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+# RoBERTa label convention used across the service
+NEGATIVE, NEUTRAL, POSITIVE = 0, 1, 2
+LABELS = ('LABEL_0', 'LABEL_1', 'LABEL_2')
+
+# Some checkpoints return readable names instead of LABEL_x
+_LABEL_ALIASES = {
+    'negative': 'LABEL_0',
+    'neutral': 'LABEL_1',
+    'positive': 'LABEL_2',
+}
+
+POSITIVE_WORDS = [
+    'amazing', 'awesome', 'fantastic', 'great', 'excellent', 'wonderful',
+    'perfect', 'love', 'best', 'incredible', 'outstanding', 'brilliant',
+    'good', 'nice', 'happy', 'excited', 'thrilled', 'delighted',
+    'obsessed', 'gorgeous', 'beautiful', 'favorite', 'favourite', 'grateful',
+    'blessed', 'stunning', 'recommend', 'enjoy', 'enjoyed', 'fun', 'cute',
+    'yummy', 'delicious', 'glow', 'inspired', 'loving', 'loved'
+]
+
+NEGATIVE_WORDS = [
+    'terrible', 'awful', 'bad', 'horrible', 'worst', 'hate', 'disgusting',
+    'disappointing', 'poor', 'sad', 'angry', 'frustrated', 'annoying',
+    'stupid', 'ugly', 'boring', 'useless', 'disappointed', 'broken',
+    'scam', 'waste', 'refund', 'gross', 'mad', 'upset'
+]
+
+NEUTRAL_WORDS = [
+    'okay', 'fine', 'average', 'normal', 'standard', 'typical', 'regular'
+]
+
+# Negators and contrast markers flip or muddy the lexicon signal,
+# so posts containing them are always sent to the transformer
+NEGATORS = [
+    'not', 'no', 'never', 'nothing', 'dont', "don't", 'didnt', "didn't",
+    'isnt', "isn't", 'wasnt', "wasn't", 'cant', "can't", 'wont', "won't",
+    'but', 'however', 'although'
+]
+
+
+def normalize_label(label: str) -> str:
+    """Map a transformer label onto the LABEL_0/1/2 convention"""
+    return _LABEL_ALIASES.get(label.lower(), label)
+
+
+def label_to_score(label: str, confidence: float) -> float:
+    """Convert a label and its confidence into a signed sentiment score"""
+    if label == 'LABEL_2':
+        return confidence
+    if label == 'LABEL_0':
+        return -confidence
+    return 0.0
+
+
+@dataclass
+class LexiconResult:
+    """Per-post lexicon classification for a batch of texts"""
+    labels: np.ndarray       # int8 class ids (NEGATIVE/NEUTRAL/POSITIVE)
+    confidence: np.ndarray   # float32 in [0, 1]
+    conflict: np.ndarray     # bool, mixed polarity or negation present
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class LexiconSentimentScorer:
+    """Word-list sentiment scorer compiled into a single regex pass per post"""
+
+    def __init__(self,
+                 positive_words: Iterable[str] = POSITIVE_WORDS,
+                 negative_words: Iterable[str] = NEGATIVE_WORDS,
+                 neutral_words: Iterable[str] = NEUTRAL_WORDS,
+                 negators: Iterable[str] = NEGATORS):
+        groups = {
+            'pos': positive_words,
+            'neg': negative_words,
+            'neu': neutral_words,
+            'negate': negators,
+        }
+        alternatives = []
+        for name, words in groups.items():
+            # Longest first so "loving" is not shadowed by "love"
+            escaped = sorted((re.escape(w.lower()) for w in words), key=len, reverse=True)
+            alternatives.append(f"(?P<{name}>{'|'.join(escaped)})")
+
+        self.pattern = re.compile(
+            r"(?<![\w'])(?:" + '|'.join(alternatives) + r")(?![\w'])",
+            re.IGNORECASE
+        )
+        self._group_index = {name: i for i, name in enumerate(groups)}
+
+    def count(self, texts: List[str]) -> np.ndarray:
+        """Return an (n_texts, 4) int32 matrix of pos/neg/neu/negate hits"""
+        counts = np.zeros((len(texts), len(self._group_index)), dtype=np.int32)
+        finditer = self.pattern.finditer
+        group_index = self._group_index
+
+        for row, text in enumerate(texts):
+            if not text:
+                continue
+            for match in finditer(text):
+                counts[row, group_index[match.lastgroup]] += 1
+
+        return counts
+
+    def score(self, texts: List[str]) -> LexiconResult:
+        """Classify a batch of texts with vectorized confidence estimation"""
+        counts = self.count(texts)
+        pos, neg, neu, negate = counts.T
+
+        margin = pos - neg
+        labels = np.full(len(texts), NEUTRAL, dtype=np.int8)
+        labels[(margin > 0) & (pos > neu)] = POSITIVE
+        labels[(margin < 0) & (neg > neu)] = NEGATIVE
+
+        # Each net polarity word halves the remaining uncertainty:
+        # one word -> 0.5, two -> 0.75, three -> 0.875
+        confidence = 1.0 - np.power(0.5, np.abs(margin)).astype(np.float32)
+        confidence[labels == NEUTRAL] = 0.0
+
+        conflict = ((pos > 0) & (neg > 0)) | (negate > 0)
+
+        return LexiconResult(labels=labels, confidence=confidence, conflict=conflict)
+
+
+class CascadeMetrics:
+    """Thread-safe counters describing how often the cascade escalates"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.posts_scored = 0
+            self.escalated = 0
+            self.escalated_low_confidence = 0
+            self.escalated_conflict = 0
+            self.batches = 0
+
+    def record(self, total: int, low_confidence: int, conflict: int, escalated: int):
+        with self._lock:
+            self.batches += 1
+            self.posts_scored += total
+            self.escalated += escalated
+            self.escalated_low_confidence += low_confidence
+            self.escalated_conflict += conflict
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            rate = self.escalated / self.posts_scored if self.posts_scored else 0.0
+            return {
+                "batches": self.batches,
+                "posts_scored": self.posts_scored,
+                "escalated": self.escalated,
+                "escalated_low_confidence": self.escalated_low_confidence,
+                "escalated_conflict": self.escalated_conflict,
+                "escalation_rate": round(rate, 4),
+                "lexicon_only_rate": round(1 - rate, 4) if self.posts_scored else 0.0
+            }
+
+
+class CascadeSentimentAnalyzer:
+    """Lexicon fast path with transformer escalation for ambiguous posts"""
+
+    def __init__(self,
+                 transformer: Optional[Callable[[List[str]], List[Dict[str, Any]]]],
+                 lexicon: Optional[LexiconSentimentScorer] = None,
+                 confidence_threshold: Optional[float] = None,
+                 max_text_length: int = 512):
+        self.transformer = transformer
+        self.lexicon = lexicon or LexiconSentimentScorer()
+        if confidence_threshold is None:
+            confidence_threshold = float(os.getenv('SENTIMENT_CONFIDENCE_THRESHOLD', 0.7))
+        self.confidence_threshold = confidence_threshold
+        self.max_text_length = max_text_length
+        self.metrics = CascadeMetrics()
+
+    def classify_lexicon(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Lexicon-only classification, never calls the transformer"""
+        result = self.lexicon.score(texts)
+        return [
+            {"label": LABELS[label], "score": float(conf), "source": "lexicon"}
+            for label, conf in zip(result.labels, result.confidence)
+        ]
+
+    def classify_transformer(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Transformer-only classification for a batch of texts"""
+        if not texts:
+            return []
+        if self.transformer is None:
+            raise RuntimeError("Transformer model is not available")
+
+        outputs = self.transformer([text[:self.max_text_length] for text in texts])
+        results = []
+        for output in outputs:
+            # Pipelines configured with return_all_scores yield a list per input
+            if isinstance(output, list):
+                output = max(output, key=lambda r: r['score'])
+            results.append({
+                "label": normalize_label(output['label']),
+                "score": float(output['score']),
+                "source": "transformer"
+            })
+        return results
+
+    def classify(self,
+                 texts: List[str],
+                 confidence_threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Classify texts, escalating only uncertain posts to the transformer"""
+        threshold = self.confidence_threshold if confidence_threshold is None else confidence_threshold
+        lexicon = self.lexicon.score(texts)
+
+        low_confidence = lexicon.confidence < threshold
+        escalate = low_confidence | lexicon.conflict
+        if self.transformer is None:
+            escalate[:] = False
+
+        results = [
+            {"label": LABELS[label], "score": float(conf), "source": "lexicon"}
+            for label, conf in zip(lexicon.labels, lexicon.confidence)
+        ]
+
+        escalated_idx = np.flatnonzero(escalate)
+        if len(escalated_idx):
+            model_results = self.classify_transformer([texts[i] for i in escalated_idx])
+            for i, model_result in zip(escalated_idx, model_results):
+                results[i] = model_result
+
+        self.metrics.record(
+            total=len(texts),
+            low_confidence=int(np.count_nonzero(low_confidence & escalate)),
+            conflict=int(np.count_nonzero(lexicon.conflict & escalate)),
+            escalated=len(escalated_idx)
+        )
+        return results
+
+    def agreement_report(self,
+                         texts: List[str],
+                         confidence_threshold: Optional[float] = None) -> Dict[str, Any]:
+        """Compare cascade output against transformer-only mode on the same texts"""
+        threshold = self.confidence_threshold if confidence_threshold is None else confidence_threshold
+        reference = self.classify_transformer(texts)
+        lexicon = self.lexicon.score(texts)
+        escalate = (lexicon.confidence < threshold) | lexicon.conflict
+
+        cascade_labels = np.array([
+            reference[i]['label'] if escalate[i] else LABELS[lexicon.labels[i]]
+            for i in range(len(texts))
+        ])
+        reference_labels = np.array([r['label'] for r in reference])
+        lexicon_labels = np.array([LABELS[label] for label in lexicon.labels])
+
+        fast_path = ~escalate
+        total = len(texts)
+        confusion = {
+            ref: {lex: int(np.count_nonzero(fast_path & (reference_labels == ref) & (lexicon_labels == lex)))
+                  for lex in LABELS}
+            for ref in LABELS
+        }
+
+        return {
+            "posts_compared": total,
+            "confidence_threshold": threshold,
+            "escalation_rate": round(float(escalate.mean()), 4) if total else 0.0,
+            "cascade_agreement": round(float((cascade_labels == reference_labels).mean()), 4) if total else 0.0,
+            "fast_path_agreement": (
+                round(float((lexicon_labels[fast_path] == reference_labels[fast_path]).mean()), 4)
+                if fast_path.any() else None
+            ),
+            "lexicon_only_agreement": round(float((lexicon_labels == reference_labels).mean()), 4) if total else 0.0,
+            "fast_path_confusion": confusion
+        }
@@ -0,0 +1,170 @@
+"""
+Streaming Sentiment Analysis for Influencelytic-Match
+Consumes NDJSON post histories in bounded-memory chunks and emits per-post
+results plus running aggregates as NDJSON
+"""
+
+import asyncio
+import json
+import logging
+import math
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sentiment_cascade import LABELS, label_to_score
+
+logger = logging.getLogger(__name__)
+
+LABEL_NAMES = {'LABEL_0': 'negative', 'LABEL_1': 'neutral', 'LABEL_2': 'positive'}
+
+# A single post larger than this is rejected rather than buffered
+MAX_LINE_BYTES = 1 << 20
+
+
+class RunningSentimentStats:
+    """Constant-memory label distribution and Welford mean/variance of scores"""
+
+    def __init__(self):
+        self.counts = {label: 0 for label in LABELS}
+        self.total = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.transformer_posts = 0
+        self.errors = 0
+
+    def update(self, label: str, score: float, source: str = "transformer"):
+        self.counts[label] = self.counts.get(label, 0) + 1
+        self.total += 1
+        delta = score - self.mean
+        self.mean += delta / self.total
+        self._m2 += delta * (score - self.mean)
+        if source == "transformer":
+            self.transformer_posts += 1
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.total - 1)) if self.total > 1 else 0.0
+
+    def snapshot(self, final: bool = False) -> Dict[str, Any]:
+        total = max(self.total, 1)
+        return {
+            "type": "aggregate",
+            "final": final,
+            "post_count_analyzed": self.total,
+            "overall_sentiment": round(self.mean, 4),
+            "sentiment_std": round(self.std, 4),
+            "sentiment_distribution": {
+                LABEL_NAMES[label]: round(self.counts[label] / total * 100, 1)
+                for label in LABELS
+            },
+            "transformer_posts": self.transformer_posts,
+            "errors": self.errors
+        }
+
+
+def _parse_post(line: bytes) -> Tuple[Optional[str], str]:
+    """Return (post id, content) from an NDJSON line; bare strings are accepted"""
+    record = json.loads(line)
+    if isinstance(record, str):
+        return None, record
+    if not isinstance(record, dict):
+        raise ValueError("Each line must be a JSON object or string")
+    content = record.get('content') or ''
+    if not isinstance(content, str):
+        raise ValueError(f"content must be a string, got {type(content).__name__}")
+    return record.get('id'), content
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes],
+                            max_line_bytes: int = MAX_LINE_BYTES) -> AsyncIterator[bytes]:
+    """Split a byte stream into non-empty lines without buffering the whole body"""
+    buffer = b''
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            if line.strip():
+                yield line
+        if len(buffer) > max_line_bytes:
+            raise ValueError(f"NDJSON line exceeds {max_line_bytes} bytes")
+    if buffer.strip():
+        yield buffer
+
+
+async def stream_sentiment(chunks: AsyncIterator[bytes],
+                           classify: Callable[[List[str]], List[Dict[str, Any]]],
+                           executor: Optional[Executor] = None,
+                           chunk_size: int = 256,
+                           include_posts: bool = True) -> AsyncIterator[str]:
+    """
+    Classify an unbounded NDJSON post stream chunk by chunk.
+    Yields NDJSON lines: per-post results, a partial aggregate after every
+    chunk and a final aggregate once the input is exhausted. A chunk the
+    classifier fails on yields an error line per post and streaming goes on.
+    """
+    stats = RunningSentimentStats()
+    loop = asyncio.get_running_loop()
+    ids: List[Optional[str]] = []
+    texts: List[str] = []
+    lines: List[int] = []
+    line_number = 0
+
+    async def flush():
+        out = []
+        try:
+            results = await loop.run_in_executor(executor, classify, texts)
+            if len(results) != len(texts):
+                raise ValueError(f"Classifier returned {len(results)} results for {len(texts)} posts")
+            scores = [label_to_score(result['label'], result['score']) for result in results]
+        except Exception as e:
+            logger.warning(f"Sentiment classification failed for a chunk of {len(texts)} posts: {e}")
+            # Nothing from a failed chunk reaches the aggregate
+            stats.errors += len(texts)
+            for post_line, post_id in zip(lines, ids):
+                out.append(json.dumps({
+                    "type": "error", "line": post_line, "id": post_id, "detail": f"Classification failed: {e}"
+                }) + '\n')
+            results, scores = [], []
+        for post_id, result, score in zip(ids, results, scores):
+            stats.update(result['label'], score, result.get('source', 'transformer'))
+            if include_posts:
+                out.append(json.dumps({
+                    "type": "post",
+                    "id": post_id,
+                    "sentiment": LABEL_NAMES.get(result['label'], result['label']),
+                    "score": round(score, 4),
+                    "confidence": round(result['score'], 4),
+                    "source": result.get('source')
+                }) + '\n')
+        out.append(json.dumps(stats.snapshot()) + '\n')
+        ids.clear()
+        texts.clear()
+        lines.clear()
+        return out
+
+    try:
+        async for line in iter_ndjson_lines(chunks):
+            line_number += 1
+            try:
+                post_id, content = _parse_post(line)
+            except ValueError as e:
+                stats.errors += 1
+                yield json.dumps({"type": "error", "line": line_number, "detail": str(e)}) + '\n'
+                continue
+            if not content:
+                continue
+
+            ids.append(post_id)
+            texts.append(content)
+            lines.append(line_number)
+            if len(texts) >= chunk_size:
+                for out_line in await flush():
+                    yield out_line
+    except ValueError as e:
+        stats.errors += 1
+        yield json.dumps({"type": "error", "line": line_number + 1, "detail": str(e)}) + '\n'
+
+    if texts:
+        for out_line in await flush():
+            yield out_line
+    yield json.dumps(stats.snapshot(final=True)) + '\n'
@@ -0,0 +1,29 @@
+import numpy as np
+
+from audience_sketch import REACH_RATE, AudienceSketchStore
+
+
+def store_with_overlap():
+    store = AudienceSketchStore()
+    store.add_followers("a", np.arange(0, 20_000))
+    store.add_followers("b", np.arange(10_000, 30_000))
+    return store
+
+
+def test_campaign_reach_deduplicates_shared_followers():
+    reach = store_with_overlap().campaign_reach(["a", "b"])
+    assert abs(reach['unique_audience'] - 30_000) < 30_000 * 0.05
+    assert abs(reach['total_audience'] - 40_000) < 40_000 * 0.05
+    assert reach['deduplicated_reach'] == int(reach['unique_audience'] * REACH_RATE)
+    assert 20 < reach['audience_overlap_pct'] < 30
+
+
+def test_combined_reach_adds_unsketched_influencers_at_their_estimate():
+    store = store_with_overlap()
+    sketched = store.campaign_reach(["a", "b"])
+    reach = store.combined_reach(["a", "b", "c"], {"a": 1e9, "c": 1500.0})
+
+    assert reach['missing_influencers'] == ["c"]
+    assert reach['deduplicated_reach'] == sketched['deduplicated_reach'] + 1500
+    assert reach['naive_reach'] == sketched['naive_reach'] + 1500
+    assert store.combined_reach(["c"], {"c": 1500.0})['deduplicated_reach'] == 1500
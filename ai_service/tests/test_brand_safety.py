@@ -0,0 +1,42 @@
+import pytest
+
+from brand_safety import BrandSafetyScanner, DEFAULT_LEXICON, brand_safety_score
+
+UNSAFE_KEYWORDS = ['controversy', 'scandal', 'hate', 'violence', 'drugs', 'alcohol']
+SAFE_KEYWORDS = ['positive', 'inspiration', 'family', 'health', 'education']
+
+
+def keyword_score(texts):
+    """The keyword loop the scanner replaced: each keyword counts once per post"""
+    unsafe_count = sum(keyword in text.lower() for text in texts for keyword in UNSAFE_KEYWORDS)
+    safe_count = sum(keyword in text.lower() for text in texts for keyword in SAFE_KEYWORDS)
+    if unsafe_count > 0:
+        return max(2.0, 10 - (unsafe_count * 2))
+    elif safe_count > 0:
+        return 10.0
+    return 8.0
+
+
+@pytest.mark.parametrize("texts", [
+    ["Scandal! Scandal! SCANDAL!"],
+    ["drugs and alcohol", "more alcohol, alcohol everywhere"],
+    ["family family family health"],
+    ["controversy scandal hate violence drugs alcohol"],
+    ["nothing to see here", ""],
+    [],
+])
+def test_score_matches_the_keyword_checks(texts):
+    scan = BrandSafetyScanner.from_lexicon(DEFAULT_LEXICON).scan(texts)
+    assert brand_safety_score(scan) == keyword_score(texts)
+
+
+def test_repeated_term_counts_once_per_post():
+    scan = BrandSafetyScanner.from_lexicon(DEFAULT_LEXICON).scan(["alcohol alcohol", "alcohol", "hate hate"])
+    assert scan.category_hits["alcohol"] == 2 and scan.category_hits["hate"] == 1
+    assert scan.post_unsafe_weight.tolist() == [1.0, 1.0, 1.0]
+    assert scan.top_terms[0] == ("alcohol", 2)
+
+
+def test_matches_whole_words_only():
+    scan = BrandSafetyScanner.from_lexicon(DEFAULT_LEXICON).scan(["whatever, hateful"])
+    assert scan.unsafe_weight == 0
@@ -0,0 +1,85 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from campaign_index import MAX_PLATFORMS, CampaignConstraints, CampaignEligibilityIndex, synthetic_campaigns
+
+
+def brute_force(campaigns, followers, engagement, fake, platforms, location, tolerance=0.1):
+    return sorted(
+        c.campaign_id for c in campaigns
+        if c.min_followers <= followers * (1 + tolerance)
+        and (c.max_followers is None or c.max_followers >= followers * (1 - tolerance))
+        and c.min_engagement_rate <= engagement * (1 + tolerance) and c.max_fake_followers >= fake
+        and (not c.required_platforms or set(c.required_platforms) & set(platforms))
+        and (not c.target_locations or location in c.target_locations)
+    )
+
+
+def test_eligible_matches_linear_scan_through_open_and_close():
+    campaigns = {c.campaign_id: c for c in synthetic_campaigns(3000)}
+    index = CampaignEligibilityIndex.from_campaigns(campaigns.values())
+    index.pending_limit = 100
+    rng = np.random.default_rng(7)
+    for round_ in range(20):
+        for campaign_id in rng.choice(list(campaigns), 50, replace=False):
+            index.close(campaign_id)
+            del campaigns[campaign_id]
+        for campaign in synthetic_campaigns(60, seed=100 + round_):
+            campaign.campaign_id = f"r{round_}-{campaign.campaign_id}"
+            campaigns[campaign.campaign_id] = campaign
+            index.open(campaign)
+        followers, engagement, fake = int(10 ** rng.uniform(3, 6)), float(rng.uniform(0.5, 8)), float(rng.uniform(0, 25))
+        platforms = list(rng.choice(["instagram", "tiktok", "youtube"], 2, replace=False))
+        location = str(rng.choice(["usa", "uk", "india"]))
+        assert sorted(index.eligible(followers, engagement, fake, platforms, location)) == \
+            brute_force(campaigns.values(), followers, engagement, fake, platforms, location)
+
+
+def test_more_platforms_than_the_bitmask_holds_are_rejected():
+    index = CampaignEligibilityIndex()
+    for i in range(MAX_PLATFORMS):
+        index.open(CampaignConstraints(campaign_id=f"c{i}", required_platforms=[f"platform{i}"]))
+
+    with pytest.raises(ValueError):
+        index.open(CampaignConstraints(campaign_id="c0", required_platforms=["one_too_many"]))
+
+    # The rejected re-open left the existing campaign untouched
+    assert len(index) == MAX_PLATFORMS
+    assert index.eligible(1000, 5.0, platforms=["platform0"]) == ["c0"]
+    # Known platforms still index fine
+    index.open(CampaignConstraints(campaign_id="extra", required_platforms=["platform1"]))
+    assert index.eligible(1000, 5.0, platforms=["platform1"]) == ["c1", "extra"]
+
+
+@pytest.fixture(scope="module")
+def service():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("transformers")
+    from benchmark_suite import load_service
+    return load_service()
+
+
+def test_find_campaigns_scores_only_eligible_campaigns(service, monkeypatch):
+    from benchmark_suite import service_campaign, service_influencer, synthetic_influencers, synthetic_posts
+    from benchmark_suite import synthetic_campaigns as campaign_rows
+
+    creator = synthetic_influencers(1)[0]
+    creator.platforms = ["instagram"]
+    influencer = service_influencer(service, creator, synthetic_posts(5))
+    campaigns = [service_campaign(service, row) for row in campaign_rows(3)]
+    indexed_open, indexed_closed, unindexed = campaigns
+    unindexed.required_platforms = ["youtube"]
+
+    index = CampaignEligibilityIndex()
+    index.open(CampaignConstraints(campaign_id=indexed_open.campaign_id))
+    index.open(CampaignConstraints(campaign_id=indexed_closed.campaign_id, min_followers=10 ** 12))
+    monkeypatch.setattr(service, "campaign_index", index)
+
+    response = asyncio.run(service.find_matching_campaigns(
+        service.MatchingRequest(influencer_profile=influencer, available_campaigns=campaigns), token="test"
+    ))
+    assert response["total_campaigns_analyzed"] == 3
+    assert response["eligible_campaigns"] == 1
+    assert [match["campaign_id"] for match in response["top_matches"]] == [indexed_open.campaign_id]
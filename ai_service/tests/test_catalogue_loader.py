@@ -0,0 +1,227 @@
+import asyncio
+import struct
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from catalogue_loader import (
+    ANALYTICS, CAMPAIGNS, CONNECTIONS, COPY_SIGNATURE, COPY_TRAILER, KINDS, OPEN_STATUS, PAIR_COLUMNS, PG_EPOCH,
+    TABLES, TAGS, BinaryCopyDecoder, Column, MatchingCatalogue, uuid_keys, uuid_strings,
+)
+
+COLUMNS = (Column('id', 'uuid'), Column('flag', 'bool'), Column('count', 'int8'), Column('rate', 'float8'),
+           Column('updated_at', 'timestamp'))
+NOW = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+def encode_value(column, value):
+    if value is None:
+        return struct.pack('>i', -1)
+    if column.kind == 'uuid':
+        data = uuid.UUID(value).bytes
+    elif column.kind == 'timestamp':
+        data = struct.pack('>q', (value - PG_EPOCH) // timedelta(microseconds=1))
+    else:
+        data = np.asarray(value, dtype=KINDS[column.kind][0]).tobytes()
+    return struct.pack('>i', len(data)) + data
+
+
+def copy_stream(columns, rows, extension=b''):
+    """COPY (FORMAT binary) bytes as Postgres writes them: header, tuples, trailer"""
+    out = bytearray(COPY_SIGNATURE + struct.pack('>iI', 0, len(extension)) + extension)
+    for row in rows:
+        out += struct.pack('>h', len(columns))
+        for column, value in zip(columns, row):
+            out += encode_value(column, value)
+    return bytes(out + COPY_TRAILER)
+
+
+def decode(columns, stream, piece=7, chunk_bytes=64):
+    decoder = BinaryCopyDecoder(columns, chunk_bytes=chunk_bytes)
+    blocks = []
+    for start in range(0, len(stream), piece):
+        block = decoder.feed(stream[start:start + piece])
+        if block is not None:
+            blocks.append(block)
+    block = decoder.finish()
+    if block is not None:
+        blocks.append(block)
+    return decoder, {name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]} if blocks else {}
+
+
+def sample_rows(n):
+    return [(str(uuid.UUID(int=i + 1)), i % 2 == 0, i * 1000 - 7, i / 3, NOW + timedelta(seconds=i)) for i in range(n)]
+
+
+def test_decoder_reads_rows_split_across_arbitrary_chunks():
+    rows = sample_rows(50)
+    decoder, block = decode(COLUMNS, copy_stream(COLUMNS, rows, extension=b'\x00' * 5))
+
+    assert decoder.rows == 50
+    assert block['id'].tolist() == uuid_keys([row[0] for row in rows]).tolist()
+    assert block['flag'].tolist() == [row[1] for row in rows]
+    assert block['count'].dtype == np.int64 and block['count'].tolist() == [row[2] for row in rows]
+    np.testing.assert_array_equal(block['rate'], [row[3] for row in rows])
+    assert (PG_EPOCH + timedelta(microseconds=int(block['updated_at'][-1]))) == rows[-1][4]
+
+
+def test_decoder_accepts_an_empty_result():
+    decoder, block = decode(COLUMNS, copy_stream(COLUMNS, []))
+    assert decoder.rows == 0 and block == {}
+
+
+def test_decoder_rejects_nulls():
+    # Column.select coalesces NULLs in SQL; a NULL reaching the wire means a column spec is wrong
+    rows = sample_rows(4)
+    rows[2] = rows[2][:2] + (None,) + rows[2][3:]
+    with pytest.raises(ValueError, match="NULL"):
+        decode(COLUMNS, copy_stream(COLUMNS, rows))
+    assert 'COALESCE' in COLUMNS[2].select
+
+
+@pytest.mark.parametrize("stream", [
+    copy_stream(COLUMNS, sample_rows(3))[:-2],                          # no trailer
+    copy_stream(COLUMNS, sample_rows(3))[:-9],                          # cut mid-row
+    copy_stream(COLUMNS, sample_rows(3)) + b'\x00',                     # bytes after the trailer
+    copy_stream(COLUMNS, sample_rows(3))[:len(COPY_SIGNATURE) + 4],     # truncated header
+])
+def test_decoder_requires_a_complete_stream(stream):
+    with pytest.raises(ValueError):
+        decode(COLUMNS, stream)
+
+
+def test_decoder_rejects_other_formats_and_field_counts():
+    with pytest.raises(ValueError, match="Not a binary COPY"):
+        decode(COLUMNS, b'id,flag\n' * 10)
+    with pytest.raises(ValueError, match="field count"):
+        decode(COLUMNS[:4], copy_stream(COLUMNS, sample_rows(3)))
+
+
+class FakeCopyConnection:
+    """
+    Serves catalogue queries from in-memory rows, encoded as binary COPY.
+    Rows are dicts over each TableSpec's columns plus the JSON list columns
+    the tags read; `since` filters on updated_at like the real WHERE clause.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @asynccontextmanager
+    async def transaction(self, **kwargs):
+        yield
+
+    def _table(self, query):
+        return next(spec for spec in TABLES if f"FROM {spec.name} t" in query)
+
+    def _tag(self, query):
+        return next(tag for tag in TAGS if f"FROM {tag.table} t" in query and tag.expression in query)
+
+    def _since(self, table, since):
+        return [row for row in self.rows[table] if since is None or row['updated_at'] >= since]
+
+    async def fetchval(self, query, *args):
+        return len(self._since(self._table(query).name, args[0] if args else None))
+
+    async def fetch(self, query, *args):
+        tag = self._tag(query)
+        terms = {term for row in self._since(tag.table, args[0] if args else None) for term in row[tag.name]}
+        return [{'term': term} for term in sorted(terms)]
+
+    async def copy_from_query(self, query, *args, output, format):
+        if 'row_id' in query:
+            tag = self._tag(query)
+            terms, codes, *since = args
+            code_of = dict(zip(terms, codes))
+            columns = PAIR_COLUMNS
+            rows = [(row['id'], code_of[term]) for row in self._since(tag.table, since[0] if since else None)
+                    for term in row[tag.name]]
+        else:
+            columns = self._table(query).columns
+            rows = [tuple(row[column.name] for column in columns)
+                    for row in self._since(self._table(query).name, args[0] if args else None)]
+        stream = copy_stream(columns, rows)
+        for start in range(0, len(stream), 1000):
+            await output(stream[start:start + 1000])
+
+
+def table_row(spec, row_id, updated_at, **values):
+    row = {column.name: 0 for column in spec.columns}
+    row.update(id=row_id, updated_at=updated_at, **values)
+    for column in spec.columns:
+        if column.kind == 'uuid' and row[column.name] == 0:
+            row[column.name] = str(uuid.UUID(int=0))
+    return row
+
+
+def campaign(number, updated_at, platforms, **values):
+    values = {'status': OPEN_STATUS, 'max_followers': -1, 'max_fake_followers': 100.0, **values}
+    return table_row(CAMPAIGNS, str(uuid.UUID(int=number)), updated_at, required_platforms=platforms,
+                     target_interests=[], target_locations=['germany'], **values)
+
+
+def test_delta_refresh_upserts_updated_rows_and_replaces_their_tags(monkeypatch):
+    monkeypatch.setattr('catalogue_loader.DELTA_OVERLAP_SECONDS', 60)
+    old = NOW - timedelta(days=1)
+    rows = {
+        ANALYTICS.name: [table_row(ANALYTICS, str(uuid.UUID(int=100)), old, engagement_rate=3.0,
+                                   niches=['tech'])],
+        CONNECTIONS.name: [table_row(CONNECTIONS, str(uuid.UUID(int=200)), old, follower_count=5000,
+                                     is_active=True)],
+        CAMPAIGNS.name: [campaign(1, old, ['instagram'], min_followers=1000),
+                         campaign(2, old, ['tiktok'], min_followers=2000),
+                         campaign(3, NOW, ['youtube'], min_followers=3000)],
+    }
+    connection = FakeCopyConnection(rows)
+    catalogue = MatchingCatalogue()
+    full = asyncio.run(catalogue.refresh(connection))
+    assert full.mode == 'full' and len(catalogue.tables[CAMPAIGNS.name]) == 3
+
+    # Campaign 1 changes requirements and platform, campaign 4 opens; campaign 2 is untouched
+    later = NOW + timedelta(hours=1)
+    rows[CAMPAIGNS.name][0] = campaign(1, later, ['snapchat'], min_followers=1500)
+    rows[CAMPAIGNS.name].append(campaign(4, later, ['instagram'], min_followers=4000))
+    delta = asyncio.run(catalogue.refresh(connection))
+
+    assert delta.mode == 'delta'
+    # Rows inside the overlap window (campaign 3) are fetched again and upserted, not duplicated
+    assert sorted(uuid.UUID(key).int for key in uuid_strings(delta.changed_campaigns)) == [1, 3, 4]
+    assert delta.tables[ANALYTICS.name]['rows'] == 1
+    assert len(catalogue.tables[CAMPAIGNS.name]) == 4
+    constraints = {campaign_id: c for campaign_id, c in catalogue.campaign_constraints()}
+    by_number = {uuid.UUID(campaign_id).int: c for campaign_id, c in constraints.items()}
+    assert {n: c.min_followers for n, c in by_number.items()} == {1: 1500, 2: 2000, 3: 3000, 4: 4000}
+    assert {n: c.required_platforms for n, c in by_number.items()} == {
+        1: ['snapchat'], 2: ['tiktok'], 3: ['youtube'], 4: ['instagram']
+    }
+    assert len(catalogue.tags['required_platforms'].pairs) == 4
+    assert catalogue.tags['required_platforms'].vocabulary[-1] == 'snapchat'
+    assert len(catalogue.tables[ANALYTICS.name]) == 1
+    assert catalogue.stats()['high_water'][CAMPAIGNS.name] == later.isoformat()
+
+    # Closing a campaign arrives as a delta too
+    rows[CAMPAIGNS.name][1] = campaign(2, later + timedelta(minutes=5), ['tiktok'], min_followers=2000, status=0)
+    asyncio.run(catalogue.refresh(connection))
+    constraints = {uuid.UUID(campaign_id).int: c for campaign_id, c in catalogue.campaign_constraints()}
+    assert constraints[2] is None and len(catalogue.tables[CAMPAIGNS.name]) == 4
+
+
+def test_full_refresh_drops_hard_deleted_rows():
+    rows = {
+        ANALYTICS.name: [],
+        CONNECTIONS.name: [],
+        CAMPAIGNS.name: [campaign(1, NOW, ['instagram']), campaign(2, NOW, ['tiktok'])],
+    }
+    connection = FakeCopyConnection(rows)
+    catalogue = MatchingCatalogue()
+    asyncio.run(catalogue.refresh(connection))
+    del rows[CAMPAIGNS.name][1]
+
+    asyncio.run(catalogue.refresh(connection))
+    assert len(catalogue.tables[CAMPAIGNS.name]) == 2
+    asyncio.run(catalogue.refresh(connection, full=True))
+    assert len(catalogue.tables[CAMPAIGNS.name]) == 1
+    assert catalogue.tags['required_platforms'].vocabulary == ['instagram']
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from demographics import MODES, NO_DATA_SCORE, DemographicMatrix, synthetic_demographics
+
+
+@pytest.fixture
+def matrix():
+    return DemographicMatrix.from_mappings(synthetic_demographics(20) + [None, {}])
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("target", [None, {}])
+def test_no_target_fits_everyone(matrix, mode, target):
+    assert (matrix.alignment(target, mode) == 100.0).all()
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_target_with_only_unknown_fields_has_no_data(matrix, mode):
+    assert (matrix.alignment({'pets': 40.0, 'income_high': 20.0}, mode) == NO_DATA_SCORE).all()
+
+
+def test_l1_scores_shared_fields_in_any_spelling():
+    matrix = DemographicMatrix.from_mappings([{'18-24': 40.0, 'Women': 70.0}, {'male': 50.0}])
+    scores = matrix.alignment({'audience_age_18_24': 30.0, 'female': 60.0, 'pets': 5.0})
+    np.testing.assert_allclose(scores, [100 - 2 * 10, NO_DATA_SCORE])
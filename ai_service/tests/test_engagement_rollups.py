@@ -0,0 +1,86 @@
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import engagement_rollups
+from engagement_rollups import METRICS, EngagementRollupStore, to_day
+
+DAY = datetime(2024, 3, 10, 15, tzinfo=timezone.utc)
+END_DAY = to_day(DAY.timestamp()) + 5
+
+
+def export():
+    return pd.DataFrame({
+        'user_id': ['u1', 'u1', 'u1', 'u2', 'u1', 'u2'],
+        'platform': ['Instagram', 'instagram', 'tiktok', 'instagram', 'instagram', 'instagram'],
+        'content_id': ['p1', 'p2', 'p3', 'p4', 'p1', 'p5'],
+        'posted_at': [DAY, pd.Timestamp(DAY) - pd.Timedelta(days=3), DAY, None, DAY, 'not a date'],
+        'likes': [10, 20, 30, 40, 15, 50],
+        'comments': [1, 2, 3, 4, 2, 5],
+    })
+
+
+def totals(store, user_id, platform=None):
+    return dict(zip(METRICS, store.window_totals(user_id, platform, 30, END_DAY).tolist()))
+
+
+def test_from_table_skips_rows_without_posted_at():
+    store = EngagementRollupStore.from_table(export())
+
+    assert 'u2' not in store
+    assert store.rows_applied == 3
+    assert totals(store, 'u1', 'instagram') == {
+        'posts': 2, 'likes': 35, 'comments': 4, 'shares': 0, 'saves': 0, 'views': 0
+    }
+    # Backfilled posts keep their last-seen counts, so a later resend applies only the change
+    store.upsert('u1', 'instagram', 'p1', None, likes=25, comments=2)
+    assert totals(store, 'u1', 'instagram')['likes'] == 45
+
+
+def test_from_table_matches_incremental_upserts():
+    table = export().iloc[[0, 1, 2, 4]]
+    incremental = EngagementRollupStore()
+    incremental.upsert_many([
+        {**row, 'posted_at': row['posted_at'].timestamp()} for row in table.to_dict('records')
+    ])
+    backfilled = EngagementRollupStore.from_table(table)
+    for user_id, platform in (('u1', 'instagram'), ('u1', 'tiktok'), ('u1', None)):
+        assert totals(backfilled, user_id, platform) == totals(incremental, user_id, platform)
+
+
+def test_upsert_without_posted_at_only_updates_known_posts():
+    store = EngagementRollupStore()
+    assert store.upsert('u1', 'instagram', 'p1', None, likes=5) is False
+    assert 'u1' not in store and len(store.post_index) == 0
+
+    assert store.upsert_many([
+        {'user_id': 'u1', 'platform': 'instagram', 'content_id': 'p1', 'posted_at': DAY.timestamp(), 'likes': 5},
+        {'user_id': 'u1', 'platform': 'instagram', 'content_id': 'p1', 'posted_at': None, 'likes': 8},
+        {'user_id': 'u1', 'platform': 'instagram', 'content_id': 'p2', 'posted_at': None, 'likes': 100},
+    ]) == 2
+    assert totals(store, 'u1')['posts'] == 1 and totals(store, 'u1')['likes'] == 8
+
+
+def test_save_replaces_state_atomically(tmp_path):
+    path = str(tmp_path / 'rollups.npz')
+    EngagementRollupStore().save(path)
+    store = EngagementRollupStore.from_table(export())
+    store.save(path)
+
+    assert sorted(os.listdir(tmp_path)) == ['rollups.npz']
+    loaded = EngagementRollupStore.load(path)
+    assert totals(loaded, 'u1') == totals(store, 'u1')
+    np.testing.assert_array_equal(loaded.post_values, store.post_values)
+
+
+def test_backfill_script_writes_the_startup_state(tmp_path, capsys):
+    source = tmp_path / 'content_performance.csv'
+    export().to_csv(source, index=False)
+    output = str(tmp_path / 'rollups.npz')
+
+    engagement_rollups.main([str(source), '--output', output])
+
+    assert '"rows_read": 6' in capsys.readouterr().out
+    assert totals(EngagementRollupStore.load_if_exists(output), 'u1')['posts'] == 3
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from fake_follower_model import FEATURE_NAMES, FakeFollowerModel, build_feature_matrix
+
+
+def organic_accounts(n=500, seed=3):
+    rng = np.random.default_rng(seed)
+    followers = np.round(10 ** rng.uniform(3, 6, n))
+    return {
+        'follower_count': followers,
+        'following_count': np.round(followers * rng.uniform(0.01, 0.3, n)),
+        'post_count': rng.integers(100, 1500, n),
+        'engagement_rate': rng.uniform(1.5, 6, n),
+        'account_age_days': rng.integers(400, 3000, n),
+        'growth_volatility': rng.uniform(0.1, 0.6, n),
+        'growth_spikes': rng.integers(0, 3, n),
+    }
+
+
+# Bought followers: following far more than followed, no engagement, spiky growth
+ANOMALOUS = {
+    'follower_count': [50_000, 120_000],
+    'following_count': [400_000, 900_000],
+    'post_count': [3, 5],
+    'engagement_rate': [0.02, 0.01],
+    'account_age_days': [20, 30],
+    'growth_volatility': [9.0, 12.0],
+    'growth_spikes': [25, 40],
+}
+
+
+@pytest.fixture(scope="module")
+def model():
+    return FakeFollowerModel.train(build_feature_matrix(organic_accounts()), n_estimators=100)
+
+
+def test_anomalous_accounts_score_as_fake(model):
+    organic = model.score_columns(organic_accounts(50, seed=9))
+    anomalous = model.score_columns(ANOMALOUS)
+
+    assert anomalous['is_anomaly'].all()
+    assert (anomalous['anomaly_percentile'] > 0.95).all()
+    assert (anomalous['fake_follower_percentage'] > 40).all()
+    assert np.median(organic['fake_follower_percentage']) < 5
+    assert anomalous['fake_follower_percentage'].min() > organic['fake_follower_percentage'].max()
+
+
+def test_model_round_trips_through_save(model, tmp_path):
+    path = str(tmp_path / "model.joblib")
+    model.save(path)
+    loaded = FakeFollowerModel.load(path)
+
+    assert loaded.metadata['feature_names'] == FEATURE_NAMES and not loaded.uses_graph_features
+    for columns in (ANOMALOUS, organic_accounts(20, seed=4)):
+        expected, actual = model.score_columns(columns), loaded.score_columns(columns)
+        for name in expected:
+            np.testing.assert_array_equal(actual[name], expected[name])
+
+
+def test_load_rejects_a_different_feature_set(model, tmp_path):
+    path = str(tmp_path / "model.joblib")
+    stale = FakeFollowerModel(model.pipeline, model.training_scores, {**model.metadata, 'feature_names': FEATURE_NAMES[:-1]})
+    stale.save(path)
+    with pytest.raises(ValueError):
+        FakeFollowerModel.load(path)
+    assert FakeFollowerModel.load_if_exists(path) is None
+    assert FakeFollowerModel.load_if_exists(str(tmp_path / "missing.joblib")) is None
+
+
+def test_missing_required_column_is_an_error():
+    columns = dict(ANOMALOUS)
+    del columns['post_count']
+    with pytest.raises(ValueError, match="post_count"):
+        build_feature_matrix(columns)
@@ -0,0 +1,67 @@
+from follower_stream_detector import DetectorConfig, StreamingFollowerMonitor
+
+DAY = 86400
+
+
+def feed(monitor, growth_by_day, followers=10_000, account="a", **snapshot):
+    """Daily snapshots; returns (day, event_type) for every event raised"""
+    events = []
+    for day, growth in enumerate(growth_by_day):
+        followers += growth
+        events += [(day, event.event_type) for event in monitor.update(account, day * DAY, followers, **snapshot)]
+    return events
+
+
+def steady(days, base=100):
+    return [base + (day % 3) * 5 for day in range(days)]
+
+
+def test_burst_fires_once_per_episode():
+    # Each day of an escalating burst is far above normal growth, but it is one episode
+    monitor = StreamingFollowerMonitor()
+    events = feed(monitor, steady(30) + [3000, 12000, 50000] + steady(40) + [3000, 12000])
+    # A later burst is a new episode
+    assert [event_type for _, event_type in events] == ["follower_burst"] * 2
+    assert events[0][0] == 30 and events[1][0] >= 73
+
+
+def test_drop_fires_once_per_episode():
+    monitor = StreamingFollowerMonitor()
+    events = feed(monitor, steady(30) + [-1000, -4000, -16000] + steady(10), followers=100_000)
+    assert events == [(30, "follower_drop")]
+
+
+def test_no_events_during_warmup_or_steady_growth():
+    monitor = StreamingFollowerMonitor()
+    assert feed(monitor, [5000, 5000] + steady(40)) == []
+
+
+def test_repeated_spikes_flag_once_until_they_fade():
+    monitor = StreamingFollowerMonitor()
+    # Growth doubling every other day: a spike each time it jumps back up
+    events = feed(monitor, [100, 300] * 12 + [100] * 200 + [100, 300] * 12)
+    spikes = [day for day, event_type in events if event_type == "repeated_growth_spikes"]
+    assert len(spikes) == 2 and spikes[0] < 24 and spikes[1] >= 224
+
+
+def test_level_flags_fire_when_they_switch_on():
+    monitor = StreamingFollowerMonitor()
+    assert [e.event_type for e in monitor.update("a", 0, 1000, following_count=5000, engagement_rate=0.2)] == [
+        "high_following_ratio", "low_engagement_rate"
+    ]
+    assert monitor.update("a", DAY, 1010, following_count=5000, engagement_rate=0.2) == []
+    assert monitor.update("a", 2 * DAY, 1020, following_count=100, engagement_rate=3.0) == []
+    assert [e.event_type for e in monitor.update("a", 3 * DAY, 1030, engagement_rate=0.5)] == ["low_engagement_rate"]
+
+
+def test_state_round_trips_through_save(tmp_path):
+    monitor = StreamingFollowerMonitor()
+    feed(monitor, steady(30) + [3000, 12000])
+    path = str(tmp_path / "monitor.json")
+    monitor.save(path)
+
+    restored = StreamingFollowerMonitor.load(path)
+    assert restored.config == monitor.config and restored.accounts == monitor.accounts
+    # The burst still in progress does not fire again after a restart
+    followers = monitor.accounts["a"].last_followers + 50000
+    assert restored.update("a", 32 * DAY, followers) == []
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from fake_follower_model import count_growth_spikes, growth_volatility
+from follower_timeseries import FollowerSeriesStore
+
+
+def histories(n_accounts=40, seed=5):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for account in range(n_accounts):
+        days = np.sort(rng.choice(np.arange(120), rng.integers(1, 60), replace=False))
+        followers = 1000 + np.cumsum(rng.integers(-50, 400, len(days)))
+        engagement = np.round(rng.uniform(0.5, 9, len(days)), 2)
+        rows += [(f"user{account}:instagram", np.datetime64('2024-01-01') + int(day), int(f), float(e))
+                 for day, f, e in zip(days, followers, engagement)]
+    order = rng.permutation(len(rows))
+    return [rows[i] for i in order]
+
+
+def build(rows):
+    keys, dates, followers, engagement = zip(*rows)
+    return FollowerSeriesStore.from_records(keys, dates, followers, engagement)
+
+
+def by_account(rows):
+    grouped = {}
+    for key, date, followers, engagement in rows:
+        grouped.setdefault(key, []).append((np.datetime64(date, 'D'), followers, engagement))
+    return {key: sorted(series) for key, series in grouped.items()}
+
+
+def test_delta_encoding_round_trips_every_series(tmp_path):
+    rows = histories()
+    store = build(rows)
+    path = str(tmp_path / "series.npz")
+    store.save(path)
+    loaded = FollowerSeriesStore.load(path)
+    expected = by_account(rows)
+
+    assert store.follower_deltas.dtype == np.int32 and store.day_deltas.dtype == np.int32
+    for candidate in (store, loaded):
+        for index, key in enumerate(candidate.keys):
+            series = candidate.series(index)
+            dates, followers, engagement = zip(*expected[key])
+            assert series['dates'].tolist() == [date.item() for date in dates]
+            assert series['follower_count'].tolist() == list(followers)
+            np.testing.assert_allclose(series['engagement_rate'], engagement)
+
+
+def test_growth_features_match_per_account_loops():
+    # Daily readings without gaps, so growth is just the day-over-day difference
+    rng = np.random.default_rng(11)
+    rows = []
+    for account in range(30):
+        days = rng.integers(1, 50)
+        followers = 5000 + np.cumsum(rng.integers(0, 300, days))
+        rows += [(f"a{account}", np.datetime64('2024-03-01') + day, int(f), 2.5) for day, f in enumerate(followers)]
+    store = build(rows)
+    features = store.growth_features()
+    expected = by_account(rows)
+
+    for index, key in enumerate(store.keys):
+        followers = np.array([f for _, f, _ in expected[key]], dtype=np.float64)
+        growth = np.diff(followers)
+        assert features['days_observed'][index] == len(followers)
+        assert features['latest_follower_count'][index] == followers[-1]
+        assert features['growth_spikes'][index] == count_growth_spikes(growth)
+        assert features['growth_volatility'][index] == pytest.approx(growth_volatility(growth), abs=1e-9)
+        assert features['growth_mean'][index] == pytest.approx(growth.mean() if len(growth) else 0.0)
+
+
+def test_gaps_spread_growth_over_the_missing_days():
+    store = build([("a", '2024-01-01', 1000, 1.0), ("a", '2024-01-02', 1100, 1.0), ("a", '2024-01-05', 1400, 1.0)])
+    features = store.growth_features()
+    assert features['growth_mean'][0] == pytest.approx(100.0)
+    assert features['growth_variance'][0] == pytest.approx(0.0)
+    assert features['daily_growth_rate_pct'][0] == pytest.approx(400 / 1000 / 4 * 100)
+
+
+def test_values_outside_int32_are_rejected():
+    with pytest.raises(OverflowError):
+        build([("a", '2024-01-01', 0, 1.0), ("a", '2024-01-02', 3_000_000_000, 1.0)])
@@ -0,0 +1,49 @@
+from engagement_stream import RollingAggregates
+from influencer_features import InfluencerFeatureCache, InfluencerFeatures
+
+
+def aggregates(total_followers=0):
+    return RollingAggregates(
+        post_count=10, total_likes=900, total_comments=90, total_shares=10, mean_estimated_engagement_rate=0.02,
+        total_followers=total_followers, posts_per_week=2.5, sentiment_posts=0, sentiment_mean=None,
+        sentiment_counts={}
+    )
+
+
+class RollupStore:
+    """EngagementRollupStore-shaped: keeps no follower counts"""
+
+    def __init__(self):
+        self.snapshots = 0
+
+    def version(self, user_id):
+        return "rollup:3"
+
+    def snapshot(self, user_id):
+        self.snapshots += 1
+        return aggregates(), [], "rollup:3"
+
+
+def test_from_rolling_fills_followers_from_the_profile():
+    features = InfluencerFeatures.from_rolling("u1", aggregates(), [], follower_counts={"instagram": 4000, "tiktok": 6000})
+    assert features.total_followers == 10_000
+    assert features.follower_data()["follower_count"] == 10_000
+    assert features.rolling.engagement_rate == 1.0
+
+
+def test_from_rolling_keeps_streamed_followers():
+    features = InfluencerFeatures.from_rolling("u1", aggregates(20_000), [], follower_counts={"instagram": 4000})
+    assert features.total_followers == 20_000
+
+
+def test_streamed_cache_rebuilds_when_follower_counts_change():
+    cache = InfluencerFeatureCache()
+    store = RollupStore()
+
+    first = cache.get_or_build_streamed("u1", store, follower_counts={"instagram": 5000})
+    again = cache.get_or_build_streamed("u1", store, follower_counts={"instagram": 5000})
+    grown = cache.get_or_build_streamed("u1", store, follower_counts={"instagram": 8000})
+
+    assert first is again and first.total_followers == 5000
+    assert grown.total_followers == 8000
+    assert store.snapshots == 2
@@ -0,0 +1,53 @@
+import numpy as np
+
+import batch_pricing
+from market_rates import MarketRateIndex
+
+
+def market():
+    index = MarketRateIndex(min_observations=5)
+    rng = np.random.default_rng(3)
+    for followers in (5_000, 50_000):
+        for rate in rng.uniform(0.005, 0.03, 40):
+            index.ingest("instagram", "fashion", followers, rate * followers)
+    for rate in rng.uniform(0.001, 0.01, 40):
+        index.ingest("tiktok", None, 20_000, rate * 20_000)
+    index.refresh()
+    return index
+
+
+def test_demand_grid_matches_per_pair_market_data():
+    index = market()
+    follower_counts = {"instagram": [5_000, 50_000, 0], "tiktok": [0, 20_000, 0]}
+    niches = ["fashion", "finance", "fashion"]
+
+    grid = index.demand_score_grid(follower_counts, niches, batch_pricing.BASE_RATES)
+
+    assert grid.shape == (3, 3)
+    for i in range(3):
+        for j, niche in enumerate(niches):
+            data = index.market_data({p: counts[i] for p, counts in follower_counts.items()}, niche,
+                                     batch_pricing.BASE_RATES)
+            if data is None:
+                assert np.isnan(grid[i, j])
+            else:
+                assert grid[i, j] == data["demand_score"]
+    assert np.isnan(grid[2]).all()
+
+
+def test_price_grid_applies_per_pair_demand():
+    demand = np.array([[100.0, np.nan], [0.0, 50.0]])
+    grid = batch_pricing.price_grid(["a", "b"], {"instagram": [100_000, 100_000]}, [10, 10], [5_000, 5_000],
+                                    ["c1", "c2"], ["beauty", "beauty"], demand)
+    flat = batch_pricing.price_grid(["a", "b"], {"instagram": [100_000, 100_000]}, [10, 10], [5_000, 5_000],
+                                    ["c1", "c2"], ["beauty", "beauty"])
+
+    np.testing.assert_allclose(grid.suggested_price / flat.suggested_price, [[1.2, 1.0], [0.8, 1.0]])
+
+
+def test_ingested_observations_wait_for_refresh():
+    index = MarketRateIndex(min_observations=1)
+    index.ingest("instagram", None, 10_000, 500.0)
+    assert index.median_rate("instagram", None, 10_000) is None
+    index.refresh()
+    assert index.median_rate("instagram", None, 10_000) == 0.05
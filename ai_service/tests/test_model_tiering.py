@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from model_tiering import TierRouter
+
+
+def test_queued_work_counts_as_in_flight():
+    router = TierRouter(workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            futures = [router.submit(executor, release.wait) for _ in range(4)]
+            await asyncio.sleep(0.01)
+            # One call running, three waiting for the single worker
+            depth = router.queue_depth
+            estimate = router.estimate_ms("full", 10)
+            release.set()
+            await asyncio.gather(*futures)
+        return depth, estimate
+
+    depth, estimate = asyncio.run(scenario())
+    stats = router.stats["full"]
+    assert depth == 4
+    assert estimate == (stats.overhead_ms + stats.per_post_ms * 10) * 5
+    assert router.queue_depth == 0
+
+
+def test_cancelled_queued_work_is_released():
+    router = TierRouter(workers=1)
+    release = threading.Event()
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            running = router.submit(executor, release.wait)
+            queued = router.submit(executor, release.wait)
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            await asyncio.sleep(0.01)
+            depth = router.queue_depth
+            release.set()
+            await running
+        return depth
+
+    assert asyncio.run(scenario()) == 1
+    assert router.queue_depth == 0
+
+
+def test_failed_tier_degrades_to_lexicon():
+    router = TierRouter(workers=1)
+
+    def unloaded():
+        raise RuntimeError("Transformer model is not available")
+
+    async def scenario():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await router.run(executor, {"full": unloaded, "lexicon": lambda: "lexicon result"}, n_posts=3)
+
+    result = asyncio.run(scenario())
+    assert result.value == "lexicon result"
+    assert (result.tier_requested, result.tier_used, result.degraded) == ("full", "lexicon", True)
+    assert router.stats["full"].failures == 1
+    assert router.snapshot()["tiers"]["full"]["failures"] == 1
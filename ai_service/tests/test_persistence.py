@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from persistence import atomic_open, save_json
+
+
+def test_save_json_replaces_the_previous_snapshot(tmp_path):
+    path = str(tmp_path / "state" / "store.json")
+    save_json(path, {"version": 1})
+    save_json(path, {"version": 2})
+
+    with open(path) as f:
+        assert json.load(f) == {"version": 2}
+    assert not (tmp_path / "state" / "store.json.tmp").exists()
+
+
+def test_failed_write_keeps_the_previous_snapshot(tmp_path):
+    path = str(tmp_path / "store.json")
+    save_json(path, {"version": 1})
+
+    with pytest.raises(TypeError):
+        save_json(path, {"version": object()})
+    with pytest.raises(RuntimeError):
+        with atomic_open(path, 'wb') as f:
+            f.write(b'partial')
+            raise RuntimeError("crashed mid-write")
+
+    with open(path) as f:
+        assert json.load(f) == {"version": 1}
+    assert not (tmp_path / "store.json.tmp").exists()
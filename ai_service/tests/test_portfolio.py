@@ -0,0 +1,86 @@
+from itertools import combinations
+
+import numpy as np
+
+from portfolio import PortfolioConstraints, PortfolioSolver, synthetic_candidates
+
+
+def brute_force(values, costs, platforms, budget, max_per_platform):
+    best = 0.0
+    for size in range(len(values) + 1):
+        for chosen in combinations(range(len(values)), size):
+            counts = {}
+            for i in chosen:
+                counts[platforms[i]] = counts.get(platforms[i], 0) + 1
+            if sum(costs[i] for i in chosen) <= budget and max(counts.values(), default=0) <= max_per_platform:
+                best = max(best, sum(values[i] for i in chosen))
+    return best
+
+
+def test_exact_matches_brute_force_with_side_constraints():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        n = 10
+        values, costs = rng.uniform(10, 100, n), rng.integers(50, 500, n).astype(float)
+        platforms = list(rng.choice(["instagram", "tiktok"], n))
+        solver = PortfolioSolver(values, costs, platforms)
+        result = solver.solve(PortfolioConstraints(budget=1000, max_per_platform={"instagram": 2, "tiktok": 2}), "exact")
+        assert result.optimal and result.feasible
+        assert abs(result.total_value - brute_force(values, costs, platforms, 1000, 2)) < 1e-6
+
+
+def test_exact_mode_handles_large_candidate_sets():
+    data = synthetic_candidates(5000)
+    solver = PortfolioSolver(data["values"], data["costs"], data["platforms"], data["niches"])
+    result = solver.solve(PortfolioConstraints(budget=200_000, max_per_niche=800), "exact")
+    assert result.method == "branch_and_bound"
+    assert result.feasible and result.total_cost <= 200_000
+
+
+def test_unreachable_minimums_return_empty_infeasible_result():
+    solver = PortfolioSolver([50, 60, 70], [100, 100, 100], ["instagram", "tiktok", "tiktok"])
+    for constraints in (PortfolioConstraints(budget=1000, min_per_platform={"tiktok": 3}),
+                        PortfolioConstraints(budget=150, min_per_platform={"tiktok": 2})):
+        result = solver.solve(constraints, "exact")
+        assert not result.feasible
+        assert len(result.selected) == 0 and result.total_value == 0.0
+        assert result.to_dict()["feasible"] is False
+
+
+def test_search_without_feasible_selection_returns_empty_result():
+    # Minimums look reachable on counts and cost, but the niche cap rules them out
+    solver = PortfolioSolver([50, 60, 70], [100, 100, 100], ["tiktok", "tiktok", "instagram"],
+                             ["fitness", "fitness", "food"])
+    result = solver.solve(PortfolioConstraints(budget=1000, min_per_platform={"tiktok": 2}, max_per_niche=1), "exact")
+    assert result.method == "branch_and_bound"
+    assert result.optimal and not result.feasible
+    assert len(result.selected) == 0
+
+
+def test_minimum_for_platform_without_candidates_is_infeasible():
+    solver = PortfolioSolver([50, 60, 100], [100, 100, 100], ["instagram", "instagram", "tiktok"])
+    for mode in ("greedy", "exact"):
+        for minimums in ({"youtube": 1}, {"instagram": 1, "youtube": 1}, {"tiktok": 2}):
+            result = solver.solve(PortfolioConstraints(budget=1000, min_per_platform=minimums), mode)
+            assert not result.feasible and len(result.selected) == 0
+
+
+def test_best_single_safeguard_respects_platform_caps():
+    solver = PortfolioSolver([50, 60, 100], [100, 100, 150], ["instagram", "instagram", "tiktok"])
+    for mode in ("greedy", "exact"):
+        result = solver.solve(PortfolioConstraints(budget=150, max_per_platform={"tiktok": 0}), mode)
+        assert result.feasible
+        assert result.selected.tolist() in ([0], [1])
+    result = solver.solve(PortfolioConstraints(budget=150, max_per_platform={"tiktok": 0}), "greedy")
+    assert result.selected.tolist() == [1] and result.total_value == 60
+
+
+def test_branch_and_bound_stops_at_the_time_limit():
+    data = synthetic_candidates(3000, seed=3)
+    solver = PortfolioSolver(data["values"], data["costs"], data["platforms"], data["niches"])
+    constraints = PortfolioConstraints(budget=150_000, max_per_niche=300, min_per_platform={"youtube": 5})
+    greedy = solver.solve(constraints, "greedy", time_limit_ms=5)
+    result = solver.solve(constraints, "exact", time_limit_ms=20)
+    assert result.method == "branch_and_bound" and not result.optimal
+    assert result.elapsed_ms < 1000
+    assert result.feasible and result.total_value >= greedy.total_value - 1e-6
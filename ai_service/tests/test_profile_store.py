@@ -0,0 +1,355 @@
+import asyncio
+import sqlite3
+import uuid
+
+import pytest
+
+import profile_store
+from profile_store import (
+    DatabaseUnavailable, InvalidProfileId, ProfileNotFound, ProfileStore, ReadThroughCache,
+    SQLiteDatabase, campaign_from_row, influencer_from_rows,
+)
+
+
+INFLUENCER_ID = str(uuid.UUID(int=1))
+CAMPAIGN_ID = str(uuid.UUID(int=2))
+BRAND_ID = str(uuid.UUID(int=3))
+MISSING_ID = str(uuid.UUID(int=99))
+
+SCHEMA = """
+CREATE TABLE profiles (id TEXT PRIMARY KEY, bio TEXT, location TEXT);
+CREATE TABLE influencer_analytics (
+    user_id TEXT, platform TEXT, engagement_rate REAL, fake_follower_percentage REAL,
+    posting_frequency_per_week REAL, niche_categories TEXT, interests TEXT, sentiment_score REAL,
+    audience_age_13_17 REAL, audience_age_18_24 REAL, audience_age_25_34 REAL, audience_age_35_44 REAL,
+    audience_age_45_54 REAL, audience_age_55_plus REAL, audience_male REAL, audience_female REAL,
+    audience_other REAL
+);
+CREATE TABLE social_connections (user_id TEXT, platform TEXT, follower_count INTEGER, is_active INTEGER);
+CREATE TABLE brand_profiles (user_id TEXT PRIMARY KEY, target_demographics TEXT);
+CREATE TABLE campaigns (
+    id TEXT PRIMARY KEY, brand_id TEXT, title TEXT, description TEXT, brief TEXT, content_guidelines TEXT,
+    required_platforms TEXT, min_followers INTEGER, max_followers INTEGER, min_engagement_rate REAL,
+    max_fake_followers REAL, target_interests TEXT, target_locations TEXT, target_age_min INTEGER,
+    target_age_max INTEGER, target_gender TEXT, budget_min INTEGER, budget_max INTEGER
+);
+"""
+
+
+def analytics_row(platform, engagement_rate, **overrides):
+    row = {
+        'platform': platform, 'engagement_rate': engagement_rate, 'fake_follower_percentage': 5.0,
+        'posting_frequency_per_week': 3, 'niche_categories': '["fitness"]', 'interests': '[]',
+        'sentiment_score': 0.2, 'audience_age_13_17': None, 'audience_age_18_24': 40.0,
+        'audience_age_25_34': 35.0, 'audience_age_35_44': None, 'audience_age_45_54': None,
+        'audience_age_55_plus': None, 'audience_male': 30.0, 'audience_female': 70.0, 'audience_other': None,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.execute("INSERT INTO profiles VALUES (?, ?, ?)", (INFLUENCER_ID, "Daily workouts", "Austin, Texas"))
+    for platform, followers, rate in (('instagram', 30000, 4.0), ('tiktok', 10000, 8.0)):
+        row = analytics_row(platform, rate)
+        connection.execute(
+            f"INSERT INTO influencer_analytics VALUES (?, {', '.join('?' * len(row))})", (INFLUENCER_ID, *row.values())
+        )
+        connection.execute("INSERT INTO social_connections VALUES (?, ?, ?, 1)", (INFLUENCER_ID, platform, followers))
+    connection.execute("INSERT INTO social_connections VALUES (?, 'youtube', 500000, 0)", (INFLUENCER_ID,))
+    connection.execute("INSERT INTO brand_profiles VALUES (?, ?)", (BRAND_ID, '{"female": 60}'))
+    connection.execute(
+        "INSERT INTO campaigns VALUES (?, ?, 'Spring', 'Activewear launch', NULL, 'Tag us', '[\"instagram\"]',"
+        " 10000, NULL, 2.5, 15, '[\"fitness\"]', '[\"United States\"]', 18, 34, NULL, 500, 2000)",
+        (CAMPAIGN_ID, BRAND_ID)
+    )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def test_influencer_from_rows_weights_by_followers():
+    profile = influencer_from_rows(
+        {'id': INFLUENCER_ID, 'bio': 'bio', 'location': None},
+        [analytics_row('instagram', 4.0), analytics_row('tiktok', 8.0, niche_categories='["dance", "fitness"]',
+                                                         audience_female=20.0, fake_follower_percentage=12.0)],
+        [{'platform': 'instagram', 'follower_count': 30000}, {'platform': 'tiktok', 'follower_count': 10000}]
+    )
+    assert profile.platforms == ['instagram', 'tiktok']
+    assert profile.follower_count == 40000
+    assert profile.engagement_rate == pytest.approx(5.0)
+    assert profile.niche_categories == ['fitness', 'dance']
+    assert profile.fake_follower_percentage == 12.0
+    assert profile.posting_frequency == 6
+    assert profile.location == ''
+    # Demographics come from the largest platform, NULL columns left out
+    assert profile.audience_demographics == {
+        'audience_age_18_24': 40.0, 'audience_age_25_34': 35.0, 'audience_male': 30.0, 'audience_female': 70.0,
+    }
+
+
+def test_influencer_from_rows_without_analytics():
+    profile = influencer_from_rows({'id': INFLUENCER_ID}, [], [{'platform': 'instagram', 'follower_count': None}])
+    assert profile.follower_count == 0
+    assert profile.engagement_rate == 0.0
+    assert profile.content_quality_score == 50
+    assert profile.audience_demographics == {}
+
+
+def test_campaign_from_row_narrows_age_and_gender():
+    campaign = campaign_from_row({
+        'id': CAMPAIGN_ID, 'brand_id': BRAND_ID, 'title': 'Spring', 'description': 'Launch', 'brief': None,
+        'required_platforms': '["instagram"]', 'min_followers': None, 'max_followers': 50000,
+        'min_engagement_rate': 2, 'max_fake_followers': None, 'target_interests': '["fitness"]',
+        'target_locations': None, 'target_age_min': 18, 'target_age_max': 30, 'target_gender': 'Female',
+        'budget_min': 100, 'budget_max': None, 'brand_target_demographics': '{"age_45_54": 50, "male": 40}',
+    })
+    assert campaign.campaign_description == 'Spring Launch'
+    assert campaign.min_followers == 0 and campaign.max_followers == 50000
+    assert campaign.max_fake_followers == 100.0
+    assert campaign.target_locations == []
+    assert campaign.budget_range == (100, 0)
+    assert campaign.target_demographics == {
+        'age_18_24': 50.0, 'age_25_34': 50.0, 'male': 0.0, 'female': 100.0, 'other': 0.0,
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_cache_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(profile_store, 'time', clock)
+    cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return len(loads)
+
+    async def scenario():
+        assert await cache.get('a', loader) == (1, False)
+        clock.now += 59
+        assert await cache.get('a', loader) == (1, True)
+        clock.now += 2
+        assert await cache.get('a', loader) == (2, False)
+
+    asyncio.run(scenario())
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ReadThroughCache(max_entries=2, ttl_seconds=60)
+
+    async def scenario():
+        for key in ('a', 'b'):
+            await cache.get(key, lambda key=key: asyncio.sleep(0, key))
+        await cache.get('a', lambda: asyncio.sleep(0, 'reloaded'))
+        await cache.get('c', lambda: asyncio.sleep(0, 'c'))
+        return (await cache.get('a', lambda: asyncio.sleep(0, 'reloaded')),
+                await cache.get('b', lambda: asyncio.sleep(0, 'reloaded')))
+
+    assert asyncio.run(scenario()) == (('a', True), ('reloaded', False))
+    assert len(cache) == 2
+
+
+def test_invalidation_during_load_keeps_result_out_of_cache():
+    cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return 'stale'
+
+        task = asyncio.create_task(cache.get('a', slow_loader))
+        await asyncio.sleep(0)
+        cache.invalidate('a')
+        release.set()
+        first = await task
+        second = await cache.get('a', lambda: asyncio.sleep(0, 'fresh'))
+        return first, second
+
+    assert asyncio.run(scenario()) == (('stale', False), ('fresh', False))
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get('a', loader) for _ in range(20)))
+
+    results = asyncio.run(scenario())
+    assert len(loads) == 1
+    assert [value for value, _ in results] == ['value'] * 20
+    assert cache.stats()['coalesced'] == 19
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def scenario():
+        leader = asyncio.create_task(cache.get('a', loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get('a', loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter, await cache.get('a', loader)
+
+    assert asyncio.run(scenario()) == (('value', False), ('value', True))
+    assert len(loads) == 1
+
+
+def test_concurrent_misses_share_a_failure():
+    cache = ReadThroughCache(max_entries=10, ttl_seconds=60)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise ProfileNotFound('gone')
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get('a', loader) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ProfileNotFound) for result in asyncio.run(scenario()))
+    assert len(cache) == 0
+
+
+def test_store_loads_profiles_from_sqlite(database_path):
+    async def scenario():
+        store = await ProfileStore.connect(f"sqlite:///{database_path}")
+        try:
+            influencer, influencer_cached = await store.influencer(INFLUENCER_ID.upper())
+            _, cached_again = await store.influencer(INFLUENCER_ID)
+            campaign, _ = await store.campaign(CAMPAIGN_ID)
+            return influencer, influencer_cached, cached_again, campaign
+        finally:
+            await store.close()
+
+    influencer, influencer_cached, cached_again, campaign = asyncio.run(scenario())
+    assert (influencer_cached, cached_again) == (False, True)
+    assert influencer.user_id == INFLUENCER_ID
+    # Inactive connections are not counted
+    assert influencer.follower_count == 40000
+    assert influencer.location == 'Austin, Texas'
+    assert campaign.target_niches == ['fitness']
+    assert campaign.target_demographics == {'female': 60, 'age_18_24': 50.0, 'age_25_34': 50.0}
+
+
+def test_store_raises_for_missing_and_malformed_ids(database_path):
+    async def scenario():
+        store = await ProfileStore.connect(f"sqlite:///{database_path}")
+        try:
+            with pytest.raises(ProfileNotFound):
+                await store.influencer(MISSING_ID)
+            with pytest.raises(ProfileNotFound):
+                await store.campaign(MISSING_ID)
+            with pytest.raises(InvalidProfileId):
+                await store.influencer("not-a-uuid")
+            with pytest.raises(InvalidProfileId):
+                store.invalidate(campaign_ids=["42"])
+        finally:
+            await store.close()
+
+    asyncio.run(scenario())
+
+
+def test_exhausted_pool_raises_unavailable(database_path, monkeypatch):
+    monkeypatch.setattr(profile_store, 'POOL_ACQUIRE_TIMEOUT_SECONDS', 0.01)
+
+    async def scenario():
+        database = SQLiteDatabase(database_path, max_size=1)
+        await database.connect()
+        held = database.pool.get_nowait()
+        try:
+            with pytest.raises(DatabaseUnavailable):
+                await database.fetch("SELECT 1")
+        finally:
+            database.pool.put_nowait(held)
+            await database.close()
+
+    asyncio.run(scenario())
+
+
+class DownDatabase:
+    async def fetch(self, query, *args):
+        raise DatabaseUnavailable("connection refused")
+
+
+@pytest.fixture(scope="module")
+def service():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("transformers")
+    from benchmark_suite import build_engine, load_service
+    service = load_service()
+    # Offline stand-in models, as the benchmark suite uses
+    service._matching_engine = build_engine()
+    return service
+
+
+def call_match(service, store, influencer_id=INFLUENCER_ID, campaign_id=CAMPAIGN_ID):
+    from fastapi import HTTPException
+
+    async def scenario():
+        if isinstance(store, str):
+            connected = await ProfileStore.connect(store)
+        else:
+            connected = store
+        service.profile_store = connected
+        try:
+            return await service.match_by_id(
+                service.IdMatchRequest(influencer_id=influencer_id, campaign_id=campaign_id), token="test"
+            )
+        except HTTPException as e:
+            return e
+        finally:
+            service.profile_store = None
+            if isinstance(store, str):
+                await connected.close()
+
+    return asyncio.run(scenario())
+
+
+def test_match_route_not_found(service, database_path):
+    response = call_match(service, f"sqlite:///{database_path}", influencer_id=MISSING_ID)
+    assert response.status_code == 404
+
+
+def test_match_route_rejects_malformed_id(service, database_path):
+    response = call_match(service, f"sqlite:///{database_path}", campaign_id="12345")
+    assert response.status_code == 400
+
+
+def test_match_route_unavailable(service):
+    assert call_match(service, None).status_code == 503
+    assert call_match(service, ProfileStore(DownDatabase())).status_code == 503
+
+
+def test_match_route_scores_stored_profiles(service, database_path):
+    response = call_match(service, f"sqlite:///{database_path}")
+    assert response["influencer_id"] == INFLUENCER_ID
+    assert 0 <= response["score"] <= 100
+    assert response["profile_cache"] == {"influencer_hit": False, "campaign_hit": False}
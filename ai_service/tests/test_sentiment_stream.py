@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from sentiment_stream import stream_sentiment
+
+
+def run(lines, classify, chunk_size=2):
+    async def chunks():
+        for line in lines:
+            yield (line if isinstance(line, str) else json.dumps(line)).encode() + b'\n'
+
+    async def collect():
+        return [json.loads(out) async for out in stream_sentiment(chunks(), classify, chunk_size=chunk_size)]
+
+    return asyncio.run(collect())
+
+
+def positive(texts):
+    return [{'label': 'LABEL_2', 'score': 0.9, 'source': 'lexicon'} for _ in texts]
+
+
+def test_failed_chunk_reports_its_posts_and_streaming_continues():
+    def classify(texts):
+        if 'boom' in texts:
+            raise RuntimeError("model crashed")
+        return positive(texts)
+
+    records = run([{'id': 'a', 'content': 'nice'}, {'id': 'b', 'content': 'boom'},
+                   {'id': 'c', 'content': 'great'}, {'id': 'd', 'content': 'love it'}], classify)
+
+    errors = [r for r in records if r['type'] == 'error']
+    assert [(e['id'], e['line']) for e in errors] == [('a', 1), ('b', 2)]
+    assert 'model crashed' in errors[0]['detail']
+    assert [r['id'] for r in records if r['type'] == 'post'] == ['c', 'd']
+    final = records[-1]
+    assert final['final'] and final['post_count_analyzed'] == 2 and final['errors'] == 2
+    assert final['overall_sentiment'] == 0.9
+
+
+def test_malformed_results_fail_only_their_chunk():
+    calls = []
+
+    def classify(texts):
+        calls.append(len(texts))
+        return positive(texts)[:1] if len(calls) == 1 else positive(texts)
+
+    records = run(['"one"', '"two"', '"three"'], classify)
+    assert [r['line'] for r in records if r['type'] == 'error'] == [1, 2]
+    assert records[-1]['post_count_analyzed'] == 1 and records[-1]['errors'] == 2
+
+
+def test_non_string_content_is_an_error_record():
+    records = run([{'id': 'a', 'content': 42}, {'id': 'b', 'content': ['x']}, '[1, 2]', 'not json',
+                   {'id': 'c', 'content': 'fine'}], positive)
+
+    assert [r['line'] for r in records if r['type'] == 'error'] == [1, 2, 3, 4]
+    assert [r['id'] for r in records if r['type'] == 'post'] == ['c']
+    assert records[-1]['errors'] == 4
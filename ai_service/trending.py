@@ -0,0 +1,498 @@
+"""
+Trending Hashtag Detection for Influencelytic-Match
+Hashtags and mentions extracted from incoming posts are counted per time window
+with Space-Saving heavy-hitter summaries per (platform, niche) segment and a
+shared Count-Min sketch, so top-k trends and window-over-window growth come
+from bounded memory instead of exact counts over every post
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from persistence import save_json
+
+
+HASHTAG_PATTERN = re.compile(r"(?<![\w#&])#(\w{1,100})")
+MENTION_PATTERN = re.compile(r"(?<![\w@])@(\w(?:[\w.]{0,28}\w)?)")
+KINDS = ("hashtag", "mention")
+PREFIXES = {"hashtag": "#", "mention": "@"}
+ANY = "*"
+
+DEFAULT_STATE_PATH = os.getenv('TREND_ENGINE_PATH', './data/trend_engine.json')
+
+
+def extract_tags(text: str, hashtags: Optional[Iterable[str]] = None) -> Dict[str, set]:
+    """
+    Lower-cased hashtags and mentions in a post, each counted once per post.
+    hashtags takes the already-parsed content_performance.hashtags column.
+    """
+    tags = {
+        "hashtag": {match.lower() for match in HASHTAG_PATTERN.findall(text or "")},
+        "mention": {match.lower() for match in MENTION_PATTERN.findall(text or "")}
+    }
+    for tag in hashtags or ():
+        tag = str(tag).strip().lstrip('#').lower()
+        if tag:
+            tags["hashtag"].add(tag)
+    return tags
+
+
+def _hash_pair(key: str) -> Tuple[int, int]:
+    """Two stable 64-bit hashes; Python's hash() is salted per process"""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+class CountMinSketch:
+    """Count-Min sketch with double hashing; estimates only ever overcount"""
+
+    def __init__(self, width: int = 8192, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self._steps = np.arange(depth, dtype=np.uint64)
+
+    def _columns(self, keys: Sequence[str]) -> np.ndarray:
+        """(len(keys), depth) column per row, uint64 arithmetic wraps identically on every call"""
+        hashes = np.array([_hash_pair(key) for key in keys], dtype=np.uint64).reshape(-1, 2)
+        with np.errstate(over='ignore'):
+            return ((hashes[:, :1] + self._steps * hashes[:, 1:]) % np.uint64(self.width)).astype(np.intp)
+
+    def add_many(self, keys: Sequence[str], counts: Sequence[int]):
+        if not len(keys):
+            return
+        columns = self._columns(keys)
+        rows = np.broadcast_to(np.arange(self.depth), columns.shape)
+        np.add.at(self.table, (rows, columns), np.asarray(counts, dtype=np.int64)[:, None])
+
+    def add(self, key: str, count: int = 1):
+        self.add_many([key], [count])
+
+    def estimate_many(self, keys: Sequence[str]) -> np.ndarray:
+        if not len(keys):
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(keys)
+        return self.table[np.arange(self.depth), columns].min(axis=1)
+
+    def estimate(self, key: str) -> int:
+        return int(self.estimate_many([key])[0])
+
+    def merge(self, other: 'CountMinSketch'):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-Min sketches must have the same dimensions to merge")
+        self.table += other.table
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"width": self.width, "depth": self.depth, "table": self.table.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CountMinSketch':
+        sketch = cls(data["width"], data["depth"])
+        sketch.table = np.asarray(data["table"], dtype=np.int64).reshape(sketch.depth, sketch.width)
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary (Metwally et al.): at most capacity counters;
+    a new item evicts the smallest counter and inherits its count as error.
+    Any item with true count above total / capacity is guaranteed tracked.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, item: str, count: int = 1):
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            floor, victim = self._pop_min()
+            del self.counts[victim]
+            del self.errors[victim]
+            self.counts[item] = floor + count
+            self.errors[item] = floor
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        """Smallest live counter; heap entries go stale as counts grow"""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+
+    def top(self, k: int) -> List[Tuple[str, int, int]]:
+        """(item, count, error) by estimated count, highest first"""
+        ranked = heapq.nlargest(k, self.counts.items(), key=lambda entry: entry[1])
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "items": [[item, count, self.errors[item]] for item, count in self.counts.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SpaceSaving':
+        summary = cls(data["capacity"])
+        summary.total = data.get("total", 0)
+        for item, count, error in data.get("items", []):
+            summary.counts[item] = count
+            summary.errors[item] = error
+        summary._heap = [(count, item) for item, count in summary.counts.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+
+@dataclass
+class TrendWindow:
+    """Counts for one time window: top-k per (kind, platform, niche) plus one shared Count-Min"""
+    window_id: int
+    capacity: int
+    cm_width: int
+    cm_depth: int
+    summaries: Dict[Tuple[str, str, str], SpaceSaving] = field(default_factory=dict)
+    posts: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    sketch: Optional[CountMinSketch] = None
+    last_timestamp: float = 0.0
+
+    def __post_init__(self):
+        if self.sketch is None:
+            self.sketch = CountMinSketch(self.cm_width, self.cm_depth)
+
+    def add(self, counts: Dict[Tuple[str, str, str, str], int], posts: Dict[Tuple[str, str], int],
+            last_timestamp: float):
+        """
+        Fold a batch pre-aggregated to {(kind, platform, niche, tag): posts};
+        Zipfian tag streams collapse to far fewer sketch updates this way
+        """
+        for segment, count in posts.items():
+            self.posts[segment] = self.posts.get(segment, 0) + count
+        for (kind, platform, niche, tag), count in counts.items():
+            key = (kind, platform, niche)
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = SpaceSaving(self.capacity)
+            summary.add(tag, count)
+        self.sketch.add_many([_sketch_key(key[0], key[1:3], key[3]) for key in counts], list(counts.values()))
+        self.last_timestamp = max(self.last_timestamp, last_timestamp)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window_id": self.window_id,
+            "last_timestamp": self.last_timestamp,
+            "summaries": [{"key": list(key), **summary.to_dict()} for key, summary in self.summaries.items()],
+            "posts": [[list(segment), count] for segment, count in self.posts.items()],
+            "sketch": self.sketch.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], capacity: int) -> 'TrendWindow':
+        sketch = CountMinSketch.from_dict(data["sketch"])
+        window = cls(data["window_id"], capacity, sketch.width, sketch.depth, sketch=sketch,
+                     last_timestamp=data.get("last_timestamp", 0.0))
+        for entry in data.get("summaries", []):
+            window.summaries[tuple(entry["key"])] = SpaceSaving.from_dict(entry)
+        for segment, count in data.get("posts", []):
+            window.posts[tuple(segment)] = count
+        return window
+
+
+def _sketch_key(kind: str, segment: Tuple[str, str], tag: str) -> str:
+    return f"{PREFIXES[kind]}{tag}|{segment[0]}|{segment[1]}"
+
+
+def _segments(platform: Optional[str], niche: Optional[str]) -> set:
+    """Post segment plus rollups, so platform-wide and niche-wide queries need no merging"""
+    platform = (platform or ANY).lower()
+    niche = (niche or ANY).lower()
+    return {(platform, niche), (platform, ANY), (ANY, niche), (ANY, ANY)}
+
+
+@dataclass
+class TrendEngine:
+    """
+    Tumbling event-time windows; only the current and previous window are
+    kept. Growth compares a tag's per-hour rate in the current (partial)
+    window with its rate over the whole previous window. The previous
+    count is a Count-Min estimate, so growth is never overstated.
+    """
+    window_seconds: float = 3600.0
+    capacity: int = 1024
+    cm_width: int = 8192
+    cm_depth: int = 4
+    current: Optional[TrendWindow] = None
+    previous: Optional[TrendWindow] = None
+    posts_ingested: int = 0
+    late_posts_dropped: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def _new_window(self, window_id: int) -> TrendWindow:
+        return TrendWindow(window_id, self.capacity, self.cm_width, self.cm_depth)
+
+    def _window_for(self, timestamp: float) -> Optional[TrendWindow]:
+        """Window a post belongs to, rotating forward when event time moves on"""
+        window_id = int(timestamp // self.window_seconds)
+        if self.current is None:
+            self.current = self._new_window(window_id)
+        if window_id > self.current.window_id:
+            self.previous = self.current if window_id == self.current.window_id + 1 else None
+            self.current = self._new_window(window_id)
+        if window_id == self.current.window_id:
+            return self.current
+        if self.previous is not None and window_id == self.previous.window_id:
+            return self.previous
+        if window_id == self.current.window_id - 1:
+            self.previous = self._new_window(window_id)
+            return self.previous
+        return None
+
+    def ingest(self,
+               text: str,
+               platform: Optional[str],
+               niche: Optional[str],
+               timestamp: float,
+               hashtags: Optional[Iterable[str]] = None):
+        """Fold one post into its window"""
+        self.ingest_many([{"content": text, "platform": platform, "niche": niche,
+                           "timestamp": timestamp, "hashtags": hashtags}])
+
+    def ingest_many(self, posts: Sequence[Dict[str, Any]]) -> int:
+        """
+        Posts as dicts with content, platform, timestamp and optional
+        niche/hashtags, in any order. Each window's share of the batch is
+        aggregated first and folded into the sketches in one pass.
+        """
+        ordered = sorted(posts, key=lambda p: p["timestamp"])
+        start = 0
+        while start < len(ordered):
+            window_id = int(ordered[start]["timestamp"] // self.window_seconds)
+            end = start
+            # Count against each post's own segment first, expand to rollups per distinct key after
+            base_counts: Counter = Counter()
+            base_posts: Counter = Counter()
+            while end < len(ordered) and int(ordered[end]["timestamp"] // self.window_seconds) == window_id:
+                post = ordered[end]
+                segment = ((post.get("platform") or ANY).lower(), (post.get("niche") or ANY).lower())
+                base_posts[segment] += 1
+                for kind, values in extract_tags(post.get("content", ""), post.get("hashtags")).items():
+                    base_counts.update((kind, segment, tag) for tag in values)
+                end += 1
+            counts: Dict[Tuple[str, str, str, str], int] = Counter()
+            segment_posts: Dict[Tuple[str, str], int] = Counter()
+            for segment, count in base_posts.items():
+                for rollup in _segments(*segment):
+                    segment_posts[rollup] += count
+            for (kind, segment, tag), count in base_counts.items():
+                for rollup in _segments(*segment):
+                    counts[(kind,) + rollup + (tag,)] += count
+            with self._lock:
+                window = self._window_for(ordered[start]["timestamp"])
+                if window is None:
+                    self.late_posts_dropped += end - start
+                else:
+                    window.add(counts, segment_posts, ordered[end - 1]["timestamp"])
+                    self.posts_ingested += end - start
+            start = end
+        return len(posts)
+
+    def trending(self,
+                 platform: Optional[str] = None,
+                 niche: Optional[str] = None,
+                 kind: str = "hashtag",
+                 k: int = 10,
+                 sort_by: str = "count",
+                 min_count: int = 5) -> Dict[str, Any]:
+        """Top-k tags in the current window for a segment, with growth vs. the previous window"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown tag kind: {kind}")
+        if sort_by not in ("count", "growth"):
+            raise ValueError(f"Unknown trend ordering: {sort_by}")
+        segment = ((platform or ANY).lower(), (niche or ANY).lower())
+        with self._lock:
+            current, previous = self.current, self.previous
+            summary = current.summaries.get((kind,) + segment) if current else None
+            if summary is None:
+                return {"platform": segment[0], "niche": segment[1], "kind": kind, "window_start": None,
+                        "posts_in_window": 0, "trends": []}
+            window_start = current.window_id * self.window_seconds
+            # Rates over at least a tenth of a window so the first few posts do not read as a surge
+            elapsed = min(max(current.last_timestamp - window_start, self.window_seconds / 10), self.window_seconds)
+            # Candidates beyond k so growth ordering can surface smaller, faster-rising tags
+            candidates = summary.top(k if sort_by == "count" else summary.capacity)
+            candidates = [entry for entry in candidates if entry[1] - entry[2] >= min_count]
+            has_previous = previous is not None and previous.window_id == current.window_id - 1
+            previous_counts = (
+                previous.sketch.estimate_many([_sketch_key(kind, segment, tag) for tag, _, _ in candidates])
+                if has_previous else np.zeros(len(candidates), dtype=np.int64)
+            )
+            trends = []
+            for (tag, count, error), previous_count in zip(candidates, previous_counts.tolist()):
+                current_rate = count / elapsed * 3600
+                guaranteed_rate = (count - error) / elapsed * 3600
+                # A tag unseen last window counts as one post, so brand-new tags rank by volume
+                previous_rate = max(previous_count, 1) / self.window_seconds * 3600
+                trends.append({
+                    "tag": f"{PREFIXES[kind]}{tag}",
+                    "posts": count,
+                    "posts_lower_bound": count - error,
+                    "previous_window_posts": previous_count,
+                    "posts_per_hour": round(current_rate, 2),
+                    "growth": round((guaranteed_rate - previous_rate) / previous_rate * 100, 1) if has_previous else None
+                })
+            posts_in_window = current.posts.get(segment, 0)
+
+        if sort_by == "growth":
+            trends.sort(key=lambda t: (-(t["growth"] or 0), -t["posts"]))
+            trends = trends[:k]
+        return {
+            "platform": segment[0],
+            "niche": segment[1],
+            "kind": kind,
+            "window_start": window_start,
+            "posts_in_window": posts_in_window,
+            "trends": trends
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "posts_ingested": self.posts_ingested,
+                "late_posts_dropped": self.late_posts_dropped,
+                "window_seconds": self.window_seconds,
+                "current_window_start": self.current.window_id * self.window_seconds if self.current else None,
+                "segments_tracked": len(self.current.summaries) if self.current else 0
+            }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "window_seconds": self.window_seconds,
+                "capacity": self.capacity,
+                "cm_width": self.cm_width,
+                "cm_depth": self.cm_depth,
+                "posts_ingested": self.posts_ingested,
+                "late_posts_dropped": self.late_posts_dropped,
+                "current": self.current.to_dict() if self.current else None,
+                "previous": self.previous.to_dict() if self.previous else None
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TrendEngine':
+        engine = cls(
+            window_seconds=data.get("window_seconds", 3600.0),
+            capacity=data.get("capacity", 1024),
+            cm_width=data.get("cm_width", 8192),
+            cm_depth=data.get("cm_depth", 4),
+            posts_ingested=data.get("posts_ingested", 0),
+            late_posts_dropped=data.get("late_posts_dropped", 0)
+        )
+        if data.get("current"):
+            engine.current = TrendWindow.from_dict(data["current"], engine.capacity)
+        if data.get("previous"):
+            engine.previous = TrendWindow.from_dict(data["previous"], engine.capacity)
+        return engine
+
+    def save(self, path: str = DEFAULT_STATE_PATH):
+        save_json(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_STATE_PATH) -> 'TrendEngine':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def load_if_exists(cls, path: str = DEFAULT_STATE_PATH, **kwargs) -> 'TrendEngine':
+        return cls.load(path) if os.path.exists(path) else cls(**kwargs)
+
+
+def synthetic_posts(n_posts: int, n_tags: int = 200_000, window_seconds: float = 3600.0,
+                    seed: int = 0) -> List[Dict[str, Any]]:
+    """Two windows of Zipf-distributed hashtags; a few tags surge in the second"""
+    rng = np.random.default_rng(seed)
+    platforms = np.array(["instagram", "tiktok", "youtube", "twitter"])
+    niches = np.array(["fashion", "fitness", "tech", "travel", "food", "beauty"])
+    ranks = np.minimum(rng.zipf(1.2, (n_posts, 3)), n_tags) - 1
+    timestamps = np.sort(rng.random(n_posts)) * 2 * window_seconds
+    surging = rng.random(n_posts) < 0.05
+    ranks[:, 0] = np.where(surging & (timestamps >= window_seconds), 5000 + rng.integers(0, 5, n_posts), ranks[:, 0])
+    platform_ids = rng.integers(0, len(platforms), n_posts)
+    niche_ids = rng.integers(0, len(niches), n_posts)
+    return [
+        {
+            "content": f"new drop #tag{ranks[i, 0]} #tag{ranks[i, 1]} #tag{ranks[i, 2]} with @creator{ranks[i, 1] % 1000}",
+            "platform": platforms[platform_ids[i]],
+            "niche": niches[niche_ids[i]],
+            "timestamp": float(timestamps[i])
+        }
+        for i in range(n_posts)
+    ]
+
+
+def benchmark(n_posts: int, k: int = 20) -> Dict[str, Any]:
+    """Ingest throughput and top-k precision against exact counts for the last window"""
+    posts = synthetic_posts(n_posts)
+    engine = TrendEngine()
+    start = time.perf_counter()
+    engine.ingest_many(posts)
+    seconds = time.perf_counter() - start
+
+    exact: Dict[str, int] = {}
+    last_window = int(posts[-1]["timestamp"] // engine.window_seconds)
+    for post in posts:
+        if int(post["timestamp"] // engine.window_seconds) == last_window:
+            for tag in extract_tags(post["content"])["hashtag"]:
+                exact[tag] = exact.get(tag, 0) + 1
+    true_top = {f"#{tag}" for tag, _ in sorted(exact.items(), key=lambda e: -e[1])[:k]}
+    reported = engine.trending(k=k, min_count=0)["trends"]
+    rising = engine.trending(k=5, sort_by="growth", min_count=50)["trends"]
+    return {
+        "posts": n_posts,
+        "ingest_seconds": round(seconds, 2),
+        "posts_per_second": int(n_posts / max(seconds, 1e-9)),
+        "top_k_precision": round(len(true_top & {t["tag"] for t in reported}) / k, 3),
+        "max_count_error": max(abs(t["posts"] - exact.get(t["tag"][1:], 0)) for t in reported),
+        "top_rising": [t["tag"] for t in rising],
+        "state_kb": round(len(json.dumps(engine.to_dict())) / 1024, 1)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Trending hashtag sketch benchmark")
+    parser.add_argument('--posts', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--k', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    for n_posts in args.posts:
+        print(json.dumps(benchmark(n_posts, args.k)))
+
+
+if __name__ == "__main__":
+    main()
@@ -29,16 +29,33 @@ router.post("/match-score", requireAuth, async (req, res) => {
 
     // Call AI service for real scoring
     try {
-      const response = await axios.post(`${AI_SERVICE_URL}/api/match`, {
-        campaign_id: campaignId,
-        influencer_id: influencerId
-      });
+      const response = await axios.post(
+        `${AI_SERVICE_URL}/api/match`,
+        {
+          campaign_id: campaignId,
+          influencer_id: influencerId
+        },
+        {
+          headers: { Authorization: `Bearer ${process.env.AI_SERVICE_API_KEY}` },
+          timeout: 5000
+        }
+      );
 
       res.json({
         success: true,
         ...response.data
       });
     } catch (aiError) {
+      // The service answered and rejected the request (unknown or malformed id):
+      // pass that through rather than inventing a score
+      const status = aiError.response?.status;
+      if (status && status < 500) {
+        return res.status(status).json({
+          success: false,
+          error: aiError.response.data?.detail || aiError.message
+        });
+      }
+
       // Fallback to mock if AI service is unavailable
       const mockScore = Math.floor(Math.random() * 40) + 60;
       res.json({
@@ -1,9 +1,12 @@
 // backend/routes/search.js - Search and Discovery Routes
 const express = require("express");
+const axios = require("axios");
 const { supabase } = require("../config/supabase");
 const { requireAuth } = require("../middleware/auth");
 const router = express.Router();
 
+const AI_SERVICE_URL = process.env.AI_SERVICE_URL || "http://localhost:8000";
+
 // Search influencers with filters
 router.get("/influencers", requireAuth, async (req, res) => {
   try {
@@ -170,7 +173,30 @@ router.get("/trends/topics", requireAuth, async (req, res) => {
 // Get trending hashtags
 router.get("/trends/hashtags", requireAuth, async (req, res) => {
   try {
-    // Mock trending hashtags - would come from social media APIs
+    const { platform, niche, limit = 10, sort_by = "count" } = req.query;
+
+    // Live trends from the AI service's windowed hashtag sketches
+    try {
+      const response = await axios.get(`${AI_SERVICE_URL}/trends/hashtag`, {
+        params: { platform, niche, k: limit, sort_by },
+        headers: { Authorization: `Bearer ${process.env.AI_SERVICE_API_KEY}` },
+        timeout: 2000,
+      });
+
+      if (response.data.trends.length > 0) {
+        return res.json(
+          response.data.trends.map((trend) => ({
+            hashtag: trend.tag,
+            posts: trend.posts,
+            growth: trend.growth,
+          }))
+        );
+      }
+    } catch (aiError) {
+      console.warn("AI trend service unavailable:", aiError.message);
+    }
+
+    // Fallback until the trend engine has seen posts in the current window
     const trendingHashtags = [
       { hashtag: "#sustainability", posts: 245000, growth: 34.2 },
       { hashtag: "#wellness", posts: 189000, growth: 28.7 },